@@ -7,15 +7,175 @@ import secrets
 import hashlib
 import os
 
+from config import sedes
+
 DB = "asistencia.db"
 
+def ruta_base_datos(db_path: str = None) -> str:
+    """Ruta explícita o, si no se indica, el archivo de la sede activa"""
+    return db_path or sedes.ruta_activa()
+
+def conectar(db_path: str = None) -> sqlite3.Connection:
+    """Abre una conexión a la base de datos instrumentada por el monitor de consultas
+
+    Sin `db_path` la conexión va al archivo de la sede activa (config.sedes).
+    """
+    from core.monitor_consultas import ConexionInstrumentada
+    from core.asistencia_periodos import registrar_funciones
+    conn = sqlite3.connect(ruta_base_datos(db_path), factory=ConexionInstrumentada)
+    registrar_funciones(conn)
+    return conn
+
+def copiar_base_datos(origen: str, destino: str):
+    """Copia una base SQLite con la API de backup en línea
+
+    A diferencia de copiar el archivo, respeta el WAL y los bloqueos: el
+    resultado es una instantánea consistente aunque haya escritores activos.
+    """
+    fuente = sqlite3.connect(origen)
+    try:
+        copia = sqlite3.connect(destino)
+        try:
+            fuente.backup(copia)
+        finally:
+            copia.close()
+    finally:
+        fuente.close()
+
 def hash_password(password: str, salt: str) -> str:
     """Hashea una contraseña con salt"""
     return hashlib.sha256((salt + password).encode('utf-8')).hexdigest()
 
-def crear_db_y_schema():
-    """Crea las tablas si no existen y realiza migraciones"""
-    conn = sqlite3.connect(DB)
+# Recalcula el resumen mensual completo desde asistencia
+SQL_RECONSTRUIR_RESUMEN = """
+    INSERT INTO resumen_asistencia_mensual (id_estudiante, mes, presentes, tardes, ausentes, justificados)
+    SELECT id_estudiante, substr(fecha, 1, 7),
+           SUM(IFNULL(estado, '') = 'Presente'), SUM(IFNULL(estado, '') = 'Tarde'),
+           SUM(IFNULL(estado, '') = 'Ausente'), SUM(IFNULL(estado, '') = 'Justificado')
+    FROM asistencia
+    WHERE id_estudiante IS NOT NULL AND fecha IS NOT NULL
+    GROUP BY id_estudiante, substr(fecha, 1, 7)
+"""
+
+def _sql_sumar_resumen(fila: str) -> str:
+    return f"""
+        INSERT INTO resumen_asistencia_mensual (id_estudiante, mes, presentes, tardes, ausentes, justificados)
+        SELECT {fila}.id_estudiante, substr({fila}.fecha, 1, 7),
+               IFNULL({fila}.estado, '') = 'Presente', IFNULL({fila}.estado, '') = 'Tarde',
+               IFNULL({fila}.estado, '') = 'Ausente', IFNULL({fila}.estado, '') = 'Justificado'
+        WHERE {fila}.id_estudiante IS NOT NULL AND {fila}.fecha IS NOT NULL
+        ON CONFLICT (id_estudiante, mes) DO UPDATE SET
+            presentes = presentes + excluded.presentes,
+            tardes = tardes + excluded.tardes,
+            ausentes = ausentes + excluded.ausentes,
+            justificados = justificados + excluded.justificados;
+    """
+
+def _sql_restar_resumen(fila: str) -> str:
+    return f"""
+        UPDATE resumen_asistencia_mensual SET
+            presentes = presentes - (IFNULL({fila}.estado, '') = 'Presente'),
+            tardes = tardes - (IFNULL({fila}.estado, '') = 'Tarde'),
+            ausentes = ausentes - (IFNULL({fila}.estado, '') = 'Ausente'),
+            justificados = justificados - (IFNULL({fila}.estado, '') = 'Justificado')
+        WHERE id_estudiante = {fila}.id_estudiante AND mes = substr({fila}.fecha, 1, 7);
+    """
+
+# Tablas con columna cedula_normalizada -> su clave primaria
+TABLAS_CEDULA = {"estudiantes": "id", "docentes": "id_docente"}
+
+def cedula_normalizada(cedula):
+    """Valor de la columna cedula_normalizada (NULL si la cédula queda vacía)
+
+    Es la misma normalización de core.indice_estudiantes; quien escriba la
+    cédula debe escribir también esta columna.
+    """
+    from core.indice_estudiantes import normalizar_cedula
+    return normalizar_cedula(cedula) or None
+
+def actualizar_cedulas_normalizadas(c, tabla: str) -> bool:
+    """Recalcula cedula_normalizada donde no coincide con la cédula
+
+    Cubre filas anteriores a la columna y las escritas por otras
+    herramientas. Devuelve False si alguna choca con una cédula ya indexada
+    (esa fila queda en NULL hasta depurar los duplicados).
+    """
+    clave = TABLAS_CEDULA[tabla]
+    completa = True
+    filas = c.execute(f"SELECT {clave}, cedula, cedula_normalizada FROM {tabla}").fetchall()
+    for id_fila, cedula, actual in filas:
+        valor = cedula_normalizada(cedula)
+        if valor == actual:
+            continue
+        try:
+            c.execute(f"UPDATE {tabla} SET cedula_normalizada = ? WHERE {clave} = ?", (valor, id_fila))
+        except sqlite3.IntegrityError:
+            c.execute(f"UPDATE {tabla} SET cedula_normalizada = NULL WHERE {clave} = ?", (id_fila,))
+            completa = False
+    return completa
+
+def crear_indices_cedula(c) -> list:
+    """Índices únicos sobre la columna cedula_normalizada de estudiantes y docentes
+
+    La columna se guarda al escribir (no es un índice de expresión sobre una
+    función de la aplicación), así que la base sigue abriéndose y pasando
+    PRAGMA integrity_check desde cualquier cliente SQLite. Si una tabla ya
+    tiene cédulas repetidas el índice no se puede crear; se devuelve la
+    lista de esas tablas para depurarlas (core.deduplicacion).
+    """
+    pendientes = []
+    for tabla in TABLAS_CEDULA:
+        columnas = [r[1] for r in c.execute(f"PRAGMA table_info({tabla})").fetchall()]
+        if "cedula_normalizada" not in columnas:
+            c.execute(f"ALTER TABLE {tabla} ADD COLUMN cedula_normalizada TEXT")
+        # Índice anterior sobre la función normalizar_cedula(), que solo existía en la aplicación
+        c.execute(f"DROP INDEX IF EXISTS idx_{tabla}_cedula_normalizada")
+        completa = actualizar_cedulas_normalizadas(c, tabla)
+        try:
+            c.execute(f"""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_{tabla}_cedula_norm
+                ON {tabla} (cedula_normalizada)
+            """)
+        except sqlite3.IntegrityError:
+            completa = False
+        if not completa:
+            pendientes.append(tabla)
+            continue
+        # Índice anterior, que solo quitaba guiones y espacios
+        c.execute(f"DROP INDEX IF EXISTS idx_{tabla}_cedula_unica")
+    return pendientes
+
+def crear_triggers_resumen(c):
+    """Triggers que mantienen resumen_asistencia_mensual al escribir asistencia"""
+    c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_resumen_asistencia_insert
+        AFTER INSERT ON asistencia
+        BEGIN {_sql_sumar_resumen("NEW")} END
+    """)
+    c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_resumen_asistencia_update
+        AFTER UPDATE OF id_estudiante, fecha, estado ON asistencia
+        BEGIN {_sql_restar_resumen("OLD")} {_sql_sumar_resumen("NEW")} END
+    """)
+    c.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_resumen_asistencia_delete
+        AFTER DELETE ON asistencia
+        BEGIN {_sql_restar_resumen("OLD")} END
+    """)
+
+def crear_db_y_schema(db_path: str = None):
+    """Crea las tablas si no existen y realiza migraciones
+
+    Sin ruta se prepara el archivo de cada sede registrada.
+    """
+    if db_path is None:
+        for sede in sedes.sedes():
+            directorio = os.path.dirname(sede.archivo)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            crear_db_y_schema(sede.archivo)
+        return
+    conn = conectar(db_path)
     c = conn.cursor()
 
     # Tabla usuarios (con salt y hash)
@@ -35,6 +195,7 @@ def crear_db_y_schema():
         CREATE TABLE IF NOT EXISTS docentes (
             id_docente INTEGER PRIMARY KEY AUTOINCREMENT,
             cedula TEXT UNIQUE,
+            cedula_normalizada TEXT,
             nombres TEXT,
             apellido TEXT,
             especialidad TEXT,
@@ -52,6 +213,7 @@ def crear_db_y_schema():
         CREATE TABLE IF NOT EXISTS estudiantes (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             cedula TEXT,
+            cedula_normalizada TEXT,
             nombres TEXT,
             apellidos TEXT,
             carrera TEXT,
@@ -84,6 +246,30 @@ def crear_db_y_schema():
         )
     """)
 
+    # Asistencia por periodo: una fila por estudiante y día, 3 bits por periodo
+    # (ver core.asistencia_periodos)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS asistencia_periodos (
+            id_estudiante INTEGER NOT NULL,
+            fecha TEXT NOT NULL,
+            estados INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (id_estudiante, fecha),
+            FOREIGN KEY (id_estudiante) REFERENCES estudiantes(id)
+        ) WITHOUT ROWID
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_asistencia_periodos_fecha ON asistencia_periodos (fecha)")
+    c.execute("""
+        CREATE VIEW IF NOT EXISTS vista_asistencia_periodos AS
+        WITH RECURSIVE numeros(n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM numeros WHERE n < 20)
+        SELECT ap.id_estudiante, ap.fecha, numeros.n + 1 AS periodo,
+               CASE (ap.estados >> (3 * numeros.n)) & 7
+                   WHEN 1 THEN 'Presente' WHEN 2 THEN 'Tarde'
+                   WHEN 3 THEN 'Ausente' WHEN 4 THEN 'Justificado'
+               END AS estado
+        FROM asistencia_periodos ap
+        JOIN numeros ON (ap.estados >> (3 * numeros.n)) & 7 <> 0
+    """)
+
     # Tabla de materias
     c.execute("""
         CREATE TABLE IF NOT EXISTS materias (
@@ -110,6 +296,28 @@ def crear_db_y_schema():
         )
     """)
     
+    # Aulas y su capacidad (para el generador de horarios)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS aulas (
+            id_aula INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL UNIQUE,
+            capacidad INTEGER
+        )
+    """)
+
+    # Disponibilidad semanal de docentes (sin filas: disponible siempre)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS disponibilidad_docentes (
+            id_disponibilidad INTEGER PRIMARY KEY AUTOINCREMENT,
+            docente_id INTEGER NOT NULL,
+            dia_semana TEXT NOT NULL,
+            hora_inicio TIME NOT NULL,
+            hora_fin TIME NOT NULL,
+            FOREIGN KEY (docente_id) REFERENCES docentes(id_docente)
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_disponibilidad_docente ON disponibilidad_docentes (docente_id)")
+
     # Tabla de justificaciones
     c.execute("""
         CREATE TABLE IF NOT EXISTS justificaciones (
@@ -124,6 +332,20 @@ def crear_db_y_schema():
         )
     """)
     
+    # Notificaciones persistidas con estado de lectura (la clave evita repetir avisos)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS notificaciones (
+            id_notificacion INTEGER PRIMARY KEY AUTOINCREMENT,
+            tipo TEXT NOT NULL,
+            titulo TEXT NOT NULL,
+            mensaje TEXT,
+            fecha DATETIME NOT NULL,
+            leida INTEGER NOT NULL DEFAULT 0,
+            clave TEXT UNIQUE
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_notificaciones_leida_fecha ON notificaciones (leida, fecha)")
+
     # Tabla de configuración del sistema
     c.execute("""
         CREATE TABLE IF NOT EXISTS configuracion (
@@ -132,6 +354,31 @@ def crear_db_y_schema():
         )
     """)
 
+    # Resumen mensual de asistencia por estudiante (mantenido por triggers)
+    c.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='resumen_asistencia_mensual'")
+    resumen_nuevo = c.fetchone() is None
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS resumen_asistencia_mensual (
+            id_estudiante INTEGER NOT NULL,
+            mes TEXT NOT NULL,
+            presentes INTEGER DEFAULT 0,
+            tardes INTEGER DEFAULT 0,
+            ausentes INTEGER DEFAULT 0,
+            justificados INTEGER DEFAULT 0,
+            PRIMARY KEY (id_estudiante, mes)
+        )
+    """)
+    if resumen_nuevo:
+        c.execute(SQL_RECONSTRUIR_RESUMEN)
+    crear_triggers_resumen(c)
+
+    # Índices
+    c.execute("CREATE INDEX IF NOT EXISTS idx_asistencia_estudiante_fecha ON asistencia (id_estudiante, fecha)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_asistencia_fecha_id ON asistencia (fecha, id_asistencia)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_estudiantes_seccion ON estudiantes (seccion)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_estudiantes_carrera ON estudiantes (carrera)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_resumen_mes_ausentes ON resumen_asistencia_mensual (mes, ausentes)")
+
     conn.commit()
 
     # Migración de usuarios existentes
@@ -149,6 +396,92 @@ def crear_db_y_schema():
     except:
         pass
 
+    # Migración de estudiantes: datos del acudiente (avisos de inasistencia)
+    try:
+        c.execute("PRAGMA table_info(estudiantes)")
+        cols = [r[1] for r in c.fetchall()]
+        for columna in ("acudiente", "acudiente_correo", "acudiente_telefono"):
+            if columna not in cols:
+                c.execute(f"ALTER TABLE estudiantes ADD COLUMN {columna} TEXT")
+        conn.commit()
+    except:
+        pass
+
+    # Bandeja de salida de avisos a acudientes (la clave evita repetir el aviso del día)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS mensajes_salida (
+            id_mensaje INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_estudiante INTEGER,
+            fecha DATE,
+            canal TEXT NOT NULL,
+            destinatario TEXT NOT NULL,
+            asunto TEXT,
+            cuerpo TEXT NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'Pendiente',
+            intentos INTEGER NOT NULL DEFAULT 0,
+            proximo_intento DATETIME NOT NULL,
+            ultimo_error TEXT,
+            creado DATETIME NOT NULL,
+            enviado DATETIME,
+            reclamado DATETIME,
+            clave TEXT UNIQUE
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_mensajes_salida_cola ON mensajes_salida (canal, estado, proximo_intento)")
+    conn.commit()
+
+    # Migración de la bandeja de salida: hora en que un repartidor reclamó el mensaje
+    try:
+        c.execute("PRAGMA table_info(mensajes_salida)")
+        cols = [r[1] for r in c.fetchall()]
+        if "reclamado" not in cols:
+            c.execute("ALTER TABLE mensajes_salida ADD COLUMN reclamado DATETIME")
+        conn.commit()
+    except:
+        pass
+
+    # Migración de horarios: sección a la que se dicta la clase
+    try:
+        c.execute("PRAGMA table_info(horarios)")
+        cols = [r[1] for r in c.fetchall()]
+        if "seccion" not in cols:
+            c.execute("ALTER TABLE horarios ADD COLUMN seccion TEXT")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_horarios_seccion_dia ON horarios (seccion, dia_semana)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_horarios_docente_dia ON horarios (docente_id, dia_semana)")
+        conn.commit()
+    except:
+        pass
+
+    # Migración de asistencia: marca de estado calculado por el motor de reglas
+    try:
+        c.execute("PRAGMA table_info(asistencia)")
+        cols = [r[1] for r in c.fetchall()]
+        if "estado_calculado" not in cols:
+            c.execute("ALTER TABLE asistencia ADD COLUMN estado_calculado INTEGER DEFAULT 0")
+        conn.commit()
+    except:
+        pass
+
+    # Migración de justificaciones: rango de fechas, revisión e índices de la cola
+    try:
+        c.execute("PRAGMA table_info(justificaciones)")
+        cols = [r[1] for r in c.fetchall()]
+        for columna in ("fecha_fin DATE", "revisado_por TEXT", "fecha_revision DATETIME", "observacion_revision TEXT"):
+            if columna.split()[0] not in cols:
+                c.execute(f"ALTER TABLE justificaciones ADD COLUMN {columna}")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_justificaciones_estado_solicitud ON justificaciones (estado, fecha_solicitud)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_justificaciones_estudiante_fecha ON justificaciones (estudiante_id, fecha)")
+        conn.commit()
+    except:
+        pass
+
+    # Migración: cédulas únicas (normalizadas) en estudiantes y docentes
+    pendientes = crear_indices_cedula(c)
+    conn.commit()
+    for tabla in pendientes:
+        print(f"⚠️ Hay cédulas repetidas en {tabla}; no se creó el índice único. "
+              f"Ejecute 'python Main.py --deduplicar' para revisarlas")
+
     # Insertar admin por defecto
     try:
         c.execute("SELECT id_usuario FROM usuarios WHERE usuario='admin'")
@@ -179,6 +512,8 @@ def crear_db_y_schema():
             ('tolerancia_minutos', '15'),
             ('max_faltas_por_mes', '3'),
             ('hora_entrada_obligatoria', '07:00:00'),
+            ('max_horas_docente_dia', '6'),
+            ('hora_aviso_entradas', '08:00'),
             ('institucion_nombre', 'Instituto Rubén Darío')
         ]
         c.executemany("INSERT OR IGNORE INTO configuracion (clave, valor) VALUES (?, ?)", configs)
@@ -187,4 +522,4 @@ def crear_db_y_schema():
     
     conn.commit()
     conn.close()
-    print("✅ Base de datos creada/actualizada correctamente")
+    print(f"✅ Base de datos creada/actualizada correctamente ({db_path})")
@@ -17,7 +17,15 @@ class ConfigManager:
             "database": {
                 "name": "asistencia.db",
                 "backup_auto": True,
-                "backup_interval_hours": 24
+                "backup_interval_hours": 24,
+                "monitor_consultas": True,
+                "slow_query_ms": 200
+            },
+            "sedes": {
+                "predeterminada": "central",
+                "registro": {
+                    "central": {"nombre": "Sede Central", "archivo": "asistencia.db"}
+                }
             },
             "instituto": {
                 "nombre": "Instituto Rubén Darío",
@@ -35,6 +43,20 @@ class ConfigManager:
                 "animaciones": True,
                 "usar_fondos": True  # NUEVO: control para fondos
             },
+            "servicio": {
+                "host": "127.0.0.1",
+                "puerto": 8765,
+                "lote_max": 200,
+                "espera_lote_ms": 20
+            },
+            "avisos": {
+                "intervalo_segundos": 5,
+                "transportes": {}
+            },
+            "auditoria": {
+                # Fuera del directorio de datos; la variable AUDITORIA_CLAVE tiene prioridad
+                "archivo_clave": ""
+            },
             "system": {
                 "version": "2.0.0",
                 "debug": False
@@ -0,0 +1,118 @@
+"""
+Registro de sedes (campus) y enrutamiento de la base de datos
+
+Cada sede tiene su propio archivo SQLite; ningún archivo guarda el historial
+de todas. El registro se lee de config.json:
+
+    "sedes": {
+        "predeterminada": "central",
+        "registro": {
+            "central": {"nombre": "Sede Central", "archivo": "asistencia.db"},
+            "norte": {"nombre": "Sede Norte", "archivo": "sedes/norte.db"}
+        }
+    }
+
+La sede de la sesión se elige al iniciar sesión (o con --sede en los jobs);
+conectar() sin ruta abre el archivo de la sede activa. Los hilos que
+consultan otra sede usan `usar_sede`, que solo afecta al hilo actual.
+"""
+
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_PREDETERMINADO = "asistencia.db"
+
+class Sede:
+    """Una sede y su archivo de base de datos"""
+
+    def __init__(self, clave: str, nombre: str = None, archivo: str = None):
+        self.clave = clave
+        self.nombre = nombre or clave
+        self.archivo = archivo or f"{clave}.db"
+
+    def __repr__(self):
+        return f"Sede({self.clave!r}, {self.archivo!r})"
+
+_registro: Optional[Dict[str, Sede]] = None
+_predeterminada: Optional[str] = None
+_sesion: Optional[str] = None
+_local = threading.local()
+_lock = threading.Lock()
+
+def cargar_registro(configuracion: dict = None) -> Dict[str, Sede]:
+    """(Re)carga el registro; sin argumento lo lee de config.json"""
+    global _registro, _predeterminada
+    if configuracion is None:
+        from config.config_manager import ConfigManager
+        configuracion = ConfigManager().get('sedes', {}) or {}
+    registro, archivos = {}, {}
+    for clave, datos in (configuracion.get('registro') or {}).items():
+        sede = Sede(clave, datos.get('nombre'), datos.get('archivo'))
+        ruta = os.path.normcase(os.path.abspath(sede.archivo))
+        if ruta in archivos:
+            logger.error(f"❌ Las sedes '{archivos[ruta]}' y '{clave}' comparten el archivo {sede.archivo}; "
+                         f"se ignora '{clave}'")
+            continue
+        archivos[ruta] = clave
+        registro[clave] = sede
+    if not registro:
+        registro = {"central": Sede("central", "Sede Central", ARCHIVO_PREDETERMINADO)}
+    predeterminada = configuracion.get('predeterminada')
+    with _lock:
+        _registro = registro
+        _predeterminada = predeterminada if predeterminada in registro else next(iter(registro))
+    return registro
+
+def _obtener_registro() -> Dict[str, Sede]:
+    return _registro if _registro is not None else cargar_registro()
+
+def sedes() -> List[Sede]:
+    return list(_obtener_registro().values())
+
+def obtener_sede(clave: str) -> Sede:
+    registro = _obtener_registro()
+    if clave not in registro:
+        raise ValueError(f"Sede desconocida: {clave}")
+    return registro[clave]
+
+def seleccionar_sede(clave: str) -> Sede:
+    """Fija la sede de la sesión (todas las conexiones sin ruta explícita)"""
+    global _sesion
+    sede = obtener_sede(clave)
+    _sesion = clave
+    logger.info(f"🏫 Sede activa: {sede.nombre}")
+    return sede
+
+def sede_activa() -> Sede:
+    """La sede del hilo (usar_sede), si no la de la sesión, si no la predeterminada"""
+    registro = _obtener_registro()
+    clave = getattr(_local, 'clave', None) or _sesion
+    return registro.get(clave) or registro[_predeterminada]
+
+def ruta_activa() -> str:
+    return sede_activa().archivo
+
+@contextmanager
+def usar_sede(clave: str):
+    """Enruta las conexiones del hilo actual a otra sede mientras dure el bloque"""
+    obtener_sede(clave)
+    anterior = getattr(_local, 'clave', None)
+    _local.clave = clave
+    try:
+        yield
+    finally:
+        _local.clave = anterior
+
+def directorio_sede(base: str) -> str:
+    """Directorio de archivos derivados (backups, auditoría archivada) de la sede activa
+
+    La sede predeterminada conserva las rutas de siempre; las demás usan un
+    subdirectorio con su clave.
+    """
+    sede = sede_activa()
+    return base if sede.clave == _predeterminada else os.path.join(base, sede.clave)
@@ -0,0 +1,201 @@
+"""
+Asistencia por periodo de clase en forma empaquetada
+
+Cada estudiante tiene una sola fila por día en `asistencia_periodos`; la
+columna `estados` guarda 3 bits por periodo (periodo 1 en los bits más
+bajos), hasta 21 periodos en un entero de 64 bits:
+
+    0 sin registro, 1 Presente, 2 Tarde, 3 Ausente, 4 Justificado
+
+Los periodos son las clases de la sección ese día (`horarios`) ordenadas
+por hora de inicio. La vista `vista_asistencia_periodos` expande la fila
+cuando hace falta; los totales se calculan sobre el entero empaquetado con
+operaciones de bits, sin expandir.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config.database import conectar
+from core.reglas_asistencia import dia_de_fecha, normalizar_dia, hora_a_segundos
+
+logger = logging.getLogger(__name__)
+
+BITS = 3
+MASCARA = (1 << BITS) - 1
+MAX_PERIODOS = 21
+
+SIN_REGISTRO = 0
+CODIGOS = {"Presente": 1, "Tarde": 2, "Ausente": 3, "Justificado": 4}
+ESTADOS = {codigo: estado for estado, codigo in CODIGOS.items()}
+
+# Bit más bajo de cada campo: 0b...001001001
+_UNOS = sum(1 << (BITS * i) for i in range(MAX_PERIODOS))
+
+def _desplazamiento(periodo: int) -> int:
+    if not 1 <= periodo <= MAX_PERIODOS:
+        raise ValueError(f"Periodo fuera de rango (1-{MAX_PERIODOS}): {periodo}")
+    return BITS * (periodo - 1)
+
+def empaquetar(estados: List[Optional[str]]) -> int:
+    """['Presente', None, 'Ausente'] -> entero empaquetado"""
+    if len(estados) > MAX_PERIODOS:
+        raise ValueError(f"Máximo {MAX_PERIODOS} periodos por día")
+    valor = 0
+    for i, estado in enumerate(estados):
+        if estado:
+            valor |= CODIGOS[estado] << (BITS * i)
+    return valor
+
+def desempaquetar(valor: int, periodos: int = None) -> List[Optional[str]]:
+    """Entero empaquetado -> lista de estados (None si el periodo no tiene registro)"""
+    valor = valor or 0
+    if periodos is None:
+        periodos = (valor.bit_length() + BITS - 1) // BITS
+    return [ESTADOS.get((valor >> (BITS * i)) & MASCARA) for i in range(periodos)]
+
+def estado_periodo(valor: int, periodo: int) -> Optional[str]:
+    return ESTADOS.get(((valor or 0) >> _desplazamiento(periodo)) & MASCARA)
+
+def contar_estado(valor: int, codigo: int) -> int:
+    """Cantidad de periodos con el código dado, sin expandir el entero
+
+    Los campos iguales al código quedan en cero tras el XOR; se cuentan los
+    campos distintos de cero y se restan del total.
+    """
+    if valor is None:
+        return 0
+    x = valor ^ (codigo * _UNOS)
+    distintos = (x | (x >> 1) | (x >> 2)) & _UNOS
+    return MAX_PERIODOS - bin(distintos).count("1")
+
+def reemplazar_estado(valor: int, codigo: int, nuevo: int) -> int:
+    """Cambia todos los periodos con `codigo` a `nuevo` (p. ej. Ausente -> Justificado)"""
+    if not valor:
+        return valor
+    x = valor ^ (codigo * _UNOS)
+    iguales = ~(x | (x >> 1) | (x >> 2)) & _UNOS
+    return valor ^ ((codigo ^ nuevo) * iguales)
+
+def combinar(valor: int, otro: int) -> int:
+    """Completa los periodos sin registro de `valor` con los de `otro`
+
+    Los periodos que ya tienen estado en `valor` no cambian.
+    """
+    valor, otro = valor or 0, otro or 0
+    vacios = ~(valor | (valor >> 1) | (valor >> 2)) & _UNOS
+    return valor | (otro & (vacios * MASCARA))
+
+def registrar_funciones(conn):
+    """Funciones SQL para consultar la forma empaquetada"""
+    conn.create_function("contar_periodos", 2, contar_estado, deterministic=True)
+    conn.create_function("reemplazar_periodos", 3, reemplazar_estado, deterministic=True)
+
+def periodos_del_dia(seccion: str, fecha: str, db_path: str = None, conn=None) -> List[dict]:
+    """Clases de la sección esa fecha en orden; la posición es el número de periodo"""
+    propia = conn is None
+    if propia:
+        conn = conectar(db_path)
+    try:
+        filas = conn.execute("""
+            SELECT h.id_horario, h.dia_semana, h.hora_inicio, h.hora_fin, IFNULL(m.nombre, ''), h.docente_id
+            FROM horarios h LEFT JOIN materias m ON m.id_materia = h.materia_id
+            WHERE UPPER(TRIM(h.seccion)) = ?
+        """, (str(seccion or "").strip().upper(),)).fetchall()
+    finally:
+        if propia:
+            conn.close()
+    dia = dia_de_fecha(fecha)
+    clases = [f for f in filas if normalizar_dia(f[1]) == dia]
+    clases.sort(key=lambda f: hora_a_segundos(f[2]) or 0)
+    return [{'periodo': i + 1, 'id_horario': f[0], 'hora_inicio': f[2], 'hora_fin': f[3],
+             'materia': f[4], 'docente_id': f[5]} for i, f in enumerate(clases[:MAX_PERIODOS])]
+
+def marcar_periodo(fecha: str, periodo: int, estados: Dict[int, Optional[str]], db_path: str = None) -> int:
+    """Marca el periodo para varios estudiantes en una transacción
+
+    estados: {id_estudiante: 'Presente' | 'Tarde' | 'Ausente' | 'Justificado' | None}
+    None borra la marca. Solo se reescriben los 3 bits del periodo.
+    """
+    desplazamiento = _desplazamiento(periodo)
+    datetime.strptime(fecha, "%Y-%m-%d")
+    limpiar = ~(MASCARA << desplazamiento)
+    filas = []
+    for id_estudiante, estado in estados.items():
+        if estado and estado not in CODIGOS:
+            raise ValueError(f"Estado inválido: {estado}")
+        filas.append((id_estudiante, fecha, (CODIGOS[estado] if estado else 0) << desplazamiento))
+    conn = conectar(db_path)
+    try:
+        conn.executemany(f"""
+            INSERT INTO asistencia_periodos (id_estudiante, fecha, estados) VALUES (?, ?, ?)
+            ON CONFLICT (id_estudiante, fecha) DO UPDATE SET
+                estados = (estados & {limpiar}) | excluded.estados
+        """, filas)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    logger.info(f"📚 Periodo {periodo} del {fecha}: {len(filas)} estudiantes marcados")
+    return len(filas)
+
+def estados_seccion(seccion: str, fecha: str, db_path: str = None) -> List[dict]:
+    """Estudiantes de la sección con su entero empaquetado del día"""
+    conn = conectar(db_path)
+    try:
+        filas = conn.execute("""
+            SELECT e.id, e.nombres || ' ' || e.apellidos, IFNULL(ap.estados, 0)
+            FROM estudiantes e
+            LEFT JOIN asistencia_periodos ap ON ap.id_estudiante = e.id AND ap.fecha = ?
+            WHERE UPPER(TRIM(e.seccion)) = ?
+            ORDER BY e.apellidos, e.nombres
+        """, (fecha, str(seccion or "").strip().upper())).fetchall()
+    finally:
+        conn.close()
+    return [{'id': f[0], 'nombre': f[1], 'estados': f[2]} for f in filas]
+
+def resumen_estudiantes(desde: str, hasta: str, seccion: str = None, db_path: str = None) -> List[dict]:
+    """Totales de periodos por estudiante en el rango, calculados sobre la forma empaquetada"""
+    query = f"""
+        SELECT ap.id_estudiante, e.nombres || ' ' || e.apellidos, e.seccion,
+               {', '.join(f'SUM(contar_periodos(ap.estados, {c}))' for c in CODIGOS.values())}
+        FROM asistencia_periodos ap JOIN estudiantes e ON e.id = ap.id_estudiante
+        WHERE ap.fecha BETWEEN ? AND ?
+    """
+    params = [desde, hasta]
+    if seccion:
+        query += " AND UPPER(TRIM(e.seccion)) = ?"
+        params.append(seccion.strip().upper())
+    query += " GROUP BY ap.id_estudiante ORDER BY e.apellidos, e.nombres"
+    conn = conectar(db_path)
+    try:
+        filas = conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+    claves = [estado.lower() for estado in CODIGOS]
+    return [dict(id_estudiante=f[0], nombre=f[1], seccion=f[2], **dict(zip(claves, f[3:]))) for f in filas]
+
+def ausencias_por_periodo(desde: str, hasta: str, seccion: str = None, periodos: int = 8,
+                          db_path: str = None) -> List[int]:
+    """Ausencias en cada periodo (1..periodos) del rango, extrayendo los bits en SQL"""
+    periodos = min(periodos, MAX_PERIODOS)
+    columnas = ", ".join(
+        f"SUM(((ap.estados >> {BITS * i}) & {MASCARA}) = {CODIGOS['Ausente']})" for i in range(periodos)
+    )
+    query = f"SELECT {columnas} FROM asistencia_periodos ap"
+    params = [desde, hasta]
+    if seccion:
+        query += " JOIN estudiantes e ON e.id = ap.id_estudiante WHERE UPPER(TRIM(e.seccion)) = ? AND"
+        params.insert(0, seccion.strip().upper())
+    else:
+        query += " WHERE"
+    query += " ap.fecha BETWEEN ? AND ?"
+    conn = conectar(db_path)
+    try:
+        fila = conn.execute(query, params).fetchone()
+    finally:
+        conn.close()
+    return [v or 0 for v in fila]
@@ -1,73 +1,725 @@
 """
 Sistema de Auditoría para registrar acciones
+
+La tabla `auditoria` es la partición caliente: solo guarda el mes en curso y
+está indexada por fecha y por usuario. Al cambiar de mes, los registros
+anteriores pasan a una tabla por mes (`auditoria_AAAA_MM`); los meses fríos
+se comprimen en archivos gzip de líneas JSON que siguen siendo consultables
+y la tabla del mes se elimina. La retención borra particiones completas
+(DROP TABLE o borrar el archivo) en lugar de recorrer la tabla con DELETE.
+
+`auditoria_particiones` registra cada mes con su cantidad de registros, sus
+usuarios y su rango de fechas, para saltar particiones que no pueden
+coincidir con una búsqueda.
+
+Cada registro guarda `hash` = SHA-256(hash anterior + datos del evento); el
+escritor por lotes encadena los eventos en orden de id dentro de una
+transacción IMMEDIATE. Cada CHECKPOINT_CADA registros se firma con HMAC el
+último hash (la clave vive fuera de la base de datos: variable
+AUDITORIA_CLAVE o archivo `auditoria.archivo_clave` de la configuración,
+fuera del directorio de datos), y la verificación solo recalcula los
+registros posteriores al último checkpoint válido.
 """
 
+import os
+import json
+import gzip
+import hmac
+import queue
+import atexit
+import heapq
+import hashlib
 import logging
-from datetime import datetime
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from config import sedes
+from config.database import conectar, ruta_base_datos
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_ARCHIVO = os.path.join("backups", "auditoria")
+MESES_ACTIVOS = 3
+COLUMNAS = "usuario, accion, detalles, fecha, ip"
+
+GENESIS = "0" * 64
+CHECKPOINT_CADA = 1000
+ARCHIVO_CLAVE = "auditoria.key"
+VARIABLE_CLAVE = "AUDITORIA_CLAVE"
+# Reintentos de un lote del escritor (p. ej. "database is locked") antes de descartarlo
+REINTENTOS_LOTE = 6
+ESPERA_REINTENTO_MAX = 5.0
+
+_avisos_clave = set()
+
+def _tabla_mes(mes: str) -> str:
+    """'2024-05' -> 'auditoria_2024_05'"""
+    return "auditoria_" + mes.replace("-", "_")
+
+def _mes_actual() -> str:
+    # CURRENT_TIMESTAMP de SQLite está en UTC
+    return datetime.now(timezone.utc).strftime("%Y-%m")
+
+def _restar_meses(mes: str, meses: int) -> str:
+    anio, numero = map(int, mes.split("-"))
+    total = anio * 12 + numero - 1 - meses
+    return f"{total // 12:04d}-{total % 12 + 1:02d}"
+
+def _fin_de_mes(mes: str) -> str:
+    """Último día del mes (AAAA-MM-DD)"""
+    siguiente = datetime.strptime(_restar_meses(mes, -1) + "-01", "%Y-%m-%d")
+    return (siguiente - timedelta(days=1)).strftime("%Y-%m-%d")
+
+# ==================== CADENA DE HASHES ====================
+
+def hash_evento(anterior: str, usuario, accion, detalles, fecha, ip) -> str:
+    datos = json.dumps([anterior, usuario, accion, detalles, fecha, ip],
+                       ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(datos.encode("utf-8")).hexdigest()
+
+def _avisar_clave(mensaje: str):
+    """Advierte una sola vez por proceso sobre una clave de firma poco segura"""
+    if mensaje not in _avisos_clave:
+        _avisos_clave.add(mensaje)
+        logger.warning(mensaje)
+
+def _ruta_clave() -> str:
+    """Archivo de la clave: el configurado en auditoria.archivo_clave o, en su defecto, ARCHIVO_CLAVE
+
+    La clave debe estar fuera del directorio de datos; si no, quien copie la
+    base junto con su carpeta puede volver a firmar la cadena.
+    """
+    from config.config_manager import ConfigManager
+    ruta = ConfigManager().get('auditoria.archivo_clave') or ""
+    if not ruta:
+        _avisar_clave(f"⚠️ Sin {VARIABLE_CLAVE} ni auditoria.archivo_clave: la clave de checkpoints "
+                      f"de auditoría se guarda en {os.path.abspath(ARCHIVO_CLAVE)}")
+        return ARCHIVO_CLAVE
+    datos = os.path.dirname(os.path.abspath(ruta_base_datos()))
+    try:
+        dentro = os.path.commonpath([datos, os.path.abspath(ruta)]) == datos
+    except ValueError:  # otra unidad en Windows
+        dentro = False
+    if dentro:
+        _avisar_clave(f"⚠️ La clave de checkpoints de auditoría ({ruta}) está dentro del "
+                      f"directorio de datos {datos}; configúrela fuera de él")
+    return ruta
+
+def _clave_hmac() -> bytes:
+    """Clave de firma de checkpoints: variable de entorno o archivo de clave (se crea si falta)"""
+    clave = os.environ.get(VARIABLE_CLAVE)
+    if clave:
+        return clave.encode("utf-8")
+    ruta = _ruta_clave()
+    if not os.path.exists(ruta):
+        descriptor = os.open(ruta, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "w") as f:
+            f.write(secrets.token_hex(32))
+        logger.info(f"🔑 Clave de checkpoints de auditoría creada en {ruta}")
+    with open(ruta, "r") as f:
+        return f.read().strip().encode("utf-8")
+
+def firmar_checkpoint(ultimo_id: int, hash_: str, fecha: str) -> str:
+    return hmac.new(_clave_hmac(), f"{ultimo_id}|{hash_}|{fecha}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+def _ultimo_hash(conn) -> str:
+    """Cola de la cadena: último registro encadenado de la partición caliente o del último mes rotado"""
+    fila = conn.execute("SELECT hash FROM auditoria WHERE hash IS NOT NULL ORDER BY id DESC LIMIT 1").fetchone()
+    if fila:
+        return fila[0]
+    fila = conn.execute("""
+        SELECT hash_final FROM auditoria_particiones WHERE hash_final IS NOT NULL ORDER BY mes DESC LIMIT 1
+    """).fetchone()
+    return fila[0] if fila else GENESIS
+
+class EscritorAuditoria:
+    """Hilo escritor de la auditoría: encadena y confirma los eventos en micro-lotes"""
+
+    _instancias = {}
+    _lock_instancias = threading.Lock()
+
+    def __init__(self, db_path: str, lote_max: int = 200, intervalo_ms: int = 100):
+        self.db_path = db_path
+        self.lote_max = lote_max
+        self.intervalo = intervalo_ms / 1000.0
+        self._pendientes = queue.Queue()
+        self._hilo = threading.Thread(target=self._escribir, name="escritor-auditoria", daemon=True)
+        self._hilo.start()
+
+    @classmethod
+    def obtener(cls, db_path: str) -> "EscritorAuditoria":
+        db_path = ruta_base_datos(db_path)
+        with cls._lock_instancias:
+            if db_path not in cls._instancias:
+                cls._instancias[db_path] = cls(db_path)
+            return cls._instancias[db_path]
+
+    @classmethod
+    def vaciar_todos(cls):
+        for escritor in list(cls._instancias.values()):
+            escritor.vaciar()
+
+    def encolar(self, usuario: str, accion: str, detalles: str, ip: str):
+        fecha = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        self._pendientes.put((usuario, accion, detalles, fecha, ip))
+
+    def vaciar(self):
+        """Espera a que los eventos encolados estén confirmados"""
+        self._pendientes.join()
+
+    def _escribir(self):
+        conn = None
+        while True:
+            lote = [self._pendientes.get()]
+            while len(lote) < self.lote_max:
+                try:
+                    lote.append(self._pendientes.get(timeout=self.intervalo / 5))
+                except queue.Empty:
+                    break
+            try:
+                conn = self._escribir_con_reintentos(conn, lote)
+            finally:
+                for _ in lote:
+                    self._pendientes.task_done()
+
+    def _escribir_con_reintentos(self, conn, lote: List[tuple]):
+        """Escribe el lote reintentando con espera creciente; devuelve la conexión a reutilizar"""
+        espera = 0.2
+        for intento in range(1, REINTENTOS_LOTE + 1):
+            try:
+                if conn is None:
+                    conn = conectar(self.db_path)
+                self.escribir_lote(conn, lote)
+                return conn
+            except Exception as e:
+                if conn is not None:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        # Conexión inservible: se abre otra en el próximo intento
+                        conn.close()
+                        conn = None
+                if intento == REINTENTOS_LOTE:
+                    logger.error(f"❌ Se descartan {len(lote)} eventos de auditoría tras "
+                                 f"{REINTENTOS_LOTE} intentos: {e}")
+                    return conn
+                logger.warning(f"⚠️ Error guardando lote de {len(lote)} eventos de auditoría "
+                               f"(intento {intento}/{REINTENTOS_LOTE}): {e}")
+                time.sleep(espera)
+                espera = min(espera * 2, ESPERA_REINTENTO_MAX)
+
+    @staticmethod
+    def escribir_lote(conn, eventos: List[tuple]) -> int:
+        """Inserta [(usuario, accion, detalles, fecha, ip)] encadenados; devuelve el último id
+
+        La transacción IMMEDIATE lee la cola de la cadena y escribe el lote
+        sin que otro proceso pueda intercalar registros.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            anterior = _ultimo_hash(conn)
+            filas = []
+            for evento in eventos:
+                anterior = hash_evento(anterior, *evento)
+                filas.append((*evento, anterior))
+            conn.executemany(f"INSERT INTO auditoria ({COLUMNAS}, hash) VALUES (?, ?, ?, ?, ?, ?)", filas)
+            ultimo_id = conn.execute("SELECT MAX(id) FROM auditoria").fetchone()[0]
+            firmado = conn.execute("SELECT IFNULL(MAX(ultimo_id), 0) FROM auditoria_checkpoints").fetchone()[0]
+            if ultimo_id - firmado >= CHECKPOINT_CADA:
+                EscritorAuditoria._insertar_checkpoint(conn, ultimo_id, anterior)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return ultimo_id
+
+    @staticmethod
+    def _insertar_checkpoint(conn, ultimo_id: int, hash_: str):
+        fecha = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        conn.execute("""
+            INSERT INTO auditoria_checkpoints (ultimo_id, hash, fecha, firma) VALUES (?, ?, ?, ?)
+        """, (ultimo_id, hash_, fecha, firmar_checkpoint(ultimo_id, hash_, fecha)))
+
+atexit.register(EscritorAuditoria.vaciar_todos)
 
 class Auditoria:
     """Sistema de auditoría para registrar acciones del sistema"""
-    
-    def __init__(self, db_manager):
+
+    _lock_rotacion = threading.Lock()
+
+    def __init__(self, db_manager, directorio_archivo: str = None):
         self.db_manager = db_manager
+        self.directorio_archivo = directorio_archivo or sedes.directorio_sede(DIRECTORIO_ARCHIVO)
         self.crear_tabla_auditoria()
-    
+
+    def _conectar(self):
+        return conectar(self.db_manager.db_path)
+
+    def _vaciar_escritor(self):
+        """Espera los eventos encolados por este proceso antes de leer"""
+        escritor = EscritorAuditoria._instancias.get(ruta_base_datos(self.db_manager.db_path))
+        if escritor:
+            escritor.vaciar()
+
     def crear_tabla_auditoria(self):
-        """Crea la tabla de auditoría si no existe"""
-        query = """
-            CREATE TABLE IF NOT EXISTS auditoria (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                usuario TEXT NOT NULL,
-                accion TEXT NOT NULL,
-                detalles TEXT,
-                fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                ip TEXT
-            )
-        """
-        self.db_manager.execute_query(query)
-    
+        """Crea la partición caliente, sus índices y el registro de particiones"""
+        conn = self._conectar()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS auditoria (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    usuario TEXT NOT NULL,
+                    accion TEXT NOT NULL,
+                    detalles TEXT,
+                    fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    ip TEXT,
+                    hash TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_auditoria_fecha ON auditoria (fecha)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_auditoria_usuario_fecha ON auditoria (usuario, fecha)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_auditoria_accion_fecha ON auditoria (accion, fecha)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS auditoria_particiones (
+                    mes TEXT PRIMARY KEY,
+                    registros INTEGER NOT NULL,
+                    usuarios TEXT,
+                    primera TEXT,
+                    ultima TEXT,
+                    archivo TEXT,
+                    id_max INTEGER,
+                    hash_final TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS auditoria_checkpoints (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ultimo_id INTEGER NOT NULL,
+                    hash TEXT NOT NULL,
+                    fecha TEXT NOT NULL,
+                    firma TEXT NOT NULL
+                )
+            """)
+            # Bases creadas antes de la cadena de hashes
+            for tabla, columna in [("auditoria", "hash TEXT"), ("auditoria_particiones", "id_max INTEGER"),
+                                   ("auditoria_particiones", "hash_final TEXT")]:
+                try:
+                    conn.execute(f"ALTER TABLE {tabla} ADD COLUMN {columna}")
+                except Exception:
+                    pass
+            for (mes,) in conn.execute("SELECT mes FROM auditoria_particiones WHERE archivo IS NULL").fetchall():
+                try:
+                    conn.execute(f"ALTER TABLE {_tabla_mes(mes)} ADD COLUMN hash TEXT")
+                except Exception:
+                    pass
+            conn.commit()
+        finally:
+            conn.close()
+
     def registrar_evento(self, usuario: str, accion: str, detalles: str = "", ip: str = "localhost"):
-        """Registra un evento en la auditoría"""
-        query = """
-            INSERT INTO auditoria (usuario, accion, detalles, ip)
-            VALUES (?, ?, ?, ?)
-        """
-        self.db_manager.execute_query(query, (usuario, accion, detalles, ip))
+        """Registra un evento en la auditoría (lo confirma el escritor por lotes)"""
+        EscritorAuditoria.obtener(self.db_manager.db_path).encolar(usuario, accion, detalles, ip)
         logging.info(f"AUDITORIA - Usuario: {usuario}, Acción: {accion}, Detalles: {detalles}")
-    
+
+    # ==================== PARTICIONES ====================
+
+    def particiones(self) -> List[dict]:
+        """Meses fuera de la partición caliente, del más reciente al más antiguo"""
+        conn = self._conectar()
+        try:
+            filas = conn.execute("""
+                SELECT mes, registros, usuarios, primera, ultima, archivo, id_max
+                FROM auditoria_particiones ORDER BY mes DESC
+            """).fetchall()
+        finally:
+            conn.close()
+        return [{'mes': f[0], 'registros': f[1], 'usuarios': json.loads(f[2] or "[]"),
+                 'primera': f[3], 'ultima': f[4], 'archivo': f[5], 'id_max': f[6]} for f in filas]
+
+    def rotar(self) -> List[str]:
+        """Mueve los meses anteriores al actual a su propia tabla
+
+        El movimiento de cada mes (INSERT ... SELECT y DELETE por rango de
+        fecha indexado) es una transacción; la partición caliente nunca
+        contiene más de un mes y medio de registros.
+        """
+        self._vaciar_escritor()
+        corte = _mes_actual() + "-01"
+        movidos = []
+        with self._lock_rotacion:
+            conn = self._conectar()
+            try:
+                meses = [f[0] for f in conn.execute("""
+                    SELECT DISTINCT substr(fecha, 1, 7) FROM auditoria WHERE fecha < ? ORDER BY 1
+                """, (corte,)).fetchall()]
+                for mes in meses:
+                    tabla = _tabla_mes(mes)
+                    desde, hasta = mes + "-01", _restar_meses(mes, -1) + "-01"
+                    conn.execute(f"""
+                        CREATE TABLE IF NOT EXISTS {tabla} (
+                            id INTEGER PRIMARY KEY,
+                            usuario TEXT NOT NULL,
+                            accion TEXT NOT NULL,
+                            detalles TEXT,
+                            fecha TIMESTAMP,
+                            ip TEXT,
+                            hash TEXT
+                        )
+                    """)
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabla}_fecha ON {tabla} (fecha)")
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabla}_usuario ON {tabla} (usuario, fecha)")
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{tabla}_accion ON {tabla} (accion, fecha)")
+                    conn.execute(f"""
+                        INSERT OR IGNORE INTO {tabla} (id, {COLUMNAS}, hash)
+                        SELECT id, {COLUMNAS}, hash FROM auditoria WHERE fecha >= ? AND fecha < ?
+                    """, (desde, hasta))
+                    conn.execute("DELETE FROM auditoria WHERE fecha >= ? AND fecha < ?", (desde, hasta))
+                    self._actualizar_registro(conn, mes, tabla)
+                    conn.commit()
+                    movidos.append(mes)
+                if movidos:
+                    self._recrear_vista(conn)
+                    conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+        if movidos:
+            logger.info(f"🗂️ Auditoría: meses {', '.join(movidos)} movidos a sus particiones")
+        return movidos
+
+    @staticmethod
+    def _actualizar_registro(conn, mes: str, tabla: str):
+        registros, primera, ultima = conn.execute(
+            f"SELECT COUNT(*), MIN(fecha), MAX(fecha) FROM {tabla}"
+        ).fetchone()
+        usuarios = [f[0] for f in conn.execute(f"SELECT DISTINCT usuario FROM {tabla} ORDER BY 1")]
+        id_max, hash_final = conn.execute(
+            f"SELECT id, hash FROM {tabla} WHERE hash IS NOT NULL ORDER BY id DESC LIMIT 1"
+        ).fetchone() or (conn.execute(f"SELECT MAX(id) FROM {tabla}").fetchone()[0], None)
+        conn.execute("""
+            INSERT INTO auditoria_particiones (mes, registros, usuarios, primera, ultima, archivo, id_max, hash_final)
+            VALUES (?, ?, ?, ?, ?, NULL, ?, ?)
+            ON CONFLICT (mes) DO UPDATE SET registros = excluded.registros, usuarios = excluded.usuarios,
+                primera = excluded.primera, ultima = excluded.ultima,
+                id_max = excluded.id_max, hash_final = excluded.hash_final
+        """, (mes, registros, json.dumps(usuarios, ensure_ascii=False), primera, ultima, id_max, hash_final))
+
+    @staticmethod
+    def _recrear_vista(conn):
+        """vista_auditoria: partición caliente más las tablas mensuales (no los archivos)"""
+        meses = [f[0] for f in conn.execute(
+            "SELECT mes FROM auditoria_particiones WHERE archivo IS NULL ORDER BY mes"
+        ).fetchall()]
+        partes = [f"SELECT id, {COLUMNAS} FROM auditoria"]
+        partes += [f"SELECT id, {COLUMNAS} FROM {_tabla_mes(m)}" for m in meses]
+        conn.execute("DROP VIEW IF EXISTS vista_auditoria")
+        conn.execute("CREATE VIEW vista_auditoria AS " + " UNION ALL ".join(partes))
+
+    def archivar(self, meses_activos: int = MESES_ACTIVOS) -> List[str]:
+        """Comprime en gzip los meses más antiguos que `meses_activos` y elimina sus tablas"""
+        limite = _restar_meses(_mes_actual(), meses_activos)
+        os.makedirs(self.directorio_archivo, exist_ok=True)
+        archivados = []
+        for particion in reversed(self.particiones()):
+            if particion['archivo'] or particion['mes'] >= limite:
+                continue
+            mes, tabla = particion['mes'], _tabla_mes(particion['mes'])
+            ruta = os.path.join(self.directorio_archivo, f"{tabla}.jsonl.gz")
+            temporal = ruta + ".tmp"
+            conn = self._conectar()
+            try:
+                escritos = 0
+                with gzip.open(temporal, "wt", encoding="utf-8") as f:
+                    for fila in conn.execute(f"SELECT id, {COLUMNAS}, hash FROM {tabla} ORDER BY id"):
+                        f.write(json.dumps(fila, ensure_ascii=False) + "\n")
+                        escritos += 1
+                if escritos != particion['registros']:
+                    raise RuntimeError(f"Archivo de {mes} incompleto: {escritos} de {particion['registros']}")
+                os.replace(temporal, ruta)
+                conn.execute("UPDATE auditoria_particiones SET archivo = ? WHERE mes = ?", (ruta, mes))
+                conn.execute(f"DROP TABLE {tabla}")
+                self._recrear_vista(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+                raise
+            finally:
+                conn.close()
+            archivados.append(mes)
+        if archivados:
+            logger.info(f"🗜️ Auditoría: {len(archivados)} meses comprimidos en {self.directorio_archivo}")
+        return archivados
+
+    def limpiar_registros_antiguos(self, dias: int = 30):
+        """Elimina las particiones completas más antiguas que los días especificados
+
+        Se descartan meses enteros (DROP TABLE o borrado del archivo); el mes
+        que contiene la fecha de corte se conserva completo. La cola del último
+        mes eliminado queda firmada como checkpoint: es el ancla desde la que
+        se verifica la cadena que sobrevive.
+        """
+        self.rotar()
+        corte = (datetime.now(timezone.utc) - timedelta(days=dias)).strftime("%Y-%m-%d")
+        eliminados = 0
+        ancla = None
+        conn = self._conectar()
+        try:
+            for particion in self.particiones():
+                if _fin_de_mes(particion['mes']) >= corte:
+                    continue
+                if not (ancla and ancla[1]):
+                    ancla = conn.execute(
+                        "SELECT id_max, hash_final FROM auditoria_particiones WHERE mes = ?",
+                        (particion['mes'],)).fetchone()
+                if particion['archivo']:
+                    if os.path.exists(particion['archivo']):
+                        os.remove(particion['archivo'])
+                else:
+                    conn.execute(f"DROP TABLE IF EXISTS {_tabla_mes(particion['mes'])}")
+                conn.execute("DELETE FROM auditoria_particiones WHERE mes = ?", (particion['mes'],))
+                eliminados += particion['registros']
+            if ancla and ancla[1] and not conn.execute(
+                    "SELECT 1 FROM auditoria_checkpoints WHERE ultimo_id = ?", (ancla[0],)).fetchone():
+                EscritorAuditoria._insertar_checkpoint(conn, ancla[0], ancla[1])
+            self._recrear_vista(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        logging.info(f"Auditoría: Eliminados {eliminados} registros antiguos")
+        return eliminados
+
+    def mantenimiento(self, meses_activos: int = MESES_ACTIVOS, retencion_dias: Optional[int] = None) -> dict:
+        """Rotación, archivo de meses fríos y retención (job programado)"""
+        rotados = self.rotar()
+        archivados = self.archivar(meses_activos)
+        eliminados = self.limpiar_registros_antiguos(retencion_dias) if retencion_dias else 0
+        return {'rotados': rotados, 'archivados': archivados, 'eliminados': eliminados}
+
+    # ==================== CONSULTAS ====================
+
+    def _leer_archivo(self, ruta: str) -> Iterator[list]:
+        """Filas [id, usuario, accion, detalles, fecha, ip, hash] de un mes archivado, una a una"""
+        with gzip.open(ruta, "rt", encoding="utf-8") as f:
+            for linea in f:
+                yield json.loads(linea)
+
+    def pagina(self, usuario: str = None, accion: str = None, desde: str = None, hasta: str = None,
+               cursor: Optional[Tuple[str, int]] = None, limite: int = 100,
+               incluir_archivo: bool = True) -> Tuple[List[tuple], Optional[Tuple[str, int]]]:
+        """Una página de registros, del más reciente al más antiguo, y el cursor de la siguiente
+
+        Filas: (id, usuario, accion, detalles, fecha, ip). El cursor es
+        (fecha, id) de la última fila entregada; cada partición se consulta
+        con una condición de rango sobre su índice, de modo que avanzar de
+        página no recorre las filas ya vistas. Los meses archivados se leen
+        en streaming conservando solo las `limite` filas más recientes.
+        """
+        self._vaciar_escritor()
+        condiciones, params = [], []
+        if usuario:
+            condiciones.append("usuario = ?")
+            params.append(usuario)
+        if accion:
+            condiciones.append("accion = ?")
+            params.append(accion)
+        if desde:
+            condiciones.append("fecha >= ?")
+            params.append(desde)
+        fin = None
+        if hasta:
+            fin = (datetime.strptime(hasta, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+            condiciones.append("fecha < ?")
+            params.append(fin)
+        if cursor:
+            condiciones.append("fecha <= ? AND (fecha < ? OR id < ?)")
+            params.extend([cursor[0], cursor[0], cursor[1]])
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+        def coincide(fila):
+            fecha = fila[4] or ""
+            return ((not usuario or fila[1] == usuario) and (not accion or fila[2] == accion)
+                    and (not desde or fecha >= desde) and (not fin or fecha < fin)
+                    and (not cursor or (fecha, fila[0]) < tuple(cursor)))
+
+        particiones = [p for p in self.particiones()
+                       if (not desde or p['mes'] >= desde[:7]) and (not hasta or p['mes'] <= hasta[:7])
+                       and (not usuario or usuario in p['usuarios'])
+                       and (not cursor or (p['primera'] or "") <= cursor[0])
+                       and (incluir_archivo or not p['archivo'])]
+        filas = []
+        conn = self._conectar()
+        try:
+            for fuente in [None] + particiones:
+                restante = limite - len(filas)
+                if restante <= 0:
+                    break
+                if fuente and fuente['archivo']:
+                    if not os.path.exists(fuente['archivo']):
+                        logger.warning(f"⚠️ Falta el archivo de auditoría {fuente['archivo']}")
+                        continue
+                    candidatas = (f for f in self._leer_archivo(fuente['archivo']) if coincide(f))
+                    mejores = heapq.nlargest(restante, candidatas, key=lambda f: (f[4] or "", f[0]))
+                    filas.extend(tuple(f[:6]) for f in mejores)
+                    continue
+                tabla = _tabla_mes(fuente['mes']) if fuente else "auditoria"
+                filas.extend(conn.execute(f"""
+                    SELECT id, {COLUMNAS} FROM {tabla} {where}
+                    ORDER BY fecha DESC, id DESC LIMIT ?
+                """, (*params, restante)).fetchall())
+        finally:
+            conn.close()
+        siguiente = (filas[-1][4], filas[-1][0]) if len(filas) == limite else None
+        return filas, siguiente
+
+    def iterar(self, lote: int = 500, **filtros) -> Iterator[tuple]:
+        """Todas las filas que cumplen los filtros, página a página (memoria acotada a un lote)"""
+        cursor = None
+        while True:
+            filas, cursor = self.pagina(cursor=cursor, limite=lote, **filtros)
+            yield from filas
+            if cursor is None:
+                return
+
     def obtener_registros(self, limite: int = 100):
         """Obtiene los últimos registros de auditoría"""
-        query = """
-            SELECT usuario, accion, detalles, fecha, ip 
-            FROM auditoria 
-            ORDER BY fecha DESC 
-            LIMIT ?
-        """
-        return self.db_manager.execute_query(query, (limite,), fetch=True) or []
-    
-    def buscar_por_usuario(self, usuario: str):
-        """Busca registros de auditoría por usuario"""
-        query = """
-            SELECT usuario, accion, detalles, fecha, ip 
-            FROM auditoria 
-            WHERE usuario = ? 
-            ORDER BY fecha DESC
+        return [f[1:] for f in self.pagina(limite=limite)[0]]
+
+    def buscar_por_usuario(self, usuario: str, limite: int = 1000):
+        """Busca registros de auditoría por usuario (incluye meses archivados)"""
+        return [f[1:] for f in self.pagina(usuario=usuario, limite=limite)[0]]
+
+    def buscar_por_fecha(self, fecha_inicio: str, fecha_fin: str, limite: int = 1000):
+        """Busca registros de auditoría por rango de fechas (incluye meses archivados)"""
+        return [f[1:] for f in self.pagina(desde=fecha_inicio, hasta=fecha_fin, limite=limite)[0]]
+
+    def acciones(self) -> List[str]:
+        """Acciones registradas en el mes en curso (sugerencias para el filtro)"""
+        conn = self._conectar()
+        try:
+            return [f[0] for f in conn.execute("SELECT DISTINCT accion FROM auditoria ORDER BY 1")]
+        finally:
+            conn.close()
+
+    # ==================== INTEGRIDAD ====================
+
+    def crear_checkpoint(self) -> Optional[dict]:
+        """Firma la cola actual de la cadena (además de los checkpoints automáticos)"""
+        self._vaciar_escritor()
+        conn = self._conectar()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            fila = conn.execute(
+                "SELECT id, hash FROM auditoria WHERE hash IS NOT NULL ORDER BY id DESC LIMIT 1"
+            ).fetchone() or conn.execute("""
+                SELECT id_max, hash_final FROM auditoria_particiones
+                WHERE hash_final IS NOT NULL ORDER BY mes DESC LIMIT 1
+            """).fetchone()
+            if not fila:
+                conn.rollback()
+                return None
+            EscritorAuditoria._insertar_checkpoint(conn, fila[0], fila[1])
+            conn.commit()
+        finally:
+            conn.close()
+        return {'ultimo_id': fila[0], 'hash': fila[1]}
+
+    def _filas_desde(self, conn, id_desde: int) -> Iterator[tuple]:
+        """(id, usuario, accion, detalles, fecha, ip, hash) con id > id_desde, en orden de id
+
+        Mezcla la partición caliente, las tablas mensuales y los archivos
+        que aún tienen registros posteriores (por id_max del registro).
         """
-        return self.db_manager.execute_query(query, (usuario,), fetch=True) or []
-    
-    def buscar_por_fecha(self, fecha_inicio: str, fecha_fin: str):
-        """Busca registros de auditoría por rango de fechas"""
-        query = """
-            SELECT usuario, accion, detalles, fecha, ip 
-            FROM auditoria 
-            WHERE date(fecha) BETWEEN ? AND ? 
-            ORDER BY fecha DESC
+        fuentes = []
+        for particion in self.particiones():
+            if particion['id_max'] is not None and particion['id_max'] <= id_desde:
+                continue
+            if particion['archivo']:
+                if not os.path.exists(particion['archivo']):
+                    raise RuntimeError(f"Falta el archivo de auditoría {particion['archivo']}")
+                fuentes.append(tuple(f) for f in self._leer_archivo(particion['archivo']) if f[0] > id_desde)
+            else:
+                fuentes.append(conn.execute(
+                    f"SELECT id, {COLUMNAS}, hash FROM {_tabla_mes(particion['mes'])} WHERE id > ? ORDER BY id",
+                    (id_desde,)))
+        fuentes.append(conn.execute(
+            f"SELECT id, {COLUMNAS}, hash FROM auditoria WHERE id > ? ORDER BY id", (id_desde,)))
+        return heapq.merge(*fuentes, key=lambda f: f[0])
+
+    def verificar(self, completa: bool = False) -> dict:
+        """Verifica la cadena desde el último checkpoint (o desde el inicio con completa=True)
+
+        Los registros sin hash anteriores a la cadena (de antes de la migración)
+        se cuentan aparte; uno sin hash después del primer registro encadenado
+        es una alteración. La verificación completa valida además la firma de
+        cada checkpoint contra el hash recalculado del registro firmado.
         """
-        return self.db_manager.execute_query(query, (fecha_inicio, fecha_fin), fetch=True) or []
-    
-    def limpiar_registros_antiguos(self, dias: int = 30):
-        """Elimina registros de auditoría más antiguos que los días especificados"""
-        query = "DELETE FROM auditoria WHERE date(fecha) < date('now', '-? days')"
-        resultado = self.db_manager.execute_query(query, (dias,))
-        logging.info(f"Auditoría: Eliminados {resultado} registros antiguos")
+        self._vaciar_escritor()
+        resultado = {'valido': True, 'verificados': 0, 'sin_cadena': 0, 'desde_id': 0,
+                     'checkpoint': None, 'error': None, 'id_error': None}
+
+        def fallo(mensaje, id_error=None):
+            resultado.update(valido=False, error=mensaje, id_error=id_error)
+            logger.warning(f"⚠️ Auditoría alterada: {mensaje}")
+            return resultado
+
+        conn = self._conectar()
+        try:
+            consulta = "SELECT ultimo_id, hash, fecha, firma FROM auditoria_checkpoints ORDER BY ultimo_id"
+            checkpoints = conn.execute(consulta).fetchall()
+            if not completa:
+                checkpoints = checkpoints[-1:]
+            for ultimo_id, hash_, fecha, firma in checkpoints:
+                if not hmac.compare_digest(firma, firmar_checkpoint(ultimo_id, hash_, fecha)):
+                    return fallo(f"firma inválida en el checkpoint del registro {ultimo_id}", ultimo_id)
+            # Registros firmados que la cadena recalculada debe reproducir
+            firmados = {c[0]: c[1] for c in checkpoints}
+            anterior = None
+            if not completa and checkpoints:
+                ultimo_id, hash_, fecha, _ = checkpoints[-1]
+                resultado.update(checkpoint=fecha, desde_id=ultimo_id)
+                anterior = hash_
+                # El registro firmado debe seguir existiendo con el mismo hash, salvo
+                # que la retención haya eliminado todo hasta él (checkpoint ancla)
+                primero = next(iter(self._filas_desde(conn, 0)), None)
+                if primero and primero[0] <= ultimo_id:
+                    firmado = next(iter(self._filas_desde(conn, ultimo_id - 1)), None)
+                    if not firmado or firmado[0] != ultimo_id or firmado[6] != hash_:
+                        return fallo(f"el registro {ultimo_id} del checkpoint fue alterado o eliminado", ultimo_id)
+                firmados.clear()
+            for fila in self._filas_desde(conn, resultado['desde_id']):
+                if fila[6] is None:
+                    if anterior is not None:
+                        return fallo(f"el registro {fila[0]} perdió su hash dentro de la cadena", fila[0])
+                    resultado['sin_cadena'] += 1
+                    continue
+                if anterior is None:
+                    # La cadena empieza en GENESIS; si la retención eliminó los meses
+                    # iniciales, en el checkpoint que firmó el último registro eliminado
+                    anclas = [i for i in firmados if i < fila[0]]
+                    anterior = firmados.pop(max(anclas)) if anclas else GENESIS
+                    for i in anclas:
+                        firmados.pop(i, None)
+                    if anclas:
+                        resultado.update(desde_id=max(anclas))
+                if hash_evento(anterior, *fila[1:6]) != fila[6]:
+                    return fallo(f"el registro {fila[0]} no coincide con la cadena", fila[0])
+                if fila[0] in firmados and firmados.pop(fila[0]) != fila[6]:
+                    return fallo(f"el registro {fila[0]} no coincide con su checkpoint", fila[0])
+                anterior = fila[6]
+                resultado['verificados'] += 1
+            if firmados:
+                faltante = min(firmados)
+                return fallo(f"el registro {faltante} del checkpoint fue eliminado", faltante)
+        finally:
+            conn.close()
+        if resultado['checkpoint'] is None and not completa:
+            logger.warning("⚠️ Auditoría sin checkpoints firmados: se verificó la cadena completa")
+        logger.info(f"🔐 Auditoría verificada: {resultado['verificados']} registros desde el id {resultado['desde_id']}")
         return resultado
@@ -0,0 +1,80 @@
+"""
+Detección de ausentismo crónico a partir del resumen mensual de asistencia
+"""
+
+import logging
+from datetime import datetime
+from typing import List
+
+from config.database import conectar, SQL_RECONSTRUIR_RESUMEN
+
+logger = logging.getLogger(__name__)
+
+UMBRAL_POR_DEFECTO = 3
+
+def mes_actual() -> str:
+    return datetime.now().strftime("%Y-%m")
+
+def umbral_faltas(conn) -> int:
+    """max_faltas_por_mes de la tabla configuracion"""
+    fila = conn.execute("SELECT valor FROM configuracion WHERE clave = 'max_faltas_por_mes'").fetchone()
+    try:
+        return int(fila[0]) if fila else UMBRAL_POR_DEFECTO
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ max_faltas_por_mes inválido: {fila[0]}")
+        return UMBRAL_POR_DEFECTO
+
+def estudiantes_en_riesgo(mes: str = None, umbral: int = None, db_path: str = None) -> List[dict]:
+    """Estudiantes que alcanzan o superan el límite de faltas del mes
+
+    Consulta indexada sobre resumen_asistencia_mensual (mes, ausentes);
+    cada resultado indica si ya superó el límite o está justo en él.
+    """
+    mes = mes or mes_actual()
+    conn = conectar(db_path)
+    try:
+        umbral = umbral_faltas(conn) if umbral is None else umbral
+        filas = conn.execute("""
+            SELECT r.id_estudiante, e.nombres || ' ' || e.apellidos, e.seccion,
+                   r.ausentes, r.tardes, r.presentes, r.justificados
+            FROM resumen_asistencia_mensual r
+            JOIN estudiantes e ON e.id = r.id_estudiante
+            WHERE r.mes = ? AND r.ausentes >= ?
+            ORDER BY r.ausentes DESC
+        """, (mes, max(umbral, 1))).fetchall()
+    finally:
+        conn.close()
+    return [{
+        'id_estudiante': id_, 'nombre': nombre, 'seccion': seccion,
+        'ausentes': ausentes, 'tardes': tardes, 'presentes': presentes,
+        'justificados': justificados, 'umbral': umbral,
+        'supera': ausentes > umbral,
+    } for id_, nombre, seccion, ausentes, tardes, presentes, justificados in filas]
+
+def porcentaje_asistencia(id_estudiante: int, desde_mes: str = None, hasta_mes: str = None,
+                          db_path: str = None) -> float:
+    """Porcentaje de asistencia (presente, tarde o justificado) en un rango de meses"""
+    desde_mes = desde_mes or mes_actual()
+    hasta_mes = hasta_mes or desde_mes
+    conn = conectar(db_path)
+    try:
+        asistidos, total = conn.execute("""
+            SELECT SUM(presentes + tardes + justificados),
+                   SUM(presentes + tardes + ausentes + justificados)
+            FROM resumen_asistencia_mensual
+            WHERE id_estudiante = ? AND mes BETWEEN ? AND ?
+        """, (id_estudiante, desde_mes, hasta_mes)).fetchone()
+    finally:
+        conn.close()
+    return round(100.0 * asistidos / total, 1) if total else 0.0
+
+def reconstruir_resumen(db_path: str = None):
+    """Recalcula el resumen mensual desde cero (reparación)"""
+    conn = conectar(db_path)
+    try:
+        conn.execute("DELETE FROM resumen_asistencia_mensual")
+        conn.execute(SQL_RECONSTRUIR_RESUMEN)
+        conn.commit()
+    finally:
+        conn.close()
+    logger.info("🔁 Resumen mensual de asistencia reconstruido")
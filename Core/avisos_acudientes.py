@@ -0,0 +1,394 @@
+"""
+Avisos de inasistencia a acudientes: bandeja de salida y repartidor
+
+El registro de asistencia no escribe en la bandeja: el encolado atiende los
+eventos ASISTENCIA_REGISTRADA / AUSENTES_MARCADOS en el hilo del bus e
+inserta con una sola sentencia INSERT ... SELECT los avisos de los
+estudiantes ausentes que tienen acudiente. La clave única
+(ausencia:estudiante:fecha:canal) deja un aviso por estudiante y día.
+
+El repartidor toma los mensajes vencidos de cada canal en lotes, los envía
+por su transporte (SMTP, archivo para una pasarela SMS o local para
+pruebas) respetando un límite por minuto, y reprograma los fallidos con
+espera exponencial hasta MAX_INTENTOS. Un mensaje reclamado queda en
+'Enviando' con la hora del reclamo; si su repartidor cae, otro lo devuelve a
+la cola cuando vence el plazo (PLAZO_RECLAMO_SEGUNDOS).
+"""
+
+import os
+import json
+import time
+import random
+import smtplib
+import logging
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config.database import conectar
+from core import eventos
+
+logger = logging.getLogger(__name__)
+
+PENDIENTE = "Pendiente"
+ENVIANDO = "Enviando"
+ENVIADO = "Enviado"
+FALLIDO = "Fallido"
+
+CANAL_CORREO = "email"
+CANAL_SMS = "sms"
+# Columna de estudiantes con el destinatario de cada canal
+DESTINATARIOS = {CANAL_CORREO: "acudiente_correo", CANAL_SMS: "acudiente_telefono"}
+
+MAX_INTENTOS = 6
+ESPERA_BASE_SEGUNDOS = 60
+ESPERA_MAX_SEGUNDOS = 6 * 3600
+# Tiempo máximo de un lote en 'Enviando' antes de considerarlo abandonado
+PLAZO_RECLAMO_SEGUNDOS = 10 * 60
+ASUNTO = "Aviso de inasistencia"
+
+def _ahora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+# ==================== TRANSPORTES ====================
+
+class LimiteTasa:
+    """Cubeta de fichas: `por_minuto` envíos por minuto con ráfagas de hasta ese tamaño"""
+
+    def __init__(self, por_minuto: int):
+        self.capacidad = max(int(por_minuto), 1)
+        self.fichas = float(self.capacidad)
+        self._ultimo = time.monotonic()
+
+    def disponibles(self) -> int:
+        ahora = time.monotonic()
+        self.fichas = min(self.capacidad, self.fichas + (ahora - self._ultimo) * self.capacidad / 60.0)
+        self._ultimo = ahora
+        return int(self.fichas)
+
+    def consumir(self, cantidad: int):
+        self.fichas -= cantidad
+
+class Transporte(ABC):
+    """Envía un lote de mensajes; devuelve {id_mensaje: None si se envió, o el error}"""
+
+    tipo = ""
+
+    def __init__(self, lote_max: int = 50, por_minuto: int = 60):
+        self.lote_max = lote_max
+        self.limite = LimiteTasa(por_minuto)
+
+    @abstractmethod
+    def enviar_lote(self, mensajes: List[dict]) -> Dict[int, Optional[str]]:
+        ...
+
+class TransporteSMTP(Transporte):
+    """Correo por SMTP: una conexión por lote"""
+
+    tipo = "smtp"
+
+    def __init__(self, host: str, puerto: int = 587, usuario: str = None, clave: str = None,
+                 remitente: str = None, tls: bool = True, timeout: int = 30, **opciones):
+        super().__init__(**opciones)
+        self.host, self.puerto = host, puerto
+        self.usuario, self.clave = usuario, clave
+        self.remitente = remitente or usuario
+        self.tls, self.timeout = tls, timeout
+
+    def enviar_lote(self, mensajes):
+        resultados = {}
+        with smtplib.SMTP(self.host, self.puerto, timeout=self.timeout) as smtp:
+            if self.tls:
+                smtp.starttls()
+            if self.usuario:
+                smtp.login(self.usuario, self.clave)
+            for mensaje in mensajes:
+                correo = EmailMessage()
+                correo["From"] = self.remitente
+                correo["To"] = mensaje['destinatario']
+                correo["Subject"] = mensaje['asunto'] or ASUNTO
+                correo.set_content(mensaje['cuerpo'])
+                try:
+                    smtp.send_message(correo)
+                    resultados[mensaje['id']] = None
+                except smtplib.SMTPException as e:
+                    resultados[mensaje['id']] = str(e)
+        return resultados
+
+class TransporteArchivo(Transporte):
+    """Deja cada lote como un archivo JSON en un directorio que recoge la pasarela (p. ej. SMS)"""
+
+    tipo = "archivo"
+
+    def __init__(self, directorio: str = "salida_avisos", **opciones):
+        super().__init__(**opciones)
+        self.directorio = directorio
+
+    def enviar_lote(self, mensajes):
+        os.makedirs(self.directorio, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+            json.dump([{k: m[k] for k in ('id', 'destinatario', 'asunto', 'cuerpo')} for m in mensajes],
+                      f, ensure_ascii=False)
+        ruta = os.path.join(self.directorio, f"lote_{datetime.now().strftime('%Y%m%d_%H%M%S')}_"
+                                             f"{mensajes[0]['id']}.json")
+        os.replace(temporal, ruta)
+        return {m['id']: None for m in mensajes}
+
+class TransporteLocal(Transporte):
+    """Guarda los mensajes en memoria (pruebas y demostraciones)"""
+
+    tipo = "local"
+
+    def __init__(self, fallar: int = 0, **opciones):
+        super().__init__(**opciones)
+        self.enviados = []
+        self.fallar = fallar
+
+    def enviar_lote(self, mensajes):
+        if self.fallar > 0:
+            self.fallar -= 1
+            raise ConnectionError("Transporte local configurado para fallar")
+        self.enviados.extend(mensajes)
+        return {m['id']: None for m in mensajes}
+
+TIPOS_TRANSPORTE = {cls.tipo: cls for cls in (TransporteSMTP, TransporteArchivo, TransporteLocal)}
+
+def crear_transportes(configuracion: dict) -> Dict[str, Transporte]:
+    """{canal: {'tipo': 'smtp' | 'archivo' | 'local', ...opciones}} -> {canal: Transporte}"""
+    transportes = {}
+    for canal, opciones in (configuracion or {}).items():
+        opciones = dict(opciones)
+        tipo = opciones.pop('tipo', None)
+        if canal not in DESTINATARIOS or tipo not in TIPOS_TRANSPORTE:
+            logger.warning(f"⚠️ Transporte de avisos inválido para '{canal}': {tipo}")
+            continue
+        transportes[canal] = TIPOS_TRANSPORTE[tipo](**opciones)
+    return transportes
+
+def transportes_configurados() -> Dict[str, Transporte]:
+    from config.config_manager import ConfigManager
+    return crear_transportes(ConfigManager().get('avisos.transportes', {}))
+
+# ==================== ENCOLADO ====================
+
+def encolar_ausencias(fecha: str, ids: List[int] = None, canales=tuple(DESTINATARIOS),
+                      db_path: str = None) -> int:
+    """Encola un aviso por canal para cada ausente de la fecha con acudiente; devuelve los nuevos"""
+    total = 0
+    filtro_ids = f"AND a.id_estudiante IN ({', '.join('?' * len(ids))})" if ids else ""
+    conn = conectar(db_path)
+    try:
+        for canal in canales:
+            columna = DESTINATARIOS[canal]
+            total += conn.execute(f"""
+                INSERT OR IGNORE INTO mensajes_salida
+                    (id_estudiante, fecha, canal, destinatario, asunto, cuerpo, proximo_intento, creado, clave)
+                SELECT a.id_estudiante, a.fecha, ?, TRIM(e.{columna}), ?,
+                       'Estimado(a) ' || IFNULL(NULLIF(TRIM(e.acudiente), ''), 'acudiente') ||
+                       ': le informamos que ' || e.nombres || ' ' || e.apellidos ||
+                       ' no asistió a clases el ' || a.fecha || '. ' ||
+                       IFNULL((SELECT valor FROM configuracion WHERE clave = 'institucion_nombre'), ''),
+                       ?, ?, 'ausencia:' || a.id_estudiante || ':' || a.fecha || ':' || ?
+                FROM asistencia a
+                JOIN estudiantes e ON e.id = a.id_estudiante
+                WHERE a.fecha = ? AND a.estado = 'Ausente' AND IFNULL(TRIM(e.{columna}), '') <> ''
+                {filtro_ids}
+            """, (canal, ASUNTO, _ahora(), _ahora(), canal, fecha, *(ids or ()))).rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    if total:
+        logger.info(f"📨 {total} avisos de inasistencia encolados ({fecha})")
+    return total
+
+def suscribir_encolado(db_path: str = None, canales=None):
+    """Encola avisos a partir de los eventos de asistencia (fuera de la ruta de escritura)"""
+    canales = tuple(canales if canales is not None else transportes_configurados())
+    if not canales:
+        return False
+    bus = eventos.BusEventos.obtener()
+    bus.suscribir(eventos.AUSENTES_MARCADOS,
+                  lambda fecha, cantidad: cantidad and encolar_ausencias(fecha, canales=canales, db_path=db_path))
+    bus.suscribir(eventos.ASISTENCIA_REGISTRADA,
+                  lambda fecha, ids: encolar_ausencias(fecha, ids, canales=canales, db_path=db_path))
+    bus.suscribir(eventos.AUSENCIAS_CORREGIDAS,
+                  lambda registros: cancelar_avisos(registros, db_path=db_path))
+    return True
+
+def cancelar_avisos(registros: List[Tuple[int, str]], db_path: str = None) -> int:
+    """Descarta los avisos aún no enviados de [(id_estudiante, fecha)] (ausencias justificadas)"""
+    conn = conectar(db_path)
+    try:
+        cancelados = conn.executemany("""
+            DELETE FROM mensajes_salida WHERE id_estudiante = ? AND fecha = ? AND estado = ?
+        """, [(id_estudiante, fecha, PENDIENTE) for id_estudiante, fecha in registros]).rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    if cancelados:
+        logger.info(f"🗑️ {cancelados} avisos de inasistencia cancelados por ausencias corregidas")
+    return cancelados
+
+# ==================== REPARTIDOR ====================
+
+def espera_reintento(intentos: int) -> float:
+    """Segundos hasta el siguiente intento: exponencial con tope y ±10% de variación"""
+    espera = min(ESPERA_BASE_SEGUNDOS * (2 ** max(intentos - 1, 0)), ESPERA_MAX_SEGUNDOS)
+    return espera * random.uniform(0.9, 1.1)
+
+class RepartidorAvisos:
+    """Hilo que vacía la bandeja de salida por lotes, canal por canal"""
+
+    def __init__(self, transportes: Dict[str, Transporte], db_path: str = None, intervalo: float = 5.0):
+        self.transportes = transportes
+        self.db_path = db_path
+        self.intervalo = intervalo
+        self._detener = threading.Event()
+        self._hilo = None
+        self._recuperado_en = None
+        self._recuperar()
+
+    def _recuperar(self):
+        """Los mensajes 'Enviando' cuyo reclamo venció (repartidor caído) vuelven a la cola
+
+        Los reclamos vigentes pueden ser de otro repartidor activo (servicio y
+        línea de comandos a la vez), por eso no se tocan.
+        """
+        vencido = (datetime.now() - timedelta(seconds=PLAZO_RECLAMO_SEGUNDOS)).strftime("%Y-%m-%d %H:%M:%S")
+        conn = conectar(self.db_path)
+        try:
+            recuperados = conn.execute("""
+                UPDATE mensajes_salida SET estado = ?, reclamado = NULL
+                WHERE estado = ? AND (reclamado IS NULL OR reclamado <= ?)
+            """, (PENDIENTE, ENVIANDO, vencido)).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        self._recuperado_en = time.monotonic()
+        if recuperados:
+            logger.warning(f"⚠️ {recuperados} avisos interrumpidos vuelven a la cola")
+
+    def _reclamar(self, conn, canal: str, cantidad: int) -> List[dict]:
+        ahora = _ahora()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            filas = conn.execute("""
+                SELECT id_mensaje, destinatario, asunto, cuerpo, intentos FROM mensajes_salida
+                WHERE canal = ? AND estado = ? AND proximo_intento <= ?
+                ORDER BY proximo_intento LIMIT ?
+            """, (canal, PENDIENTE, ahora, cantidad)).fetchall()
+            conn.executemany("UPDATE mensajes_salida SET estado = ?, reclamado = ? WHERE id_mensaje = ?",
+                             [(ENVIANDO, ahora, f[0]) for f in filas])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return [{'id': f[0], 'destinatario': f[1], 'asunto': f[2], 'cuerpo': f[3], 'intentos': f[4]}
+                for f in filas]
+
+    def _registrar(self, conn, mensajes: List[dict], resultados: Dict[int, Optional[str]]) -> dict:
+        ahora = datetime.now()
+        enviados, reintentos, fallidos = [], [], []
+        for mensaje in mensajes:
+            error = resultados.get(mensaje['id'], "Sin respuesta del transporte")
+            if error is None:
+                enviados.append((ENVIADO, ahora.strftime("%Y-%m-%d %H:%M:%S"), mensaje['id']))
+                continue
+            intentos = mensaje['intentos'] + 1
+            if intentos >= MAX_INTENTOS:
+                fallidos.append((FALLIDO, intentos, error[:500], mensaje['id']))
+            else:
+                proximo = ahora + timedelta(seconds=espera_reintento(intentos))
+                reintentos.append((PENDIENTE, intentos, error[:500], proximo.strftime("%Y-%m-%d %H:%M:%S"),
+                                   mensaje['id']))
+        conn.executemany("UPDATE mensajes_salida SET estado = ?, enviado = ? WHERE id_mensaje = ?", enviados)
+        conn.executemany("""
+            UPDATE mensajes_salida SET estado = ?, intentos = ?, ultimo_error = ?, proximo_intento = ?
+            WHERE id_mensaje = ?
+        """, reintentos)
+        conn.executemany("""
+            UPDATE mensajes_salida SET estado = ?, intentos = ?, ultimo_error = ? WHERE id_mensaje = ?
+        """, fallidos)
+        conn.commit()
+        if fallidos:
+            logger.error(f"❌ {len(fallidos)} avisos descartados tras {MAX_INTENTOS} intentos")
+        return {'enviados': len(enviados), 'reintentos': len(reintentos), 'fallidos': len(fallidos)}
+
+    def repartir_una_vez(self) -> dict:
+        """Un lote por canal (lo que permita el límite de tasa)"""
+        if time.monotonic() - self._recuperado_en >= PLAZO_RECLAMO_SEGUNDOS:
+            self._recuperar()
+        totales = {'enviados': 0, 'reintentos': 0, 'fallidos': 0, 'limitados': 0}
+        conn = conectar(self.db_path)
+        try:
+            for canal, transporte in self.transportes.items():
+                cupo = min(transporte.lote_max, transporte.limite.disponibles())
+                if cupo <= 0:
+                    totales['limitados'] += 1
+                    continue
+                mensajes = self._reclamar(conn, canal, cupo)
+                if not mensajes:
+                    continue
+                transporte.limite.consumir(len(mensajes))
+                try:
+                    resultados = transporte.enviar_lote(mensajes)
+                except Exception as e:
+                    logger.warning(f"⚠️ Falló el lote de {len(mensajes)} avisos por {canal}: {e}")
+                    resultados = {m['id']: str(e) or type(e).__name__ for m in mensajes}
+                for clave, valor in self._registrar(conn, mensajes, resultados).items():
+                    totales[clave] += valor
+        finally:
+            conn.close()
+        if totales['enviados']:
+            logger.info(f"📤 {totales['enviados']} avisos enviados")
+        return totales
+
+    def pendientes(self) -> int:
+        """Mensajes de los canales configurados que ya deberían enviarse"""
+        if not self.transportes:
+            return 0
+        conn = conectar(self.db_path)
+        try:
+            return conn.execute(f"""
+                SELECT COUNT(*) FROM mensajes_salida
+                WHERE canal IN ({', '.join('?' * len(self.transportes))}) AND estado = ? AND proximo_intento <= ?
+            """, (*self.transportes, PENDIENTE, _ahora())).fetchone()[0]
+        finally:
+            conn.close()
+
+    def vaciar(self, max_segundos: float = 300) -> dict:
+        """Reparte hasta que no queden mensajes vencidos (job de línea de comandos)"""
+        totales = {'enviados': 0, 'reintentos': 0, 'fallidos': 0}
+        limite = time.monotonic() + max_segundos
+        while self.pendientes() and time.monotonic() < limite:
+            resultado = self.repartir_una_vez()
+            for clave in totales:
+                totales[clave] += resultado[clave]
+            if not (resultado['enviados'] or resultado['reintentos'] or resultado['fallidos']):
+                time.sleep(1)
+        return totales
+
+    def iniciar(self):
+        if self._hilo is None and self.transportes:
+            self._hilo = threading.Thread(target=self._ejecutar, name="repartidor-avisos", daemon=True)
+            self._hilo.start()
+            logger.info(f"📮 Repartidor de avisos iniciado ({', '.join(self.transportes)})")
+        return self
+
+    def detener(self):
+        self._detener.set()
+
+    def _ejecutar(self):
+        while not self._detener.is_set():
+            try:
+                resultado = self.repartir_una_vez()
+            except Exception as e:
+                logger.error(f"❌ Error repartiendo avisos: {e}")
+                resultado = {}
+            # Sin trabajo (o limitado por tasa): esperar al siguiente ciclo
+            if not (resultado.get('enviados') or resultado.get('reintentos')):
+                self._detener.wait(self.intervalo)
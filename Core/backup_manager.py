@@ -3,18 +3,22 @@ Sistema de Backup y Restauración
 """
 
 import os
-import shutil
 from datetime import datetime
 import tkinter as tk
 from tkinter import Toplevel, Frame, Label, Button, Listbox, messagebox
 
-from config.database import DB
+from config import sedes
+from config.database import ruta_base_datos, copiar_base_datos
+from core.tareas import ejecutar_en_segundo_plano
+from core import eventos
 
 class BackupManager:
     """Gestor de backups del sistema"""
     
     def __init__(self):
-        self.backup_dir = "backups"
+        # Cada sede respalda su propio archivo en su propio directorio
+        self.db_path = ruta_base_datos()
+        self.backup_dir = sedes.directorio_sede("backups")
         os.makedirs(self.backup_dir, exist_ok=True)
     
     def crear_backup(self):
@@ -23,7 +27,8 @@ class BackupManager:
         backup_file = os.path.join(self.backup_dir, f"asistencia_backup_{timestamp}.db")
         
         try:
-            shutil.copy2(DB, backup_file)
+            copiar_base_datos(self.db_path, backup_file)
+            eventos.publicar(eventos.BACKUP_REALIZADO, ruta=backup_file)
             return True, f"Backup creado: {backup_file}"
         except Exception as e:
             return False, f"Error creando backup: {e}"
@@ -31,7 +36,8 @@ class BackupManager:
     def restaurar_backup(self, backup_file):
         """Restaura un backup"""
         try:
-            shutil.copy2(backup_file, DB)
+            # Se escribe a través de SQLite para que el WAL de la base viva no quede desfasado
+            copiar_base_datos(backup_file, self.db_path)
             return True, "Backup restaurado exitosamente"
         except Exception as e:
             return False, f"Error restaurando backup: {e}"
@@ -88,12 +94,15 @@ class GestionBackup:
     
     def crear_backup(self):
         """Crea un nuevo backup"""
-        success, message = self.backup_manager.crear_backup()
-        if success:
-            messagebox.showinfo("Éxito", message)
-            self.listar_backups()
-        else:
-            messagebox.showerror("Error", message)
+        def al_terminar(resultado):
+            success, message = resultado
+            if success:
+                messagebox.showinfo("Éxito", message)
+                self.listar_backups()
+            else:
+                messagebox.showerror("Error", message)
+        
+        ejecutar_en_segundo_plano(self.root, self.backup_manager.crear_backup, al_terminar=al_terminar)
     
     def listar_backups(self):
         """Lista los backups disponibles"""
@@ -114,11 +123,15 @@ class GestionBackup:
         
         if messagebox.askyesno("Confirmar", 
                              f"¿Restaurar backup {backup_file}?\n\nSe sobreescribirán los datos actuales."):
-            success, message = self.backup_manager.restaurar_backup(backup_path)
-            if success:
-                messagebox.showinfo("Éxito", message)
-            else:
-                messagebox.showerror("Error", message)
+            def al_terminar(resultado):
+                success, message = resultado
+                if success:
+                    messagebox.showinfo("Éxito", message)
+                else:
+                    messagebox.showerror("Error", message)
+            
+            ejecutar_en_segundo_plano(self.root, self.backup_manager.restaurar_backup, backup_path,
+                                      al_terminar=al_terminar)
     
     def eliminar_backup(self):
         """Elimina un backup seleccionado"""
@@ -0,0 +1,127 @@
+"""
+Cola de registro de entradas por escaneo de carnet (lector de código de barras/QR)
+
+El lector funciona como teclado: escribe el código y envía Enter. Cada
+lectura se resuelve contra el índice en memoria, se descarta si el
+estudiante ya entró hoy y se encola; un hilo escritor confirma las
+entradas en micro-lotes.
+"""
+
+import queue
+import logging
+import threading
+from datetime import datetime
+
+from config.database import conectar
+from core.indice_estudiantes import IndiceEstudiantes
+from core.registro_asistencia import registrar_entradas, publicar_entradas, ENTRADA_REGISTRADA
+from core.reglas_asistencia import ReglasAsistencia
+
+logger = logging.getLogger(__name__)
+
+ESCANEO_ENCOLADO = "encolado"
+ESCANEO_DUPLICADO = "duplicado"
+ESCANEO_DESCONOCIDO = "desconocido"
+
+
+class ColaEscaneo:
+    """Registra entradas escaneadas en micro-lotes desde un hilo escritor"""
+
+    def __init__(self, db_path: str = None, lote_max: int = 50, intervalo_ms: int = 250):
+        self.db_path = db_path
+        self.lote_max = lote_max
+        self.intervalo = intervalo_ms / 1000.0
+        self.indice = IndiceEstudiantes.obtener(db_path)
+        self.reglas = ReglasAsistencia.obtener(db_path)
+        self.confirmados = queue.Queue()
+        self._pendientes = queue.Queue()
+        self._vistos = set()
+        self._fecha_vistos = None
+        self._lock = threading.Lock()
+        self._activo = True
+        self._hilo = threading.Thread(target=self._escribir, name="cola-escaneo", daemon=True)
+        self._hilo.start()
+
+    def preparar(self):
+        """Construye el índice y precarga los vistos de hoy (llamar fuera del hilo de Tk)"""
+        if not self.indice.construido:
+            self.indice.construir()
+        with self._lock:
+            self._cargar_vistos(datetime.now().strftime("%Y-%m-%d"))
+
+    def _cargar_vistos(self, fecha: str):
+        """Precarga quién ya tiene entrada en la fecha (para descartar duplicados)"""
+        conn = conectar(self.db_path)
+        try:
+            filas = conn.execute("SELECT id_estudiante FROM asistencia WHERE fecha = ?", (fecha,)).fetchall()
+        finally:
+            conn.close()
+        self._vistos = {fila[0] for fila in filas}
+        self._fecha_vistos = fecha
+
+    def encolar(self, codigo: str, estado: str = None):
+        """Procesa una lectura; devuelve (resultado, id_estudiante, nombre)
+
+        Puede consultar la base (índice sin construir, código desconocido o
+        cambio de día): desde la interfaz se llama en segundo plano.
+        """
+        id_estudiante = self.indice.resolver(codigo)
+        if id_estudiante is None:
+            return ESCANEO_DESCONOCIDO, None, ""
+
+        ahora = datetime.now()
+        fecha = ahora.strftime("%Y-%m-%d")
+        with self._lock:
+            if self._fecha_vistos != fecha:
+                self._cargar_vistos(fecha)
+            if id_estudiante in self._vistos:
+                return ESCANEO_DUPLICADO, id_estudiante, self.indice.nombre(id_estudiante)
+            self._vistos.add(id_estudiante)
+
+        self._pendientes.put({
+            'id_estudiante': id_estudiante,
+            'fecha': fecha,
+            'hora_entrada': ahora.strftime("%H:%M:%S"),
+            'estado': estado,
+            'observaciones': 'Escaneo de carnet',
+        })
+        return ESCANEO_ENCOLADO, id_estudiante, self.indice.nombre(id_estudiante)
+
+    def _escribir(self):
+        """Hilo escritor: agrupa lecturas y hace un commit por micro-lote"""
+        conn = None
+        while self._activo or not self._pendientes.empty():
+            try:
+                lote = [self._pendientes.get(timeout=self.intervalo)]
+            except queue.Empty:
+                continue
+            while len(lote) < self.lote_max:
+                try:
+                    lote.append(self._pendientes.get(timeout=self.intervalo / 5))
+                except queue.Empty:
+                    break
+            try:
+                if conn is None:
+                    conn = conectar(self.db_path)
+                resultados = registrar_entradas(conn, lote, self.reglas)
+                conn.commit()
+            except Exception as e:
+                logger.error(f"❌ Error guardando lote de {len(lote)} escaneos: {e}")
+                if conn is not None:
+                    conn.rollback()
+                # Liberar a los estudiantes para que puedan volver a escanear
+                with self._lock:
+                    for entrada in lote:
+                        self._vistos.discard(entrada['id_estudiante'])
+                continue
+            publicar_entradas(lote, resultados)
+            for entrada, resultado in zip(lote, resultados):
+                self.confirmados.put((entrada, resultado == ENTRADA_REGISTRADA))
+        if conn is not None:
+            conn.close()
+
+    def detener(self, esperar: bool = True):
+        """Vacía la cola pendiente y detiene el hilo escritor"""
+        self._activo = False
+        if esperar:
+            self._hilo.join(timeout=5)
@@ -0,0 +1,106 @@
+"""
+Consultas federadas entre sedes
+
+Cada sede vive en su propio archivo SQLite. Un reporte de varias sedes se
+reparte en paralelo (un hilo por sede, SQLite libera el GIL mientras
+ejecuta la consulta), cada hilo enruta sus conexiones con usar_sede y los
+resultados parciales se combinan aquí: los conteos se suman y los
+porcentajes se recalculan sobre los totales, nunca se promedian.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from config import sedes
+from core.reportes import MotorReportes, FiltroReporte, formatear_resumen, AGRUPAMIENTOS
+
+logger = logging.getLogger(__name__)
+
+MAX_HILOS = 4
+
+def _en_sede(clave: str, funcion: Callable, args, kwargs):
+    with sedes.usar_sede(clave):
+        return funcion(*args, **kwargs)
+
+def en_sedes(funcion: Callable, *args, claves: List[str] = None, max_hilos: int = MAX_HILOS,
+             **kwargs) -> Tuple[Dict[str, object], Dict[str, str]]:
+    """Ejecuta funcion(*args, **kwargs) en cada sede en paralelo
+
+    Devuelve (resultados, errores) por clave de sede; la falla de una sede no
+    detiene a las demás.
+    """
+    claves = claves or [sede.clave for sede in sedes.sedes()]
+    resultados, errores = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_hilos, len(claves))),
+                            thread_name_prefix="sede") as pool:
+        futuros = {clave: pool.submit(_en_sede, clave, funcion, args, kwargs) for clave in claves}
+        for clave, futuro in futuros.items():
+            try:
+                resultados[clave] = futuro.result()
+            except Exception as e:
+                logger.error(f"❌ Error consultando la sede {clave}: {e}")
+                errores[clave] = str(e)
+    return resultados, errores
+
+def _sumar_totales(parciales) -> tuple:
+    """Combina tuplas de MotorReportes.totales de varias sedes"""
+    registros = estudiantes = presentes = tardes = ausentes = justificados = 0
+    primeras, ultimas = [], []
+    for total, alumnos, primera, ultima, p, t, a, j in parciales:
+        registros += total or 0
+        estudiantes += alumnos or 0  # cada estudiante pertenece a una sola sede
+        presentes, tardes = presentes + (p or 0), tardes + (t or 0)
+        ausentes, justificados = ausentes + (a or 0), justificados + (j or 0)
+        if primera:
+            primeras.append(primera)
+            ultimas.append(ultima)
+    return (registros, estudiantes, min(primeras, default=None), max(ultimas, default=None),
+            presentes, tardes, ausentes, justificados)
+
+def _porcentaje(registros, presentes, tardes, justificados):
+    return round(100.0 * (presentes + tardes + justificados) / registros, 1) if registros else None
+
+def resumen_sedes(filtro: FiltroReporte, claves: List[str] = None) -> dict:
+    """Encabezado de reporte por sede y total de todas las sedes"""
+    parciales, errores = en_sedes(lambda: MotorReportes().totales(filtro), claves=claves)
+    return {
+        'sedes': {clave: formatear_resumen(totales) for clave, totales in parciales.items()},
+        'total': formatear_resumen(_sumar_totales(parciales.values())),
+        'errores': errores,
+    }
+
+def agrupar_sedes(filtro: FiltroReporte, por: str = 'sede',
+                  claves: List[str] = None) -> Tuple[list, Dict[str, str]]:
+    """Filas con el formato de MotorReportes.agrupar combinando todas las sedes
+
+    'sede' da una fila por sede más el total; 'dia' suma las sedes en cada
+    fecha; 'estudiante' y 'seccion' conservan los grupos de cada sede con su
+    nombre como prefijo (no existen en más de una). Devuelve (filas, errores)
+    como en_sedes: las sedes que fallaron quedan fuera de los totales.
+    """
+    if por == 'sede':
+        parciales, errores = en_sedes(lambda: MotorReportes().totales(filtro), claves=claves)
+        filas = []
+        for clave, (total, _, _, _, p, t, a, j) in parciales.items():
+            filas.append((clave, sedes.obtener_sede(clave).nombre, total, p or 0, t or 0, a or 0, j or 0,
+                          _porcentaje(total, p or 0, t or 0, j or 0)))
+        total, _, _, _, p, t, a, j = _sumar_totales(parciales.values())
+        filas.append((None, "Todas las sedes", total, p, t, a, j, _porcentaje(total, p, t, j)))
+        return filas, errores
+    if por not in AGRUPAMIENTOS:
+        raise ValueError(f"Agrupamiento no soportado: {por}")
+
+    parciales, errores = en_sedes(lambda: MotorReportes().agrupar(filtro, por), claves=claves)
+    if por != 'dia':
+        filas = [((clave, fila[0]), f"{sedes.obtener_sede(clave).nombre} · {fila[1]}", *fila[2:])
+                 for clave, grupo in parciales.items() for fila in grupo]
+        return sorted(filas, key=lambda fila: fila[1]), errores
+
+    por_dia = {}
+    for grupo in parciales.values():
+        for fecha, _, total, p, t, a, j, _ in grupo:
+            acumulado = por_dia.get(fecha, (0, 0, 0, 0, 0))
+            por_dia[fecha] = tuple(x + (y or 0) for x, y in zip(acumulado, (total, p, t, a, j)))
+    return [(fecha, fecha, total, p, t, a, j, _porcentaje(total, p, t, j))
+            for fecha, (total, p, t, a, j) in sorted(por_dia.items(), reverse=True)], errores
@@ -6,18 +6,20 @@ import sqlite3
 import logging
 from typing import List, Tuple, Any, Optional
 
+from config.database import conectar
+
 logger = logging.getLogger(__name__)
 
 class DatabaseManager:
     """Manejador mejorado para operaciones de base de datos"""
     
-    def __init__(self, db_path="asistencia.db"):
+    def __init__(self, db_path=None):
         self.db_path = db_path
         self.cache = {}
     
     def get_connection(self):
         """Obtiene una conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
+        conn = conectar(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
     
@@ -0,0 +1,353 @@
+"""
+Detección y fusión de estudiantes y docentes duplicados
+
+Los candidatos se agrupan por bloques con claves normalizadas (cédula sin
+guiones; nombre completo sin tildes + sección) en diccionarios, en lugar de
+comparar todos los registros entre sí. Los bloques que comparten registros
+se unen en un solo grupo. La fusión conserva un registro principal y le
+reasigna la asistencia y las justificaciones de los duplicados; en docentes,
+sus clases del horario.
+"""
+
+import logging
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from config.database import conectar, crear_indices_cedula
+from core.indice_estudiantes import IndiceEstudiantes, normalizar_cedula
+from core.asistencia_periodos import combinar
+from core import eventos
+
+logger = logging.getLogger(__name__)
+
+MOTIVO_CEDULA = "cedula"
+MOTIVO_NOMBRE_SECCION = "nombre_seccion"
+
+COLUMNAS = ("id", "cedula", "nombres", "apellidos", "carrera", "anio", "seccion", "telefono", "direccion")
+# Campos que el principal hereda de un duplicado cuando los tiene vacíos
+COMPLETABLES = ("carrera", "anio", "seccion", "telefono", "direccion")
+
+COLUMNAS_DOCENTE = ("id_docente", "cedula", "nombres", "apellido", "especialidad", "email", "telefono",
+                    "estado", "direccion")
+COMPLETABLES_DOCENTE = ("especialidad", "email", "telefono", "direccion")
+
+def clave_nombre(nombres, apellidos) -> str:
+    """Nombre completo en minúsculas, sin tildes y con espacios simples"""
+    texto = unicodedata.normalize("NFKD", f"{nombres or ''} {apellidos or ''}".lower())
+    return " ".join("".join(c for c in texto if not unicodedata.combining(c)).split())
+
+
+class _Conjuntos:
+    """Unión de conjuntos disjuntos para juntar bloques que comparten registros"""
+
+    def __init__(self):
+        self.padre = {}
+
+    def raiz(self, x):
+        self.padre.setdefault(x, x)
+        while self.padre[x] != x:
+            self.padre[x] = self.padre[self.padre[x]]
+            x = self.padre[x]
+        return x
+
+    def unir(self, a, b):
+        ra, rb = self.raiz(a), self.raiz(b)
+        if ra != rb:
+            self.padre[max(ra, rb)] = min(ra, rb)
+
+
+def agrupar_duplicados(registros: Iterable[dict]) -> List[dict]:
+    """Agrupa registros duplicados; cada grupo lleva sus motivos y registros"""
+    bloques = {MOTIVO_CEDULA: defaultdict(list), MOTIVO_NOMBRE_SECCION: defaultdict(list)}
+    por_id = {}
+    for registro in registros:
+        por_id[registro["id"]] = registro
+        cedula = normalizar_cedula(registro.get("cedula"))
+        if cedula:
+            bloques[MOTIVO_CEDULA][cedula].append(registro["id"])
+        nombre = clave_nombre(registro.get("nombres"), registro.get("apellidos"))
+        if nombre:
+            seccion = str(registro.get("seccion") or "").strip().upper()
+            bloques[MOTIVO_NOMBRE_SECCION][(nombre, seccion)].append(registro["id"])
+
+    conjuntos = _Conjuntos()
+    motivos = defaultdict(set)
+    for motivo, bloque in bloques.items():
+        for ids in bloque.values():
+            if len(ids) < 2:
+                continue
+            for id_ in ids[1:]:
+                conjuntos.unir(ids[0], id_)
+            for id_ in ids:
+                motivos[id_].add(motivo)
+
+    grupos = defaultdict(list)
+    for id_ in motivos:
+        grupos[conjuntos.raiz(id_)].append(id_)
+    resultado = []
+    for ids in grupos.values():
+        ids.sort()
+        resultado.append({
+            'ids': ids,
+            'motivos': sorted(set().union(*(motivos[i] for i in ids))),
+            'registros': [por_id[i] for i in ids],
+        })
+    resultado.sort(key=lambda g: g['ids'][0])
+    return resultado
+
+def buscar_duplicados(db_path: str = None) -> List[dict]:
+    """Grupos de estudiantes duplicados o casi duplicados en la base de datos"""
+    conn = conectar(db_path)
+    try:
+        filas = conn.execute(f"SELECT {', '.join(COLUMNAS)} FROM estudiantes").fetchall()
+        asistencias = dict(conn.execute(
+            "SELECT id_estudiante, COUNT(*) FROM asistencia GROUP BY id_estudiante"
+        ).fetchall())
+    finally:
+        conn.close()
+    registros = []
+    for fila in filas:
+        registro = dict(zip(COLUMNAS, fila))
+        registro["asistencias"] = asistencias.get(registro["id"], 0)
+        registros.append(registro)
+    grupos = agrupar_duplicados(registros)
+    logger.info(f"🔎 {len(grupos)} grupos de posibles duplicados entre {len(registros)} estudiantes")
+    return grupos
+
+def elegir_principal(registros: List[dict]) -> int:
+    """Registro a conservar: el de más asistencias, luego el más completo, luego el más antiguo"""
+    def puntaje(r):
+        completos = sum(1 for c in COLUMNAS if r.get(c) not in (None, ""))
+        return (-r.get("asistencias", 0), -completos, r["id"])
+    return min(registros, key=puntaje)["id"]
+
+def fusionar(id_principal: int, ids_duplicados: Iterable[int], db_path: str = None) -> dict:
+    """Fusiona los duplicados en el principal en una sola transacción
+
+    La asistencia y las justificaciones se reasignan al principal; si ambos
+    tienen asistencia el mismo día se conserva la del principal. En la
+    asistencia por periodo el principal conserva sus marcas y completa con
+    las de los duplicados los periodos que tenga sin registro.
+    """
+    duplicados = sorted({int(i) for i in ids_duplicados} - {int(id_principal)})
+    if not duplicados:
+        return {'principal': id_principal, 'fusionados': 0, 'asistencias': 0,
+                'descartadas': 0, 'justificaciones': 0, 'dias_periodos': 0}
+    marcadores = ", ".join("?" * len(duplicados))
+    conn = conectar(db_path)
+    try:
+        if conn.execute("SELECT 1 FROM estudiantes WHERE id = ?", (id_principal,)).fetchone() is None:
+            raise ValueError(f"No existe el estudiante {id_principal}")
+
+        # Días que ya tiene el principal: se descarta la fila del duplicado
+        descartadas = conn.execute(f"""
+            DELETE FROM asistencia
+            WHERE id_estudiante IN ({marcadores})
+              AND fecha IN (SELECT fecha FROM asistencia WHERE id_estudiante = ?)
+        """, (*duplicados, id_principal)).rowcount
+        # Si dos duplicados tienen el mismo día, se conserva el de menor id
+        descartadas += conn.execute(f"""
+            DELETE FROM asistencia
+            WHERE id_estudiante IN ({marcadores})
+              AND id_asistencia NOT IN (
+                  SELECT MIN(id_asistencia) FROM asistencia
+                  WHERE id_estudiante IN ({marcadores}) GROUP BY fecha
+              )
+        """, (*duplicados, *duplicados)).rowcount
+        asistencias = conn.execute(
+            f"UPDATE asistencia SET id_estudiante = ? WHERE id_estudiante IN ({marcadores})",
+            (id_principal, *duplicados)
+        ).rowcount
+        justificaciones = conn.execute(
+            f"UPDATE justificaciones SET estudiante_id = ? WHERE estudiante_id IN ({marcadores})",
+            (id_principal, *duplicados)
+        ).rowcount
+
+        # asistencia_periodos tiene una fila por estudiante y día: se combinan los bits
+        por_fecha = dict(conn.execute(
+            "SELECT fecha, estados FROM asistencia_periodos WHERE id_estudiante = ?", (id_principal,)
+        ).fetchall())
+        cambios = {}
+        for fecha, estados in conn.execute(f"""
+            SELECT fecha, estados FROM asistencia_periodos
+            WHERE id_estudiante IN ({marcadores}) ORDER BY id_estudiante
+        """, duplicados).fetchall():
+            combinado = combinar(por_fecha.get(fecha), estados)
+            if combinado != por_fecha.get(fecha):
+                por_fecha[fecha] = cambios[fecha] = combinado
+        conn.executemany(
+            "INSERT OR REPLACE INTO asistencia_periodos (id_estudiante, fecha, estados) VALUES (?, ?, ?)",
+            [(id_principal, fecha, estados) for fecha, estados in cambios.items()]
+        )
+        conn.execute(f"DELETE FROM asistencia_periodos WHERE id_estudiante IN ({marcadores})", duplicados)
+
+        # El principal hereda los datos que le falten
+        for columna in COMPLETABLES:
+            conn.execute(f"""
+                UPDATE estudiantes SET {columna} = (
+                    SELECT d.{columna} FROM estudiantes d
+                    WHERE d.id IN ({marcadores}) AND IFNULL(d.{columna}, '') <> ''
+                    ORDER BY d.id LIMIT 1
+                )
+                WHERE id = ? AND IFNULL({columna}, '') = ''
+                  AND EXISTS (SELECT 1 FROM estudiantes d
+                              WHERE d.id IN ({marcadores}) AND IFNULL(d.{columna}, '') <> '')
+            """, (*duplicados, id_principal, *duplicados))
+
+        # Los triggers ya movieron los conteos; quedan filas en cero
+        conn.execute(f"DELETE FROM resumen_asistencia_mensual WHERE id_estudiante IN ({marcadores})", duplicados)
+        conn.execute(f"DELETE FROM estudiantes WHERE id IN ({marcadores})", duplicados)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    indice = IndiceEstudiantes.obtener(db_path)
+    for id_ in duplicados:
+        indice.eliminar(id_)
+    eventos.publicar(eventos.ESTUDIANTES_ELIMINADOS, ids=list(duplicados))
+    resultado = {'principal': id_principal, 'fusionados': len(duplicados), 'asistencias': asistencias,
+                 'descartadas': descartadas, 'justificaciones': justificaciones,
+                 'dias_periodos': len(cambios)}
+    logger.info(f"🔗 Estudiantes {duplicados} fusionados en {id_principal}: {asistencias} asistencias "
+                f"reasignadas, {descartadas} descartadas, {justificaciones} justificaciones")
+    return resultado
+
+def fusionar_por_cedula(db_path: str = None, grupos: Optional[List[dict]] = None) -> dict:
+    """Fusiona automáticamente los grupos con la misma cédula normalizada
+
+    Incluye a los docentes repetidos. Los grupos de estudiantes que solo
+    coinciden por nombre y sección se dejan para revisión manual. Al terminar
+    intenta crear los índices únicos de cédula.
+    """
+    grupos = buscar_duplicados(db_path) if grupos is None else grupos
+    totales = defaultdict(int)
+    docentes = fusionar_docentes_por_cedula(db_path)
+    for grupo in grupos:
+        por_cedula = defaultdict(list)
+        for registro in grupo['registros']:
+            clave = normalizar_cedula(registro.get("cedula"))
+            if clave:
+                por_cedula[clave].append(registro)
+        for registros in por_cedula.values():
+            if len(registros) < 2:
+                continue
+            principal = elegir_principal(registros)
+            resultado = fusionar(principal, [r["id"] for r in registros], db_path)
+            totales['grupos'] += 1
+            for clave in ('fusionados', 'asistencias', 'descartadas', 'justificaciones', 'dias_periodos'):
+                totales[clave] += resultado[clave]
+
+    conn = conectar(db_path)
+    try:
+        pendientes = crear_indices_cedula(conn.cursor())
+        conn.commit()
+    finally:
+        conn.close()
+    totales = dict(totales)
+    totales['docentes'] = docentes
+    totales['indices_pendientes'] = pendientes
+    return totales
+
+# ==================== DOCENTES ====================
+
+def buscar_docentes_duplicados(db_path: str = None) -> List[dict]:
+    """Grupos de docentes con la misma cédula normalizada (lo que impide su índice único)"""
+    conn = conectar(db_path)
+    try:
+        filas = conn.execute(f"SELECT {', '.join(COLUMNAS_DOCENTE)} FROM docentes").fetchall()
+        clases = dict(conn.execute(
+            "SELECT docente_id, COUNT(*) FROM horarios WHERE docente_id IS NOT NULL GROUP BY docente_id"
+        ).fetchall())
+    finally:
+        conn.close()
+    bloques = defaultdict(list)
+    for fila in filas:
+        registro = dict(zip(COLUMNAS_DOCENTE, fila))
+        registro["clases"] = clases.get(registro["id_docente"], 0)
+        cedula = normalizar_cedula(registro["cedula"])
+        if cedula:
+            bloques[cedula].append(registro)
+    grupos = [{'ids': sorted(r["id_docente"] for r in registros), 'motivos': [MOTIVO_CEDULA],
+               'registros': sorted(registros, key=lambda r: r["id_docente"])}
+              for registros in bloques.values() if len(registros) > 1]
+    grupos.sort(key=lambda g: g['ids'][0])
+    logger.info(f"🔎 {len(grupos)} grupos de docentes con cédula repetida entre {len(filas)} docentes")
+    return grupos
+
+def elegir_docente_principal(registros: List[dict]) -> int:
+    """Docente a conservar: el activo, luego el de más clases, el más completo y el más antiguo"""
+    def puntaje(r):
+        completos = sum(1 for c in COLUMNAS_DOCENTE if r.get(c) not in (None, ""))
+        return (r.get("estado") != "ACTIVO", -r.get("clases", 0), -completos, r["id_docente"])
+    return min(registros, key=puntaje)["id_docente"]
+
+def fusionar_docentes(id_principal: int, ids_duplicados: Iterable[int], db_path: str = None) -> dict:
+    """Fusiona docentes duplicados en el principal en una sola transacción
+
+    Las clases del horario se reasignan al principal. La disponibilidad del
+    principal se conserva; solo si no tiene ninguna hereda la de los duplicados.
+    """
+    duplicados = sorted({int(i) for i in ids_duplicados} - {int(id_principal)})
+    if not duplicados:
+        return {'principal': id_principal, 'fusionados': 0, 'clases': 0}
+    marcadores = ", ".join("?" * len(duplicados))
+    conn = conectar(db_path)
+    try:
+        if conn.execute("SELECT 1 FROM docentes WHERE id_docente = ?", (id_principal,)).fetchone() is None:
+            raise ValueError(f"No existe el docente {id_principal}")
+
+        clases = conn.execute(
+            f"UPDATE horarios SET docente_id = ? WHERE docente_id IN ({marcadores})",
+            (id_principal, *duplicados)
+        ).rowcount
+        if conn.execute("SELECT 1 FROM disponibilidad_docentes WHERE docente_id = ? LIMIT 1",
+                        (id_principal,)).fetchone() is None:
+            conn.execute(f"UPDATE disponibilidad_docentes SET docente_id = ? WHERE docente_id IN ({marcadores})",
+                         (id_principal, *duplicados))
+        conn.execute(f"DELETE FROM disponibilidad_docentes WHERE docente_id IN ({marcadores})", duplicados)
+
+        for columna in COMPLETABLES_DOCENTE:
+            conn.execute(f"""
+                UPDATE docentes SET {columna} = (
+                    SELECT d.{columna} FROM docentes d
+                    WHERE d.id_docente IN ({marcadores}) AND IFNULL(d.{columna}, '') <> ''
+                    ORDER BY d.id_docente LIMIT 1
+                )
+                WHERE id_docente = ? AND IFNULL({columna}, '') = ''
+                  AND EXISTS (SELECT 1 FROM docentes d
+                              WHERE d.id_docente IN ({marcadores}) AND IFNULL(d.{columna}, '') <> '')
+            """, (*duplicados, id_principal, *duplicados))
+
+        conn.execute(f"DELETE FROM docentes WHERE id_docente IN ({marcadores})", duplicados)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    logger.info(f"🔗 Docentes {duplicados} fusionados en {id_principal}: {clases} clases reasignadas")
+    return {'principal': id_principal, 'fusionados': len(duplicados), 'clases': clases}
+
+def fusionar_docentes_por_cedula(db_path: str = None, grupos: Optional[List[dict]] = None) -> dict:
+    """Fusiona cada grupo de docentes con la misma cédula normalizada"""
+    grupos = buscar_docentes_duplicados(db_path) if grupos is None else grupos
+    totales = defaultdict(int)
+    for grupo in grupos:
+        principal = elegir_docente_principal(grupo['registros'])
+        resultado = fusionar_docentes(principal, grupo['ids'], db_path)
+        totales['grupos'] += 1
+        totales['fusionados'] += resultado['fusionados']
+        totales['clases'] += resultado['clases']
+    return dict(totales)
+
+def resumen_grupos(grupos: List[dict]) -> Dict[str, int]:
+    """Cantidad de grupos por motivo"""
+    conteo = defaultdict(int)
+    for grupo in grupos:
+        for motivo in grupo['motivos']:
+            conteo[motivo] += 1
+    return dict(conteo)
@@ -0,0 +1,83 @@
+"""
+Bus de eventos de dominio del proceso
+
+Las rutas de escritura publican un evento después del commit; los
+suscriptores (motor de notificaciones) lo reciben en un hilo despachador,
+de modo que publicar nunca bloquea al escritor. Si nadie está suscrito al
+tipo, publicar no hace nada.
+"""
+
+import queue
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+ASISTENCIA_REGISTRADA = "asistencia_registrada"    # fecha, ids
+AUSENTES_MARCADOS = "ausentes_marcados"            # fecha, cantidad
+ESTUDIANTES_AGREGADOS = "estudiantes_agregados"    # cantidad
+ESTUDIANTES_ELIMINADOS = "estudiantes_eliminados"  # ids
+BACKUP_REALIZADO = "backup_realizado"              # ruta
+AUSENCIAS_CORREGIDAS = "ausencias_corregidas"      # registros [(id_estudiante, fecha)]
+
+class BusEventos:
+    """Publicación/suscripción en memoria con un hilo despachador"""
+
+    _instancia = None
+    _lock_instancia = threading.Lock()
+
+    def __init__(self):
+        self._suscriptores = defaultdict(list)
+        self._pendientes = queue.Queue()
+        self._hilo = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def obtener(cls) -> "BusEventos":
+        with cls._lock_instancia:
+            if cls._instancia is None:
+                cls._instancia = cls()
+            return cls._instancia
+
+    def suscribir(self, tipo: str, manejador: Callable):
+        """manejador(**datos) se llama en el hilo despachador"""
+        with self._lock:
+            if manejador not in self._suscriptores[tipo]:
+                self._suscriptores[tipo].append(manejador)
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._despachar, name="bus-eventos", daemon=True)
+                self._hilo.start()
+
+    def desuscribir(self, tipo: str, manejador: Callable):
+        with self._lock:
+            if manejador in self._suscriptores[tipo]:
+                self._suscriptores[tipo].remove(manejador)
+
+    def publicar(self, tipo: str, **datos):
+        if self._suscriptores.get(tipo):
+            self._pendientes.put((tipo, datos))
+
+    def vaciar(self):
+        """Espera a que los eventos publicados hayan sido despachados"""
+        if self._hilo is not None:
+            self._pendientes.join()
+
+    def _despachar(self):
+        while True:
+            tipo, datos = self._pendientes.get()
+            try:
+                with self._lock:
+                    manejadores = list(self._suscriptores.get(tipo, ()))
+                for manejador in manejadores:
+                    try:
+                        manejador(**datos)
+                    except Exception as e:
+                        logger.error(f"❌ Error atendiendo el evento {tipo} en {manejador.__qualname__}: {e}")
+            finally:
+                self._pendientes.task_done()
+
+def publicar(tipo: str, **datos):
+    """Atajo: publica en el bus del proceso"""
+    BusEventos.obtener().publicar(tipo, **datos)
@@ -0,0 +1,443 @@
+"""
+Generación automática de horarios (pasada voraz + recocido simulado)
+
+Cada hora semanal de una materia en una sección es una sesión que recibe una
+franja, un docente y un aula. Las restricciones duras (choques de docente,
+aula o sección, disponibilidad del docente, máximo de horas diarias) pesan
+mucho más que las blandas (misma materia concentrada en un día, varios
+docentes para una misma materia, docente sin la especialidad). El costo se
+actualiza de forma incremental con contadores, de modo que cada movimiento
+del recocido cuesta O(1).
+
+Varios reinicios con semillas distintas corren en un pool de procesos con
+el mismo presupuesto de tiempo; se conserva la mejor solución, que se
+escribe en `horarios` en una sola transacción.
+"""
+
+import os
+import math
+import time
+import random
+import logging
+import unicodedata
+import multiprocessing
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional
+
+from config.database import conectar
+from core.reglas_asistencia import ReglasAsistencia, DIAS_LABORABLES, normalizar_dia, hora_a_segundos
+from core.horarios import NOMBRES_DIA
+
+logger = logging.getLogger(__name__)
+
+BLOQUES_POR_DEFECTO = ("07:00", "08:00", "09:00", "10:00", "11:00", "12:00")
+DURACION_BLOQUE = 3600
+HORAS_POR_DEFECTO = 2
+MAX_HORAS_DIA_POR_DEFECTO = 6
+
+PESO_DURO = 100
+PESO_BLANDO = 1
+PESO_SIN_ESPECIALIDAD = 3
+
+def _texto(valor) -> str:
+    texto = unicodedata.normalize("NFKD", str(valor or "").lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+def _palabras(valor) -> set:
+    return {p for p in "".join(c if c.isalnum() else " " for c in _texto(valor)).split() if len(p) >= 4}
+
+def es_especialista(especialidad, materia) -> bool:
+    """La especialidad comparte alguna palabra significativa con la materia"""
+    return bool(_palabras(especialidad) & _palabras(materia))
+
+def _max_horas_dia(conn) -> int:
+    fila = conn.execute("SELECT valor FROM configuracion WHERE clave = 'max_horas_docente_dia'").fetchone()
+    try:
+        return int(fila[0]) if fila else MAX_HORAS_DIA_POR_DEFECTO
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ max_horas_docente_dia inválido: {fila[0]}")
+        return MAX_HORAS_DIA_POR_DEFECTO
+
+def _franjas(dias=DIAS_LABORABLES, bloques=BLOQUES_POR_DEFECTO) -> List[tuple]:
+    """(día, inicio, fin) en segundos, en orden"""
+    return [(dia, hora_a_segundos(b), hora_a_segundos(b) + DURACION_BLOQUE) for dia in dias for b in bloques]
+
+def _franjas_solapadas(franjas, dia, inicio, fin) -> List[int]:
+    return [i for i, (d, a, b) in enumerate(franjas) if d == dia and a < fin and inicio < b]
+
+def cargar_problema(secciones: Optional[List[str]] = None, db_path: str = None) -> dict:
+    """Arma el problema (estructura simple y serializable) desde la base de datos
+
+    Las clases ya guardadas de otras secciones se respetan como ocupación fija
+    de docentes y aulas.
+    """
+    franjas = _franjas()
+    conn = conectar(db_path)
+    try:
+        filas = conn.execute("""
+            SELECT UPPER(TRIM(seccion)), carrera, COUNT(*) FROM estudiantes
+            WHERE IFNULL(TRIM(seccion), '') <> ''
+            GROUP BY UPPER(TRIM(seccion)), carrera
+        """).fetchall()
+        materias = conn.execute("""
+            SELECT m.id_materia, m.nombre, IFNULL(m.creditos, 0), c.nombre
+            FROM materias m JOIN carreras c ON c.id = m.carrera_id
+        """).fetchall()
+        docentes = conn.execute("""
+            SELECT id_docente, especialidad FROM docentes WHERE IFNULL(estado, 'ACTIVO') = 'ACTIVO'
+        """).fetchall()
+        aulas = conn.execute("SELECT nombre, capacidad FROM aulas ORDER BY nombre").fetchall()
+        disponibilidad = conn.execute(
+            "SELECT docente_id, dia_semana, hora_inicio, hora_fin FROM disponibilidad_docentes"
+        ).fetchall()
+        fijas = conn.execute(
+            "SELECT docente_id, aula, dia_semana, hora_inicio, hora_fin, UPPER(TRIM(IFNULL(seccion, ''))) FROM horarios"
+        ).fetchall()
+        max_horas_dia = _max_horas_dia(conn)
+    finally:
+        conn.close()
+
+    if not docentes:
+        raise ValueError("No hay docentes activos")
+    if not aulas:
+        raise ValueError("No hay aulas registradas")
+
+    # Carrera y tamaño de cada sección (la carrera con más estudiantes)
+    tamano, carreras_seccion = Counter(), defaultdict(Counter)
+    for seccion, carrera, total in filas:
+        tamano[seccion] += total
+        carreras_seccion[seccion][carrera] += total
+    objetivo = {s.strip().upper() for s in secciones} if secciones else set(tamano)
+
+    materias_carrera = defaultdict(list)
+    for id_materia, nombre, creditos, carrera in materias:
+        materias_carrera[carrera].append((id_materia, nombre, creditos or HORAS_POR_DEFECTO))
+
+    sesiones, problemas = [], []
+    for seccion in sorted(objetivo):
+        carrera = carreras_seccion[seccion].most_common(1)[0][0] if carreras_seccion[seccion] else None
+        aulas_ok = [a for a, capacidad in aulas if not capacidad or capacidad >= tamano[seccion]]
+        if not aulas_ok:
+            problemas.append(f"Sección {seccion}: ningún aula tiene capacidad para {tamano[seccion]} estudiantes")
+            continue
+        if not materias_carrera.get(carrera):
+            problemas.append(f"Sección {seccion}: la carrera {carrera or 'sin asignar'} no tiene materias")
+            continue
+        horas = sum(h for _, _, h in materias_carrera[carrera])
+        if horas > len(franjas):
+            problemas.append(f"Sección {seccion}: {horas} horas semanales no caben en {len(franjas)} franjas")
+            continue
+        for id_materia, nombre, horas_materia in materias_carrera.get(carrera, ()):
+            especialistas = [d for d, especialidad in docentes if es_especialista(especialidad, nombre)]
+            if not especialistas and f"{nombre}: sin docente de la especialidad" not in problemas:
+                problemas.append(f"{nombre}: sin docente de la especialidad")
+            for _ in range(horas_materia):
+                sesiones.append({
+                    'seccion': seccion, 'materia_id': id_materia,
+                    'docentes': especialistas or [d for d, _ in docentes],
+                    'especialista': bool(especialistas), 'aulas': aulas_ok,
+                })
+
+    # Solo se reemplaza el horario de las secciones que recibieron sesiones;
+    # las omitidas conservan sus clases y ocupan docentes y aulas como las demás
+    generadas = {sesion['seccion'] for sesion in sesiones}
+
+    # Franjas permitidas por docente (sin filas: disponible siempre)
+    permitidas = defaultdict(set)
+    for docente_id, dia, inicio, fin in disponibilidad:
+        a, b = hora_a_segundos(inicio), hora_a_segundos(fin)
+        if a is not None and b is not None:
+            permitidas[docente_id].update(i for i, (d, x, y) in enumerate(franjas)
+                                          if d == normalizar_dia(dia) and a <= x and y <= b)
+
+    ocupado = []
+    for docente_id, aula, dia, inicio, fin, seccion in fijas:
+        if seccion in generadas:
+            continue
+        a, b = hora_a_segundos(inicio), hora_a_segundos(fin)
+        if a is None or b is None:
+            continue
+        for franja in _franjas_solapadas(franjas, normalizar_dia(dia), a, b):
+            if docente_id is not None:
+                ocupado.append(('docente', docente_id, franja))
+            if aula:
+                ocupado.append(('aula', aula.strip().upper(), franja))
+
+    return {
+        'franjas': franjas,
+        'sesiones': sesiones,
+        'permitidas': {d: sorted(f) for d, f in permitidas.items()},
+        'ocupado': ocupado,
+        'max_horas_dia': max_horas_dia,
+        'secciones': sorted(generadas),
+        'problemas': problemas,
+    }
+
+
+class _Estado:
+    """Asignación actual y contadores para calcular el costo de forma incremental"""
+
+    def __init__(self, problema: dict):
+        self.franjas = problema['franjas']
+        self.sesiones = problema['sesiones']
+        self.permitidas = {d: set(f) for d, f in problema['permitidas'].items()}
+        self.max_horas = problema['max_horas_dia']
+        self.uso = Counter()
+        self.duros = 0
+        self.blandos = 0
+        for tipo, recurso, franja in problema['ocupado']:
+            self._sumar((tipo, recurso, franja), 1, True)
+            if tipo == 'docente':
+                self._sumar(('horas', recurso, self.franjas[franja][0]), self.max_horas, True)
+        n = len(self.sesiones)
+        self.franja, self.docente, self.aula = [None] * n, [None] * n, [None] * n
+
+    @property
+    def costo(self) -> int:
+        return self.duros * PESO_DURO + self.blandos
+
+    def _sumar(self, clave, umbral: int, duro: bool) -> int:
+        """Incrementa el contador; devuelve la variación de costo"""
+        c = self.uso[clave]
+        self.uso[clave] = c + 1
+        if c >= umbral:
+            if duro:
+                self.duros += 1
+                return PESO_DURO
+            self.blandos += PESO_BLANDO
+            return PESO_BLANDO
+        return 0
+
+    def _restar(self, clave, umbral: int, duro: bool) -> int:
+        c = self.uso[clave]
+        self.uso[clave] = c - 1
+        if c > umbral:
+            if duro:
+                self.duros -= 1
+                return -PESO_DURO
+            self.blandos -= PESO_BLANDO
+            return -PESO_BLANDO
+        return 0
+
+    def _claves(self, i: int, franja: int, docente, aula):
+        sesion = self.sesiones[i]
+        dia = self.franjas[franja][0]
+        seccion, materia = sesion['seccion'], sesion['materia_id']
+        return (
+            (('docente', docente, franja), 1, True),
+            (('aula', aula.strip().upper(), franja), 1, True),
+            (('seccion', seccion, franja), 1, True),
+            (('horas', docente, dia), self.max_horas, True),
+            (('materia_dia', seccion, materia, dia), 2, False),
+        )
+
+    def _fijo(self, i: int, franja: int, docente) -> tuple:
+        """Costo que no depende de otras sesiones: (duros, blandos)"""
+        permitidas = self.permitidas.get(docente)
+        duros = 1 if permitidas is not None and franja not in permitidas else 0
+        blandos = 0 if self.sesiones[i]['especialista'] else PESO_SIN_ESPECIALIDAD
+        return duros, blandos
+
+    def poner(self, i: int, franja: int, docente, aula) -> int:
+        delta = 0
+        for clave, umbral, duro in self._claves(i, franja, docente, aula):
+            delta += self._sumar(clave, umbral, duro)
+        # Docentes distintos para la misma materia de la sección
+        sesion = self.sesiones[i]
+        if self.uso[('docente_materia', sesion['seccion'], sesion['materia_id'], docente)] == 0:
+            delta += self._sumar(('docentes_materia', sesion['seccion'], sesion['materia_id']), 1, False)
+        self.uso[('docente_materia', sesion['seccion'], sesion['materia_id'], docente)] += 1
+        duros, blandos = self._fijo(i, franja, docente)
+        self.duros += duros
+        self.blandos += blandos
+        self.franja[i], self.docente[i], self.aula[i] = franja, docente, aula
+        return delta + duros * PESO_DURO + blandos
+
+    def quitar(self, i: int) -> int:
+        franja, docente, aula = self.franja[i], self.docente[i], self.aula[i]
+        delta = 0
+        for clave, umbral, duro in self._claves(i, franja, docente, aula):
+            delta += self._restar(clave, umbral, duro)
+        sesion = self.sesiones[i]
+        self.uso[('docente_materia', sesion['seccion'], sesion['materia_id'], docente)] -= 1
+        if self.uso[('docente_materia', sesion['seccion'], sesion['materia_id'], docente)] == 0:
+            delta += self._restar(('docentes_materia', sesion['seccion'], sesion['materia_id']), 1, False)
+        duros, blandos = self._fijo(i, franja, docente)
+        self.duros -= duros
+        self.blandos -= blandos
+        self.franja[i] = self.docente[i] = self.aula[i] = None
+        return delta - duros * PESO_DURO - blandos
+
+    def mover(self, i: int, franja: int, docente, aula) -> int:
+        return self.quitar(i) + self.poner(i, franja, docente, aula)
+
+
+def _voraz(estado: _Estado, rnd: random.Random, candidatos: int = 60):
+    """Asigna las sesiones más restringidas primero, eligiendo el candidato más barato"""
+    n_franjas = len(estado.franjas)
+    orden = sorted(range(len(estado.sesiones)),
+                   key=lambda i: (len(estado.sesiones[i]['docentes']), len(estado.sesiones[i]['aulas']), rnd.random()))
+    for i in orden:
+        sesion = estado.sesiones[i]
+        mejor, mejor_delta = None, None
+        for _ in range(candidatos):
+            opcion = (rnd.randrange(n_franjas), rnd.choice(sesion['docentes']), rnd.choice(sesion['aulas']))
+            delta = estado.poner(i, *opcion)
+            estado.quitar(i)
+            if mejor_delta is None or delta < mejor_delta:
+                mejor, mejor_delta = opcion, delta
+                if delta == 0:
+                    break
+        estado.poner(i, *mejor)
+
+def resolver(problema: dict, semilla: int, segundos: float) -> dict:
+    """Un reinicio: pasada voraz y recocido simulado hasta agotar el tiempo"""
+    rnd = random.Random(semilla)
+    estado = _Estado(problema)
+    n = len(estado.sesiones)
+    if n == 0:
+        return {'semilla': semilla, 'costo': 0, 'duros': 0, 'blandos': 0, 'asignacion': [], 'iteraciones': 0}
+    _voraz(estado, rnd)
+    mejor = (estado.costo, estado.duros, estado.blandos, list(zip(estado.franja, estado.docente, estado.aula)))
+
+    n_franjas = len(estado.franjas)
+    temp_inicial, temp_final = 20.0, 0.05
+    inicio = time.perf_counter()
+    limite = inicio + segundos
+    iteraciones = 0
+    temperatura = temp_inicial
+    while mejor[0] > 0:
+        if iteraciones % 256 == 0:
+            ahora = time.perf_counter()
+            if ahora >= limite:
+                break
+            avance = (ahora - inicio) / segundos
+            temperatura = temp_inicial * (temp_final / temp_inicial) ** avance
+        iteraciones += 1
+
+        i = rnd.randrange(n)
+        sesion = estado.sesiones[i]
+        anterior = (estado.franja[i], estado.docente[i], estado.aula[i])
+        movimiento = rnd.random()
+        if movimiento < 0.2:
+            # Intercambio de franja con otra sesión de la misma sección
+            j = rnd.randrange(n)
+            if j == i or estado.sesiones[j]['seccion'] != sesion['seccion']:
+                continue
+            otra = (estado.franja[j], estado.docente[j], estado.aula[j])
+            delta = estado.mover(i, otra[0], anterior[1], anterior[2]) + estado.mover(j, anterior[0], otra[1], otra[2])
+            if delta > 0 and rnd.random() >= math.exp(-delta / temperatura):
+                estado.mover(i, *anterior)
+                estado.mover(j, *otra)
+                continue
+        else:
+            franja, docente, aula = anterior
+            if movimiento < 0.6:
+                franja = rnd.randrange(n_franjas)
+            elif movimiento < 0.8:
+                docente = rnd.choice(sesion['docentes'])
+            else:
+                aula = rnd.choice(sesion['aulas'])
+            delta = estado.mover(i, franja, docente, aula)
+            if delta > 0 and rnd.random() >= math.exp(-delta / temperatura):
+                estado.mover(i, *anterior)
+                continue
+        if estado.costo < mejor[0]:
+            mejor = (estado.costo, estado.duros, estado.blandos,
+                     list(zip(estado.franja, estado.docente, estado.aula)))
+
+    costo, duros, blandos, asignacion = mejor
+    return {'semilla': semilla, 'costo': costo, 'duros': duros, 'blandos': blandos,
+            'asignacion': asignacion, 'iteraciones': iteraciones}
+
+def generar(segundos: float = 20, reinicios: int = None, secciones: Optional[List[str]] = None,
+            db_path: str = None, semilla: int = None) -> dict:
+    """Resuelve el problema con varios reinicios en paralelo y devuelve la mejor solución"""
+    problema = cargar_problema(secciones, db_path)
+    reinicios = max(1, reinicios or os.cpu_count() or 2)
+    base = semilla if semilla is not None else random.randrange(1 << 30)
+    semillas = [base + k for k in range(reinicios)]
+    t0 = time.perf_counter()
+
+    resultados = []
+    procesos = min(reinicios, os.cpu_count() or 2)
+    if procesos == 1 or not problema['sesiones']:
+        # Sin paralelismo los reinicios se reparten el presupuesto
+        for s in semillas:
+            resultados.append(resolver(problema, s, segundos / len(semillas)))
+    else:
+        # Si hay más reinicios que procesos, corren por tandas dentro del presupuesto
+        por_reinicio = segundos / math.ceil(reinicios / procesos)
+        # spawn: se llama desde hilos de la interfaz; no conviene clonar el proceso de Tk
+        contexto = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+            futuros = [pool.submit(resolver, problema, s, por_reinicio) for s in semillas]
+            for futuro in as_completed(futuros):
+                try:
+                    resultados.append(futuro.result())
+                except Exception as e:
+                    logger.error(f"❌ Error en un reinicio del generador de horarios: {e}")
+    if not resultados:
+        raise RuntimeError("Ningún reinicio del generador terminó correctamente")
+
+    mejor = min(resultados, key=lambda r: (r['costo'], r['semilla']))
+    mejor.update(
+        problema=problema,
+        reinicios=len(resultados),
+        iteraciones_totales=sum(r['iteraciones'] for r in resultados),
+        segundos=time.perf_counter() - t0,
+    )
+    logger.info(f"🤖 Horario generado: {len(problema['sesiones'])} sesiones, costo {mejor['costo']} "
+                f"({mejor['duros']} violaciones duras), {len(resultados)} reinicios "
+                f"en {mejor['segundos']:.1f} s")
+    return mejor
+
+def clases_de_solucion(solucion: dict) -> List[dict]:
+    """Convierte la asignación en clases para `horarios`, uniendo bloques consecutivos"""
+    problema = solucion['problema']
+    franjas = problema['franjas']
+    bloques = sorted(
+        (sesion['seccion'], franjas[f][0], franjas[f][1], franjas[f][2], sesion['materia_id'], docente, aula)
+        for sesion, (f, docente, aula) in zip(problema['sesiones'], solucion['asignacion'])
+    )
+    clases = []
+    for seccion, dia, inicio, fin, materia, docente, aula in bloques:
+        previa = clases[-1] if clases else None
+        if (previa and previa['seccion'] == seccion and previa['dia'] == dia and previa['fin'] == inicio
+                and (previa['materia_id'], previa['docente_id'], previa['aula']) == (materia, docente, aula)):
+            previa['fin'] = fin
+            continue
+        clases.append({'seccion': seccion, 'dia': dia, 'inicio': inicio, 'fin': fin,
+                       'materia_id': materia, 'docente_id': docente, 'aula': aula})
+    return [{
+        'materia_id': c['materia_id'], 'docente_id': c['docente_id'], 'dia_semana': NOMBRES_DIA[c['dia']],
+        'hora_inicio': f"{c['inicio'] // 3600:02d}:{c['inicio'] % 3600 // 60:02d}",
+        'hora_fin': f"{c['fin'] // 3600:02d}:{c['fin'] % 3600 // 60:02d}",
+        'aula': c['aula'], 'seccion': c['seccion'],
+    } for c in clases]
+
+def guardar_solucion(solucion: dict, db_path: str = None, forzar: bool = False) -> int:
+    """Reemplaza el horario de las secciones generadas en una sola transacción"""
+    if solucion['duros'] and not forzar:
+        raise ValueError(f"La solución tiene {solucion['duros']} violaciones de restricciones duras")
+    clases = clases_de_solucion(solucion)
+    secciones = solucion['problema']['secciones']
+    conn = conectar(db_path)
+    try:
+        if secciones:
+            conn.execute(f"DELETE FROM horarios WHERE UPPER(TRIM(seccion)) IN ({', '.join('?' * len(secciones))})",
+                         secciones)
+        conn.executemany("""
+            INSERT INTO horarios (materia_id, docente_id, dia_semana, hora_inicio, hora_fin, aula, seccion)
+            VALUES (:materia_id, :docente_id, :dia_semana, :hora_inicio, :hora_fin, :aula, :seccion)
+        """, clases)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    ReglasAsistencia.obtener(db_path).invalidar()
+    logger.info(f"🗓️ Horario generado guardado: {len(clases)} clases en {len(secciones)} secciones")
+    return len(clases)
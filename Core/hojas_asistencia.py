@@ -0,0 +1,198 @@
+"""
+Hojas de asistencia mensuales en PDF por sección
+
+Cada sección se genera en un proceso del pool (una tarea por sección). Las
+métricas de fuente, las reglas/horarios y la plantilla del mes quedan en
+caché dentro de cada proceso, que el pool reutiliza entre tareas.
+"""
+
+import os
+import calendar
+import logging
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+from config.database import conectar, ruta_base_datos
+from core.reglas_asistencia import ReglasAsistencia
+from utils.pdf import DocumentoPDF, A4_HORIZONTAL, recortar
+
+logger = logging.getLogger(__name__)
+
+MESES = ("Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio",
+         "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre")
+INICIALES_DIA = ("L", "M", "X", "J", "V", "S", "D")
+CODIGO_ESTADO = {"Presente": "P", "Tarde": "T", "Ausente": "A", "Justificado": "J"}
+TOTALES = ("P", "T", "A", "J")
+
+MARGEN = 28
+ALTO_FILA = 15
+ANCHO_NUMERO = 22
+ANCHO_NOMBRE = 170
+ANCHO_TOTAL = 20
+FILAS_POR_PAGINA = 30
+
+@lru_cache(maxsize=64)
+def _plantilla_mes(anio: int, mes: int, dias: Tuple[int, ...]) -> dict:
+    """Posiciones de las columnas de días y totales (compartida entre secciones)"""
+    ancho_pagina, alto_pagina = A4_HORIZONTAL
+    x_dias = MARGEN + ANCHO_NUMERO + ANCHO_NOMBRE
+    disponible = ancho_pagina - MARGEN - x_dias - ANCHO_TOTAL * len(TOTALES)
+    ancho_dia = min(24.0, disponible / max(len(dias), 1))
+    columnas = {dia: x_dias + i * ancho_dia for i, dia in enumerate(dias)}
+    x_totales = x_dias + ancho_dia * len(dias)
+    return {
+        'ancho_dia': ancho_dia,
+        'columnas': columnas,
+        'x_totales': x_totales,
+        'x_fin': x_totales + ANCHO_TOTAL * len(TOTALES),
+        'y_tabla': alto_pagina - 110,
+        'iniciales': {dia: INICIALES_DIA[calendar.weekday(anio, mes, dia)] for dia in dias},
+    }
+
+def _dias_de_clase(reglas: ReglasAsistencia, seccion: str, anio: int, mes: int) -> Tuple[int, ...]:
+    """Días del mes en que la sección tiene clases según sus horarios"""
+    _, total = calendar.monthrange(anio, mes)
+    return tuple(d for d in range(1, total + 1)
+                 if reglas.tiene_clases(seccion, f"{anio:04d}-{mes:02d}-{d:02d}"))
+
+def _consultar_seccion(conn, seccion: str, anio: int, mes: int):
+    """Estudiantes de la sección y sus registros del mes (dos consultas)"""
+    estudiantes = conn.execute("""
+        SELECT id, apellidos || ', ' || nombres, carrera
+        FROM estudiantes WHERE seccion = ?
+        ORDER BY apellidos, nombres
+    """, (seccion,)).fetchall()
+    registros = conn.execute("""
+        SELECT a.id_estudiante, CAST(substr(a.fecha, 9, 2) AS INTEGER), a.estado
+        FROM asistencia a
+        JOIN estudiantes e ON e.id = a.id_estudiante
+        WHERE e.seccion = ? AND a.fecha BETWEEN ? AND ?
+    """, (seccion, f"{anio:04d}-{mes:02d}-01", f"{anio:04d}-{mes:02d}-31")).fetchall()
+    marcas = {(id_, dia): CODIGO_ESTADO.get(estado, "") for id_, dia, estado in registros}
+    return estudiantes, marcas
+
+def _encabezado(doc: DocumentoPDF, institucion: str, seccion: str, carrera: str,
+                anio: int, mes: int, pagina: int, paginas: int, plantilla: dict):
+    alto = doc.alto
+    doc.texto(doc.ancho / 2, alto - 40, institucion, 15, "negrita", "centro")
+    doc.texto(doc.ancho / 2, alto - 58, f"Hoja de asistencia — {MESES[mes - 1]} {anio}", 11, alineacion="centro")
+    doc.texto(MARGEN, alto - 80, f"Sección: {seccion}", 10, "negrita")
+    if carrera:
+        doc.texto(MARGEN + 120, alto - 80, f"Carrera: {carrera}", 10)
+    doc.texto(doc.ancho - MARGEN, alto - 80, f"Página {pagina} de {paginas}", 9, alineacion="derecha")
+
+    y = plantilla['y_tabla']
+    doc.rectangulo(MARGEN, y, plantilla['x_fin'] - MARGEN, ALTO_FILA * 1.6, relleno=(0.86, 0.91, 0.98))
+    doc.texto(MARGEN + ANCHO_NUMERO / 2, y + 6, "N°", 8, "negrita", "centro")
+    doc.texto(MARGEN + ANCHO_NUMERO + 4, y + 6, "Estudiante", 8, "negrita")
+    ancho_dia = plantilla['ancho_dia']
+    for dia, x in plantilla['columnas'].items():
+        doc.texto(x + ancho_dia / 2, y + 13, plantilla['iniciales'][dia], 6, alineacion="centro")
+        doc.texto(x + ancho_dia / 2, y + 4, str(dia), 7, "negrita", "centro")
+    for i, total in enumerate(TOTALES):
+        doc.texto(plantilla['x_totales'] + i * ANCHO_TOTAL + ANCHO_TOTAL / 2, y + 6, total, 8, "negrita", "centro")
+
+def _tabla(doc: DocumentoPDF, filas: list, inicio: int, marcas: dict, plantilla: dict):
+    y = plantilla['y_tabla']
+    ancho_dia = plantilla['ancho_dia']
+    for i, (id_estudiante, nombre, _) in enumerate(filas):
+        y -= ALTO_FILA
+        if i % 2:
+            doc.rectangulo(MARGEN, y, plantilla['x_fin'] - MARGEN, ALTO_FILA, relleno=(0.97, 0.98, 0.99), borde=False)
+        doc.texto(MARGEN + ANCHO_NUMERO / 2, y + 4, str(inicio + i), 8, alineacion="centro")
+        doc.texto(MARGEN + ANCHO_NUMERO + 4, y + 4, recortar(nombre or "", ANCHO_NOMBRE - 8, 8), 8)
+        conteo = dict.fromkeys(TOTALES, 0)
+        for dia, x in plantilla['columnas'].items():
+            marca = marcas.get((id_estudiante, dia), "")
+            if marca:
+                conteo[marca] += 1
+                doc.texto(x + ancho_dia / 2, y + 4, marca, 8, "negrita" if marca != "P" else "normal", "centro")
+        for j, total in enumerate(TOTALES):
+            doc.texto(plantilla['x_totales'] + j * ANCHO_TOTAL + ANCHO_TOTAL / 2, y + 4, str(conteo[total]), 8,
+                      alineacion="centro")
+    # Cuadrícula
+    y_arriba = plantilla['y_tabla'] + ALTO_FILA * 1.6
+    y_abajo = plantilla['y_tabla'] - ALTO_FILA * len(filas)
+    for k in range(len(filas) + 1):
+        yk = plantilla['y_tabla'] - ALTO_FILA * k
+        doc.linea(MARGEN, yk, plantilla['x_fin'], yk, 0.3)
+    verticales = [MARGEN, MARGEN + ANCHO_NUMERO] + list(plantilla['columnas'].values())
+    verticales += [plantilla['x_totales'] + j * ANCHO_TOTAL for j in range(len(TOTALES) + 1)]
+    for x in verticales:
+        doc.linea(x, y_arriba, x, y_abajo, 0.3)
+
+def generar_hoja_seccion(seccion: str, anio: int, mes: int, directorio: str,
+                         db_path: str = None, institucion: str = None) -> Tuple[str, str, int]:
+    """Genera el PDF de una sección; devuelve (sección, ruta, estudiantes)
+
+    Es la tarea que ejecuta cada proceso del pool.
+    """
+    reglas = ReglasAsistencia.obtener(db_path)
+    conn = conectar(db_path)
+    try:
+        estudiantes, marcas = _consultar_seccion(conn, seccion, anio, mes)
+        if institucion is None:
+            fila = conn.execute("SELECT valor FROM configuracion WHERE clave = 'institucion_nombre'").fetchone()
+            institucion = fila[0] if fila else "Instituto Rubén Darío"
+        reglas._asegurar(conn)
+    finally:
+        conn.close()
+
+    plantilla = _plantilla_mes(anio, mes, _dias_de_clase(reglas, seccion, anio, mes))
+    carreras = sorted({c for _, _, c in estudiantes if c})
+    carrera = carreras[0] if len(carreras) == 1 else ", ".join(carreras)
+
+    doc = DocumentoPDF(A4_HORIZONTAL, f"Asistencia {seccion} {MESES[mes - 1]} {anio}")
+    paginas = max(1, -(-len(estudiantes) // FILAS_POR_PAGINA))
+    for p in range(paginas):
+        doc.nueva_pagina()
+        filas = estudiantes[p * FILAS_POR_PAGINA:(p + 1) * FILAS_POR_PAGINA]
+        _encabezado(doc, institucion, seccion, carrera, anio, mes, p + 1, paginas, plantilla)
+        _tabla(doc, filas, p * FILAS_POR_PAGINA + 1, marcas, plantilla)
+        doc.texto(MARGEN, 30, "P: Presente   T: Tarde   A: Ausente   J: Justificado", 8)
+        doc.texto(doc.ancho - MARGEN, 30, "Firma del docente: ______________________", 9, alineacion="derecha")
+
+    nombre_archivo = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(seccion))
+    ruta = os.path.join(directorio, f"asistencia_{anio:04d}_{mes:02d}_seccion_{nombre_archivo}.pdf")
+    doc.guardar(ruta)
+    return seccion, ruta, len(estudiantes)
+
+def secciones_registradas(db_path: str = None) -> List[str]:
+    conn = conectar(db_path)
+    try:
+        return [fila[0] for fila in conn.execute(
+            "SELECT DISTINCT seccion FROM estudiantes WHERE seccion IS NOT NULL AND seccion <> '' ORDER BY seccion"
+        ).fetchall()]
+    finally:
+        conn.close()
+
+def generar_hojas_mes(anio: int, mes: int, secciones: Optional[List[str]] = None,
+                      directorio: str = os.path.join("exportaciones", "hojas_asistencia"),
+                      max_procesos: int = None, db_path: str = None) -> List[Tuple[str, str, int]]:
+    """Genera las hojas de todas las secciones en paralelo (una tarea por sección)
+
+    La ruta de la base de datos se resuelve aquí: los procesos hijos (spawn)
+    no heredan la sede de la sesión y sin ruta abrirían la predeterminada.
+    """
+    db_path = ruta_base_datos(db_path)
+    secciones = secciones or secciones_registradas(db_path)
+    os.makedirs(directorio, exist_ok=True)
+    if len(secciones) <= 1:
+        return [generar_hoja_seccion(s, anio, mes, directorio, db_path) for s in secciones]
+
+    resultados = []
+    procesos = min(max_procesos or os.cpu_count() or 2, len(secciones))
+    # spawn: se llama desde hilos de la interfaz; no conviene clonar el proceso de Tk
+    contexto = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+        futuros = {pool.submit(generar_hoja_seccion, s, anio, mes, directorio, db_path): s for s in secciones}
+        for futuro in as_completed(futuros):
+            try:
+                resultados.append(futuro.result())
+            except Exception as e:
+                logger.error(f"❌ Error generando la hoja de la sección {futuros[futuro]}: {e}")
+    resultados.sort(key=lambda r: str(r[0]))
+    logger.info(f"🖨️ {len(resultados)} hojas de asistencia generadas en {directorio}")
+    return resultados
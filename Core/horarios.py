@@ -0,0 +1,267 @@
+"""
+Horarios semanales por sección y detección de choques
+
+Los choques de docente, aula y sección se detectan con un barrido por día:
+las clases de cada recurso se ordenan por hora de inicio y se recorren
+manteniendo un montículo con las clases activas (por hora de fin). Cada
+clase solo se compara con las que siguen abiertas, en lugar de cruzar
+todas contra todas con un self-join.
+"""
+
+import heapq
+import logging
+import sqlite3
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from config.database import conectar
+from core.reglas_asistencia import ReglasAsistencia, DIAS_SEMANA, normalizar_dia, hora_a_segundos
+
+logger = logging.getLogger(__name__)
+
+RECURSO_DOCENTE = "docente"
+RECURSO_AULA = "aula"
+RECURSO_SECCION = "seccion"
+
+# Columna de la clase que identifica cada recurso
+RECURSOS = {RECURSO_DOCENTE: "docente_id", RECURSO_AULA: "aula", RECURSO_SECCION: "seccion"}
+
+COLUMNAS = ("id_horario", "materia_id", "docente_id", "dia_semana", "hora_inicio", "hora_fin", "aula", "seccion")
+
+NOMBRES_DIA = {"lunes": "Lunes", "martes": "Martes", "miercoles": "Miércoles", "jueves": "Jueves",
+               "viernes": "Viernes", "sabado": "Sábado", "domingo": "Domingo"}
+
+
+class ConflictoHorario(Exception):
+    """La clase no se guardó porque choca con otras"""
+
+    def __init__(self, conflictos: List[dict]):
+        self.conflictos = conflictos
+        super().__init__(f"{len(conflictos)} choques de horario")
+
+
+def _clave_recurso(tipo: str, valor) -> Optional[str]:
+    if valor is None or str(valor).strip() == "":
+        return None
+    return str(valor).strip().upper() if tipo != RECURSO_DOCENTE else str(valor)
+
+def _a_hora(segundos: int) -> str:
+    return f"{segundos // 3600:02d}:{segundos % 3600 // 60:02d}"
+
+def normalizar_clase(clase: dict) -> dict:
+    """Valida y normaliza una clase; lanza ValueError si está incompleta"""
+    dia = normalizar_dia(clase.get("dia_semana"))
+    if dia not in DIAS_SEMANA:
+        raise ValueError(f"Día inválido: {clase.get('dia_semana')}")
+    inicio, fin = hora_a_segundos(clase.get("hora_inicio")), hora_a_segundos(clase.get("hora_fin"))
+    if inicio is None or fin is None:
+        raise ValueError("Las horas deben tener formato HH:MM")
+    if fin <= inicio:
+        raise ValueError("La hora de fin debe ser posterior a la de inicio")
+    normalizada = {c: clase.get(c) for c in COLUMNAS}
+    normalizada.update(dia_semana=NOMBRES_DIA[dia], hora_inicio=_a_hora(inicio), hora_fin=_a_hora(fin),
+                       aula=str(clase.get("aula") or "").strip() or None,
+                       seccion=str(clase.get("seccion") or "").strip().upper() or None)
+    return normalizada
+
+def detectar_conflictos(clases: Iterable[dict]) -> List[dict]:
+    """Todos los choques de docente, aula y sección entre las clases dadas
+
+    Devuelve una lista de dicts con tipo, recurso, día, las dos clases y el
+    tramo en que se superponen. Las clases con día u horas inválidas (datos
+    previos a la validación) se omiten, como lo haría normalizar_clase.
+    """
+    grupos = defaultdict(list)
+    for clase in clases:
+        inicio, fin = hora_a_segundos(clase.get("hora_inicio")), hora_a_segundos(clase.get("hora_fin"))
+        if inicio is None or fin is None or fin <= inicio:
+            continue
+        dia = normalizar_dia(clase.get("dia_semana"))
+        if dia not in DIAS_SEMANA:
+            logger.warning(f"⚠️ Clase #{clase.get('id_horario')} con día inválido: {clase.get('dia_semana')}")
+            continue
+        for tipo, columna in RECURSOS.items():
+            recurso = _clave_recurso(tipo, clase.get(columna))
+            if recurso is not None:
+                grupos[(tipo, recurso, dia)].append((inicio, fin, clase))
+
+    conflictos = []
+    for (tipo, recurso, dia), intervalos in grupos.items():
+        if len(intervalos) < 2:
+            continue
+        intervalos.sort(key=lambda t: (t[0], t[1]))
+        activos = []  # montículo (fin, orden, inicio, clase)
+        for orden, (inicio, fin, clase) in enumerate(intervalos):
+            while activos and activos[0][0] <= inicio:
+                heapq.heappop(activos)
+            for fin_otro, _, _, otra in activos:
+                conflictos.append({
+                    'tipo': tipo, 'recurso': recurso, 'dia': NOMBRES_DIA.get(dia, dia),
+                    'clase_a': otra, 'clase_b': clase,
+                    'desde': _a_hora(inicio), 'hasta': _a_hora(min(fin, fin_otro)),
+                })
+            heapq.heappush(activos, (fin, orden, inicio, clase))
+    conflictos.sort(key=lambda c: (DIAS_SEMANA.index(normalizar_dia(c['dia'])), c['desde'], c['tipo']))
+    return conflictos
+
+def describir_conflicto(conflicto: dict) -> str:
+    etiquetas = {RECURSO_DOCENTE: "Docente", RECURSO_AULA: "Aula", RECURSO_SECCION: "Sección"}
+    a, b = conflicto['clase_a'], conflicto['clase_b']
+    return (f"{etiquetas[conflicto['tipo']]} {conflicto['recurso']} — {conflicto['dia']} "
+            f"{conflicto['desde']}-{conflicto['hasta']}: "
+            f"#{a.get('id_horario') or 'nueva'} ({a.get('hora_inicio')}-{a.get('hora_fin')}) y "
+            f"#{b.get('id_horario') or 'nueva'} ({b.get('hora_inicio')}-{b.get('hora_fin')})")
+
+
+class GestorHorarios:
+    """Lectura y escritura de horarios con validación de choques"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path
+
+    def listar(self, seccion: str = None, conn=None) -> List[dict]:
+        """Clases con nombres de materia y docente, ordenadas por día y hora"""
+        propia = conn is None
+        if propia:
+            conn = conectar(self.db_path)
+        try:
+            query = f"""
+                SELECT {', '.join('h.' + c for c in COLUMNAS)},
+                       IFNULL(m.nombre, ''), TRIM(IFNULL(d.nombres, '') || ' ' || IFNULL(d.apellido, ''))
+                FROM horarios h
+                LEFT JOIN materias m ON m.id_materia = h.materia_id
+                LEFT JOIN docentes d ON d.id_docente = h.docente_id
+            """
+            params = ()
+            if seccion:
+                query += " WHERE h.seccion = ?"
+                params = (seccion.strip().upper(),)
+            filas = conn.execute(query, params).fetchall()
+        finally:
+            if propia:
+                conn.close()
+        clases = []
+        for fila in filas:
+            clase = dict(zip(COLUMNAS, fila))
+            clase['materia'], clase['docente'] = fila[-2], fila[-1]
+            clases.append(clase)
+        orden_dia = {d: i for i, d in enumerate(DIAS_SEMANA)}
+        clases.sort(key=lambda c: (orden_dia.get(normalizar_dia(c['dia_semana']), 7), c['hora_inicio'] or ""))
+        return clases
+
+    def validar_todo(self) -> List[dict]:
+        """Choques del horario completo de la institución"""
+        return detectar_conflictos(self.listar())
+
+    def conflictos_con(self, nuevas: List[dict], conn=None) -> List[dict]:
+        """Choques que provocarían las clases nuevas (o modificadas) con el horario actual"""
+        ids = {c.get('id_horario') for c in nuevas if c.get('id_horario')}
+        actuales = [c for c in self.listar(conn=conn) if c['id_horario'] not in ids]
+        marcadas = {id(c) for c in nuevas}
+        return [c for c in detectar_conflictos(actuales + list(nuevas))
+                if id(c['clase_a']) in marcadas or id(c['clase_b']) in marcadas]
+
+    def guardar(self, clase: dict, forzar: bool = False) -> int:
+        """Inserta o modifica una clase; lanza ConflictoHorario si choca con otras"""
+        return self.guardar_lote([clase], forzar)[0]
+
+    def guardar_lote(self, clases: List[dict], forzar: bool = False) -> List[int]:
+        """Guarda varias clases en una transacción, validando todos los choques juntos"""
+        clases = [normalizar_clase(c) for c in clases]
+        conn = conectar(self.db_path)
+        try:
+            if not forzar:
+                conflictos = self.conflictos_con(clases, conn)
+                if conflictos:
+                    raise ConflictoHorario(conflictos)
+            ids = []
+            for clase in clases:
+                valores = tuple(clase[c] for c in COLUMNAS[1:])
+                if clase.get('id_horario'):
+                    conn.execute(f"""
+                        UPDATE horarios SET {', '.join(c + ' = ?' for c in COLUMNAS[1:])}
+                        WHERE id_horario = ?
+                    """, valores + (clase['id_horario'],))
+                    ids.append(clase['id_horario'])
+                else:
+                    cursor = conn.execute(f"""
+                        INSERT INTO horarios ({', '.join(COLUMNAS[1:])})
+                        VALUES ({', '.join('?' * len(COLUMNAS[1:]))})
+                    """, valores)
+                    ids.append(cursor.lastrowid)
+            conn.commit()
+        except (ConflictoHorario, sqlite3.Error):
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        ReglasAsistencia.obtener(self.db_path).invalidar()
+        logger.info(f"🗓️ {len(ids)} clases guardadas en horarios")
+        return ids
+
+    def eliminar(self, id_horario: int):
+        conn = conectar(self.db_path)
+        try:
+            conn.execute("DELETE FROM horarios WHERE id_horario = ?", (id_horario,))
+            conn.commit()
+        finally:
+            conn.close()
+        ReglasAsistencia.obtener(self.db_path).invalidar()
+
+    def opciones(self) -> Dict[str, list]:
+        """Materias, docentes activos y secciones para los formularios"""
+        conn = conectar(self.db_path)
+        try:
+            return {
+                'materias': conn.execute("SELECT id_materia, nombre FROM materias ORDER BY nombre").fetchall(),
+                'docentes': conn.execute("""
+                    SELECT id_docente, TRIM(IFNULL(nombres, '') || ' ' || IFNULL(apellido, ''))
+                    FROM docentes WHERE IFNULL(estado, 'ACTIVO') = 'ACTIVO' ORDER BY nombres, apellido
+                """).fetchall(),
+                'secciones': [f[0] for f in conn.execute("""
+                    SELECT seccion FROM estudiantes WHERE IFNULL(seccion, '') <> ''
+                    UNION SELECT seccion FROM horarios WHERE IFNULL(seccion, '') <> ''
+                    ORDER BY 1
+                """).fetchall()],
+            }
+        finally:
+            conn.close()
+
+    def agregar_materia(self, nombre: str, carrera_id: int = None) -> int:
+        conn = conectar(self.db_path)
+        try:
+            cursor = conn.execute("INSERT INTO materias (nombre, carrera_id) VALUES (?, ?)",
+                                  (nombre.strip(), carrera_id))
+            conn.commit()
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    # ==================== AULAS ====================
+
+    def listar_aulas(self) -> List[tuple]:
+        conn = conectar(self.db_path)
+        try:
+            return conn.execute("SELECT id_aula, nombre, capacidad FROM aulas ORDER BY nombre").fetchall()
+        finally:
+            conn.close()
+
+    def guardar_aula(self, nombre: str, capacidad: Optional[int]):
+        """Registra el aula o actualiza su capacidad"""
+        conn = conectar(self.db_path)
+        try:
+            conn.execute("""
+                INSERT INTO aulas (nombre, capacidad) VALUES (?, ?)
+                ON CONFLICT(nombre) DO UPDATE SET capacidad = excluded.capacidad
+            """, (nombre.strip().upper(), capacidad))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def eliminar_aula(self, id_aula: int):
+        conn = conectar(self.db_path)
+        try:
+            conn.execute("DELETE FROM aulas WHERE id_aula = ?", (id_aula,))
+            conn.commit()
+        finally:
+            conn.close()
@@ -0,0 +1,173 @@
+"""
+Importación masiva de estudiantes desde CSV o Excel (XLSX)
+
+El archivo se lee por lotes; cada lote se valida columna por columna con
+ESQUEMA_ESTUDIANTE de utils.validators. Los errores se acumulan en un
+reporte CSV en lugar de mostrarse en diálogos, las cédulas repetidas se
+detectan contra el propio archivo y contra la base de datos, y las filas
+válidas se insertan con executemany en una sola transacción.
+"""
+
+import os
+import csv
+import logging
+import unicodedata
+from datetime import datetime
+from itertools import islice
+from typing import Iterator, List
+
+from config.database import conectar
+from core.indice_estudiantes import IndiceEstudiantes, normalizar_cedula
+from core import eventos
+from utils.validators import ESQUEMA_ESTUDIANTE
+from utils.xlsx import LectorXLSX
+
+logger = logging.getLogger(__name__)
+
+CAMPOS = ESQUEMA_ESTUDIANTE.nombres
+OBLIGATORIOS = ESQUEMA_ESTUDIANTE.obligatorios
+
+# Encabezados aceptados (sin tildes, en minúsculas) -> campo
+ALIAS_ENCABEZADOS = {
+    "cedula": "cedula", "identificacion": "cedula",
+    "nombres": "nombres", "nombre": "nombres",
+    "apellidos": "apellidos", "apellido": "apellidos",
+    "carrera": "carrera", "carrera tecnica": "carrera",
+    "anio": "anio", "ano": "anio",
+    "seccion": "seccion",
+    "telefono": "telefono", "celular": "telefono",
+    "direccion": "direccion",
+    "acudiente": "acudiente", "tutor": "acudiente",
+    "correo acudiente": "acudiente_correo", "email acudiente": "acudiente_correo",
+    "telefono acudiente": "acudiente_telefono", "celular acudiente": "acudiente_telefono",
+}
+
+def _normalizar_encabezado(texto: str) -> str:
+    texto = unicodedata.normalize("NFKD", str(texto or "").strip().lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+def _filas_csv(ruta: str) -> Iterator[list]:
+    with open(ruta, newline="", encoding="utf-8-sig") as f:
+        muestra = f.read(4096)
+        f.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        yield from csv.reader(f, dialecto)
+
+def leer_lotes(ruta: str, tamano_lote: int = 1000) -> Iterator[List[dict]]:
+    """Lee el archivo por lotes de dicts con las claves de CAMPOS"""
+    if ruta.lower().endswith(".xlsx"):
+        filas = LectorXLSX(ruta).filas()
+    else:
+        filas = _filas_csv(ruta)
+
+    encabezados = next(filas, None)
+    if not encabezados:
+        return
+    columnas = [ALIAS_ENCABEZADOS.get(_normalizar_encabezado(h)) for h in encabezados]
+    faltantes = [c for c in OBLIGATORIOS if c not in columnas]
+    if faltantes:
+        raise ValueError(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+
+    while True:
+        lote = list(islice(filas, tamano_lote))
+        if not lote:
+            return
+        yield [
+            {campo: str(valor).strip() for campo, valor in zip(columnas, fila) if campo}
+            for fila in lote
+        ]
+
+
+class ImportadorEstudiantes:
+    """Valida e inserta estudiantes en bloque"""
+
+    def __init__(self, db_path: str = None, tamano_lote: int = 1000):
+        self.db_path = db_path
+        self.tamano_lote = tamano_lote
+
+    def _validar_lote(self, lote: List[dict], primera_fila: int, cedulas_vistas: dict,
+                      cedulas_bd: set, carreras: set) -> tuple:
+        """Valida todas las filas del lote; devuelve (válidas, errores)"""
+        errores = []
+        errores_esquema = ESQUEMA_ESTUDIANTE.validar_muchos(lote)
+        carrera_ok = [not carreras or not fila.get("carrera") or fila["carrera"] in carreras for fila in lote]
+
+        validas = []
+        for i, fila in enumerate(lote):
+            numero = primera_fila + i
+            errores_fila = errores_esquema[i]
+            if not carrera_ok[i]:
+                errores_fila.append(("carrera", "Carrera no registrada"))
+
+            clave = normalizar_cedula(fila.get("cedula"))
+            if clave and not errores_fila:
+                if clave in cedulas_bd:
+                    errores_fila.append(("cedula", "Ya existe en el sistema"))
+                elif clave in cedulas_vistas:
+                    errores_fila.append(("cedula", f"Repetida en el archivo (fila {cedulas_vistas[clave]})"))
+                else:
+                    cedulas_vistas[clave] = numero
+
+            if errores_fila:
+                errores.extend((numero, campo, mensaje, fila.get(campo, "")) for campo, mensaje in errores_fila)
+            else:
+                validas.append((*(fila.get(campo, "") for campo in CAMPOS), clave or None))
+        return validas, errores
+
+    def _escribir_reporte(self, errores: list, nombre_archivo: str) -> str:
+        os.makedirs("exportaciones", exist_ok=True)
+        ruta = os.path.join(
+            "exportaciones",
+            f"errores_importacion_{os.path.splitext(os.path.basename(nombre_archivo))[0]}_"
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        with open(ruta, "w", newline="", encoding="utf-8-sig") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(["Fila", "Campo", "Error", "Valor"])
+            escritor.writerows(errores)
+        return ruta
+
+    def importar(self, ruta: str, solo_validar: bool = False) -> dict:
+        """Importa el archivo; devuelve totales y la ruta del reporte de errores"""
+        conn = conectar(self.db_path)
+        try:
+            cedulas_bd = {normalizar_cedula(c) for (c,) in conn.execute("SELECT cedula FROM estudiantes")}
+            carreras = {n for (n,) in conn.execute("SELECT nombre FROM carreras")}
+            cedulas_vistas, validas, errores = {}, [], []
+            total = 0
+            # La fila 1 es el encabezado
+            for lote in leer_lotes(ruta, self.tamano_lote):
+                v, e = self._validar_lote(lote, total + 2, cedulas_vistas, cedulas_bd, carreras)
+                validas.extend(v)
+                errores.extend(e)
+                total += len(lote)
+
+            if validas and not solo_validar:
+                conn.executemany(f"""
+                    INSERT INTO estudiantes ({', '.join(CAMPOS)}, cedula_normalizada)
+                    VALUES ({', '.join('?' * (len(CAMPOS) + 1))})
+                """, validas)
+                conn.commit()
+                IndiceEstudiantes.obtener(self.db_path).invalidar()
+                eventos.publicar(eventos.ESTUDIANTES_AGREGADOS, cantidad=len(validas))
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        filas_con_error = len({e[0] for e in errores})
+        reporte = self._escribir_reporte(errores, ruta) if errores else None
+        importados = 0 if solo_validar else len(validas)
+        logger.info(f"📥 Importación de {os.path.basename(ruta)}: {total} filas, "
+                    f"{importados} importadas, {filas_con_error} con errores")
+        return {
+            'total': total,
+            'validas': len(validas),
+            'importados': importados,
+            'con_errores': filas_con_error,
+            'reporte_errores': reporte,
+        }
@@ -0,0 +1,202 @@
+"""
+Índice en memoria de estudiantes por cédula y código de carnet
+
+Incluye un índice de prefijos (arreglo ordenado + búsqueda binaria) sobre
+nombres normalizados y cédulas para el autocompletado de estudiantes.
+"""
+
+import re
+import time
+import bisect
+import logging
+import threading
+import unicodedata
+from typing import List, Optional, Tuple
+
+from config.database import conectar, ruta_base_datos
+
+logger = logging.getLogger(__name__)
+
+_RE_NO_ALFANUMERICO = re.compile(r"[^0-9A-Z]")
+_RE_CODIGO_CARNET = re.compile(r"^EST0*(\d+)$")
+# Un código desconocido recarga el índice como mucho una vez en este intervalo
+RECARGA_MIN_SEGUNDOS = 5.0
+
+def normalizar_cedula(cedula) -> str:
+    """Cédula en mayúsculas sin guiones ni espacios: 001-080888-8888a -> 0010808888888A"""
+    return _RE_NO_ALFANUMERICO.sub("", str(cedula or "").upper())
+
+def normalizar_busqueda(texto) -> str:
+    """Texto en minúsculas, sin tildes y con espacios simples: 'Pérez  Ana' -> 'perez ana'"""
+    texto = unicodedata.normalize("NFKD", str(texto or "").lower())
+    return " ".join("".join(c for c in texto if not unicodedata.combining(c)).split())
+
+def _claves_prefijo(clave_cedula: str, nombre: str) -> List[str]:
+    """Claves de búsqueda: el nombre desde cada palabra y la cédula normalizada"""
+    palabras = normalizar_busqueda(nombre).split()
+    claves = {" ".join(palabras[i:]) for i in range(len(palabras))}
+    if clave_cedula:
+        claves.add(clave_cedula.lower())
+    return sorted(claves)
+
+def codigo_carnet(id_estudiante: int) -> str:
+    """Código impreso en el carnet (código de barras / QR) del estudiante"""
+    return f"EST{int(id_estudiante):06d}"
+
+
+class IndiceEstudiantes:
+    """Resuelve códigos escaneados a id_estudiante sin consultar la base de datos"""
+
+    _instancias = {}
+    _lock_instancias = threading.Lock()
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path
+        self._por_cedula = {}
+        self._estudiantes = {}
+        self._prefijos: List[Tuple[str, int]] = []
+        self._construido = False
+        self._construido_en = 0.0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def obtener(cls, db_path: str = None) -> "IndiceEstudiantes":
+        """Índice compartido para la base de datos indicada"""
+        db_path = ruta_base_datos(db_path)
+        with cls._lock_instancias:
+            indice = cls._instancias.get(db_path)
+            if indice is None:
+                indice = cls._instancias[db_path] = cls(db_path)
+            return indice
+
+    def construir(self):
+        """Carga todos los estudiantes en memoria (una sola consulta)"""
+        conn = conectar(self.db_path)
+        try:
+            filas = conn.execute("SELECT id, cedula, nombres, apellidos FROM estudiantes").fetchall()
+        finally:
+            conn.close()
+        with self._lock:
+            self._por_cedula.clear()
+            self._estudiantes.clear()
+            self._prefijos = []
+            for id_, cedula, nombres, apellidos in filas:
+                self._agregar(id_, cedula, f"{nombres or ''} {apellidos or ''}".strip(), ordenar=False)
+            self._prefijos.sort()
+            self._construido = True
+            self._construido_en = time.monotonic()
+        logger.info(f"🗂️ Índice de estudiantes construido: {len(filas)} registros")
+
+    def _agregar(self, id_estudiante: int, cedula: str, nombre: str, ordenar: bool = True):
+        clave = normalizar_cedula(cedula)
+        if clave:
+            if clave in self._por_cedula and self._por_cedula[clave] != id_estudiante:
+                logger.warning(f"⚠️ Cédula duplicada en el índice: {cedula}")
+            self._por_cedula[clave] = id_estudiante
+        self._estudiantes[id_estudiante] = (clave, nombre)
+        for prefijo in _claves_prefijo(clave, nombre):
+            if ordenar:
+                bisect.insort(self._prefijos, (prefijo, id_estudiante))
+            else:
+                self._prefijos.append((prefijo, id_estudiante))
+
+    def _asegurar(self):
+        if not self._construido:
+            self.construir()
+
+    def resolver(self, codigo: str) -> Optional[int]:
+        """Obtiene el id_estudiante a partir de una cédula o código de carnet
+
+        Si el código no está, el estudiante pudo haberse agregado desde otro
+        proceso (la interfaz frente al servicio): se recarga el índice y se
+        vuelve a buscar, a lo sumo una vez cada RECARGA_MIN_SEGUNDOS.
+        """
+        clave = normalizar_cedula(codigo)
+        if not clave:
+            return None
+        with self._lock:
+            self._asegurar()
+            id_estudiante = self._buscar_codigo(clave)
+            if id_estudiante is None and time.monotonic() - self._construido_en >= RECARGA_MIN_SEGUNDOS:
+                self.construir()
+                id_estudiante = self._buscar_codigo(clave)
+            return id_estudiante
+
+    def _buscar_codigo(self, clave: str) -> Optional[int]:
+        id_estudiante = self._por_cedula.get(clave)
+        if id_estudiante is None:
+            coincidencia = _RE_CODIGO_CARNET.match(clave)
+            if coincidencia and int(coincidencia.group(1)) in self._estudiantes:
+                id_estudiante = int(coincidencia.group(1))
+        return id_estudiante
+
+    def buscar(self, texto: str, limite: int = 10) -> List[Tuple[int, str, str]]:
+        """Estudiantes cuyo nombre (desde cualquier palabra) o cédula empieza con el texto
+
+        Devuelve hasta `limite` tuplas (id, nombre, cédula normalizada).
+        """
+        consultas = {normalizar_busqueda(texto)}
+        if any(c.isdigit() for c in str(texto or "")):
+            consultas.add(normalizar_cedula(texto).lower())
+        consultas.discard("")
+        if not consultas:
+            return []
+        with self._lock:
+            self._asegurar()
+            encontrados = {}
+            for consulta in sorted(consultas):
+                i = bisect.bisect_left(self._prefijos, (consulta,))
+                while i < len(self._prefijos) and len(encontrados) < limite:
+                    prefijo, id_estudiante = self._prefijos[i]
+                    if not prefijo.startswith(consulta):
+                        break
+                    encontrados.setdefault(id_estudiante, None)
+                    i += 1
+            resultado = []
+            for id_estudiante in encontrados:
+                clave, nombre = self._estudiantes[id_estudiante]
+                resultado.append((id_estudiante, nombre, clave))
+        resultado.sort(key=lambda r: normalizar_busqueda(r[1]))
+        return resultado[:limite]
+
+    @property
+    def construido(self) -> bool:
+        return self._construido
+
+    def nombre(self, id_estudiante: int) -> str:
+        with self._lock:
+            self._asegurar()
+            return self._estudiantes.get(id_estudiante, ("", ""))[1]
+
+    def actualizar(self, id_estudiante: int, cedula: str, nombre: str = ""):
+        """Agrega o modifica un estudiante sin reconstruir el índice"""
+        with self._lock:
+            if not self._construido:
+                return
+            self._quitar(id_estudiante)
+            self._agregar(id_estudiante, cedula, nombre)
+
+    def eliminar(self, id_estudiante: int):
+        with self._lock:
+            if self._construido:
+                self._quitar(id_estudiante)
+
+    def _quitar(self, id_estudiante: int):
+        anterior = self._estudiantes.pop(id_estudiante, None)
+        if anterior is None:
+            return
+        if self._por_cedula.get(anterior[0]) == id_estudiante:
+            del self._por_cedula[anterior[0]]
+        for prefijo in _claves_prefijo(*anterior):
+            i = bisect.bisect_left(self._prefijos, (prefijo, id_estudiante))
+            if i < len(self._prefijos) and self._prefijos[i] == (prefijo, id_estudiante):
+                del self._prefijos[i]
+
+    def invalidar(self):
+        """Fuerza la reconstrucción en el próximo uso"""
+        with self._lock:
+            self._construido = False
+
+    def __len__(self):
+        with self._lock:
+            return len(self._estudiantes)
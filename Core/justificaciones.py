@@ -0,0 +1,214 @@
+"""
+Justificaciones de inasistencia: solicitud, cola de revisión y aprobación en bloque
+
+Aprobar un grupo de justificaciones actualiza la asistencia del rango de
+fechas con una sola sentencia UPDATE por tabla (diaria y por periodo), en la
+misma transacción que cambia el estado. La evidencia se guarda en un
+almacén direccionado por contenido (SHA-256): el mismo archivo subido dos
+veces ocupa espacio una sola vez.
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from config.database import conectar
+from core.asistencia_periodos import CODIGOS
+from core import eventos
+
+logger = logging.getLogger(__name__)
+
+PENDIENTE = "Pendiente"
+APROBADA = "Aprobada"
+RECHAZADA = "Rechazada"
+ESTADOS = (PENDIENTE, APROBADA, RECHAZADA)
+
+DIRECTORIO_EVIDENCIAS = "evidencias"
+TAMANO_BLOQUE = 1 << 16
+
+# ==================== EVIDENCIAS ====================
+
+def guardar_evidencia(ruta_origen: str, directorio: str = DIRECTORIO_EVIDENCIAS) -> str:
+    """Copia el archivo al almacén y devuelve su ruta relativa (evidencias/ab/<sha256>.ext)
+
+    El hash se calcula mientras se copia a un temporal; si el contenido ya
+    existe, el temporal se descarta.
+    """
+    extension = os.path.splitext(ruta_origen)[1].lower()
+    os.makedirs(directorio, exist_ok=True)
+    sha = hashlib.sha256()
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    try:
+        with open(ruta_origen, "rb") as origen, os.fdopen(descriptor, "wb") as destino:
+            for bloque in iter(lambda: origen.read(TAMANO_BLOQUE), b""):
+                sha.update(bloque)
+                destino.write(bloque)
+        digesto = sha.hexdigest()
+        carpeta = os.path.join(directorio, digesto[:2])
+        os.makedirs(carpeta, exist_ok=True)
+        ruta = os.path.join(carpeta, digesto + extension)
+        if os.path.exists(ruta):
+            os.remove(temporal)
+            logger.info(f"📎 Evidencia ya almacenada: {ruta}")
+        else:
+            os.replace(temporal, ruta)
+            logger.info(f"📎 Evidencia guardada: {ruta}")
+        return ruta
+    except Exception:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+def verificar_evidencia(ruta: str) -> bool:
+    """El contenido del archivo coincide con el hash de su nombre"""
+    if not ruta or not os.path.exists(ruta):
+        return False
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b""):
+            sha.update(bloque)
+    return os.path.splitext(os.path.basename(ruta))[0] == sha.hexdigest()
+
+# ==================== SOLICITUD ====================
+
+def _validar_rango(desde: str, hasta: str = None) -> tuple:
+    hasta = hasta or desde
+    try:
+        inicio, fin = datetime.strptime(desde, "%Y-%m-%d"), datetime.strptime(hasta, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        raise ValueError("Las fechas deben tener formato AAAA-MM-DD")
+    if inicio > fin:
+        raise ValueError("La fecha final es anterior a la inicial")
+    return desde, hasta
+
+def enviar(estudiante_id: int, desde: str, hasta: str = None, motivo: str = "",
+           ruta_evidencia: str = None, db_path: str = None) -> int:
+    """Registra una justificación pendiente; devuelve su id"""
+    desde, hasta = _validar_rango(desde, hasta)
+    if not str(motivo or "").strip():
+        raise ValueError("Indique el motivo")
+    evidencia = guardar_evidencia(ruta_evidencia) if ruta_evidencia else None
+    conn = conectar(db_path)
+    try:
+        cursor = conn.execute("""
+            INSERT INTO justificaciones (estudiante_id, fecha, fecha_fin, motivo, evidencia, estado, fecha_solicitud)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (estudiante_id, desde, hasta, motivo.strip(), evidencia, PENDIENTE,
+              datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        conn.commit()
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+# ==================== COLA DE REVISIÓN ====================
+
+def cola(estado: Optional[str] = PENDIENTE, desde: str = None, hasta: str = None, seccion: str = None,
+         texto: str = None, limite: int = 500, db_path: str = None) -> List[dict]:
+    """Justificaciones filtradas, en orden de llegada
+
+    Con estado y rango de solicitud la consulta recorre el índice
+    (estado, fecha_solicitud) sin ordenar aparte.
+    """
+    condiciones, params = [], []
+    if estado:
+        condiciones.append("j.estado = ?")
+        params.append(estado)
+    if desde:
+        condiciones.append("j.fecha_solicitud >= ?")
+        params.append(desde)
+    if hasta:
+        condiciones.append("j.fecha_solicitud < date(?, '+1 day')")
+        params.append(hasta)
+    if seccion:
+        condiciones.append("UPPER(TRIM(e.seccion)) = ?")
+        params.append(seccion.strip().upper())
+    if texto:
+        condiciones.append("(e.nombres || ' ' || e.apellidos LIKE ? OR e.cedula LIKE ? OR j.motivo LIKE ?)")
+        params.extend([f"%{texto.strip()}%"] * 3)
+    where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+    conn = conectar(db_path)
+    try:
+        filas = conn.execute(f"""
+            SELECT j.id_justificacion, j.fecha_solicitud, j.estudiante_id,
+                   IFNULL(e.nombres, '') || ' ' || IFNULL(e.apellidos, ''), IFNULL(e.seccion, ''),
+                   j.fecha, IFNULL(j.fecha_fin, j.fecha), j.motivo, j.evidencia, j.estado,
+                   j.revisado_por, j.fecha_revision
+            FROM justificaciones j
+            LEFT JOIN estudiantes e ON e.id = j.estudiante_id
+            {where}
+            ORDER BY j.fecha_solicitud
+            LIMIT ?
+        """, (*params, limite)).fetchall()
+    finally:
+        conn.close()
+    columnas = ("id", "fecha_solicitud", "estudiante_id", "estudiante", "seccion", "desde", "hasta",
+                "motivo", "evidencia", "estado", "revisado_por", "fecha_revision")
+    return [dict(zip(columnas, f)) for f in filas]
+
+def resolver(ids: Iterable[int], aprobar: bool, revisor: str, observacion: str = "",
+             db_path: str = None) -> dict:
+    """Aprueba o rechaza las justificaciones pendientes en una sola transacción
+
+    Al aprobar, la asistencia 'Ausente' o 'Tarde' de cada rango pasa a
+    'Justificado' con un UPDATE basado en conjuntos (los triggers mantienen
+    el resumen mensual), y los periodos ausentes se reescriben en la forma
+    empaquetada.
+    """
+    ids = sorted({int(i) for i in ids})
+    if not ids:
+        return {'resueltas': 0, 'asistencias': 0, 'periodos': 0}
+    estado = APROBADA if aprobar else RECHAZADA
+    marcadores = ", ".join("?" * len(ids))
+    # Rangos aprobados en esta operación (el estado ya cambió dentro de la transacción)
+    cubre = f"""
+        SELECT 1 FROM justificaciones j
+        WHERE j.id_justificacion IN ({marcadores}) AND j.estado = ?
+          AND j.estudiante_id = {{tabla}}.id_estudiante
+          AND {{tabla}}.fecha BETWEEN j.fecha AND IFNULL(j.fecha_fin, j.fecha)
+    """
+    # Limita el UPDATE a los estudiantes involucrados (índice por estudiante y fecha)
+    estudiantes = f"SELECT estudiante_id FROM justificaciones WHERE id_justificacion IN ({marcadores})"
+    conn = conectar(db_path)
+    try:
+        resueltas = conn.execute(f"""
+            UPDATE justificaciones
+            SET estado = ?, revisado_por = ?, fecha_revision = ?, observacion_revision = ?
+            WHERE id_justificacion IN ({marcadores}) AND estado = ?
+        """, (estado, revisor, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), observacion or None,
+              *ids, PENDIENTE)).rowcount
+        asistencias = periodos = 0
+        corregidas = []
+        if aprobar and resueltas:
+            corregidas = conn.execute(f"""
+                SELECT id_estudiante, fecha FROM asistencia
+                WHERE id_estudiante IN ({estudiantes})
+                  AND estado = 'Ausente'
+                  AND EXISTS ({cubre.format(tabla='asistencia')})
+            """, (*ids, *ids, APROBADA)).fetchall()
+            asistencias = conn.execute(f"""
+                UPDATE asistencia SET estado = 'Justificado', estado_calculado = 0
+                WHERE id_estudiante IN ({estudiantes})
+                  AND estado IN ('Ausente', 'Tarde')
+                  AND EXISTS ({cubre.format(tabla='asistencia')})
+            """, (*ids, *ids, APROBADA)).rowcount
+            periodos = conn.execute(f"""
+                UPDATE asistencia_periodos
+                SET estados = reemplazar_periodos(estados, {CODIGOS['Ausente']}, {CODIGOS['Justificado']})
+                WHERE id_estudiante IN ({estudiantes})
+                  AND contar_periodos(estados, {CODIGOS['Ausente']}) > 0
+                  AND EXISTS ({cubre.format(tabla='asistencia_periodos')})
+            """, (*ids, *ids, APROBADA)).rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    if corregidas:
+        eventos.publicar(eventos.AUSENCIAS_CORREGIDAS, registros=corregidas)
+    logger.info(f"📝 {resueltas} justificaciones {estado.lower()}s por {revisor}: "
+                f"{asistencias} asistencias y {periodos} días con periodos justificados")
+    return {'resueltas': resueltas, 'asistencias': asistencias, 'periodos': periodos}
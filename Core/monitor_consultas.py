@@ -0,0 +1,288 @@
+"""
+Monitor de consultas SQL: tiempos, filas y registro de consultas lentas
+"""
+
+import re
+import sys
+import time
+import sqlite3
+import logging
+import threading
+from collections import deque, Counter
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+logger_lentas = logging.getLogger("consultas_lentas")
+
+# Módulos que envuelven la ejecución y no cuentan como "llamador"
+_MODULOS_INTERNOS = {__name__, "core.database_manager", "sqlite3"}
+
+_RE_ESPACIOS = re.compile(r"\s+")
+_RE_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SIN_PLAN = ("PRAGMA", "EXPLAIN", "BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+def normalizar_sql(sql: str) -> str:
+    """Normaliza una sentencia para agrupar ejecuciones equivalentes"""
+    sql = _RE_CADENAS.sub("?", sql)
+    sql = _RE_NUMEROS.sub("?", sql)
+    return _RE_ESPACIOS.sub(" ", sql).strip()
+
+
+def _modulo_llamador() -> str:
+    """Obtiene el módulo que originó la consulta"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        modulo = frame.f_globals.get("__name__", "?")
+        if modulo not in _MODULOS_INTERNOS:
+            return modulo
+        frame = frame.f_back
+    return "?"
+
+
+class EstadisticaConsulta:
+    """Acumulado de una sentencia normalizada con ventana móvil de tiempos"""
+
+    def __init__(self, sql: str, ventana: int):
+        self.sql = sql
+        self.llamadas = 0
+        self.errores = 0
+        self.filas = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.muestras = deque(maxlen=ventana)
+        self.modulos = Counter()
+
+    def agregar(self, duracion_ms: float, filas: int, modulo: str, error: bool):
+        self.llamadas += 1
+        self.filas += max(filas, 0)
+        self.total_ms += duracion_ms
+        self.max_ms = max(self.max_ms, duracion_ms)
+        self.muestras.append(duracion_ms)
+        self.modulos[modulo] += 1
+        if error:
+            self.errores += 1
+
+    def percentiles(self, *ps) -> list:
+        """Percentiles sobre la ventana móvil de muestras"""
+        ordenadas = sorted(self.muestras)
+        if not ordenadas:
+            return [0.0 for _ in ps]
+        ultimo = len(ordenadas) - 1
+        return [ordenadas[min(ultimo, int(round(p / 100 * ultimo)))] for p in ps]
+
+    def resumen(self) -> dict:
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            'sql': self.sql,
+            'modulo': self.modulos.most_common(1)[0][0] if self.modulos else "?",
+            'llamadas': self.llamadas,
+            'errores': self.errores,
+            'filas': self.filas,
+            'total_ms': self.total_ms,
+            'promedio_ms': self.total_ms / self.llamadas if self.llamadas else 0.0,
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'p99_ms': p99,
+            'max_ms': self.max_ms,
+        }
+
+
+class MonitorConsultas:
+    """Registro central de tiempos de todas las consultas del sistema"""
+
+    _instancia = None
+    _lock_instancia = threading.Lock()
+
+    def __init__(self, umbral_lenta_ms: float = 200.0, ventana: int = 500, max_lentas: int = 100):
+        self.umbral_lenta_ms = umbral_lenta_ms
+        self.ventana = ventana
+        self.activo = True
+        self._stats = {}
+        self._lentas = deque(maxlen=max_lentas)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instancia(cls) -> "MonitorConsultas":
+        """Obtiene el monitor global, configurado desde config.json"""
+        if cls._instancia is None:
+            with cls._lock_instancia:
+                if cls._instancia is None:
+                    umbral, activo = 200.0, True
+                    try:
+                        from config.config_manager import ConfigManager
+                        config = ConfigManager()
+                        umbral = float(config.get('database.slow_query_ms', umbral))
+                        activo = bool(config.get('database.monitor_consultas', activo))
+                    except Exception as e:
+                        logger.debug(f"Monitor de consultas con valores por defecto: {e}")
+                    cls._instancia = cls(umbral_lenta_ms=umbral)
+                    cls._instancia.activo = activo
+        return cls._instancia
+
+    def registrar(self, conn, sql: str, params, duracion_ms: float, filas: int,
+                  modulo: str, error: bool = False):
+        """Registra una ejecución y reporta si supera el umbral"""
+        if not self.activo:
+            return
+        clave = normalizar_sql(sql)
+        with self._lock:
+            stat = self._stats.get(clave)
+            if stat is None:
+                stat = self._stats[clave] = EstadisticaConsulta(clave, self.ventana)
+            stat.agregar(duracion_ms, filas, modulo, error)
+
+        if duracion_ms >= self.umbral_lenta_ms:
+            plan = self._plan_consulta(conn, sql, params)
+            with self._lock:
+                self._lentas.append({
+                    'fecha': datetime.now(),
+                    'sql': clave,
+                    'modulo': modulo,
+                    'duracion_ms': duracion_ms,
+                    'filas': filas,
+                    'plan': plan,
+                })
+            logger_lentas.warning(
+                f"🐢 Consulta lenta ({duracion_ms:.1f} ms, {filas} filas, {modulo}): {clave}\n"
+                f"   Plan: {plan or 'no disponible'}"
+            )
+
+    def _plan_consulta(self, conn, sql: str, params) -> str:
+        """Obtiene el EXPLAIN QUERY PLAN de la sentencia sin instrumentarlo"""
+        if params is None or sql.lstrip().upper().startswith(_SIN_PLAN):
+            return ""
+        try:
+            cursor = sqlite3.Cursor(conn)
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return " | ".join(str(fila[-1]) for fila in cursor.fetchall())
+        except sqlite3.Error as e:
+            return f"(sin plan: {e})"
+
+    def estadisticas(self, orden: str = 'total_ms') -> list:
+        """Resumen por sentencia, ordenado de mayor a menor"""
+        with self._lock:
+            resumenes = [stat.resumen() for stat in self._stats.values()]
+        return sorted(resumenes, key=lambda r: r[orden], reverse=True)
+
+    def consultas_lentas(self) -> list:
+        """Últimas consultas que superaron el umbral (más recientes primero)"""
+        with self._lock:
+            return list(reversed(self._lentas))
+
+    def reiniciar(self):
+        """Limpia todas las estadísticas acumuladas"""
+        with self._lock:
+            self._stats.clear()
+            self._lentas.clear()
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """Cursor que mide ejecución y lectura de filas de cada sentencia"""
+
+    _medicion = None
+
+    def execute(self, sql, params=()):
+        self._finalizar()
+        modulo = _modulo_llamador()
+        inicio = time.perf_counter()
+        try:
+            super().execute(sql, params)
+        except sqlite3.Error:
+            self._medicion = [sql, params, time.perf_counter() - inicio, 0, modulo]
+            self._finalizar(error=True)
+            raise
+        self._medicion = [sql, params, time.perf_counter() - inicio, 0, modulo]
+        if self.description is None:
+            # Sentencias sin filas (INSERT/UPDATE/DDL) se cierran al instante
+            self._medicion[3] = self.rowcount
+            self._finalizar()
+        return self
+
+    def executemany(self, sql, seq_params):
+        self._finalizar()
+        modulo = _modulo_llamador()
+        inicio = time.perf_counter()
+        error = False
+        try:
+            super().executemany(sql, seq_params)
+        except sqlite3.Error:
+            error = True
+            raise
+        finally:
+            self._medicion = [sql, None, time.perf_counter() - inicio,
+                              0 if error else self.rowcount, modulo]
+            self._finalizar(error=error)
+        return self
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        fila = super().fetchone()
+        self._sumar(inicio, 0 if fila is None else 1)
+        if fila is None:
+            self._finalizar()
+        return fila
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        filas = super().fetchmany(self.arraysize if size is None else size)
+        self._sumar(inicio, len(filas))
+        if not filas:
+            self._finalizar()
+        return filas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        filas = super().fetchall()
+        self._sumar(inicio, len(filas))
+        self._finalizar()
+        return filas
+
+    def __next__(self):
+        inicio = time.perf_counter()
+        try:
+            fila = super().__next__()
+        except StopIteration:
+            self._sumar(inicio, 0)
+            self._finalizar()
+            raise
+        self._sumar(inicio, 1)
+        return fila
+
+    def close(self):
+        self._finalizar()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finalizar()
+        except Exception:
+            pass
+
+    def _sumar(self, inicio: float, filas: int):
+        if self._medicion is not None:
+            self._medicion[2] += time.perf_counter() - inicio
+            self._medicion[3] += filas
+
+    def _finalizar(self, error: bool = False):
+        medicion, self._medicion = self._medicion, None
+        if medicion is None:
+            return
+        sql, params, segundos, filas, modulo = medicion
+        MonitorConsultas.instancia().registrar(
+            self.connection, sql, params, segundos * 1000.0, filas, modulo, error
+        )
+
+
+class ConexionInstrumentada(sqlite3.Connection):
+    """Conexión cuyos cursores pasan todos por el monitor de consultas"""
+
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_params):
+        return self.cursor().executemany(sql, seq_params)
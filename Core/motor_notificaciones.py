@@ -0,0 +1,311 @@
+"""
+Motor de notificaciones por eventos y reglas programadas
+
+Los contadores del día (estudiantes registrados, quiénes ya tienen entrada,
+último backup) se cargan una vez y se mantienen con los eventos del bus; las
+reglas se evalúan sobre esos contadores, sin recorrer tablas. Como otros
+procesos (el servicio de kioscos) también registran entradas, los contadores
+se reconcilian con una consulta indexada al cambiar de día y antes de cada
+regla programada.
+
+Las notificaciones se guardan en la tabla `notificaciones` con estado de
+lectura; la clave única evita repetir el mismo aviso (p. ej. una vez por día).
+"""
+
+import os
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from config import sedes
+from config.database import conectar, ruta_base_datos
+from core import eventos, avisos_acudientes
+from core.ausentismo import estudiantes_en_riesgo
+from core.reglas_asistencia import dia_de_fecha, DIAS_LABORABLES
+
+logger = logging.getLogger(__name__)
+
+INFO = "info"
+EXITO = "exito"
+ADVERTENCIA = "advertencia"
+PELIGRO = "peligro"
+
+HORA_AVISO_ENTRADAS = "08:00"
+HORA_AVISO_BACKUP = "18:00"
+DIRECTORIO_BACKUPS = "backups"
+
+# ==================== ALMACÉN ====================
+
+def guardar_notificacion(tipo: str, titulo: str, mensaje: str, clave: str = None,
+                         db_path: str = None) -> Optional[int]:
+    """Inserta la notificación; con clave repetida no hace nada y devuelve None"""
+    conn = conectar(db_path)
+    try:
+        cursor = conn.execute("""
+            INSERT OR IGNORE INTO notificaciones (tipo, titulo, mensaje, fecha, clave)
+            VALUES (?, ?, ?, ?, ?)
+        """, (tipo, titulo, mensaje, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), clave))
+        conn.commit()
+        if cursor.rowcount:
+            logger.info(f"🔔 {titulo}: {mensaje}")
+            return cursor.lastrowid
+        return None
+    finally:
+        conn.close()
+
+def no_leidas(limite: int = 50, db_path: str = None) -> List[dict]:
+    """Notificaciones sin leer, las más recientes primero (índice leida, fecha)"""
+    conn = conectar(db_path)
+    try:
+        filas = conn.execute("""
+            SELECT id_notificacion, tipo, titulo, mensaje, fecha
+            FROM notificaciones WHERE leida = 0
+            ORDER BY fecha DESC LIMIT ?
+        """, (limite,)).fetchall()
+    finally:
+        conn.close()
+    return [{'id': f[0], 'tipo': f[1], 'titulo': f[2], 'mensaje': f[3],
+             'fecha': datetime.strptime(f[4], "%Y-%m-%d %H:%M:%S")} for f in filas]
+
+def marcar_leidas(ids: List[int], db_path: str = None) -> int:
+    ids = [int(i) for i in ids]
+    if not ids:
+        return 0
+    conn = conectar(db_path)
+    try:
+        marcadas = conn.execute(
+            f"UPDATE notificaciones SET leida = 1 WHERE id_notificacion IN ({', '.join('?' * len(ids))})", ids
+        ).rowcount
+        conn.commit()
+        return marcadas
+    finally:
+        conn.close()
+
+# ==================== PROGRAMADOR ====================
+
+class Programador:
+    """Ejecuta reglas diarias a una hora fija en un hilo propio
+
+    Si al iniciar la hora del día ya pasó, la regla se ejecuta de inmediato
+    (la clave de la notificación evita duplicados tras reiniciar).
+    """
+
+    def __init__(self):
+        self._cola = []
+        self._contador = 0
+        self._cambio = threading.Condition()
+        self._activo = False
+        self._hilo = None
+
+    def agregar(self, hora: str, nombre: str, regla: Callable[[], None]):
+        """hora 'HH:MM'"""
+        with self._cambio:
+            self._contador += 1
+            ahora = datetime.now()
+            hh, mm = map(int, hora.split(":"))
+            primera = max(ahora.replace(hour=hh, minute=mm, second=0, microsecond=0), ahora)
+            heapq.heappush(self._cola, (primera, self._contador, hora, nombre, regla))
+            self._cambio.notify()
+
+    @staticmethod
+    def _proxima(hora: str, despues: datetime) -> datetime:
+        hh, mm = map(int, hora.split(":"))
+        candidata = despues.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        return candidata if candidata > despues else candidata + timedelta(days=1)
+
+    def iniciar(self):
+        if self._hilo is None:
+            self._activo = True
+            self._hilo = threading.Thread(target=self._ejecutar, name="programador-reglas", daemon=True)
+            self._hilo.start()
+
+    def detener(self):
+        with self._cambio:
+            self._activo = False
+            self._cambio.notify()
+        hilo, self._hilo = self._hilo, None
+        # Una regla puede detener el programador desde su propio hilo
+        if hilo is not None and hilo is not threading.current_thread():
+            hilo.join()
+
+    def _ejecutar(self):
+        while True:
+            with self._cambio:
+                while self._activo and (not self._cola or self._cola[0][0] > datetime.now()):
+                    espera = (self._cola[0][0] - datetime.now()).total_seconds() if self._cola else None
+                    self._cambio.wait(timeout=espera)
+                if not self._activo:
+                    return
+                _, orden, hora, nombre, regla = heapq.heappop(self._cola)
+                heapq.heappush(self._cola, (self._proxima(hora, datetime.now()), orden, hora, nombre, regla))
+            try:
+                regla()
+            except Exception as e:
+                logger.error(f"❌ Error en la regla programada '{nombre}': {e}")
+
+# ==================== MOTOR ====================
+
+class MotorNotificaciones:
+    """Reglas incrementales sobre contadores en memoria más reglas programadas"""
+
+    _instancias = {}
+    _lock_instancias = threading.Lock()
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path
+        self.directorio_backups = sedes.directorio_sede(DIRECTORIO_BACKUPS)
+        self.programador = Programador()
+        self._lock = threading.Lock()
+        self._fecha = None
+        self.total_estudiantes = 0
+        self.con_entrada = set()
+        self.ultimo_backup = None
+        self._iniciado = False
+
+    @classmethod
+    def obtener(cls, db_path: str = None) -> "MotorNotificaciones":
+        db_path = ruta_base_datos(db_path)
+        with cls._lock_instancias:
+            if db_path not in cls._instancias:
+                cls._instancias[db_path] = cls(db_path)
+            return cls._instancias[db_path]
+
+    def iniciar(self, programar: bool = True, hora_entradas: str = None, hora_backup: str = HORA_AVISO_BACKUP):
+        """Suscribe las reglas al bus y arranca el programador (idempotente)
+
+        Los jobs de línea de comandos usan programar=False: solo atienden los
+        eventos que ellos mismos publican.
+        """
+        with self._lock:
+            if self._iniciado:
+                return self
+            self._iniciado = True
+        bus = eventos.BusEventos.obtener()
+        bus.suscribir(eventos.ASISTENCIA_REGISTRADA, self._al_registrar_asistencia)
+        bus.suscribir(eventos.AUSENTES_MARCADOS, self._al_marcar_ausentes)
+        bus.suscribir(eventos.ESTUDIANTES_AGREGADOS, self._al_agregar_estudiantes)
+        bus.suscribir(eventos.ESTUDIANTES_ELIMINADOS, self._al_eliminar_estudiantes)
+        bus.suscribir(eventos.BACKUP_REALIZADO, self._al_realizar_backup)
+        avisos_acudientes.suscribir_encolado(self.db_path)
+        if not programar:
+            return self
+        self.programador.agregar(hora_entradas or self._hora_configurada(), "entradas faltantes",
+                                 self.regla_entradas_faltantes)
+        self.programador.agregar(hora_backup, "backup diario", self.regla_backup)
+        self.programador.iniciar()
+        logger.info("🔔 Motor de notificaciones iniciado")
+        return self
+
+    def detener(self):
+        self.programador.detener()
+
+    def _hora_configurada(self) -> str:
+        conn = conectar(self.db_path)
+        try:
+            fila = conn.execute("SELECT valor FROM configuracion WHERE clave = 'hora_aviso_entradas'").fetchone()
+        finally:
+            conn.close()
+        return fila[0][:5] if fila and fila[0] else HORA_AVISO_ENTRADAS
+
+    def _notificar(self, tipo, titulo, mensaje, clave=None):
+        return guardar_notificacion(tipo, titulo, mensaje, clave, self.db_path)
+
+    # ==================== CONTADORES ====================
+
+    def sincronizar(self, fecha: str = None):
+        """Reconcilia los contadores con la base (una consulta por contador)"""
+        fecha = fecha or datetime.now().strftime("%Y-%m-%d")
+        conn = conectar(self.db_path)
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM estudiantes").fetchone()[0]
+            con_entrada = {f[0] for f in conn.execute(
+                "SELECT id_estudiante FROM asistencia WHERE fecha = ?", (fecha,))}
+        finally:
+            conn.close()
+        ultimo = None
+        if os.path.isdir(self.directorio_backups):
+            fechas = [e.stat().st_mtime for e in os.scandir(self.directorio_backups) if e.name.endswith(".db")]
+            ultimo = datetime.fromtimestamp(max(fechas)) if fechas else None
+        with self._lock:
+            self._fecha, self.total_estudiantes, self.con_entrada = fecha, total, con_entrada
+            if ultimo and (self.ultimo_backup is None or ultimo > self.ultimo_backup):
+                self.ultimo_backup = ultimo
+
+    def _asegurar_dia(self, fecha: str = None):
+        if self._fecha != (fecha or datetime.now().strftime("%Y-%m-%d")):
+            self.sincronizar()
+
+    # ==================== REGLAS POR EVENTO ====================
+
+    def _al_registrar_asistencia(self, fecha: str, ids):
+        self._asegurar_dia()
+        if fecha == self._fecha:
+            with self._lock:
+                self.con_entrada.update(ids)
+
+    def _al_agregar_estudiantes(self, cantidad: int):
+        self._asegurar_dia()
+        with self._lock:
+            self.total_estudiantes += cantidad
+
+    def _al_eliminar_estudiantes(self, ids):
+        self._asegurar_dia()
+        with self._lock:
+            self.total_estudiantes = max(self.total_estudiantes - len(ids), 0)
+            self.con_entrada.difference_update(ids)
+            vacio = self.total_estudiantes == 0
+        if vacio:
+            self._notificar(INFO, "Base de datos", "No hay estudiantes registrados en el sistema",
+                            f"sin_estudiantes:{self._fecha}")
+
+    def _al_realizar_backup(self, ruta: str):
+        with self._lock:
+            self.ultimo_backup = datetime.now()
+
+    def _al_marcar_ausentes(self, fecha: str, cantidad: int):
+        """Tras el cierre del día: ausentismo crónico del mes (consulta indexada sobre el resumen)"""
+        en_riesgo = estudiantes_en_riesgo(mes=fecha[:7], db_path=self.db_path)
+        superan = [e for e in en_riesgo if e['supera']]
+        en_limite = [e for e in en_riesgo if not e['supera']]
+        if superan:
+            nombres = ", ".join(f"{e['nombre']} ({e['ausentes']})" for e in superan[:5])
+            extra = f" y {len(superan) - 5} más" if len(superan) > 5 else ""
+            self._notificar(PELIGRO, "Ausentismo crónico",
+                            f"{len(superan)} estudiantes superan el límite de {superan[0]['umbral']} "
+                            f"faltas este mes: {nombres}{extra}", f"ausentismo:{fecha}")
+        if en_limite:
+            self._notificar(ADVERTENCIA, "Estudiantes en el límite de faltas",
+                            f"{len(en_limite)} estudiantes alcanzaron el máximo de faltas permitido este mes",
+                            f"limite_faltas:{fecha}")
+
+    # ==================== REGLAS PROGRAMADAS ====================
+
+    def regla_entradas_faltantes(self):
+        """A la hora de aviso: estudiantes sin entrada en un día laborable"""
+        fecha = datetime.now().strftime("%Y-%m-%d")
+        if dia_de_fecha(fecha) not in DIAS_LABORABLES:
+            return
+        self.sincronizar(fecha)
+        with self._lock:
+            faltantes = self.total_estudiantes - len(self.con_entrada)
+            total = self.total_estudiantes
+        if total == 0:
+            self._notificar(INFO, "Base de datos", "No hay estudiantes registrados en el sistema",
+                            f"sin_estudiantes:{fecha}")
+        elif faltantes > 0:
+            self._notificar(ADVERTENCIA, "Estudiantes sin asistencia",
+                            f"{faltantes} estudiantes no tienen asistencia registrada hoy",
+                            f"sin_entrada:{fecha}")
+
+    def regla_backup(self):
+        """Aviso si no hubo backup en las últimas 24 horas"""
+        self._asegurar_dia()
+        with self._lock:
+            ultimo = self.ultimo_backup
+        if ultimo is None or datetime.now() - ultimo > timedelta(days=1):
+            detalle = f"El último backup es del {ultimo.strftime('%Y-%m-%d %H:%M')}" if ultimo \
+                else "No hay backups de la base de datos"
+            self._notificar(ADVERTENCIA, "Backup pendiente", detalle,
+                            f"backup:{datetime.now().strftime('%Y-%m-%d')}")
@@ -6,56 +6,23 @@ import tkinter as tk
 from tkinter import Toplevel, Frame, Label, Button
 from datetime import datetime
 
+from core.motor_notificaciones import MotorNotificaciones, guardar_notificacion, no_leidas, marcar_leidas
+
 class SistemaNotificaciones:
-    """Sistema de notificaciones mejorado"""
+    """Sistema de notificaciones mejorado
+
+    Las reglas las evalúa MotorNotificaciones a partir de eventos y de un
+    programador; aquí solo se leen las notificaciones persistidas sin leer.
+    """
     
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.notificaciones = []
+        MotorNotificaciones.obtener(db_manager.db_path).iniciar()
     
     def verificar_notificaciones_pendientes(self):
-        """Verifica y genera notificaciones automáticas"""
-        self.notificaciones.clear()
-        
-        # Verificar estudiantes sin asistencia hoy
-        fecha_hoy = datetime.now().strftime("%Y-%m-%d")
-        query = """
-            SELECT COUNT(*) as faltantes 
-            FROM estudiantes e
-            LEFT JOIN asistencia a ON e.id = a.id_estudiante AND a.fecha = ?
-            WHERE a.id_asistencia IS NULL
-        """
-        result = self.db_manager.execute_query(query, (fecha_hoy,), fetch=True)
-        
-        if result and result[0]['faltantes'] > 0:
-            self.notificaciones.append({
-                'tipo': 'advertencia',
-                'titulo': 'Estudiantes sin asistencia',
-                'mensaje': f'{result[0]["faltantes"]} estudiantes no tienen asistencia registrada hoy',
-                'fecha': datetime.now()
-            })
-        
-        # Verificar backup automático
-        if not os.path.exists("backups"):
-            self.notificaciones.append({
-                'tipo': 'info',
-                'titulo': 'Carpeta de backups',
-                'mensaje': 'La carpeta de backups no existe',
-                'fecha': datetime.now()
-            })
-        
-        # Verificar base de datos
-        try:
-            stats = self.db_manager.get_estadisticas()
-            if stats['total_estudiantes'] == 0:
-                self.notificaciones.append({
-                    'tipo': 'info',
-                    'titulo': 'Base de datos',
-                    'mensaje': 'No hay estudiantes registrados en el sistema',
-                    'fecha': datetime.now()
-                })
-        except:
-            pass
+        """Carga las notificaciones sin leer (consulta indexada)"""
+        self.notificaciones = no_leidas(db_path=self.db_manager.db_path)
     
     def mostrar_notificaciones(self, parent):
         """Muestra las notificaciones pendientes"""
@@ -76,8 +43,17 @@ class SistemaNotificaciones:
         for notif in self.notificaciones:
             self._crear_notificacion(frame_lista, notif)
         
-        Button(ventana_notificaciones, text="Cerrar", 
-               command=ventana_notificaciones.destroy).pack(pady=10)
+        botones = Frame(ventana_notificaciones, bg="white")
+        botones.pack(pady=10)
+        
+        def marcar_y_cerrar():
+            self.marcar_leidas()
+            ventana_notificaciones.destroy()
+        
+        Button(botones, text="✔️ Marcar como leídas", bg="#16a34a", fg="white",
+               command=marcar_y_cerrar).pack(side=tk.LEFT, padx=5)
+        Button(botones, text="Cerrar", 
+               command=ventana_notificaciones.destroy).pack(side=tk.LEFT, padx=5)
     
     def _crear_notificacion(self, parent, notificacion):
         """Crea una notificación individual"""
@@ -98,16 +74,20 @@ class SistemaNotificaciones:
     
     def agregar_notificacion(self, tipo: str, titulo: str, mensaje: str):
         """Agrega una notificación manualmente"""
+        id_notificacion = guardar_notificacion(tipo, titulo, mensaje, db_path=self.db_manager.db_path)
         self.notificaciones.append({
+            'id': id_notificacion,
             'tipo': tipo,
             'titulo': titulo,
             'mensaje': mensaje,
             'fecha': datetime.now()
         })
     
+    def marcar_leidas(self):
+        """Marca como leídas las notificaciones mostradas"""
+        marcar_leidas([n['id'] for n in self.notificaciones if n.get('id')], db_path=self.db_manager.db_path)
+        self.notificaciones.clear()
+    
     def limpiar_notificaciones(self):
         """Limpia todas las notificaciones"""
         self.notificaciones.clear()
-
-# Import necesario
-import os
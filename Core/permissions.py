@@ -10,7 +10,9 @@ class PermisosManager:
             'gestion_usuarios': True,
             'gestion_docentes': True,
             'gestion_estudiantes': True,
+            'gestion_horarios': True,
             'control_asistencia': True,
+            'revisar_justificaciones': True,
             'ver_reportes': True,
             'exportar_datos': True,
             'configuracion_sistema': True,
@@ -21,7 +23,9 @@ class PermisosManager:
             'gestion_usuarios': False,
             'gestion_docentes': False,
             'gestion_estudiantes': False,
+            'gestion_horarios': False,
             'control_asistencia': True,
+            'revisar_justificaciones': False,
             'ver_reportes': True,
             'exportar_datos': True,
             'configuracion_sistema': False,
@@ -32,7 +36,9 @@ class PermisosManager:
             'gestion_usuarios': False,
             'gestion_docentes': False,
             'gestion_estudiantes': False,
+            'gestion_horarios': False,
             'control_asistencia': False,
+            'revisar_justificaciones': False,
             'ver_reportes': False,
             'exportar_datos': False,
             'configuracion_sistema': False,
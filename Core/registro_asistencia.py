@@ -0,0 +1,73 @@
+"""
+Escritura de entradas y salidas de asistencia en lote
+"""
+
+import logging
+from datetime import datetime
+from typing import List
+
+from core.reglas_asistencia import clasificar_entradas, ReglasAsistencia
+from core import eventos
+
+logger = logging.getLogger(__name__)
+
+ENTRADA_REGISTRADA = "registrada"
+ENTRADA_DUPLICADA = "duplicada"
+SALIDA_REGISTRADA = "registrada"
+SALIDA_SIN_ENTRADA = "sin_entrada"
+
+def registrar_entradas(conn, entradas: List[dict], reglas: ReglasAsistencia = None) -> List[str]:
+    """Inserta entradas en una sola transacción, omitiendo las que ya existen ese día
+
+    Cada entrada es un dict con id_estudiante, fecha, hora_entrada, estado y
+    observaciones (fecha/hora por defecto: ahora). Sin estado, o con estado
+    'Automático', lo decide el motor de reglas. Devuelve el resultado de
+    cada entrada en el mismo orden; las registradas reciben su id_asistencia.
+    No hace commit.
+    """
+    clasificar_entradas(conn, entradas, reglas)
+    ahora = datetime.now()
+    resultados = []
+    c = conn.cursor()
+    for entrada in entradas:
+        fecha = entrada.get('fecha') or ahora.strftime("%Y-%m-%d")
+        hora = entrada.get('hora_entrada') or ahora.strftime("%H:%M:%S")
+        c.execute("""
+            INSERT INTO asistencia (id_estudiante, fecha, hora_entrada, estado, estado_calculado, observaciones)
+            SELECT ?, ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM asistencia WHERE id_estudiante = ? AND fecha = ?
+            )
+        """, (entrada['id_estudiante'], fecha, hora, entrada['estado'], entrada['estado_calculado'],
+              entrada.get('observaciones', ''), entrada['id_estudiante'], fecha))
+        if c.rowcount == 1:
+            entrada['id_asistencia'] = c.lastrowid
+            resultados.append(ENTRADA_REGISTRADA)
+        else:
+            resultados.append(ENTRADA_DUPLICADA)
+    return resultados
+
+def publicar_entradas(entradas: List[dict], resultados: List[str]):
+    """Publica ASISTENCIA_REGISTRADA por fecha con las entradas nuevas (llamar tras el commit)"""
+    hoy = datetime.now().strftime("%Y-%m-%d")
+    por_fecha = {}
+    for entrada, resultado in zip(entradas, resultados):
+        if resultado == ENTRADA_REGISTRADA:
+            por_fecha.setdefault(entrada.get('fecha') or hoy, []).append(entrada['id_estudiante'])
+    for fecha, ids in por_fecha.items():
+        eventos.publicar(eventos.ASISTENCIA_REGISTRADA, fecha=fecha, ids=ids)
+
+def registrar_salidas(conn, salidas: List[dict]) -> List[str]:
+    """Marca la hora de salida de la entrada del día de cada estudiante. No hace commit."""
+    ahora = datetime.now()
+    resultados = []
+    c = conn.cursor()
+    for salida in salidas:
+        fecha = salida.get('fecha') or ahora.strftime("%Y-%m-%d")
+        hora = salida.get('hora_salida') or ahora.strftime("%H:%M:%S")
+        c.execute("""
+            UPDATE asistencia SET hora_salida = ?
+            WHERE id_estudiante = ? AND fecha = ?
+        """, (hora, salida['id_estudiante'], fecha))
+        resultados.append(SALIDA_REGISTRADA if c.rowcount > 0 else SALIDA_SIN_ENTRADA)
+    return resultados
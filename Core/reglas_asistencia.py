@@ -0,0 +1,292 @@
+"""
+Motor de reglas de asistencia: clasificación automática Presente/Tarde/Ausente
+
+La hora de referencia de cada entrada es el inicio de la primera clase del día
+de la sección del estudiante (tabla horarios); si la sección no tiene clases
+configuradas se usa hora_entrada_obligatoria. Las reglas se leen una sola vez
+y quedan en memoria hasta que se invalidan.
+"""
+
+import json
+import logging
+import threading
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config.database import conectar, ruta_base_datos
+from core import eventos
+
+logger = logging.getLogger(__name__)
+
+ESTADO_AUTOMATICO = "Automático"
+PRESENTE = "Presente"
+TARDE = "Tarde"
+AUSENTE = "Ausente"
+JUSTIFICADO = "Justificado"
+
+# Estados que el motor puede recalcular, solo en registros con estado_calculado = 1;
+# un estado elegido a mano (aunque sea Presente o Tarde) no se toca
+ESTADOS_CALCULADOS = (PRESENTE, TARDE)
+
+DIAS_SEMANA = ("lunes", "martes", "miercoles", "jueves", "viernes", "sabado", "domingo")
+DIAS_LABORABLES = DIAS_SEMANA[:5]
+
+def normalizar_dia(dia) -> str:
+    """'Miércoles' -> 'miercoles' (sin tildes, en minúsculas)"""
+    texto = unicodedata.normalize("NFKD", str(dia or "").strip().lower())
+    return "".join(ch for ch in texto if not unicodedata.combining(ch))
+
+def dia_de_fecha(fecha: str) -> str:
+    """Nombre normalizado del día de la semana de una fecha YYYY-MM-DD"""
+    return DIAS_SEMANA[datetime.strptime(fecha, "%Y-%m-%d").weekday()]
+
+def hora_a_segundos(hora) -> Optional[int]:
+    """'07:15' o '07:15:30' -> segundos desde medianoche"""
+    if not hora:
+        return None
+    partes = str(hora).strip().split(":")
+    try:
+        h, m = int(partes[0]), int(partes[1]) if len(partes) > 1 else 0
+        s = int(partes[2][:2]) if len(partes) > 2 else 0
+    except ValueError:
+        return None
+    return h * 3600 + m * 60 + s
+
+
+class ReglasAsistencia:
+    """Reglas de entrada en memoria (tolerancia, hora obligatoria y horarios por sección)"""
+
+    _instancias = {}
+    _lock_instancias = threading.Lock()
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path
+        self.tolerancia = timedelta(minutes=15)
+        self.hora_entrada = hora_a_segundos("07:00:00")
+        # (seccion, dia) -> (inicio primera clase, fin última clase) en segundos
+        self._jornadas: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._secciones_con_horario = set()
+        self._cargadas = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def obtener(cls, db_path: str = None) -> "ReglasAsistencia":
+        """Reglas compartidas para la base de datos indicada"""
+        db_path = ruta_base_datos(db_path)
+        with cls._lock_instancias:
+            reglas = cls._instancias.get(db_path)
+            if reglas is None:
+                reglas = cls._instancias[db_path] = cls(db_path)
+            return reglas
+
+    def cargar(self, conn=None):
+        """Lee configuración y horarios (dos consultas)"""
+        propia = conn is None
+        if propia:
+            conn = conectar(self.db_path)
+        try:
+            config = dict(conn.execute("""
+                SELECT clave, valor FROM configuracion
+                WHERE clave IN ('tolerancia_minutos', 'hora_entrada_obligatoria')
+            """).fetchall())
+            horarios = conn.execute("""
+                SELECT seccion, dia_semana, MIN(hora_inicio), MAX(hora_fin)
+                FROM horarios
+                WHERE seccion IS NOT NULL AND seccion <> ''
+                GROUP BY seccion, dia_semana
+            """).fetchall()
+        finally:
+            if propia:
+                conn.close()
+
+        with self._lock:
+            try:
+                self.tolerancia = timedelta(minutes=int(config.get('tolerancia_minutos', 15)))
+            except (TypeError, ValueError):
+                logger.warning(f"⚠️ tolerancia_minutos inválida: {config.get('tolerancia_minutos')}")
+            self.hora_entrada = hora_a_segundos(config.get('hora_entrada_obligatoria')) or hora_a_segundos("07:00:00")
+            self._jornadas.clear()
+            self._secciones_con_horario.clear()
+            for seccion, dia, inicio, fin in horarios:
+                inicio, fin = hora_a_segundos(inicio), hora_a_segundos(fin)
+                if inicio is None:
+                    continue
+                clave = (str(seccion).strip().upper(), normalizar_dia(dia))
+                anterior = self._jornadas.get(clave)
+                if anterior:
+                    # El mismo día escrito de dos formas ('Miércoles'/'miercoles')
+                    inicio = min(inicio, anterior[0])
+                    fin = max(fin or 0, anterior[1] or 0)
+                self._jornadas[clave] = (inicio, fin)
+                self._secciones_con_horario.add(clave[0])
+            self._cargadas = True
+        logger.info(f"📐 Reglas de asistencia cargadas: {len(self._jornadas)} jornadas por sección")
+
+    def invalidar(self):
+        """Fuerza la recarga en el próximo uso (cambios en configuración u horarios)"""
+        with self._lock:
+            self._cargadas = False
+
+    def _asegurar(self, conn=None):
+        if not self._cargadas:
+            self.cargar(conn)
+
+    def jornada(self, seccion, fecha: str) -> Optional[Tuple[int, int]]:
+        """(inicio, fin) de las clases de la sección ese día, o None si no tiene clases"""
+        with self._lock:
+            self._asegurar()
+            return self._jornadas.get((str(seccion or "").strip().upper(), dia_de_fecha(fecha)))
+
+    def tiene_clases(self, seccion, fecha: str) -> bool:
+        """Indica si la sección debía asistir esa fecha"""
+        with self._lock:
+            self._asegurar()
+            clave = str(seccion or "").strip().upper()
+            if clave in self._secciones_con_horario:
+                return (clave, dia_de_fecha(fecha)) in self._jornadas
+            return dia_de_fecha(fecha) in DIAS_LABORABLES
+
+    def secciones_con_clases(self, fecha: str) -> List[str]:
+        """Secciones con horario configurado que tienen clases esa fecha"""
+        dia = dia_de_fecha(fecha)
+        with self._lock:
+            self._asegurar()
+            return [seccion for seccion, d in self._jornadas if d == dia]
+
+    def clasificar(self, seccion, fecha: str, hora: str) -> str:
+        """Estado que corresponde a una entrada a esa hora"""
+        segundos = hora_a_segundos(hora)
+        with self._lock:
+            self._asegurar()
+            jornada = self._jornadas.get((str(seccion or "").strip().upper(), dia_de_fecha(fecha)))
+            inicio = jornada[0] if jornada else self.hora_entrada
+            limite = inicio + int(self.tolerancia.total_seconds())
+        if segundos is None or segundos <= limite:
+            return PRESENTE
+        # Llegar después del final de la última clase no cuenta como asistencia
+        if jornada and jornada[1] is not None and segundos >= jornada[1]:
+            return AUSENTE
+        return TARDE
+
+
+def requiere_clasificacion(estado) -> bool:
+    return not estado or estado == ESTADO_AUTOMATICO
+
+def clasificar_entradas(conn, entradas: List[dict], reglas: ReglasAsistencia = None) -> List[dict]:
+    """Completa el estado de las entradas sin estado o marcadas 'Automático'
+
+    Obtiene las secciones de los estudiantes con una sola consulta. Las
+    entradas clasificadas quedan con estado_calculado = 1. Modifica y
+    devuelve la misma lista.
+    """
+    pendientes = [e for e in entradas if requiere_clasificacion(e.get('estado'))]
+    for entrada in entradas:
+        entrada['estado_calculado'] = 0
+    if not pendientes:
+        return entradas
+    reglas = reglas or ReglasAsistencia.obtener()
+    reglas._asegurar(conn)
+
+    ids = sorted({e['id_estudiante'] for e in pendientes})
+    secciones = dict(conn.execute(
+        "SELECT id, seccion FROM estudiantes WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(ids),)
+    ).fetchall())
+
+    ahora = datetime.now()
+    for entrada in pendientes:
+        fecha = entrada.get('fecha') or ahora.strftime("%Y-%m-%d")
+        hora = entrada.get('hora_entrada') or ahora.strftime("%H:%M:%S")
+        entrada['estado'] = reglas.clasificar(secciones.get(entrada['id_estudiante']), fecha, hora)
+        entrada['estado_calculado'] = 1
+    return entradas
+
+def clasificar_dia(conn, fecha: str, reglas: ReglasAsistencia = None) -> int:
+    """Recalcula Presente/Tarde de los registros del día que calculó el motor
+
+    Solo considera registros sin estado, 'Automático' o con
+    estado_calculado = 1; no toca los estados elegidos a mano. Devuelve
+    cuántos registros cambiaron. No hace commit.
+    """
+    reglas = reglas or ReglasAsistencia.obtener()
+    reglas._asegurar(conn)
+    filas = conn.execute("""
+        SELECT a.id_asistencia, e.seccion, a.hora_entrada, a.estado
+        FROM asistencia a
+        JOIN estudiantes e ON e.id = a.id_estudiante
+        WHERE a.fecha = ? AND a.hora_entrada IS NOT NULL
+          AND (a.estado IS NULL OR a.estado = ?
+               OR (a.estado_calculado = 1 AND a.estado IN (?, ?)))
+    """, (fecha, ESTADO_AUTOMATICO) + ESTADOS_CALCULADOS).fetchall()
+
+    cambios = []
+    for id_asistencia, seccion, hora, estado in filas:
+        nuevo = reglas.clasificar(seccion, fecha, hora)
+        if nuevo != estado:
+            cambios.append((nuevo, id_asistencia))
+    if cambios:
+        conn.executemany("UPDATE asistencia SET estado = ?, estado_calculado = 1 WHERE id_asistencia = ?",
+                         cambios)
+    logger.info(f"📐 Clasificación del {fecha}: {len(cambios)} de {len(filas)} registros actualizados")
+    return len(cambios)
+
+def marcar_ausentes(conn, fecha: str, reglas: ReglasAsistencia = None) -> int:
+    """Inserta 'Ausente' para quienes no registraron entrada (una sola sentencia)
+
+    Solo se consideran estudiantes cuya sección tenía clases ese día; las
+    secciones sin horario configurado asisten de lunes a viernes. Si hay una
+    justificación aprobada cuyo rango cubre la fecha, el registro queda 'Justificado'.
+    No hace commit. Devuelve el número de registros insertados.
+    """
+    reglas = reglas or ReglasAsistencia.obtener()
+    reglas._asegurar(conn)
+    with reglas._lock:
+        con_clases = reglas.secciones_con_clases(fecha)
+        con_horario = sorted(reglas._secciones_con_horario)
+    laborable = 1 if dia_de_fecha(fecha) in DIAS_LABORABLES else 0
+
+    c = conn.execute("""
+        INSERT INTO asistencia (id_estudiante, fecha, hora_entrada, hora_salida, estado, observaciones)
+        SELECT e.id, :fecha, NULL, NULL,
+               CASE WHEN EXISTS (
+                   SELECT 1 FROM justificaciones j
+                   WHERE j.estudiante_id = e.id AND j.fecha <= :fecha
+                     AND IFNULL(j.fecha_fin, j.fecha) >= :fecha
+                     AND j.estado IN ('Aprobada', 'Aprobado')
+               ) THEN :justificado ELSE :ausente END,
+               'Cierre diario automático'
+        FROM estudiantes e
+        WHERE NOT EXISTS (
+            SELECT 1 FROM asistencia a WHERE a.id_estudiante = e.id AND a.fecha = :fecha
+        )
+        AND (
+            UPPER(TRIM(COALESCE(e.seccion, ''))) IN (SELECT value FROM json_each(:con_clases))
+            OR (:laborable = 1 AND UPPER(TRIM(COALESCE(e.seccion, '')))
+                NOT IN (SELECT value FROM json_each(:con_horario)))
+        )
+    """, {
+        'fecha': fecha, 'ausente': AUSENTE, 'justificado': JUSTIFICADO,
+        'con_clases': json.dumps(con_clases), 'con_horario': json.dumps(con_horario),
+        'laborable': laborable,
+    })
+    logger.info(f"🌙 Cierre del {fecha}: {c.rowcount} ausencias registradas")
+    return c.rowcount
+
+def cierre_diario(fecha: str = None, db_path: str = None) -> dict:
+    """Job nocturno: reclasifica el día y marca ausentes en una transacción"""
+    fecha = fecha or datetime.now().strftime("%Y-%m-%d")
+    reglas = ReglasAsistencia.obtener(db_path)
+    reglas.invalidar()
+    conn = conectar(db_path)
+    try:
+        reclasificados = clasificar_dia(conn, fecha, reglas)
+        ausentes = marcar_ausentes(conn, fecha, reglas)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    eventos.publicar(eventos.AUSENTES_MARCADOS, fecha=fecha, cantidad=ausentes)
+    return {'fecha': fecha, 'reclasificados': reclasificados, 'ausentes': ausentes}
@@ -0,0 +1,221 @@
+"""
+Motor de reportes de asistencia
+
+Compila los filtros a una sola consulta parametrizada y entrega los
+resultados por páginas con cursor por clave (fecha, id_asistencia), de modo
+que los reportes de un mes o de un período nunca cargan filas sin límite en
+memoria. Los agrupamientos se calculan en SQL.
+"""
+
+import logging
+from typing import Iterator, List, Optional, Tuple
+
+from config.database import conectar
+
+logger = logging.getLogger(__name__)
+
+COLUMNAS_DETALLE = ("ID", "Estudiante", "Sección", "Fecha", "Hora Entrada", "Hora Salida", "Estado")
+ESTADOS = ("Presente", "Tarde", "Ausente", "Justificado")
+COLUMNAS_AGRUPADO = ("Grupo", "Registros", "Presentes", "Tardes", "Ausentes", "Justificados", "% Asistencia")
+
+# Expresión de la clave y etiqueta de cada agrupamiento
+AGRUPAMIENTOS = {
+    'estudiante': ("a.id_estudiante", "IFNULL(e.nombres || ' ' || e.apellidos, 'Estudiante ' || a.id_estudiante)"),
+    'dia': ("a.fecha", "a.fecha"),
+    'seccion': ("e.seccion", "IFNULL(e.seccion, 'Sin sección')"),
+}
+
+
+class FiltroReporte:
+    """Criterios de un reporte; los vacíos no se aplican"""
+
+    def __init__(self, desde: str = None, hasta: str = None, seccion: str = None,
+                 carrera: str = None, estado: str = None, id_estudiante: int = None,
+                 estudiante: str = None):
+        self.desde = desde or None
+        self.hasta = hasta or None
+        self.seccion = seccion or None
+        self.carrera = carrera or None
+        self.estado = estado or None
+        self.id_estudiante = id_estudiante
+        self.estudiante = (estudiante or "").strip() or None
+
+    def compilar(self) -> Tuple[List[str], list]:
+        """Devuelve las condiciones WHERE y sus parámetros"""
+        condiciones, parametros = [], []
+        if self.id_estudiante is not None:
+            condiciones.append("a.id_estudiante = ?")
+            parametros.append(self.id_estudiante)
+        if self.desde:
+            condiciones.append("a.fecha >= ?")
+            parametros.append(self.desde)
+        if self.hasta:
+            condiciones.append("a.fecha <= ?")
+            parametros.append(self.hasta)
+        if self.estado:
+            condiciones.append("a.estado = ?")
+            parametros.append(self.estado)
+        if self.seccion:
+            condiciones.append("e.seccion = ?")
+            parametros.append(self.seccion)
+        if self.carrera:
+            condiciones.append("e.carrera = ?")
+            parametros.append(self.carrera)
+        if self.estudiante:
+            condiciones.append("(e.cedula = ? OR e.nombres || ' ' || e.apellidos LIKE ?)")
+            parametros.extend([self.estudiante, f"%{self.estudiante}%"])
+        return condiciones, parametros
+
+    def __repr__(self):
+        activos = {k: v for k, v in vars(self).items() if v is not None}
+        return f"FiltroReporte({activos})"
+
+
+def formatear_resumen(totales: tuple) -> dict:
+    """Encabezado de un reporte a partir de MotorReportes.totales (o de su suma entre sedes)"""
+    total, estudiantes, primera, ultima, presentes, tardes, ausentes, justificados = totales
+    asistidos = (presentes or 0) + (tardes or 0) + (justificados or 0)
+    return {
+        'Registros': total,
+        'Estudiantes': estudiantes,
+        'Período': f"{primera} a {ultima}" if primera else "-",
+        'Presentes': presentes or 0,
+        'Tardes': tardes or 0,
+        'Ausentes': ausentes or 0,
+        'Justificados': justificados or 0,
+        '% Asistencia': f"{100.0 * asistidos / total:.1f}%" if total else "-",
+    }
+
+
+class MotorReportes:
+    """Consultas de reportes paginadas y agrupadas"""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path
+
+    @staticmethod
+    def _where(condiciones: List[str]) -> str:
+        return ("WHERE " + " AND ".join(condiciones)) if condiciones else ""
+
+    def pagina(self, filtro: FiltroReporte, cursor: Optional[tuple] = None,
+               tamano: int = 200) -> Tuple[list, Optional[tuple]]:
+        """Una página del detalle, de la más reciente a la más antigua
+
+        `cursor` es el (fecha, id_asistencia) de la última fila de la página
+        anterior. Devuelve (filas, cursor_siguiente); el cursor es None cuando
+        no hay más páginas.
+        """
+        condiciones, parametros = filtro.compilar()
+        if cursor is not None:
+            condiciones.append("(a.fecha, a.id_asistencia) < (?, ?)")
+            parametros.extend(cursor)
+        sql = f"""
+            SELECT a.id_asistencia,
+                   e.nombres || ' ' || e.apellidos AS estudiante,
+                   IFNULL(e.seccion, '-'),
+                   a.fecha,
+                   IFNULL(a.hora_entrada, '-'),
+                   IFNULL(a.hora_salida, '-'),
+                   a.estado
+            FROM asistencia a
+            LEFT JOIN estudiantes e ON a.id_estudiante = e.id
+            {self._where(condiciones)}
+            ORDER BY a.fecha DESC, a.id_asistencia DESC
+            LIMIT ?
+        """
+        conn = conectar(self.db_path)
+        try:
+            # Una fila extra indica si existe otra página
+            filas = conn.execute(sql, parametros + [tamano + 1]).fetchall()
+        finally:
+            conn.close()
+        if len(filas) <= tamano:
+            return filas, None
+        filas = filas[:tamano]
+        return filas, (filas[-1][3], filas[-1][0])
+
+    def filas(self, filtro: FiltroReporte, tamano: int = 1000) -> Iterator[tuple]:
+        """Recorre todo el detalle página por página (para exportaciones)"""
+        cursor = None
+        while True:
+            pagina, cursor = self.pagina(filtro, cursor, tamano)
+            yield from pagina
+            if cursor is None:
+                return
+
+    def contar(self, filtro: FiltroReporte) -> int:
+        condiciones, parametros = filtro.compilar()
+        conn = conectar(self.db_path)
+        try:
+            return conn.execute(f"""
+                SELECT COUNT(*) FROM asistencia a
+                LEFT JOIN estudiantes e ON a.id_estudiante = e.id
+                {self._where(condiciones)}
+            """, parametros).fetchone()[0]
+        finally:
+            conn.close()
+
+    def totales(self, filtro: FiltroReporte) -> tuple:
+        """(registros, estudiantes, primera, última, presentes, tardes, ausentes, justificados)"""
+        condiciones, parametros = filtro.compilar()
+        conn = conectar(self.db_path)
+        try:
+            fila = conn.execute(f"""
+                SELECT COUNT(*),
+                       COUNT(DISTINCT a.id_estudiante),
+                       MIN(a.fecha), MAX(a.fecha),
+                       SUM(a.estado = 'Presente'),
+                       SUM(a.estado = 'Tarde'),
+                       SUM(a.estado = 'Ausente'),
+                       SUM(a.estado = 'Justificado')
+                FROM asistencia a
+                LEFT JOIN estudiantes e ON a.id_estudiante = e.id
+                {self._where(condiciones)}
+            """, parametros).fetchone()
+        finally:
+            conn.close()
+        return tuple(fila)
+
+    def resumen(self, filtro: FiltroReporte) -> dict:
+        """Totales del filtro para el encabezado de los reportes (una consulta)"""
+        return formatear_resumen(self.totales(filtro))
+
+    def agrupar(self, filtro: FiltroReporte, por: str = 'estudiante') -> list:
+        """Totales por estudiante, día o sección calculados en la base de datos"""
+        if por not in AGRUPAMIENTOS:
+            raise ValueError(f"Agrupamiento no soportado: {por}")
+        clave, etiqueta = AGRUPAMIENTOS[por]
+        condiciones, parametros = filtro.compilar()
+        orden = "a.fecha DESC" if por == 'dia' else "2"
+        conn = conectar(self.db_path)
+        try:
+            return conn.execute(f"""
+                SELECT {clave}, {etiqueta},
+                       COUNT(*),
+                       SUM(a.estado = 'Presente'),
+                       SUM(a.estado = 'Tarde'),
+                       SUM(a.estado = 'Ausente'),
+                       SUM(a.estado = 'Justificado'),
+                       ROUND(100.0 * SUM(a.estado IN ('Presente', 'Tarde', 'Justificado')) / COUNT(*), 1)
+                FROM asistencia a
+                LEFT JOIN estudiantes e ON a.id_estudiante = e.id
+                {self._where(condiciones)}
+                GROUP BY {clave}
+                ORDER BY {orden}
+            """, parametros).fetchall()
+        finally:
+            conn.close()
+
+    def opciones_filtro(self) -> dict:
+        """Valores disponibles para los combos de sección, carrera y estado"""
+        conn = conectar(self.db_path)
+        try:
+            def distintos(sql):
+                return [fila[0] for fila in conn.execute(sql).fetchall() if fila[0]]
+            return {
+                'secciones': distintos("SELECT DISTINCT seccion FROM estudiantes ORDER BY seccion"),
+                'carreras': distintos("SELECT nombre FROM carreras ORDER BY nombre"),
+                'estados': list(ESTADOS),
+            }
+        finally:
+            conn.close()
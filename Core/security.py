@@ -7,7 +7,7 @@ import hashlib
 import secrets
 from typing import Optional, Tuple
 
-from config.database import DB
+from config.database import conectar
 
 def hash_password(password: str, salt: str) -> str:
     """Hashea una contraseña con salt"""
@@ -15,7 +15,7 @@ def hash_password(password: str, salt: str) -> str:
 
 def create_user(usuario: str, password: str, rol: str = 'Usuario') -> Tuple[bool, str]:
     """Crea un nuevo usuario en el sistema"""
-    conn = sqlite3.connect(DB)
+    conn = conectar()
     c = conn.cursor()
     salt = secrets.token_hex(8)
     h = hash_password(password, salt)
@@ -36,7 +36,7 @@ def create_user(usuario: str, password: str, rol: str = 'Usuario') -> Tuple[bool
 
 def verificar_usuario(usuario: str, clave: str) -> Optional[Tuple[str, str]]:
     """Verifica las credenciales de un usuario"""
-    conn = sqlite3.connect(DB)
+    conn = conectar()
     c = conn.cursor()
     c.execute("SELECT pass_hash, salt, rol FROM usuarios WHERE usuario=?", (usuario,))
     row = c.fetchone()
@@ -57,7 +57,7 @@ def verificar_usuario(usuario: str, clave: str) -> Optional[Tuple[str, str]]:
 
 def cambiar_password(usuario: str, nueva_clave: str) -> bool:
     """Cambia la contraseña de un usuario"""
-    conn = sqlite3.connect(DB)
+    conn = conectar()
     c = conn.cursor()
     salt = secrets.token_hex(8)
     nuevo_hash = hash_password(nueva_clave, salt)
@@ -76,7 +76,7 @@ def cambiar_password(usuario: str, nueva_clave: str) -> bool:
 
 def usuario_existe(usuario: str) -> bool:
     """Verifica si un usuario existe"""
-    conn = sqlite3.connect(DB)
+    conn = conectar()
     c = conn.cursor()
     c.execute("SELECT id_usuario FROM usuarios WHERE usuario=?", (usuario,))
     existe = c.fetchone() is not None
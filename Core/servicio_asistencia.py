@@ -0,0 +1,383 @@
+"""
+Servicio local de registro de asistencia (HTTP/JSON sobre asyncio)
+
+Pensado para kioscos de entrada: varias terminales envían entradas y
+salidas a una sola base de datos. Todas las escrituras pasan por una única
+tarea escritora que las agrupa y hace un commit por lote.
+
+Endpoints:
+    GET  /api/salud
+    GET  /api/roster?seccion=A
+    GET  /api/estado?fecha=YYYY-MM-DD&seccion=A
+    POST /api/checkin   {"id_estudiante": 1} o {"cedula": "..."} (cédula o código de carnet)
+    POST /api/checkout  {"id_estudiante": 1} o {"cedula": "..."}
+"""
+
+import json
+import asyncio
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from config.database import conectar
+from core.registro_asistencia import registrar_entradas, registrar_salidas, publicar_entradas
+from core.indice_estudiantes import IndiceEstudiantes
+from core.reglas_asistencia import ReglasAsistencia
+from utils.validators import ESQUEMA_ESTUDIANTE, ESQUEMA_REGISTRO_API
+
+logger = logging.getLogger(__name__)
+
+_MOTIVOS_HTTP = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+                 405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"}
+_MAX_CUERPO = 64 * 1024
+
+
+class ErrorSolicitud(Exception):
+    """Error de validación que se responde al cliente con su código HTTP"""
+
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+class ServicioAsistencia:
+    """Servicio HTTP/JSON de entradas y salidas con escritor único por lotes"""
+
+    def __init__(self, db_path: str = None, lote_max: int = 200, espera_lote_ms: int = 20):
+        self.db_path = db_path
+        self.lote_max = lote_max
+        self.espera_lote = espera_lote_ms / 1000.0
+        self._cola = None
+        self._escritor = None
+        self._servidor = None
+        # Un solo hilo para escribir: serializa todas las escrituras
+        self._hilo_escritura = ThreadPoolExecutor(max_workers=1, thread_name_prefix="escritor")
+        self._hilo_lectura = ThreadPoolExecutor(max_workers=4, thread_name_prefix="lector")
+        self._conn_escritura = None
+        self.lotes_escritos = 0
+
+    # ==================== CICLO DE VIDA ====================
+
+    async def iniciar(self, host: str = None, puerto: int = None):
+        """Arranca la tarea escritora y, si se indica puerto, el servidor HTTP"""
+        self._cola = asyncio.Queue()
+        self._escritor = asyncio.create_task(self._tarea_escritora())
+        if puerto is not None:
+            self._servidor = await asyncio.start_server(self._atender_conexion, host or "127.0.0.1", puerto)
+            logger.info(f"🌐 Servicio de asistencia escuchando en http://{host or '127.0.0.1'}:{puerto}")
+
+    async def detener(self):
+        """Detiene el servidor y vacía la cola de escrituras pendientes"""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        if self._escritor is not None:
+            await self._cola.put(None)
+            await self._escritor
+            self._escritor = None
+        await asyncio.get_running_loop().run_in_executor(self._hilo_escritura, self._cerrar_conexion)
+        self._hilo_escritura.shutdown(wait=True)
+        self._hilo_lectura.shutdown(wait=True)
+
+    async def servir_para_siempre(self, host: str, puerto: int):
+        """Ejecuta el servicio hasta que se interrumpa"""
+        await self.iniciar(host, puerto)
+        try:
+            await self._servidor.serve_forever()
+        finally:
+            await self.detener()
+
+    # ==================== ESCRITOR ÚNICO ====================
+
+    async def _encolar(self, operacion: str, datos: dict) -> str:
+        futuro = asyncio.get_running_loop().create_future()
+        await self._cola.put((operacion, datos, futuro))
+        return await futuro
+
+    async def _tarea_escritora(self):
+        """Agrupa solicitudes de escritura y las confirma en un solo commit por lote"""
+        loop = asyncio.get_running_loop()
+        terminar = False
+        while not terminar:
+            item = await self._cola.get()
+            if item is None:
+                break
+            lote = [item]
+            limite = loop.time() + self.espera_lote
+            while len(lote) < self.lote_max:
+                restante = limite - loop.time()
+                try:
+                    item = self._cola.get_nowait() if restante <= 0 else \
+                        await asyncio.wait_for(self._cola.get(), restante)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    terminar = True
+                    break
+                lote.append(item)
+
+            try:
+                resultados = await loop.run_in_executor(
+                    self._hilo_escritura, self._escribir_lote, [(op, datos) for op, datos, _ in lote]
+                )
+            except Exception as e:
+                logger.error(f"❌ Error escribiendo lote de {len(lote)} registros: {e}")
+                if len(lote) == 1:
+                    self._fallar(lote[0][2], e)
+                    continue
+                # Se reintenta uno por uno para que un registro defectuoso no tumbe al resto
+                resultados = []
+                for op, datos, futuro in lote:
+                    try:
+                        resultados += await loop.run_in_executor(
+                            self._hilo_escritura, self._escribir_lote, [(op, datos)])
+                    except Exception as e_individual:
+                        self._fallar(futuro, e_individual)
+                        resultados.append(None)
+            for (_, _, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+    @staticmethod
+    def _fallar(futuro, error: Exception):
+        if not futuro.done():
+            futuro.set_exception(error)
+
+    def _escribir_lote(self, operaciones: list) -> list:
+        """Escribe un lote completo en una transacción (hilo escritor)"""
+        if self._conn_escritura is None:
+            self._conn_escritura = conectar(self.db_path)
+            self._conn_escritura.execute("PRAGMA journal_mode=WAL")
+        conn = self._conn_escritura
+        entradas = [(i, datos) for i, (op, datos) in enumerate(operaciones) if op == 'checkin']
+        salidas = [(i, datos) for i, (op, datos) in enumerate(operaciones) if op == 'checkout']
+        resultados = [None] * len(operaciones)
+        reglas = ReglasAsistencia.obtener(self.db_path)
+        try:
+            registradas = registrar_entradas(conn, [d for _, d in entradas], reglas)
+            for (i, _), resultado in zip(entradas, registradas):
+                resultados[i] = resultado
+            for (i, _), resultado in zip(salidas, registrar_salidas(conn, [d for _, d in salidas])):
+                resultados[i] = resultado
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        publicar_entradas([d for _, d in entradas], [resultados[i] for i, _ in entradas])
+        self.lotes_escritos += 1
+        return resultados
+
+    def _cerrar_conexion(self):
+        if self._conn_escritura is not None:
+            self._conn_escritura.close()
+            self._conn_escritura = None
+
+    # ==================== LECTURAS ====================
+
+    async def _leer(self, funcion, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._hilo_lectura, funcion, *args)
+
+    def _resolver_estudiante(self, datos: dict) -> int:
+        """Obtiene el id del estudiante a partir de id_estudiante o cedula"""
+        if datos.get('id_estudiante') is not None:
+            try:
+                id_estudiante = int(datos['id_estudiante'])
+            except (TypeError, ValueError):
+                raise ErrorSolicitud(400, "id_estudiante inválido")
+            conn = conectar(self.db_path)
+            try:
+                existe = conn.execute("SELECT 1 FROM estudiantes WHERE id = ?", (id_estudiante,)).fetchone()
+            finally:
+                conn.close()
+            if existe is None:
+                raise ErrorSolicitud(404, f"No existe estudiante con id {id_estudiante}")
+            return id_estudiante
+        cedula = str(datos.get('cedula') or '').strip()
+        if not cedula:
+            raise ErrorSolicitud(400, "Debe indicar id_estudiante o cedula")
+        error = ESQUEMA_ESTUDIANTE.validar_campo("cedula", cedula)
+        if error:
+            raise ErrorSolicitud(400, f"cedula: {error}")
+        id_estudiante = IndiceEstudiantes.obtener(self.db_path).resolver(cedula)
+        if id_estudiante is None:
+            raise ErrorSolicitud(404, f"No existe estudiante con cédula {cedula}")
+        return id_estudiante
+
+    def _consultar_roster(self, seccion: str = None) -> list:
+        conn = conectar(self.db_path)
+        try:
+            query = "SELECT id, cedula, nombres, apellidos, carrera, anio, seccion FROM estudiantes"
+            params = ()
+            if seccion:
+                query += " WHERE seccion = ?"
+                params = (seccion,)
+            query += " ORDER BY apellidos, nombres"
+            cols = ("id", "cedula", "nombres", "apellidos", "carrera", "anio", "seccion")
+            return [dict(zip(cols, fila)) for fila in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
+    def _consultar_estado(self, fecha: str, seccion: str = None) -> dict:
+        conn = conectar(self.db_path)
+        try:
+            filtro, params = "", [fecha]
+            if seccion:
+                filtro = " AND e.seccion = ?"
+                params.append(seccion)
+            c = conn.cursor()
+            c.execute(f"""
+                SELECT IFNULL(a.estado, 'Sin registro'), COUNT(*)
+                FROM estudiantes e
+                LEFT JOIN asistencia a ON a.id_estudiante = e.id AND a.fecha = ?
+                WHERE 1=1{filtro}
+                GROUP BY 1
+            """, params)
+            conteos = dict(c.fetchall())
+            c.execute(f"""
+                SELECT COUNT(*) FROM asistencia a JOIN estudiantes e ON a.id_estudiante = e.id
+                WHERE a.fecha = ? AND a.hora_salida IS NOT NULL{filtro}
+            """, params)
+            salidas = c.fetchone()[0]
+        finally:
+            conn.close()
+        return {'fecha': fecha, 'seccion': seccion, 'conteos': conteos,
+                'total': sum(conteos.values()), 'salidas': salidas}
+
+    # ==================== ENRUTADOR ====================
+
+    async def manejar(self, metodo: str, ruta: str, cuerpo: dict = None):
+        """Atiende una solicitud; devuelve (código HTTP, respuesta dict)"""
+        partes = urlsplit(ruta)
+        parametros = {k: v[-1] for k, v in parse_qs(partes.query).items()}
+        try:
+            if partes.path == "/api/salud" and metodo == "GET":
+                return 200, {'ok': True, 'lotes_escritos': self.lotes_escritos,
+                             'pendientes': self._cola.qsize() if self._cola else 0}
+
+            if partes.path == "/api/roster" and metodo == "GET":
+                estudiantes = await self._leer(self._consultar_roster, parametros.get('seccion'))
+                return 200, {'estudiantes': estudiantes, 'total': len(estudiantes)}
+
+            if partes.path == "/api/estado" and metodo == "GET":
+                fecha = parametros.get('fecha') or datetime.now().strftime("%Y-%m-%d")
+                return 200, await self._leer(self._consultar_estado, fecha, parametros.get('seccion'))
+
+            if partes.path in ("/api/checkin", "/api/checkout"):
+                if metodo != "POST":
+                    raise ErrorSolicitud(405, "Use POST")
+                if cuerpo is not None and not isinstance(cuerpo, dict):
+                    raise ErrorSolicitud(400, "El cuerpo debe ser un objeto JSON")
+                return await self._registrar(partes.path.rsplit("/", 1)[-1], cuerpo or {})
+
+            raise ErrorSolicitud(404, f"Ruta no encontrada: {partes.path}")
+        except ErrorSolicitud as e:
+            return e.estado, {'ok': False, 'error': e.mensaje}
+        except Exception as e:
+            logger.error(f"❌ Error atendiendo {metodo} {ruta}: {e}")
+            return 500, {'ok': False, 'error': str(e)}
+
+    async def _registrar(self, operacion: str, cuerpo: dict):
+        errores = ESQUEMA_REGISTRO_API.validar(cuerpo)
+        if errores:
+            raise ErrorSolicitud(400, "; ".join(f"{campo}: {mensaje}" for campo, mensaje in errores))
+        cuerpo = {**cuerpo, **{k: v for k, v in ESQUEMA_REGISTRO_API.limpiar(cuerpo).items() if v}}
+        id_estudiante = await self._leer(self._resolver_estudiante, cuerpo)
+        ahora = datetime.now()
+        datos = {'id_estudiante': id_estudiante, 'fecha': cuerpo.get('fecha') or ahora.strftime("%Y-%m-%d")}
+        if operacion == 'checkin':
+            datos.update(hora_entrada=cuerpo.get('hora') or ahora.strftime("%H:%M:%S"),
+                         estado=cuerpo.get('estado'), observaciones=cuerpo.get('observaciones', ''))
+        else:
+            datos.update(hora_salida=cuerpo.get('hora') or ahora.strftime("%H:%M:%S"))
+
+        resultado = await self._encolar(operacion, datos)
+        ok = resultado == "registrada"
+        return (201 if ok else 409), {'ok': ok, 'resultado': resultado, **datos}
+
+    # ==================== HTTP ====================
+
+    async def _atender_conexion(self, reader, writer):
+        """Atiende solicitudes HTTP/1.1 (con keep-alive) de una conexión"""
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, ruta, version = linea.decode('latin-1').split()
+                except ValueError:
+                    await self._responder(writer, 400, {'ok': False, 'error': 'Solicitud mal formada'}, False)
+                    break
+
+                cabeceras = {}
+                while True:
+                    linea = await reader.readline()
+                    if linea in (b"\r\n", b"\n", b""):
+                        break
+                    clave, _, valor = linea.decode('latin-1').partition(":")
+                    cabeceras[clave.strip().lower()] = valor.strip()
+
+                cuerpo = None
+                try:
+                    largo = int(cabeceras.get('content-length') or 0)
+                except ValueError:
+                    largo = -1
+                if largo < 0:
+                    await self._responder(writer, 400, {'ok': False, 'error': 'Content-Length inválido'}, False)
+                    break
+                if largo > _MAX_CUERPO:
+                    await self._responder(writer, 400, {'ok': False, 'error': 'Cuerpo demasiado grande'}, False)
+                    break
+                if largo:
+                    try:
+                        cuerpo = json.loads(await reader.readexactly(largo))
+                    except ValueError:
+                        await self._responder(writer, 400, {'ok': False, 'error': 'JSON inválido'}, False)
+                        break
+
+                estado, respuesta = await self.manejar(metodo.upper(), ruta, cuerpo)
+                mantener = cabeceras.get('connection', '').lower() != 'close' and version == "HTTP/1.1"
+                await self._responder(writer, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _responder(writer, estado: int, respuesta: dict, mantener: bool):
+        cuerpo = json.dumps(respuesta, ensure_ascii=False).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {estado} {_MOTIVOS_HTTP.get(estado, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode('latin-1') + cuerpo
+        )
+        await writer.drain()
+
+
+class ClienteLocal:
+    """Cliente en proceso que llama al enrutador sin pasar por la red"""
+
+    def __init__(self, servicio: ServicioAsistencia):
+        self.servicio = servicio
+
+    async def get(self, ruta: str):
+        return await self.servicio.manejar("GET", ruta)
+
+    async def post(self, ruta: str, datos: dict):
+        # Ida y vuelta por JSON para reproducir lo que recibiría por HTTP
+        return await self.servicio.manejar("POST", ruta, json.loads(json.dumps(datos)))
+
+
+def ejecutar_servicio(host: str = "127.0.0.1", puerto: int = 8765, **opciones):
+    """Punto de entrada bloqueante del modo servicio (python Main.py --serve)"""
+    servicio = ServicioAsistencia(**opciones)
+    try:
+        asyncio.run(servicio.servir_para_siempre(host, puerto))
+    except KeyboardInterrupt:
+        logger.info("🛑 Servicio de asistencia detenido")
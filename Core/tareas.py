@@ -0,0 +1,165 @@
+"""
+Ejecutor de tareas en segundo plano para la interfaz Tkinter
+
+Las funciones enviadas corren en un pool de hilos; sus resultados se
+entregan en el hilo principal de Tk mediante root.after, de modo que los
+callbacks pueden tocar widgets con seguridad.
+"""
+
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class Tarea:
+    """Resultado futuro de una tarea enviada al ejecutor"""
+
+    def __init__(self, future, widget=None, descripcion: str = ""):
+        self.future = future
+        self.widget = widget
+        self.descripcion = descripcion
+        self._cancelada = threading.Event()
+
+    def cancelar(self) -> bool:
+        """Cancela la tarea; si ya está corriendo, su callback no se ejecutará"""
+        self._cancelada.set()
+        return self.future.cancel() or not self.future.done()
+
+    @property
+    def cancelada(self) -> bool:
+        return self._cancelada.is_set()
+
+    @property
+    def terminada(self) -> bool:
+        return self.future.done()
+
+    def resultado(self, timeout: Optional[float] = None):
+        """Espera el resultado (bloqueante, no usar desde el hilo de Tk)"""
+        return self.future.result(timeout)
+
+
+class EjecutorTareas:
+    """Pool de hilos con despachador de resultados al hilo principal de Tk"""
+
+    _instancias = {}
+    _lock = threading.Lock()
+
+    def __init__(self, root, max_workers: int = 4, intervalo_ms: int = 40):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tarea")
+        self._resultados = queue.Queue()
+        self._pendientes = 0
+        self._despachando = False
+        self._ocupados = {}
+
+    @classmethod
+    def obtener(cls, widget) -> "EjecutorTareas":
+        """Obtiene el ejecutor asociado a la raíz Tk del widget"""
+        root = widget._root()
+        with cls._lock:
+            ejecutor = cls._instancias.get(root)
+            if ejecutor is None:
+                ejecutor = cls._instancias[root] = cls(root)
+            return ejecutor
+
+    def enviar(self, funcion: Callable, *args, al_terminar: Callable = None,
+               al_error: Callable = None, widget=None, descripcion: str = "", **kwargs) -> Tarea:
+        """Ejecuta funcion(*args, **kwargs) en segundo plano
+
+        al_terminar(resultado) y al_error(excepcion) se llaman en el hilo de Tk.
+        Si se indica widget, su ventana muestra el indicador de ocupado y los
+        callbacks se omiten si la ventana ya fue cerrada.
+        """
+        future = self._pool.submit(funcion, *args, **kwargs)
+        tarea = Tarea(future, widget, descripcion or getattr(funcion, "__name__", ""))
+        self._pendientes += 1
+        if widget is not None:
+            self._marcar_ocupado(widget, +1)
+        future.add_done_callback(
+            lambda f: self._resultados.put((tarea, al_terminar, al_error))
+        )
+        if not self._despachando:
+            self._despachando = True
+            self.root.after(self.intervalo_ms, self._despachar)
+        return tarea
+
+    def _despachar(self):
+        """Entrega en el hilo de Tk los resultados de las tareas terminadas"""
+        while True:
+            try:
+                tarea, al_terminar, al_error = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            self._pendientes -= 1
+            if tarea.widget is not None:
+                self._marcar_ocupado(tarea.widget, -1)
+            self._entregar(tarea, al_terminar, al_error)
+
+        if self._pendientes > 0:
+            try:
+                self.root.after(self.intervalo_ms, self._despachar)
+                return
+            except Exception:
+                logger.debug("Raíz Tk destruida, se detiene el despachador")
+        self._despachando = False
+
+    def _entregar(self, tarea: Tarea, al_terminar, al_error):
+        """Invoca el callback que corresponda a la tarea terminada"""
+        if tarea.cancelada or not _widget_vivo(tarea.widget):
+            return
+        try:
+            resultado = tarea.future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            if al_error:
+                al_error(e)
+            else:
+                logger.error(f"❌ Error en tarea '{tarea.descripcion}': {e}", exc_info=e)
+            return
+        if al_terminar:
+            try:
+                al_terminar(resultado)
+            except Exception as e:
+                logger.error(f"❌ Error en callback de '{tarea.descripcion}': {e}", exc_info=e)
+
+    def _marcar_ocupado(self, widget, delta: int):
+        """Mantiene el indicador de ocupado de la ventana del widget"""
+        try:
+            ventana = widget.winfo_toplevel()
+        except Exception:
+            return
+        from ui.indicador_ocupado import IndicadorOcupado
+        indicador = self._ocupados.get(ventana)
+        if indicador is None:
+            if delta < 0:
+                return
+            indicador = self._ocupados[ventana] = IndicadorOcupado(ventana)
+        indicador.ajustar(delta)
+        if indicador.activas == 0:
+            self._ocupados.pop(ventana, None)
+
+    def cerrar(self, esperar: bool = False):
+        """Detiene el pool; las tareas en cola se cancelan"""
+        self._pool.shutdown(wait=esperar, cancel_futures=True)
+        with self._lock:
+            self._instancias.pop(self.root, None)
+
+
+def _widget_vivo(widget) -> bool:
+    if widget is None:
+        return True
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
+
+
+def ejecutar_en_segundo_plano(widget, funcion: Callable, *args, **kwargs) -> Tarea:
+    """Atajo: envía la función al ejecutor de la raíz del widget"""
+    kwargs.setdefault('widget', widget)
+    return EjecutorTareas.obtener(widget).enviar(funcion, *args, **kwargs)
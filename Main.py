@@ -7,14 +7,14 @@ Punto de entrada principal - CORREGIDO
 import sys
 import os
 import logging
+import argparse
 
 # Agregar el directorio raíz al path para imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from config import sedes
 from config.database import crear_db_y_schema
 from config.config_manager import ConfigManager
-from modules.login import Login
-from tkinter import Tk, messagebox
 
 def setup_logging():
     """Configura el sistema de logging"""
@@ -28,10 +28,224 @@ def setup_logging():
     )
     return logging.getLogger(__name__)
 
+def parse_args(argv=None):
+    """Interpreta los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Sistema de Gestión Académica - Instituto Rubén Darío")
+    parser.add_argument("--serve", action="store_true",
+                        help="Inicia el servicio local de registro de asistencia (sin interfaz gráfica)")
+    parser.add_argument("--host", help="Dirección de escucha del servicio")
+    parser.add_argument("--port", type=int, help="Puerto del servicio")
+    parser.add_argument("--cierre-diario", nargs="?", const="hoy", metavar="FECHA",
+                        help="Clasifica las entradas del día y marca ausentes (YYYY-MM-DD, por defecto hoy)")
+    parser.add_argument("--deduplicar", nargs="?", const="reporte", choices=["reporte", "fusionar"],
+                        help="Lista estudiantes y docentes duplicados; 'fusionar' une los que comparten cédula")
+    parser.add_argument("--mantener-auditoria", action="store_true",
+                        help="Rota la auditoría por mes, comprime los meses fríos y aplica la retención")
+    parser.add_argument("--verificar-auditoria", nargs="?", const="incremental", choices=["incremental", "completa"],
+                        help="Verifica la cadena de hashes de la auditoría desde el último checkpoint firmado")
+    parser.add_argument("--enviar-avisos", action="store_true",
+                        help="Envía los avisos de inasistencia pendientes a los acudientes")
+    parser.add_argument("--archivar", nargs=2, metavar=("DESDE", "HASTA"),
+                        help="Archiva la asistencia del rango en formato columnar comprimido (.acol)")
+    parser.add_argument("--leer-archivo", metavar="RUTA",
+                        help="Muestra el resumen de un archivo .acol (lee solo las columnas necesarias)")
+    parser.add_argument("--sede", metavar="CLAVE",
+                        help="Sede sobre la que trabajan el servicio y los jobs (por defecto la predeterminada)")
+    parser.add_argument("--resumen-sedes", nargs="?", const="mes", metavar="AAAA-MM",
+                        help="Totales de asistencia del mes en cada sede y en todas (consulta en paralelo)")
+    return parser.parse_args(argv)
+
+def iniciar_servicio(args, config_manager, logger):
+    """Modo servicio para kioscos y terminales de entrada"""
+    from core.servicio_asistencia import ejecutar_servicio
+    from core.motor_notificaciones import MotorNotificaciones
+    from core.avisos_acudientes import RepartidorAvisos, transportes_configurados
+    
+    MotorNotificaciones.obtener().iniciar()
+    RepartidorAvisos(transportes_configurados(),
+                     intervalo=config_manager.get('avisos.intervalo_segundos', 5)).iniciar()
+    host = args.host or config_manager.get('servicio.host', '127.0.0.1')
+    puerto = args.port or config_manager.get('servicio.puerto', 8765)
+    logger.info(f"🛰️ Modo servicio en {host}:{puerto}")
+    ejecutar_servicio(
+        host, puerto,
+        lote_max=config_manager.get('servicio.lote_max', 200),
+        espera_lote_ms=config_manager.get('servicio.espera_lote_ms', 20)
+    )
+
+def ejecutar_cierre_diario(args, logger):
+    """Job nocturno: reclasifica Presente/Tarde y marca ausentes"""
+    from core.reglas_asistencia import cierre_diario
+    from core.motor_notificaciones import MotorNotificaciones
+    from core.eventos import BusEventos
+    
+    MotorNotificaciones.obtener().iniciar(programar=False)
+    fecha = None if args.cierre_diario == "hoy" else args.cierre_diario
+    resultado = cierre_diario(fecha)
+    BusEventos.obtener().vaciar()
+    logger.info(f"🌙 Cierre diario {resultado['fecha']}: {resultado['reclasificados']} reclasificados, "
+                f"{resultado['ausentes']} ausentes")
+
+def ejecutar_deduplicacion(args, logger):
+    """Revisión de estudiantes y docentes duplicados desde la línea de comandos"""
+    from core.deduplicacion import buscar_duplicados, buscar_docentes_duplicados, fusionar_por_cedula
+    
+    grupos = buscar_duplicados()
+    for grupo in grupos:
+        logger.info(f"👥 [{', '.join(grupo['motivos'])}] " + " | ".join(
+            f"#{r['id']} {r['cedula']} {r['nombres']} {r['apellidos']} ({r['seccion'] or '-'})"
+            for r in grupo['registros']
+        ))
+    for grupo in buscar_docentes_duplicados():
+        logger.info("👨‍🏫 [cedula] " + " | ".join(
+            f"#{r['id_docente']} {r['cedula']} {r['nombres']} {r['apellido']} ({r['clases']} clases)"
+            for r in grupo['registros']
+        ))
+    if args.deduplicar == "fusionar":
+        resultado = fusionar_por_cedula(grupos=grupos)
+        logger.info(f"🔗 {resultado.get('fusionados', 0)} registros fusionados en {resultado.get('grupos', 0)} grupos; "
+                    f"{resultado.get('asistencias', 0)} asistencias reasignadas")
+        docentes = resultado['docentes']
+        logger.info(f"🔗 {docentes.get('fusionados', 0)} docentes fusionados en {docentes.get('grupos', 0)} grupos; "
+                    f"{docentes.get('clases', 0)} clases reasignadas")
+        for tabla in resultado['indices_pendientes']:
+            logger.warning(f"⚠️ {tabla} aún tiene cédulas repetidas; revise los grupos manualmente")
+
+def ejecutar_mantenimiento_auditoria(config_manager, logger):
+    """Job mensual: particiones de auditoría, archivo comprimido y retención"""
+    from core.auditoria import Auditoria
+    from core.database_manager import DatabaseManager
+    
+    resultado = Auditoria(DatabaseManager()).mantenimiento(
+        meses_activos=config_manager.get('auditoria.meses_activos', 3),
+        retencion_dias=config_manager.get('auditoria.retencion_dias', 0)
+    )
+    logger.info(f"🗂️ Auditoría: {len(resultado['rotados'])} meses rotados, "
+                f"{len(resultado['archivados'])} archivados, {resultado['eliminados']} registros eliminados")
+
+def ejecutar_verificacion_auditoria(args, logger):
+    """Verificación de integridad de la auditoría; código de salida 1 si fue alterada"""
+    from core.auditoria import Auditoria
+    from core.database_manager import DatabaseManager
+    
+    resultado = Auditoria(DatabaseManager()).verificar(completa=args.verificar_auditoria == "completa")
+    if not resultado['valido']:
+        logger.error(f"❌ Auditoría alterada: {resultado['error']}")
+        sys.exit(1)
+    logger.info(f"✅ Auditoría íntegra: {resultado['verificados']} registros verificados "
+                f"desde el id {resultado['desde_id']} ({resultado['sin_cadena']} sin cadena)")
+
+def ejecutar_envio_avisos(logger):
+    """Job periódico: vacía la bandeja de avisos a acudientes"""
+    from core.avisos_acudientes import RepartidorAvisos, transportes_configurados
+    
+    transportes = transportes_configurados()
+    if not transportes:
+        logger.warning("⚠️ No hay transportes configurados en 'avisos.transportes'")
+        return
+    resultado = RepartidorAvisos(transportes).vaciar()
+    logger.info(f"📤 Avisos: {resultado['enviados']} enviados, {resultado['reintentos']} por reintentar, "
+                f"{resultado['fallidos']} descartados")
+
+def ejecutar_archivo_asistencia(args, logger):
+    """Histórico de asistencia en formato columnar"""
+    from utils.exporters import ExportadorAvanzado
+    
+    desde, hasta = args.archivar
+    exito, mensaje = ExportadorAvanzado.archivar_asistencia(desde, hasta)
+    if not exito:
+        logger.error(f"❌ {mensaje}")
+        sys.exit(1)
+    logger.info(f"🗄️ {mensaje}")
+
+def ejecutar_lectura_archivo(args, logger):
+    """Resumen de un archivo columnar: filas, período y conteo por estado"""
+    from collections import Counter
+    from utils.columnar import LectorColumnar
+    
+    lector = LectorColumnar(args.leer_archivo)
+    fechas = [f for f in lector.leer_columna("fecha") if f]
+    periodo = f"{min(fechas)} a {max(fechas)}" if fechas else "-"
+    logger.info(f"🗄️ {args.leer_archivo}: {len(lector)} registros ({periodo})")
+    for estado, cantidad in Counter(lector.leer_columna("estado")).most_common():
+        logger.info(f"   {estado or 'Sin estado'}: {cantidad}")
+
+def ejecutar_resumen_sedes(args, logger):
+    """Reporte de asistencia de todas las sedes"""
+    from datetime import datetime
+    from core.consultas_sedes import resumen_sedes
+    from core.reportes import FiltroReporte
+    
+    mes = datetime.now().strftime("%Y-%m") if args.resumen_sedes == "mes" else args.resumen_sedes
+    resultado = resumen_sedes(FiltroReporte(desde=f"{mes}-01", hasta=f"{mes}-31"))
+    for clave, resumen in resultado['sedes'].items():
+        logger.info(f"🏫 {sedes.obtener_sede(clave).nombre}: {resumen['Registros']} registros, "
+                    f"{resumen['Estudiantes']} estudiantes, {resumen['% Asistencia']} de asistencia")
+    for clave, error in resultado['errores'].items():
+        logger.error(f"❌ {clave}: {error}")
+    total = resultado['total']
+    logger.info(f"📊 Todas las sedes ({mes}): {total['Registros']} registros, {total['Estudiantes']} estudiantes, "
+                f"{total['Ausentes']} ausencias, {total['% Asistencia']} de asistencia")
+
 def main():
     """Función principal de la aplicación - CORREGIDA"""
+    args = parse_args()
+    logger = setup_logging()
+    if args.sede:
+        try:
+            sedes.seleccionar_sede(args.sede)
+        except ValueError as e:
+            logger.error(f"❌ {e}")
+            sys.exit(2)
+    
+    if args.archivar:
+        crear_db_y_schema()
+        ejecutar_archivo_asistencia(args, logger)
+        return
+    
+    if args.leer_archivo:
+        ejecutar_lectura_archivo(args, logger)
+        return
+    
+    if args.resumen_sedes:
+        crear_db_y_schema()
+        ejecutar_resumen_sedes(args, logger)
+        return
+    
+    if args.cierre_diario:
+        crear_db_y_schema()
+        ejecutar_cierre_diario(args, logger)
+        return
+    
+    if args.deduplicar:
+        crear_db_y_schema()
+        ejecutar_deduplicacion(args, logger)
+        return
+    
+    if args.mantener_auditoria:
+        crear_db_y_schema()
+        ejecutar_mantenimiento_auditoria(ConfigManager(), logger)
+        return
+    
+    if args.verificar_auditoria:
+        crear_db_y_schema()
+        ejecutar_verificacion_auditoria(args, logger)
+        return
+    
+    if args.enviar_avisos:
+        crear_db_y_schema()
+        ejecutar_envio_avisos(logger)
+        return
+    
+    if args.serve:
+        crear_db_y_schema()
+        iniciar_servicio(args, ConfigManager(), logger)
+        return
+    
+    from modules.login import Login
+    from tkinter import Tk, messagebox
+    
     try:
-        logger = setup_logging()
         logger.info("🚀 Iniciando Sistema de Gestión Académica")
         
         # Crear base de datos y esquema
@@ -0,0 +1,166 @@
+"""
+Asistencia por periodo de clase (una marca por clase del horario)
+"""
+
+import tkinter as tk
+from tkinter import Frame, Label, Entry, Button, StringVar, ttk
+from datetime import datetime
+
+from core.asistencia_periodos import (CODIGOS, periodos_del_dia, estados_seccion, marcar_periodo,
+                                      desempaquetar, estado_periodo)
+from core.horarios import GestorHorarios
+from core.tareas import ejecutar_en_segundo_plano
+from ui.message_manager import MessageManager
+
+INICIALES = {"Presente": "P", "Tarde": "T", "Ausente": "A", "Justificado": "J", None: "·"}
+
+class AsistenciaPeriodos:
+    """Pasa lista de una sección en un periodo del día"""
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Asistencia por Periodo")
+        self.root.geometry("1000x620")
+        self.root.configure(bg="#f9fafb")
+
+        self.periodos = []
+        self.estudiantes = []
+        self.cambios = {}
+
+        self._crear_interfaz()
+        ejecutar_en_segundo_plano(self.root, GestorHorarios().opciones,
+                                  al_terminar=lambda o: self.cmb_seccion.config(values=o['secciones']),
+                                  al_error=self._error)
+
+    def _crear_interfaz(self):
+        Label(self.root, text="📚 Asistencia por Periodo de Clase", font=("Arial", 16, "bold"),
+              bg="#f9fafb", fg="#1e3a8a").pack(pady=8)
+
+        frm = Frame(self.root, bg="#f9fafb")
+        frm.pack(pady=4)
+        Label(frm, text="Sección:", bg="#f9fafb").grid(row=0, column=0, padx=5)
+        self.cmb_seccion = ttk.Combobox(frm, width=10, state="readonly")
+        self.cmb_seccion.grid(row=0, column=1, padx=5)
+        Label(frm, text="Fecha:", bg="#f9fafb").grid(row=0, column=2, padx=5)
+        self.fecha_var = StringVar(value=datetime.now().strftime("%Y-%m-%d"))
+        Entry(frm, textvariable=self.fecha_var, width=12).grid(row=0, column=3, padx=5)
+        Button(frm, text="🔄 Cargar", bg="#2563eb", fg="white", command=self.cargar).grid(row=0, column=4, padx=5)
+        Label(frm, text="Periodo:", bg="#f9fafb").grid(row=0, column=5, padx=5)
+        self.cmb_periodo = ttk.Combobox(frm, width=38, state="readonly")
+        self.cmb_periodo.grid(row=0, column=6, padx=5)
+
+        self.tree = ttk.Treeview(self.root, show="headings", height=18, selectmode="extended")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=12, pady=6)
+
+        btns = Frame(self.root, bg="#f9fafb")
+        btns.pack(pady=6)
+        colores = {"Presente": "#16a34a", "Tarde": "#f59e0b", "Ausente": "#dc2626", "Justificado": "#2563eb"}
+        for estado in CODIGOS:
+            Button(btns, text=estado, bg=colores[estado], fg="white",
+                   command=lambda e=estado: self.marcar(e)).pack(side=tk.LEFT, padx=4)
+        Button(btns, text="✅ Todos Presentes", bg="#0f766e", fg="white",
+               command=self.todos_presentes).pack(side=tk.LEFT, padx=4)
+        Button(btns, text="💾 Guardar", bg="#1e3a8a", fg="white",
+               command=self.guardar).pack(side=tk.LEFT, padx=12)
+
+    # ==================== CARGA ====================
+
+    def cargar(self):
+        seccion, fecha = self.cmb_seccion.get(), self.fecha_var.get().strip()
+        if not seccion:
+            MessageManager.show_warning(self.root, "Atención", "Seleccione una sección.")
+            return
+        try:
+            datetime.strptime(fecha, "%Y-%m-%d")
+        except ValueError:
+            MessageManager.show_error(self.root, "Error", "La fecha debe tener formato AAAA-MM-DD.")
+            return
+        ejecutar_en_segundo_plano(self.root, self._consultar, seccion, fecha,
+                                  al_terminar=self._mostrar, al_error=self._error)
+
+    @staticmethod
+    def _consultar(seccion, fecha):
+        """Se ejecuta en un hilo de trabajo"""
+        return periodos_del_dia(seccion, fecha), estados_seccion(seccion, fecha)
+
+    def _mostrar(self, resultado):
+        self.periodos, self.estudiantes = resultado
+        self.cambios = {}
+        if not self.periodos:
+            MessageManager.show_warning(self.root, "Atención", "La sección no tiene clases ese día.")
+        self.cmb_periodo['values'] = [f"{p['periodo']}. {p['hora_inicio']}-{p['hora_fin']} {p['materia']}"
+                                      for p in self.periodos]
+        if self.periodos:
+            self.cmb_periodo.current(0)
+
+        columnas = ["nombre"] + [f"p{p['periodo']}" for p in self.periodos]
+        self.tree.config(columns=columnas)
+        self.tree.heading("nombre", text="Estudiante")
+        self.tree.column("nombre", width=280)
+        for p in self.periodos:
+            self.tree.heading(f"p{p['periodo']}", text=f"P{p['periodo']} {p['hora_inicio']}")
+            self.tree.column(f"p{p['periodo']}", width=80, anchor=tk.CENTER)
+        self.tree.delete(*self.tree.get_children())
+        for est in self.estudiantes:
+            self.tree.insert("", "end", iid=str(est['id']), values=self._fila(est))
+
+    def _fila(self, est):
+        estados = desempaquetar(est['estados'], len(self.periodos))
+        for (id_est, periodo), estado in self.cambios.items():
+            if id_est == est['id']:
+                estados[periodo - 1] = estado
+        return [est['nombre']] + [INICIALES[e] for e in estados]
+
+    def _error(self, e):
+        MessageManager.show_error(self.root, "Error", f"Error en asistencia por periodo: {str(e)}")
+
+    # ==================== MARCAS ====================
+
+    def _periodo(self):
+        indice = self.cmb_periodo.current()
+        return self.periodos[indice]['periodo'] if indice >= 0 else None
+
+    def marcar(self, estado, ids=None):
+        periodo = self._periodo()
+        if periodo is None:
+            MessageManager.show_warning(self.root, "Atención", "Cargue la sección y elija el periodo.")
+            return
+        ids = ids if ids is not None else [int(i) for i in self.tree.selection()]
+        if not ids:
+            MessageManager.show_warning(self.root, "Atención", "Seleccione uno o más estudiantes.")
+            return
+        por_id = {est['id']: est for est in self.estudiantes}
+        for id_est in ids:
+            self.cambios[(id_est, periodo)] = estado
+            self.tree.item(str(id_est), values=self._fila(por_id[id_est]))
+
+    def todos_presentes(self):
+        """Marca Presente a quienes no tienen marca en el periodo"""
+        periodo = self._periodo()
+        if periodo is None:
+            return
+        pendientes = [est['id'] for est in self.estudiantes
+                      if (est['id'], periodo) not in self.cambios
+                      and estado_periodo(est['estados'], periodo) is None]
+        if pendientes:
+            self.marcar("Presente", pendientes)
+
+    def guardar(self):
+        if not self.cambios:
+            MessageManager.show_info(self.root, "Información", "No hay cambios por guardar.")
+            return
+        por_periodo = {}
+        for (id_est, periodo), estado in self.cambios.items():
+            por_periodo.setdefault(periodo, {})[id_est] = estado
+        fecha = self.fecha_var.get().strip()
+        ejecutar_en_segundo_plano(self.root, self._guardar_periodos, fecha, por_periodo,
+                                  al_terminar=self._guardado, al_error=self._error)
+
+    @staticmethod
+    def _guardar_periodos(fecha, por_periodo):
+        """Se ejecuta en un hilo de trabajo"""
+        return sum(marcar_periodo(fecha, periodo, estados) for periodo, estados in por_periodo.items())
+
+    def _guardado(self, total):
+        MessageManager.show_info(self.root, "Éxito", f"{total} marcas de periodo guardadas.")
+        self.cargar()
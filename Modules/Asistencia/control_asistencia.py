@@ -4,12 +4,17 @@ Control de Asistencia de Estudiantes
 
 import tkinter as tk
 from tkinter import Toplevel, Frame, Label, Entry, Button, ttk, StringVar
-import sqlite3
 from datetime import datetime
 
-from config.database import DB
+from config.database import conectar
 from ui.theme_manager import FondoManager
 from ui.message_manager import MessageManager
+from ui.selector_estudiante import SelectorEstudiante
+from ui.window_manager import GestorVentanas
+from core.tareas import ejecutar_en_segundo_plano
+from core.registro_asistencia import registrar_entradas, publicar_entradas, ENTRADA_REGISTRADA
+from core.cola_escaneo import ColaEscaneo, ESCANEO_ENCOLADO, ESCANEO_DUPLICADO
+from core.reglas_asistencia import ESTADO_AUTOMATICO
 
 class GestionAsistencia:
     def __init__(self, root):
@@ -26,9 +31,10 @@ class GestionAsistencia:
         self.panel_principal = Frame(root, bg='white', bd=3, relief='raised')
         self.panel_principal.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
+        self._tarea_tabla = None
+
         self._crear_interfaz()
         self.crear_tabla()
-        self.cargar_estudiantes()
         self.llenar_tabla()
 
     def _crear_interfaz(self):
@@ -43,8 +49,8 @@ class GestionAsistencia:
 
         # Estudiante
         Label(frm, text="Estudiante:", bg="white").grid(row=0, column=0, sticky=tk.E, padx=6, pady=6)
-        self.cmb_estudiante = ttk.Combobox(frm, width=40, state="readonly")
-        self.cmb_estudiante.grid(row=0, column=1, padx=6, pady=6)
+        self.selector_estudiante = SelectorEstudiante(frm, width=40, bg="white")
+        self.selector_estudiante.grid(row=0, column=1, padx=6, pady=6)
         
         # Fecha
         Label(frm, text="Fecha:", bg="white").grid(row=0, column=2, sticky=tk.E, padx=6, pady=6)
@@ -54,10 +60,10 @@ class GestionAsistencia:
 
         # Estado
         Label(frm, text="Estado:", bg="white").grid(row=1, column=0, sticky=tk.E, padx=6, pady=6)
-        self.cmb_estado = ttk.Combobox(frm, values=["Presente", "Tarde", "Ausente", "Justificado"], 
+        self.cmb_estado = ttk.Combobox(frm, values=[ESTADO_AUTOMATICO, "Presente", "Tarde", "Ausente", "Justificado"], 
                                      width=20, state='readonly')
         self.cmb_estado.grid(row=1, column=1, padx=6, pady=6)
-        self.cmb_estado.set("Presente")
+        self.cmb_estado.set(ESTADO_AUTOMATICO)
         
         # Observaciones
         Label(frm, text="Observaciones:", bg="white").grid(row=1, column=2, sticky=tk.E, padx=6, pady=6)
@@ -74,10 +80,57 @@ class GestionAsistencia:
                command=self.registrar_salida).grid(row=0, column=1, padx=6)
         Button(btns, text="🔄 Actualizar Lista", bg="#64748b", fg="white", 
                command=self.llenar_tabla).grid(row=0, column=2, padx=6)
+        Button(btns, text="📚 Asistencia por Periodo", bg="#0f766e", fg="white",
+               command=self.abrir_periodos).grid(row=0, column=3, padx=6)
+
+        # Modo escaneo de carnet
+        self._crear_panel_escaneo()
 
         # Tabla de asistencias
         self._crear_tabla_asistencias()
 
+    def abrir_periodos(self):
+        from modules.asistencia.asistencia_periodos import AsistenciaPeriodos
+        GestorVentanas.abrir_ventana(self.root, AsistenciaPeriodos, "Asistencia por Periodo")
+
+    def _crear_panel_escaneo(self):
+        """Crea el campo para lector de código de barras/QR (modo teclado)"""
+        frm_scan = Frame(self.panel_principal, bg="#eff6ff", bd=1, relief='solid')
+        frm_scan.pack(fill=tk.X, padx=10, pady=6)
+        
+        Label(frm_scan, text="📇 Escanear carnet:", font=("Arial", 11, "bold"),
+              bg="#eff6ff", fg="#1e3a8a").pack(side=tk.LEFT, padx=8, pady=6)
+        self.txt_escaneo = Entry(frm_scan, width=28, font=("Arial", 12))
+        self.txt_escaneo.pack(side=tk.LEFT, padx=6, pady=6)
+        self.txt_escaneo.bind('<Return>', self.procesar_escaneo)
+        
+        self.lbl_escaneo = Label(frm_scan, text="Cédula o código del carnet + Enter",
+                                 font=("Arial", 11), bg="#eff6ff", fg="#64748b")
+        self.lbl_escaneo.pack(side=tk.LEFT, padx=10)
+        
+        self.cola_escaneo = None
+        self._escaneos_en_espera = []
+        self.root.bind('<Destroy>', self._al_cerrar, add='+')
+        # El índice y los vistos de hoy se cargan fuera del hilo de Tk
+        ejecutar_en_segundo_plano(self.root, self._preparar_escaneo, al_terminar=self._escaneo_listo)
+
+    @staticmethod
+    def _preparar_escaneo() -> ColaEscaneo:
+        """Crea la cola de escaneo con el índice ya construido (hilo de trabajo)"""
+        cola = ColaEscaneo()
+        cola.preparar()
+        return cola
+
+    def _escaneo_listo(self, cola: ColaEscaneo):
+        if not self.root.winfo_exists():
+            cola.detener(esperar=False)
+            return
+        self.cola_escaneo = cola
+        self.root.after(1000, self._revisar_escaneos)
+        for codigo in self._escaneos_en_espera:
+            self._encolar_escaneo(codigo)
+        self._escaneos_en_espera = []
+
     def _crear_tabla_asistencias(self):
         """Crea la tabla de asistencias"""
         cols = ("id_asistencia", "estudiante", "fecha", "hora_entrada", "hora_salida", "estado", "observaciones")
@@ -98,7 +151,7 @@ class GestionAsistencia:
 
     def crear_tabla(self):
         """Crea la tabla de asistencia si no existe"""
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         c.execute("""
             CREATE TABLE IF NOT EXISTS asistencia (
@@ -115,55 +168,98 @@ class GestionAsistencia:
         conn.commit()
         conn.close()
 
-    def cargar_estudiantes(self):
-        """Carga la lista de estudiantes en el combobox"""
-        conn = sqlite3.connect(DB)
-        c = conn.cursor()
-        try:
-            c.execute("SELECT id, nombres || ' ' || apellidos FROM estudiantes ORDER BY nombres")
-            rows = c.fetchall()
-        except Exception:
-            rows = []
-        conn.close()
+    def procesar_escaneo(self, event=None):
+        """Registra la entrada del carnet leído sin diálogos (flujo de portería)"""
+        codigo = self.txt_escaneo.get().strip()
+        self.txt_escaneo.delete(0, tk.END)
+        if not codigo:
+            return
         
-        self.estudiantes_map = {nombre: id_ for id_, nombre in rows}
-        self.cmb_estudiante['values'] = list(self.estudiantes_map.keys())
-        if rows:
-            self.cmb_estudiante.current(0)
+        if self.cola_escaneo is None:
+            self._escaneos_en_espera.append(codigo)
+            self.lbl_escaneo.config(text="⏳ Preparando lector...", fg="#64748b")
+            return
+        self._encolar_escaneo(codigo)
+
+    def _encolar_escaneo(self, codigo: str):
+        # Un código desconocido o el cambio de día consultan la base: fuera del hilo de Tk
+        ejecutar_en_segundo_plano(
+            self.root, self.cola_escaneo.encolar, codigo,
+            al_terminar=lambda r: self._mostrar_escaneo(codigo, *r),
+            al_error=lambda e: self.lbl_escaneo.config(text=f"❌ Error leyendo carnet: {e}", fg="#dc2626")
+        )
+
+    def _mostrar_escaneo(self, codigo: str, resultado: str, _id_estudiante, nombre: str):
+        if resultado == ESCANEO_ENCOLADO:
+            self.lbl_escaneo.config(text=f"✅ {nombre} - {datetime.now().strftime('%H:%M:%S')}", fg="#16a34a")
+        elif resultado == ESCANEO_DUPLICADO:
+            self.lbl_escaneo.config(text=f"⚠️ {nombre} ya registró entrada hoy", fg="#d97706")
+        else:
+            self.lbl_escaneo.config(text=f"❌ Código no reconocido: {codigo}", fg="#dc2626")
+            self.root.bell()
+
+    def _revisar_escaneos(self):
+        """Agrega a la tabla las entradas que el hilo escritor confirmó"""
+        if self.cola_escaneo is None:
+            return
+        fecha = self.fecha_var.get()
+        while not self.cola_escaneo.confirmados.empty():
+            entrada, registrada = self.cola_escaneo.confirmados.get_nowait()
+            if registrada and entrada['fecha'] == fecha:
+                self.tree.insert("", 0, values=(
+                    entrada['id_asistencia'], self.cola_escaneo.indice.nombre(entrada['id_estudiante']),
+                    entrada['fecha'], entrada['hora_entrada'], '-', entrada['estado'],
+                    entrada.get('observaciones', '')
+                ))
+        self.root.after(1000, self._revisar_escaneos)
+
+    def _al_cerrar(self, event):
+        if event.widget is self.root and self.cola_escaneo is not None:
+            self.cola_escaneo.detener()
+            self.cola_escaneo = None
 
     def registrar_entrada(self):
         """Registra la entrada de un estudiante"""
-        estudiante = self.cmb_estudiante.get()
-        if not estudiante:
-            MessageManager.show_warning(self.root, "Atención", "Seleccione un estudiante.")
+        id_est = self.selector_estudiante.id_estudiante
+        if id_est is None:
+            MessageManager.show_warning(self.root, "Atención", "Escriba y seleccione un estudiante de la lista.")
+            self.selector_estudiante.focus_set()
             return
         
-        id_est = self.estudiantes_map.get(estudiante)
         fecha = self.fecha_var.get()
         hora = datetime.now().strftime("%H:%M:%S")
         estado = self.cmb_estado.get()
         obs = self.txt_obs.get().strip()
         
-        conn = sqlite3.connect(DB)
-        c = conn.cursor()
-        
-        # Verificar si ya existe entrada hoy para ese estudiante
-        c.execute("SELECT id_asistencia FROM asistencia WHERE id_estudiante=? AND fecha=?", (id_est, fecha))
-        if c.fetchone():
-            MessageManager.show_info(self.root, "Información", "Ya existe una entrada para este estudiante hoy.")
-            conn.close()
-            return
+        def al_terminar(estado_final):
+            if not estado_final:
+                MessageManager.show_info(self.root, "Información", "Ya existe una entrada para este estudiante hoy.")
+                return
+            MessageManager.show_info(self.root, "Éxito", f"✅ Entrada registrada correctamente ({estado_final}).")
+            self.llenar_tabla()
         
+        ejecutar_en_segundo_plano(
+            self.root, self._insertar_entrada, id_est, fecha, hora, estado, obs,
+            al_terminar=al_terminar,
+            al_error=lambda e: MessageManager.show_error(self.root, "Error", f"❌ Error al registrar entrada: {str(e)}")
+        )
+
+    @staticmethod
+    def _insertar_entrada(id_est, fecha, hora, estado, obs):
+        """Inserta la entrada si no existe otra ese día (hilo de trabajo)
+
+        Devuelve el estado con que quedó registrada, o None si ya existía.
+        """
+        conn = conectar()
         try:
-            c.execute("""
-                INSERT INTO asistencia (id_estudiante, fecha, hora_entrada, estado, observaciones) 
-                VALUES (?, ?, ?, ?, ?)
-            """, (id_est, fecha, hora, estado, obs))
+            entrada = {
+                'id_estudiante': id_est, 'fecha': fecha, 'hora_entrada': hora,
+                'estado': estado, 'observaciones': obs
+            }
+            resultado, = registrar_entradas(conn, [entrada])
             conn.commit()
-            MessageManager.show_info(self.root, "Éxito", "✅ Entrada registrada correctamente.")
-            self.llenar_tabla()
-        except Exception as e:
-            MessageManager.show_error(self.root, "Error", f"❌ Error al registrar entrada: {str(e)}")
+            publicar_entradas([entrada], [resultado])
+            return entrada['estado'] if resultado == ENTRADA_REGISTRADA else None
         finally:
             conn.close()
 
@@ -178,26 +274,42 @@ class GestionAsistencia:
         estudiante_nombre = self.tree.item(sel[0])['values'][1]
         hora_salida = datetime.now().strftime("%H:%M:%S")
         
-        conn = sqlite3.connect(DB)
-        c = conn.cursor()
-        try:
-            c.execute("UPDATE asistencia SET hora_salida=? WHERE id_asistencia=?", (hora_salida, id_asist))
-            conn.commit()
+        def al_terminar(_):
             MessageManager.show_info(self.root, "Éxito", f"✅ Salida registrada para {estudiante_nombre}.")
             self.llenar_tabla()
-        except Exception as e:
-            MessageManager.show_error(self.root, "Error", f"❌ Error al registrar salida: {str(e)}")
+        
+        ejecutar_en_segundo_plano(
+            self.root, self._actualizar_salida, id_asist, hora_salida,
+            al_terminar=al_terminar,
+            al_error=lambda e: MessageManager.show_error(self.root, "Error", f"❌ Error al registrar salida: {str(e)}")
+        )
+
+    @staticmethod
+    def _actualizar_salida(id_asist, hora_salida):
+        """Guarda la hora de salida (hilo de trabajo)"""
+        conn = conectar()
+        try:
+            conn.execute("UPDATE asistencia SET hora_salida=? WHERE id_asistencia=?", (hora_salida, id_asist))
+            conn.commit()
         finally:
             conn.close()
 
     def llenar_tabla(self):
-        """Llena la tabla con los registros de asistencia"""
-        for i in self.tree.get_children(): 
-            self.tree.delete(i)
-        
-        conn = sqlite3.connect(DB)
-        c = conn.cursor()
+        """Llena la tabla con los registros de asistencia de la fecha"""
+        if self._tarea_tabla is not None:
+            self._tarea_tabla.cancelar()
+        self._tarea_tabla = ejecutar_en_segundo_plano(
+            self.root, self._consultar_asistencias, self.fecha_var.get(),
+            al_terminar=self._mostrar_asistencias,
+            al_error=lambda e: MessageManager.show_error(self.root, "Error", f"Error al cargar asistencias: {str(e)}")
+        )
+
+    @staticmethod
+    def _consultar_asistencias(fecha: str) -> list:
+        """Consulta los registros de asistencia de una fecha (hilo de trabajo)"""
+        conn = conectar()
         try:
+            c = conn.cursor()
             c.execute("""
                 SELECT a.id_asistencia,
                        e.nombres || ' ' || e.apellidos as estudiante,
@@ -208,11 +320,17 @@ class GestionAsistencia:
                        IFNULL(a.observaciones, '') as observaciones
                 FROM asistencia a
                 LEFT JOIN estudiantes e ON a.id_estudiante = e.id
+                WHERE a.fecha = ?
                 ORDER BY a.id_asistencia DESC
-            """)
-            for row in c.fetchall():
-                self.tree.insert("", "end", values=row)
-        except Exception as e:
-            MessageManager.show_error(self.root, "Error", f"Error al cargar asistencias: {str(e)}")
+            """, (fecha,))
+            return c.fetchall()
         finally:
             conn.close()
+
+    def _mostrar_asistencias(self, filas):
+        """Vuelca las filas consultadas en la tabla"""
+        self._tarea_tabla = None
+        for i in self.tree.get_children(): 
+            self.tree.delete(i)
+        for row in filas:
+            self.tree.insert("", "end", values=row)
@@ -0,0 +1,227 @@
+"""
+Justificaciones de inasistencia: solicitud y cola de revisión
+"""
+
+import os
+import sys
+import subprocess
+import tkinter as tk
+from tkinter import Frame, Label, Entry, Button, StringVar, ttk, filedialog
+from datetime import datetime
+
+from core.justificaciones import ESTADOS, PENDIENTE, enviar, cola, resolver, verificar_evidencia
+from core.permissions import PermisosManager
+from core.auditoria import Auditoria
+from core.database_manager import DatabaseManager
+from core.tareas import ejecutar_en_segundo_plano
+from ui.message_manager import MessageManager
+from ui.selector_estudiante import SelectorEstudiante
+
+TODOS = "Todos"
+
+class GestionJustificaciones:
+    """Registro de justificaciones y aprobación/rechazo en bloque"""
+
+    def __init__(self, root, usuario: str = "", rol: str = ""):
+        self.root = root
+        self.usuario = usuario
+        self.puede_revisar = PermisosManager.tiene_permiso(rol, 'revisar_justificaciones')
+        self.root.title("Justificaciones")
+        self.root.geometry("1150x680")
+        self.root.configure(bg="#f9fafb")
+
+        self.ruta_evidencia = None
+        self.filas = {}
+
+        Label(self.root, text="📝 Justificaciones de Inasistencia", font=("Arial", 16, "bold"),
+              bg="#f9fafb", fg="#1e3a8a").pack(pady=8)
+        pestanas = ttk.Notebook(self.root)
+        pestanas.pack(fill=tk.BOTH, expand=True, padx=10, pady=6)
+        self._crear_solicitud(pestanas)
+        self._crear_cola(pestanas)
+        self.cargar_cola()
+
+    # ==================== SOLICITUD ====================
+
+    def _crear_solicitud(self, pestanas):
+        frm = Frame(pestanas, bg="white", padx=20, pady=20)
+        pestanas.add(frm, text="Nueva justificación")
+
+        Label(frm, text="Estudiante:*", bg="white").grid(row=0, column=0, sticky=tk.E, padx=6, pady=6)
+        self.selector_estudiante = SelectorEstudiante(frm, width=45, bg="white")
+        self.selector_estudiante.grid(row=0, column=1, columnspan=3, sticky=tk.W, padx=6, pady=6)
+
+        hoy = datetime.now().strftime("%Y-%m-%d")
+        Label(frm, text="Desde:*", bg="white").grid(row=1, column=0, sticky=tk.E, padx=6, pady=6)
+        self.desde_var = StringVar(value=hoy)
+        Entry(frm, textvariable=self.desde_var, width=12).grid(row=1, column=1, sticky=tk.W, padx=6, pady=6)
+        Label(frm, text="Hasta:", bg="white").grid(row=1, column=2, sticky=tk.E, padx=6, pady=6)
+        self.hasta_var = StringVar(value=hoy)
+        Entry(frm, textvariable=self.hasta_var, width=12).grid(row=1, column=3, sticky=tk.W, padx=6, pady=6)
+
+        Label(frm, text="Motivo:*", bg="white").grid(row=2, column=0, sticky=tk.NE, padx=6, pady=6)
+        self.txt_motivo = tk.Text(frm, width=60, height=5)
+        self.txt_motivo.grid(row=2, column=1, columnspan=3, sticky=tk.W, padx=6, pady=6)
+
+        Label(frm, text="Evidencia:", bg="white").grid(row=3, column=0, sticky=tk.E, padx=6, pady=6)
+        self.lbl_evidencia = Label(frm, text="Sin archivo", bg="white", fg="#64748b")
+        self.lbl_evidencia.grid(row=3, column=1, columnspan=2, sticky=tk.W, padx=6, pady=6)
+        Button(frm, text="📎 Adjuntar", bg="#64748b", fg="white",
+               command=self.elegir_evidencia).grid(row=3, column=3, sticky=tk.W, padx=6, pady=6)
+
+        Button(frm, text="📤 Enviar Justificación", bg="#2563eb", fg="white",
+               command=self.enviar).grid(row=4, column=1, sticky=tk.W, padx=6, pady=12)
+
+    def elegir_evidencia(self):
+        ruta = filedialog.askopenfilename(
+            parent=self.root, title="Evidencia",
+            filetypes=[("Documentos e imágenes", "*.pdf *.jpg *.jpeg *.png"), ("Todos", "*.*")]
+        )
+        if ruta:
+            self.ruta_evidencia = ruta
+            self.lbl_evidencia.config(text=os.path.basename(ruta))
+
+    def enviar(self):
+        id_estudiante = self.selector_estudiante.id_estudiante
+        if id_estudiante is None:
+            MessageManager.show_warning(self.root, "Atención", "Seleccione un estudiante de la lista.")
+            return
+        ejecutar_en_segundo_plano(
+            self.root, enviar, id_estudiante, self.desde_var.get().strip(), self.hasta_var.get().strip(),
+            self.txt_motivo.get("1.0", tk.END).strip(), self.ruta_evidencia,
+            al_terminar=self._enviada, al_error=self._error
+        )
+
+    def _enviada(self, id_justificacion):
+        MessageManager.show_info(self.root, "Éxito", f"Justificación #{id_justificacion} registrada.")
+        self.selector_estudiante.limpiar()
+        self.txt_motivo.delete("1.0", tk.END)
+        self.ruta_evidencia = None
+        self.lbl_evidencia.config(text="Sin archivo")
+        self.cargar_cola()
+
+    def _error(self, e):
+        titulo = "Datos inválidos" if isinstance(e, ValueError) else "Error"
+        MessageManager.show_error(self.root, titulo, str(e))
+
+    # ==================== COLA DE REVISIÓN ====================
+
+    def _crear_cola(self, pestanas):
+        marco = Frame(pestanas, bg="white")
+        pestanas.add(marco, text="Cola de revisión")
+
+        filtros = Frame(marco, bg="white")
+        filtros.pack(fill='x', padx=8, pady=6)
+        Label(filtros, text="Estado:", bg="white").pack(side=tk.LEFT)
+        self.cmb_estado = ttk.Combobox(filtros, values=[*ESTADOS, TODOS], width=11, state="readonly")
+        self.cmb_estado.set(PENDIENTE)
+        self.cmb_estado.pack(side=tk.LEFT, padx=4)
+        Label(filtros, text="Solicitadas desde:", bg="white").pack(side=tk.LEFT)
+        self.txt_desde = Entry(filtros, width=11)
+        self.txt_desde.pack(side=tk.LEFT, padx=4)
+        Label(filtros, text="hasta:", bg="white").pack(side=tk.LEFT)
+        self.txt_hasta = Entry(filtros, width=11)
+        self.txt_hasta.pack(side=tk.LEFT, padx=4)
+        Label(filtros, text="Sección:", bg="white").pack(side=tk.LEFT)
+        self.txt_seccion = Entry(filtros, width=6)
+        self.txt_seccion.pack(side=tk.LEFT, padx=4)
+        Label(filtros, text="Buscar:", bg="white").pack(side=tk.LEFT)
+        self.txt_buscar = Entry(filtros, width=18)
+        self.txt_buscar.pack(side=tk.LEFT, padx=4)
+        self.txt_buscar.bind("<Return>", lambda e: self.cargar_cola())
+        Button(filtros, text="🔍 Filtrar", bg="#2563eb", fg="white",
+               command=self.cargar_cola).pack(side=tk.LEFT, padx=6)
+
+        cols = ("id", "solicitud", "estudiante", "seccion", "desde", "hasta", "motivo", "evidencia", "estado", "revisor")
+        self.tree = ttk.Treeview(marco, columns=cols, show="headings", height=16, selectmode="extended")
+        headers = {"id": "ID", "solicitud": "Solicitada", "estudiante": "Estudiante", "seccion": "Sección",
+                   "desde": "Desde", "hasta": "Hasta", "motivo": "Motivo", "evidencia": "📎",
+                   "estado": "Estado", "revisor": "Revisó"}
+        widths = {"id": 50, "solicitud": 130, "estudiante": 200, "seccion": 60, "desde": 85, "hasta": 85,
+                  "motivo": 250, "evidencia": 35, "estado": 85, "revisor": 90}
+        for col in cols:
+            self.tree.heading(col, text=headers[col])
+            self.tree.column(col, width=widths[col])
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=4)
+        self.tree.bind("<Double-1>", lambda e: self.abrir_evidencia())
+
+        self.lbl_total = Label(marco, text="", bg="white", fg="#64748b")
+        self.lbl_total.pack(anchor='w', padx=8)
+
+        acciones = Frame(marco, bg="white")
+        acciones.pack(pady=6)
+        Label(acciones, text="Observación:", bg="white").pack(side=tk.LEFT)
+        self.txt_observacion = Entry(acciones, width=40)
+        self.txt_observacion.pack(side=tk.LEFT, padx=4)
+        estado_botones = tk.NORMAL if self.puede_revisar else tk.DISABLED
+        Button(acciones, text="✅ Aprobar Seleccionadas", bg="#16a34a", fg="white", state=estado_botones,
+               command=lambda: self.resolver(True)).pack(side=tk.LEFT, padx=4)
+        Button(acciones, text="❌ Rechazar Seleccionadas", bg="#dc2626", fg="white", state=estado_botones,
+               command=lambda: self.resolver(False)).pack(side=tk.LEFT, padx=4)
+        Button(acciones, text="📂 Ver Evidencia", bg="#64748b", fg="white",
+               command=self.abrir_evidencia).pack(side=tk.LEFT, padx=4)
+
+    def cargar_cola(self):
+        estado = self.cmb_estado.get()
+        filtros = dict(
+            estado=None if estado == TODOS else estado,
+            desde=self.txt_desde.get().strip() or None,
+            hasta=self.txt_hasta.get().strip() or None,
+            seccion=self.txt_seccion.get().strip() or None,
+            texto=self.txt_buscar.get().strip() or None,
+        )
+        ejecutar_en_segundo_plano(self.root, lambda: cola(**filtros),
+                                  al_terminar=self._mostrar_cola, al_error=self._error)
+
+    def _mostrar_cola(self, filas):
+        self.filas = {str(f['id']): f for f in filas}
+        self.tree.delete(*self.tree.get_children())
+        for f in filas:
+            self.tree.insert("", "end", iid=str(f['id']), values=(
+                f['id'], f['fecha_solicitud'], f['estudiante'], f['seccion'], f['desde'], f['hasta'],
+                (f['motivo'] or "").replace("\n", " "), "📎" if f['evidencia'] else "", f['estado'],
+                f['revisado_por'] or ""
+            ))
+        self.lbl_total.config(text=f"{len(filas)} justificaciones")
+
+    def resolver(self, aprobar: bool):
+        ids = [int(i) for i in self.tree.selection() if self.filas[i]['estado'] == PENDIENTE]
+        if not ids:
+            MessageManager.show_warning(self.root, "Atención", "Seleccione justificaciones pendientes.")
+            return
+        accion = "aprobar" if aprobar else "rechazar"
+        if not MessageManager.ask_yesno(self.root, "Confirmar", f"¿{accion.capitalize()} {len(ids)} justificaciones?"):
+            return
+        observacion = self.txt_observacion.get().strip()
+        ejecutar_en_segundo_plano(self.root, resolver, ids, aprobar, self.usuario, observacion,
+                                  al_terminar=lambda r: self._resueltas(r, ids, aprobar), al_error=self._error)
+
+    def _resueltas(self, resultado, ids, aprobar):
+        accion = "APROBAR_JUSTIFICACIONES" if aprobar else "RECHAZAR_JUSTIFICACIONES"
+        Auditoria(DatabaseManager()).registrar_evento(
+            self.usuario, accion, f"{resultado['resueltas']} justificaciones {ids[:20]}; "
+                                  f"{resultado['asistencias']} asistencias justificadas"
+        )
+        mensaje = f"{resultado['resueltas']} justificaciones procesadas."
+        if aprobar:
+            mensaje += (f"\n{resultado['asistencias']} registros de asistencia y "
+                        f"{resultado['periodos']} días por periodo pasaron a Justificado.")
+        MessageManager.show_info(self.root, "Éxito", mensaje)
+        self.txt_observacion.delete(0, tk.END)
+        self.cargar_cola()
+
+    def abrir_evidencia(self):
+        seleccion = self.tree.selection()
+        if not seleccion:
+            return
+        ruta = self.filas[seleccion[0]]['evidencia']
+        if not ruta:
+            MessageManager.show_info(self.root, "Información", "La justificación no tiene evidencia.")
+            return
+        if not verificar_evidencia(ruta):
+            MessageManager.show_error(self.root, "Error", "El archivo de evidencia no existe o fue modificado.")
+            return
+        if sys.platform.startswith("win"):
+            os.startfile(os.path.abspath(ruta))
+        else:
+            subprocess.Popen(["open" if sys.platform == "darwin" else "xdg-open", ruta])
@@ -2,23 +2,140 @@
 Módulo de Reportes de Asistencia
 """
 
+import os
 import tkinter as tk
-from tkinter import Toplevel, Frame, Label, Entry, Button, ttk
-import sqlite3
+from tkinter import Toplevel, Frame, Label, Entry, Button, BooleanVar, Checkbutton, ttk
 from datetime import datetime
 
-from config.database import DB
+from config import sedes
 from ui.message_manager import MessageManager
+from core.tareas import ejecutar_en_segundo_plano
+from core.hojas_asistencia import generar_hojas_mes, secciones_registradas, MESES
+from core.reportes import MotorReportes, FiltroReporte, COLUMNAS_DETALLE, COLUMNAS_AGRUPADO
+from core.consultas_sedes import agrupar_sedes
 
-class ReporteGeneral:
-    """Reporte General de Asistencia"""
+def _mostrar_resultado_exportacion(root, resultado):
+    """Muestra el mensaje devuelto por el exportador"""
+    success, message = resultado
+    if success:
+        MessageManager.show_info(root, "Éxito", message)
+    else:
+        MessageManager.show_error(root, "Error", message)
+
+class _ReportePaginado:
+    """Base de los reportes: tabla que se llena página por página"""
+    
+    TAMANO_PAGINA = 200
+    
+    def _crear_tabla(self):
+        """Crea la tabla de resultados y la barra de paginación"""
+        tabla_frame = Frame(self.root)
+        tabla_frame.pack(fill="both", expand=True, padx=10, pady=8)
+        
+        self.tree = ttk.Treeview(tabla_frame, show="headings")
+        scroll = ttk.Scrollbar(tabla_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        self.tree.pack(side=tk.LEFT, fill="both", expand=True)
+        scroll.pack(side=tk.RIGHT, fill="y")
+        self._configurar_columnas(COLUMNAS_DETALLE)
+        
+        paginacion = Frame(self.root)
+        paginacion.pack(fill=tk.X, padx=10)
+        self.lbl_total = Label(paginacion, text="", fg="#64748b")
+        self.lbl_total.pack(side=tk.LEFT)
+        self.btn_mas = Button(paginacion, text="⬇️ Cargar más", state=tk.DISABLED,
+                              command=self.cargar_mas)
+        self.btn_mas.pack(side=tk.RIGHT)
+        
+        self.motor = MotorReportes()
+        self.filtro = FiltroReporte()
+        self._cursor = None
+        self._tarea = None
+
+    def _configurar_columnas(self, columnas):
+        self.tree.configure(columns=columnas)
+        for col in columnas:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=120)
+
+    def _consultar(self, filtro: FiltroReporte):
+        """Inicia una consulta nueva desde la primera página"""
+        self.filtro = filtro
+        self._cursor = None
+        for i in self.tree.get_children():
+            self.tree.delete(i)
+        self._configurar_columnas(COLUMNAS_DETALLE)
+        ejecutar_en_segundo_plano(
+            self.root, self.motor.contar, filtro,
+            al_terminar=lambda total: self.lbl_total.config(text=f"{total} registros")
+        )
+        self.cargar_mas()
+
+    def cargar_mas(self):
+        """Trae la siguiente página del detalle"""
+        if self._tarea is not None:
+            self._tarea.cancelar()
+        self.btn_mas.config(state=tk.DISABLED)
+        self._tarea = ejecutar_en_segundo_plano(
+            self.root, self.motor.pagina, self.filtro, self._cursor, self.TAMANO_PAGINA,
+            al_terminar=self._agregar_pagina,
+            al_error=lambda e: MessageManager.show_error(self.root, "Error", f"Error al cargar datos: {str(e)}")
+        )
+
+    def _agregar_pagina(self, resultado):
+        filas, self._cursor = resultado
+        for row in filas:
+            self.tree.insert("", "end", values=row)
+        self.btn_mas.config(state=tk.NORMAL if self._cursor else tk.DISABLED)
+
+    def _exportar(self, nombre_archivo: str, formato: str = "csv"):
+        """Exporta todas las filas del filtro actual, no solo las visibles"""
+        try:
+            from utils.exporters import ExportadorAvanzado
+            
+            if formato == "html":
+                ejecutar_en_segundo_plano(
+                    self.root, self._exportar_html, self.motor, self.filtro, nombre_archivo,
+                    self.root.title(),
+                    al_terminar=lambda r: _mostrar_resultado_exportacion(self.root, r)
+                )
+                return
+            
+            exportar = ExportadorAvanzado.exportar_xlsx if formato == "xlsx" else ExportadorAvanzado.exportar_csv
+            ejecutar_en_segundo_plano(
+                self.root, exportar,
+                self.motor.filas(self.filtro),
+                nombre_archivo,
+                list(COLUMNAS_DETALLE),
+                al_terminar=lambda r: _mostrar_resultado_exportacion(self.root, r)
+            )
+                
+        except ImportError:
+            MessageManager.show_error(self.root, "Error", "Módulo de exportación no disponible")
+
+    @staticmethod
+    def _exportar_html(motor, filtro, nombre_archivo, titulo):
+        """Genera el HTML paginado con el resumen calculado en SQL (hilo de trabajo)"""
+        from utils.exporters import ExportadorAvanzado
+        
+        return ExportadorAvanzado.exportar_html(
+            motor.filas(filtro), nombre_archivo, titulo, list(COLUMNAS_DETALLE),
+            resumen=motor.resumen(filtro)
+        )
+
+class ReporteGeneral(_ReportePaginado):
+    """Reporte General de Asistencia con filtros y agrupamientos"""
+    
+    AGRUPAR = {"Detalle": None, "Por estudiante": "estudiante", "Por día": "dia", "Por sección": "seccion",
+               "Por sede": "sede"}
     
     def __init__(self, root):
         self.root = root
         self.root.title("Reporte General de Asistencia")
-        self.root.geometry("900x520")
+        self.root.geometry("1000x600")
         
         self._crear_interfaz()
+        self._cargar_opciones()
         self.cargar_datos()
 
     def _crear_interfaz(self):
@@ -26,81 +143,151 @@ class ReporteGeneral:
         Label(self.root, text="📊 Reporte General de Asistencia", 
               font=("Arial", 14, "bold")).pack(pady=12)
         
-        # Crear tabla
-        cols = ("id", "estudiante", "fecha", "hora_entrada", "hora_salida", "estado")
-        self.tree = ttk.Treeview(self.root, columns=cols, show="headings")
+        # Filtros
+        frm = Frame(self.root)
+        frm.pack(pady=4)
+        
+        Label(frm, text="Desde:").grid(row=0, column=0, padx=4, pady=4, sticky=tk.E)
+        self.txt_desde = Entry(frm, width=12)
+        self.txt_desde.grid(row=0, column=1, padx=4, pady=4)
+        self.txt_desde.insert(0, datetime.now().strftime("%Y-%m-01"))
+        
+        Label(frm, text="Hasta:").grid(row=0, column=2, padx=4, pady=4, sticky=tk.E)
+        self.txt_hasta = Entry(frm, width=12)
+        self.txt_hasta.grid(row=0, column=3, padx=4, pady=4)
+        self.txt_hasta.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        
+        Label(frm, text="Estudiante:").grid(row=0, column=4, padx=4, pady=4, sticky=tk.E)
+        self.txt_estudiante = Entry(frm, width=22)
+        self.txt_estudiante.grid(row=0, column=5, padx=4, pady=4)
+        
+        Label(frm, text="Sección:").grid(row=1, column=0, padx=4, pady=4, sticky=tk.E)
+        self.cmb_seccion = ttk.Combobox(frm, width=10, state="readonly")
+        self.cmb_seccion.grid(row=1, column=1, padx=4, pady=4)
         
-        # Configurar columnas
-        for col in cols:
-            self.tree.heading(col, text=col.capitalize())
-            self.tree.column(col, width=140)
+        Label(frm, text="Carrera:").grid(row=1, column=2, padx=4, pady=4, sticky=tk.E)
+        self.cmb_carrera = ttk.Combobox(frm, width=24, state="readonly")
+        self.cmb_carrera.grid(row=1, column=3, padx=4, pady=4)
         
-        self.tree.pack(fill="both", expand=True, padx=10, pady=8)
+        Label(frm, text="Estado:").grid(row=1, column=4, padx=4, pady=4, sticky=tk.E)
+        self.cmb_estado = ttk.Combobox(frm, width=14, state="readonly")
+        self.cmb_estado.grid(row=1, column=5, padx=4, pady=4)
+        
+        Label(frm, text="Agrupar:").grid(row=0, column=6, padx=4, pady=4, sticky=tk.E)
+        self.cmb_agrupar = ttk.Combobox(frm, width=14, state="readonly", values=list(self.AGRUPAR))
+        self.cmb_agrupar.grid(row=0, column=7, padx=4, pady=4)
+        self.cmb_agrupar.set("Detalle")
+        
+        # Los agrupamientos pueden combinar todas las sedes (consulta en paralelo)
+        self.todas_sedes_var = BooleanVar(value=False)
+        if len(sedes.sedes()) > 1:
+            Checkbutton(frm, text="Todas las sedes", variable=self.todas_sedes_var).grid(
+                row=1, column=6, columnspan=2, padx=4, pady=4, sticky=tk.W)
+        
+        self._crear_tabla()
         
         # Botones de acción
         btn_frame = Frame(self.root)
         btn_frame.pack(pady=10)
         
-        Button(btn_frame, text="🔄 Actualizar", bg="#2563eb", fg="white",
+        Button(btn_frame, text="🔍 Consultar", bg="#2563eb", fg="white",
                command=self.cargar_datos).pack(side=tk.LEFT, padx=5)
-        Button(btn_frame, text="📤 Exportar", bg="#16a34a", fg="white",
+        Button(btn_frame, text="📤 Exportar CSV", bg="#16a34a", fg="white",
                command=self.exportar_reporte).pack(side=tk.LEFT, padx=5)
+        Button(btn_frame, text="📗 Exportar Excel", bg="#15803d", fg="white",
+               command=lambda: self.exportar_reporte("xlsx")).pack(side=tk.LEFT, padx=5)
+        Button(btn_frame, text="🌐 Exportar HTML", bg="#0f766e", fg="white",
+               command=lambda: self.exportar_reporte("html")).pack(side=tk.LEFT, padx=5)
+
+    def _cargar_opciones(self):
+        """Llena los combos de filtros"""
+        def al_terminar(opciones):
+            self.cmb_seccion['values'] = [""] + opciones['secciones']
+            self.cmb_carrera['values'] = [""] + opciones['carreras']
+            self.cmb_estado['values'] = [""] + opciones['estados']
+        
+        ejecutar_en_segundo_plano(self.root, self.motor.opciones_filtro, al_terminar=al_terminar)
+
+    def _leer_filtro(self) -> FiltroReporte:
+        return FiltroReporte(
+            desde=self.txt_desde.get().strip(),
+            hasta=self.txt_hasta.get().strip(),
+            seccion=self.cmb_seccion.get(),
+            carrera=self.cmb_carrera.get(),
+            estado=self.cmb_estado.get(),
+            estudiante=self.txt_estudiante.get()
+        )
 
     def cargar_datos(self):
-        """Carga los datos en la tabla"""
+        """Carga los datos en la tabla según filtros y agrupamiento"""
+        filtro = self._leer_filtro()
+        agrupar = self.AGRUPAR.get(self.cmb_agrupar.get())
+        todas = self.todas_sedes_var.get()
+        if agrupar is None:
+            if todas:
+                MessageManager.show_warning(self.root, "Reporte",
+                                            "El detalle se consulta en la sede actual; elija un agrupamiento "
+                                            "para combinar todas las sedes.")
+                return
+            self._consultar(filtro)
+            return
+        
+        if todas or agrupar == "sede":
+            claves = None if todas else [sedes.sede_activa().clave]
+            consulta, argumentos = agrupar_sedes, (filtro, agrupar, claves)
+            al_terminar = lambda resultado: self._mostrar_agrupado(*resultado)
+        else:
+            consulta, argumentos = self.motor.agrupar, (filtro, agrupar)
+            al_terminar = self._mostrar_agrupado
+        
+        self.filtro = filtro
+        self.btn_mas.config(state=tk.DISABLED)
+        if self._tarea is not None:
+            self._tarea.cancelar()
+        self._tarea = ejecutar_en_segundo_plano(
+            self.root, consulta, *argumentos,
+            al_terminar=al_terminar,
+            al_error=lambda e: MessageManager.show_error(self.root, "Error", f"Error al cargar datos: {str(e)}")
+        )
+
+    def _mostrar_agrupado(self, filas, errores=None):
+        """Vuelca los totales agrupados (sin la clave interna) y avisa de las sedes que fallaron"""
         for i in self.tree.get_children():
             self.tree.delete(i)
-            
-        conn = sqlite3.connect(DB)
-        c = conn.cursor()
-        try:
-            c.execute("""
-                SELECT a.id_asistencia, 
-                       e.nombres || ' ' || e.apellidos as estudiante, 
-                       a.fecha, 
-                       a.hora_entrada, 
-                       IFNULL(a.hora_salida, '-') as hora_salida, 
-                       a.estado
-                FROM asistencia a
-                LEFT JOIN estudiantes e ON a.id_estudiante = e.id
-                ORDER BY a.id_asistencia DESC
-            """)
-            
-            for row in c.fetchall():
-                self.tree.insert("", "end", values=row)
-                
-        except Exception as e:
-            MessageManager.show_error(self.root, "Error", f"Error al cargar datos: {str(e)}")
-        finally:
-            conn.close()
+        self._configurar_columnas(COLUMNAS_AGRUPADO)
+        for row in filas:
+            self.tree.insert("", "end", values=row[1:])
+        if not errores:
+            self.lbl_total.config(text=f"{len(filas)} grupos")
+            return
+        fallidas = [sedes.obtener_sede(clave).nombre for clave in errores]
+        self.lbl_total.config(text=f"{len(filas)} grupos · ⚠️ sin datos de: {', '.join(fallidas)}")
+        MessageManager.show_warning(
+            self.root, "Reporte incompleto",
+            "No se pudo consultar estas sedes; el reporte no incluye sus datos:\n\n" +
+            "\n".join(f"• {sedes.obtener_sede(clave).nombre}: {error}" for clave, error in errores.items())
+        )
 
-    def exportar_reporte(self):
-        """Exporta el reporte a CSV"""
-        try:
-            from utils.exporters import ExportadorAvanzado
-            
-            # Obtener datos de la tabla
-            datos = []
-            for item in self.tree.get_children():
-                datos.append(self.tree.item(item)['values'])
-            
-            # Exportar
-            success, message = ExportadorAvanzado.exportar_csv(
-                datos, 
-                "reporte_general_asistencia",
-                ["ID", "Estudiante", "Fecha", "Hora Entrada", "Hora Salida", "Estado"]
-            )
-            
-            if success:
-                MessageManager.show_info(self.root, "Éxito", message)
-            else:
-                MessageManager.show_error(self.root, "Error", message)
-                
-        except ImportError:
-            MessageManager.show_error(self.root, "Error", "Módulo de exportación no disponible")
+    def exportar_reporte(self, formato: str = "csv"):
+        """Exporta el reporte a CSV, Excel o HTML"""
+        if self.AGRUPAR.get(self.cmb_agrupar.get()) is None:
+            self._exportar("reporte_general_asistencia", formato)
+            return
+        
+        from utils.exporters import ExportadorAvanzado
+        exportar = {
+            "xlsx": ExportadorAvanzado.exportar_xlsx,
+            "html": ExportadorAvanzado.exportar_html,
+        }.get(formato, ExportadorAvanzado.exportar_csv)
+        datos = [self.tree.item(item)['values'] for item in self.tree.get_children()]
+        ejecutar_en_segundo_plano(
+            self.root, exportar,
+            datos, "reporte_general_agrupado", encabezados=list(COLUMNAS_AGRUPADO),
+            al_terminar=lambda r: _mostrar_resultado_exportacion(self.root, r)
+        )
 
-class ReportePorFecha:
-    """Reporte de Asistencia por Fecha"""
+class ReportePorFecha(_ReportePaginado):
+    """Reporte de Asistencia por Fecha o rango de fechas"""
     
     def __init__(self, root):
         self.root = root
@@ -117,99 +304,124 @@ class ReportePorFecha:
         frm = Frame(self.root)
         frm.pack(pady=8)
         
-        Label(frm, text="📅 Fecha (YYYY-MM-DD):").grid(row=0, column=0, padx=6, pady=6)
-        self.txt_fecha = Entry(frm)
+        Label(frm, text="📅 Desde (YYYY-MM-DD):").grid(row=0, column=0, padx=6, pady=6)
+        self.txt_fecha = Entry(frm, width=12)
         self.txt_fecha.grid(row=0, column=1, padx=6, pady=6)
         self.txt_fecha.insert(0, datetime.now().strftime("%Y-%m-%d"))
         
+        Label(frm, text="Hasta (opcional):").grid(row=0, column=2, padx=6, pady=6)
+        self.txt_hasta = Entry(frm, width=12)
+        self.txt_hasta.grid(row=0, column=3, padx=6, pady=6)
+        
         Button(frm, text="🔍 Buscar", command=self.buscar, 
-               bg="#2563eb", fg="white").grid(row=0, column=2, padx=6)
+               bg="#2563eb", fg="white").grid(row=0, column=4, padx=6)
         
         Button(frm, text="📅 Hoy", command=self.fecha_hoy,
-               bg="#16a34a", fg="white").grid(row=0, column=3, padx=6)
+               bg="#16a34a", fg="white").grid(row=0, column=5, padx=6)
 
-        # Crear tabla
-        cols = ("id", "estudiante", "fecha", "entrada", "salida", "estado")
-        self.tree = ttk.Treeview(self.root, columns=cols, show="headings")
-        
-        for col in cols:
-            self.tree.heading(col, text=col.capitalize())
-            self.tree.column(col, width=140)
-        
-        self.tree.pack(fill="both", expand=True, padx=10, pady=8)
+        self._crear_tabla()
         
         # Botones adicionales
         btn_frame = Frame(self.root)
         btn_frame.pack(pady=10)
         
-        Button(btn_frame, text="📤 Exportar", bg="#16a34a", fg="white",
+        Button(btn_frame, text="📤 Exportar CSV", bg="#16a34a", fg="white",
                command=self.exportar_reporte).pack(side=tk.LEFT, padx=5)
+        Button(btn_frame, text="📗 Exportar Excel", bg="#15803d", fg="white",
+               command=lambda: self.exportar_reporte("xlsx")).pack(side=tk.LEFT, padx=5)
+        Button(btn_frame, text="🌐 Exportar HTML", bg="#0f766e", fg="white",
+               command=lambda: self.exportar_reporte("html")).pack(side=tk.LEFT, padx=5)
 
     def buscar(self):
-        """Busca asistencias por fecha"""
+        """Busca asistencias por fecha o rango de fechas"""
         fecha = self.txt_fecha.get().strip()
+        hasta = self.txt_hasta.get().strip() or fecha
         
         if not fecha:
             MessageManager.show_warning(self.root, "Atención", "Ingrese una fecha")
             return
-            
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-            
-        conn = sqlite3.connect(DB)
-        c = conn.cursor()
-        try:
-            c.execute("""
-                SELECT a.id_asistencia, 
-                       e.nombres || ' ' || e.apellidos as estudiante, 
-                       a.fecha, 
-                       a.hora_entrada, 
-                       IFNULL(a.hora_salida,'-') as hora_salida, 
-                       a.estado
-                FROM asistencia a
-                LEFT JOIN estudiantes e ON a.id_estudiante = e.id
-                WHERE a.fecha=?
-                ORDER BY a.id_asistencia DESC
-            """, (fecha,))
-            
-            for row in c.fetchall():
-                self.tree.insert("", "end", values=row)
-                
-            # Mostrar conteo
-            total = len(self.tree.get_children())
-            self.root.title(f"Reporte por Fecha - {fecha} ({total} registros)")
-            
-        except Exception as e:
-            MessageManager.show_error(self.root, "Error", f"Error al buscar: {str(e)}")
-        finally:
-            conn.close()
+        
+        self.root.title(f"Reporte por Fecha - {fecha}" + (f" a {hasta}" if hasta != fecha else ""))
+        self._consultar(FiltroReporte(desde=fecha, hasta=hasta))
 
     def fecha_hoy(self):
         """Establece la fecha actual"""
         self.txt_fecha.delete(0, tk.END)
         self.txt_fecha.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        self.txt_hasta.delete(0, tk.END)
         self.buscar()
 
-    def exportar_reporte(self):
-        """Exporta el reporte a CSV"""
+    def exportar_reporte(self, formato: str = "csv"):
+        """Exporta el reporte a CSV, Excel o HTML"""
+        fecha = self.txt_fecha.get().strip()
+        hasta = self.txt_hasta.get().strip()
+        self._exportar(f"reporte_asistencia_{fecha}" + (f"_{hasta}" if hasta else ""), formato)
+
+class HojasAsistenciaPDF:
+    """Genera las hojas de asistencia mensuales en PDF por sección"""
+    
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Hojas de Asistencia (PDF)")
+        self.root.geometry("460x260")
+        
+        self._crear_interfaz()
+        ejecutar_en_segundo_plano(
+            self.root, secciones_registradas,
+            al_terminar=lambda secciones: self.cmb_seccion.configure(values=["Todas"] + secciones)
+        )
+
+    def _crear_interfaz(self):
+        Label(self.root, text="🖨️ Hojas de Asistencia Mensuales", 
+              font=("Arial", 14, "bold")).pack(pady=12)
+        
+        frm = Frame(self.root)
+        frm.pack(pady=6)
+        hoy = datetime.now()
+        
+        Label(frm, text="Mes:").grid(row=0, column=0, padx=6, pady=6, sticky=tk.E)
+        self.cmb_mes = ttk.Combobox(frm, values=list(MESES), width=14, state="readonly")
+        self.cmb_mes.grid(row=0, column=1, padx=6, pady=6)
+        self.cmb_mes.current(hoy.month - 1)
+        
+        Label(frm, text="Año:").grid(row=0, column=2, padx=6, pady=6, sticky=tk.E)
+        self.txt_anio = Entry(frm, width=8)
+        self.txt_anio.grid(row=0, column=3, padx=6, pady=6)
+        self.txt_anio.insert(0, str(hoy.year))
+        
+        Label(frm, text="Sección:").grid(row=1, column=0, padx=6, pady=6, sticky=tk.E)
+        self.cmb_seccion = ttk.Combobox(frm, values=["Todas"], width=14, state="readonly")
+        self.cmb_seccion.grid(row=1, column=1, padx=6, pady=6)
+        self.cmb_seccion.set("Todas")
+        
+        Button(self.root, text="🖨️ Generar PDF", bg="#2563eb", fg="white",
+               command=self.generar).pack(pady=12)
+        self.lbl_estado = Label(self.root, text="", fg="#64748b")
+        self.lbl_estado.pack()
+
+    def generar(self):
+        """Genera los PDF en segundo plano (un proceso por sección)"""
         try:
-            from utils.exporters import ExportadorAvanzado
-            
-            fecha = self.txt_fecha.get().strip()
-            datos = []
-            for item in self.tree.get_children():
-                datos.append(self.tree.item(item)['values'])
-            
-            success, message = ExportadorAvanzado.exportar_csv(
-                datos, 
-                f"reporte_asistencia_{fecha}",
-                ["ID", "Estudiante", "Fecha", "Hora Entrada", "Hora Salida", "Estado"]
-            )
-            
-            if success:
-                MessageManager.show_info(self.root, "Éxito", message)
-            else:
-                MessageManager.show_error(self.root, "Error", message)
-                
-        except ImportError:
-            MessageManager.show_error(self.root, "Error", "Módulo de exportación no disponible")
+            anio = int(self.txt_anio.get().strip())
+        except ValueError:
+            MessageManager.show_warning(self.root, "Atención", "Ingrese un año válido")
+            return
+        mes = self.cmb_mes.current() + 1
+        seccion = self.cmb_seccion.get()
+        secciones = None if seccion in ("", "Todas") else [seccion]
+        
+        self.lbl_estado.config(text="Generando hojas...")
+        ejecutar_en_segundo_plano(
+            self.root, generar_hojas_mes, anio, mes, secciones,
+            al_terminar=self._mostrar_generadas,
+            al_error=lambda e: MessageManager.show_error(self.root, "Error", f"❌ Error generando PDF: {str(e)}")
+        )
+
+    def _mostrar_generadas(self, resultados):
+        if not resultados:
+            self.lbl_estado.config(text="")
+            MessageManager.show_warning(self.root, "Atención", "No hay secciones con estudiantes registrados")
+            return
+        carpeta = os.path.dirname(resultados[0][1])
+        self.lbl_estado.config(text=f"✅ {len(resultados)} hojas generadas")
+        MessageManager.show_info(self.root, "Éxito", f"✅ {len(resultados)} hojas generadas en:\n{carpeta}")
@@ -6,13 +6,11 @@ import tkinter as tk
 from tkinter import Toplevel, Frame, Label, Entry, Button, ttk, END
 import sqlite3
 
-from config.database import DB
+from config.database import conectar, cedula_normalizada
 from ui.theme_manager import FondoManager
 from ui.message_manager import MessageManager
-from utils.validators import (
-    validar_cedula, validar_solo_texto, validar_telefono, validar_correo,
-    mostrar_error_cedula, mostrar_error_texto, mostrar_error_telefono, mostrar_error_correo
-)
+from ui.validacion_formulario import ValidadorFormulario
+from utils.validators import ESQUEMA_DOCENTE, mostrar_error_campo
 
 class GestionDocentes:
     def __init__(self, root):
@@ -129,12 +127,15 @@ class GestionDocentes:
         self.txt_email.bind('<Return>', lambda event: self.txt_telefono.focus_set())
         self.txt_telefono.bind('<Return>', lambda event: self.agregar_docente())
 
-        # Validaciones en tiempo real
-        self.txt_cedula.bind("<FocusOut>", self.validar_cedula_tiempo_real)
-        self.txt_nombres.bind("<FocusOut>", self.validar_nombres_tiempo_real)
-        self.txt_apellido.bind("<FocusOut>", self.validar_apellido_tiempo_real)
-        self.txt_email.bind("<FocusOut>", self.validar_correo_tiempo_real)
-        self.txt_telefono.bind("<FocusOut>", self.validar_telefono_tiempo_real)
+        # Validaciones en tiempo real (al dejar de escribir) y cédula duplicada en segundo plano;
+        # al editar, la cédula propia del docente no cuenta como duplicada
+        self._id_editando = None
+        entradas = self._entradas()
+        self.validador = ValidadorFormulario(
+            ESQUEMA_DOCENTE,
+            {campo: entradas[campo] for campo in ("cedula", "nombres", "apellido", "email", "telefono")},
+            verificar_unico={"cedula": self._cedula_registrada},
+        )
 
     def _crear_botones_accion(self, parent):
         """Crea los botones de acción"""
@@ -147,15 +148,18 @@ class GestionDocentes:
         Button(acciones, text="➕ Agregar Docente", bg="#2563eb", fg="white", 
                font=("Arial", 11, "bold"), padx=15, pady=8, 
                command=self.agregar_docente).grid(row=0, column=0, padx=10)
+        Button(acciones, text="✏️ Actualizar", bg="#0891b2", fg="white", 
+               font=("Arial", 11), padx=15, pady=8, 
+               command=self.actualizar_docente).grid(row=0, column=1, padx=10)
         Button(acciones, text="🔄 Actualizar Lista", bg="#16a34a", fg="white", 
                font=("Arial", 11), padx=15, pady=8, 
-               command=self.llenar_docentes).grid(row=0, column=1, padx=10)
+               command=self.llenar_docentes).grid(row=0, column=2, padx=10)
         Button(acciones, text="❌ Desactivar", bg="#dc2626", fg="white", 
                font=("Arial", 11), padx=15, pady=8, 
-               command=self.desactivar_docente).grid(row=0, column=2, padx=10)
+               command=self.desactivar_docente).grid(row=0, column=3, padx=10)
         Button(acciones, text="🧹 Limpiar Campos", bg="#f59e0b", fg="white", 
                font=("Arial", 11), padx=15, pady=8, 
-               command=self.limpiar_campos).grid(row=0, column=3, padx=10)
+               command=self.limpiar_campos).grid(row=0, column=4, padx=10)
 
     def _crear_tabla_docentes(self, parent):
         """Crea la tabla de docentes"""
@@ -187,6 +191,7 @@ class GestionDocentes:
         
         self.tree.pack(fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.tree.yview)
+        self.tree.bind("<<TreeviewSelect>>", self.seleccionar_docente)
 
     def _crear_leyenda(self, parent):
         """Crea la leyenda de campos obligatorios"""
@@ -206,56 +211,81 @@ class GestionDocentes:
         email = self.txt_email.get().strip()
         tel = self.txt_telefono.get().strip()
         
-        # Validaciones obligatorias
-        if not (ced and nom and ape and esp):
-            MessageManager.show_warning(self.root, "Atención", "Complete los campos obligatorios (*).")
+        # Validaciones (reglas en ESQUEMA_DOCENTE)
+        errores = ESQUEMA_DOCENTE.validar({
+            "cedula": ced, "nombres": nom, "apellido": ape,
+            "especialidad": esp, "email": email, "telefono": tel,
+        })
+        if errores:
+            campo, mensaje = errores[0]
+            mostrar_error_campo(ESQUEMA_DOCENTE, campo, mensaje, parent=self.root)
+            self._entradas()[campo].focus_set()
             return
         
-        # Validación de cédula
-        if not validar_cedula(ced):
-            mostrar_error_cedula()
-            self.txt_cedula.focus_set()
+        conn = conectar()
+        c = conn.cursor()
+        try:
+            c.execute("""
+                INSERT INTO docentes (cedula, nombres, apellido, especialidad, email, telefono, cedula_normalizada) 
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (ced, nom, ape, esp, email, tel, cedula_normalizada(ced)))
+            conn.commit()
+            MessageManager.show_info(self.root, "Éxito", "Docente agregado correctamente.")
+            self.llenar_docentes()
+            self.limpiar_campos()
+        except sqlite3.IntegrityError:
+            MessageManager.show_error(self.root, "Error", "La cédula ya existe en el sistema.")
+        except Exception as e:
+            MessageManager.show_error(self.root, "Error", f"Error al agregar docente: {str(e)}")
+        finally:
+            conn.close()
+
+    def seleccionar_docente(self, event):
+        """Carga el docente seleccionado en el formulario para editarlo"""
+        selection = self.tree.selection()
+        if not selection:
             return
-        
-        # Validación de nombres (solo texto)
-        if not validar_solo_texto(nom):
-            mostrar_error_texto("nombres")
-            self.txt_nombres.focus_set()
+        values = self.tree.item(selection[0])['values']
+        if not values:
             return
-        
-        # Validación de apellidos (solo texto)
-        if not validar_solo_texto(ape):
-            mostrar_error_texto("apellidos")
-            self.txt_apellido.focus_set()
+        self.limpiar_campos()
+        self._id_editando = values[0]
+        for entrada, valor in zip((self.txt_cedula, self.txt_nombres, self.txt_apellido,
+                                   self.txt_especialidad, self.txt_email, self.txt_telefono), values[1:7]):
+            entrada.insert(0, str(valor) if valor else "")
+
+    def actualizar_docente(self):
+        """Guarda los cambios del docente cargado en el formulario"""
+        if self._id_editando is None:
+            MessageManager.show_warning(self.root, "Atención", "Seleccione un docente para actualizar.")
             return
-        
-        # Validación de correo
-        if email and not validar_correo(email):
-            mostrar_error_correo()
-            self.txt_email.focus_set()
+        datos = {campo: entrada.get().strip() for campo, entrada in self._entradas().items()}
+        errores = ESQUEMA_DOCENTE.validar(datos)
+        if errores:
+            campo, mensaje = errores[0]
+            mostrar_error_campo(ESQUEMA_DOCENTE, campo, mensaje, parent=self.root)
+            self._entradas()[campo].focus_set()
             return
-        
-        # Validación de teléfono
-        if tel and not validar_telefono(tel):
-            mostrar_error_telefono()
-            self.txt_telefono.focus_set()
+        if self._cedula_registrada(datos["cedula"]):
+            MessageManager.show_error(self.root, "Error", "La cédula ya existe en el sistema.")
             return
-        
-        conn = sqlite3.connect(DB)
-        c = conn.cursor()
+
+        conn = conectar()
         try:
-            c.execute("""
-                INSERT INTO docentes (cedula, nombres, apellido, especialidad, email, telefono) 
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (ced, nom, ape, esp, email, tel))
+            conn.execute("""
+                UPDATE docentes SET cedula=?, nombres=?, apellido=?, especialidad=?, email=?, telefono=?,
+                                    cedula_normalizada=?
+                WHERE id_docente=?
+            """, (datos["cedula"], datos["nombres"], datos["apellido"], datos["especialidad"],
+                  datos["email"], datos["telefono"], cedula_normalizada(datos["cedula"]), self._id_editando))
             conn.commit()
-            MessageManager.show_info(self.root, "Éxito", "Docente agregado correctamente.")
+            MessageManager.show_info(self.root, "Éxito", "Docente actualizado correctamente.")
             self.llenar_docentes()
             self.limpiar_campos()
         except sqlite3.IntegrityError:
             MessageManager.show_error(self.root, "Error", "La cédula ya existe en el sistema.")
         except Exception as e:
-            MessageManager.show_error(self.root, "Error", f"Error al agregar docente: {str(e)}")
+            MessageManager.show_error(self.root, "Error", f"Error al actualizar docente: {str(e)}")
         finally:
             conn.close()
 
@@ -263,7 +293,7 @@ class GestionDocentes:
         """Llena la tabla con datos de docentes"""
         for i in self.tree.get_children(): 
             self.tree.delete(i)
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("""
@@ -297,7 +327,7 @@ class GestionDocentes:
         if not respuesta:
             return
             
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("UPDATE docentes SET estado='INACTIVO' WHERE id_docente=?", (id_doc,))
@@ -315,56 +345,25 @@ class GestionDocentes:
                  self.txt_especialidad, self.txt_email, self.txt_telefono]
         for campo in campos:
             campo.delete(0, END)
-            campo.config(bg="white")
+        self._id_editando = None
+        self.validador.reiniciar()
 
     # ==================== VALIDACIONES EN TIEMPO REAL ====================
 
-    def validar_cedula_tiempo_real(self, event=None):
-        cedula = self.txt_cedula.get().strip()
-        if cedula:
-            if validar_cedula(cedula):
-                self.txt_cedula.config(bg="#f0fff4")
-            else:
-                self.txt_cedula.config(bg="#fff0f0")
-        else:
-            self.txt_cedula.config(bg="white")
-
-    def validar_nombres_tiempo_real(self, event=None):
-        nombres = self.txt_nombres.get().strip()
-        if nombres:
-            if validar_solo_texto(nombres):
-                self.txt_nombres.config(bg="#f0fff4")
-            else:
-                self.txt_nombres.config(bg="#fff0f0")
-        else:
-            self.txt_nombres.config(bg="white")
-
-    def validar_apellido_tiempo_real(self, event=None):
-        apellido = self.txt_apellido.get().strip()
-        if apellido:
-            if validar_solo_texto(apellido):
-                self.txt_apellido.config(bg="#f0fff4")
-            else:
-                self.txt_apellido.config(bg="#fff0f0")
-        else:
-            self.txt_apellido.config(bg="white")
+    def _entradas(self) -> dict:
+        """Widgets del formulario por nombre de campo del esquema"""
+        return {
+            "cedula": self.txt_cedula, "nombres": self.txt_nombres, "apellido": self.txt_apellido,
+            "especialidad": self.txt_especialidad, "email": self.txt_email, "telefono": self.txt_telefono,
+        }
 
-    def validar_correo_tiempo_real(self, event=None):
-        email = self.txt_email.get().strip()
-        if email:
-            if validar_correo(email):
-                self.txt_email.config(bg="#f0fff4")
-            else:
-                self.txt_email.config(bg="#fff0f0")
-        else:
-            self.txt_email.config(bg="white")
-
-    def validar_telefono_tiempo_real(self, event=None):
-        telefono = self.txt_telefono.get().strip()
-        if telefono:
-            if validar_telefono(telefono):
-                self.txt_telefono.config(bg="#f0fff4")
-            else:
-                self.txt_telefono.config(bg="#fff0f0")
-        else:
-            self.txt_telefono.config(bg="white")
+    def _cedula_registrada(self, cedula: str) -> bool:
+        """Corre en un hilo de trabajo; excluye al docente que se está editando"""
+        conn = conectar()
+        try:
+            return conn.execute(
+                "SELECT 1 FROM docentes WHERE cedula_normalizada = ? AND id_docente IS NOT ? LIMIT 1",
+                (cedula_normalizada(cedula), self._id_editando)
+            ).fetchone() is not None
+        finally:
+            conn.close()
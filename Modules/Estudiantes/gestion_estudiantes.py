@@ -3,16 +3,27 @@ Gestión de Estudiantes del Sistema
 """
 
 import tkinter as tk
-from tkinter import Toplevel, Frame, Label, Entry, Button, ttk, END
+from tkinter import Toplevel, Frame, Label, Entry, Button, ttk, END, filedialog
 import sqlite3
 
-from config.database import DB
+from config.database import conectar, cedula_normalizada
 from ui.theme_manager import FondoManager
 from ui.message_manager import MessageManager
-from utils.validators import (
-    validar_cedula, validar_solo_texto, validar_telefono,
-    mostrar_error_cedula, mostrar_error_texto, mostrar_error_telefono
-)
+from core.tareas import ejecutar_en_segundo_plano
+from core.indice_estudiantes import IndiceEstudiantes
+from core import eventos
+from core.importacion_estudiantes import ImportadorEstudiantes
+from ui.validacion_formulario import ValidadorFormulario, INVALIDO
+from utils.validators import ESQUEMA_ESTUDIANTE, mostrar_error_campo
+
+# Texto de ayuda junto a cada campo validado (se reemplaza por el error mientras sea inválido)
+AYUDAS = {
+    "cedula": "Ejemplo: 001-080888-8888A",
+    "nombres": "Solo letras y espacios",
+    "apellidos": "Solo letras y espacios",
+    "telefono": "Ejemplo: 8888-8888",
+    "acudiente_correo": "Recibe los avisos de inasistencia",
+}
 
 class GestionEstudiantes:
     def __init__(self, root):
@@ -79,22 +90,25 @@ class GestionEstudiantes:
 
     def _crear_campos_formulario(self, form):
         """Crea los campos del formulario"""
+        self._ayudas = {}
         # Fila 1 - Cédula y Nombres
         Label(form, text="Cédula:*", bg="#f9fafb", fg="red", 
               font=("Arial", 10, "bold")).grid(row=0, column=0, padx=12, pady=10, sticky=tk.E)
         self.txt_cedula = Entry(form, width=22, font=("Arial", 10))
         self.txt_cedula.grid(row=0, column=1, padx=12, pady=10, sticky=tk.W)
         
-        Label(form, text="Ejemplo: 001-080888-8888A", font=("Arial", 9), 
-              fg="gray", bg="#f9fafb", wraplength=200).grid(row=0, column=2, sticky=tk.W, padx=5)
+        self._ayudas["cedula"] = Label(form, text=AYUDAS["cedula"], font=("Arial", 9), 
+                                       fg="gray", bg="#f9fafb", wraplength=200)
+        self._ayudas["cedula"].grid(row=0, column=2, sticky=tk.W, padx=5)
         
         Label(form, text="Nombres:*", bg="#f9fafb", fg="red", 
               font=("Arial", 10, "bold")).grid(row=0, column=3, padx=12, pady=10, sticky=tk.E)
         self.txt_nombres = Entry(form, width=25, font=("Arial", 10))
         self.txt_nombres.grid(row=0, column=4, padx=12, pady=10, sticky=tk.W)
         
-        Label(form, text="Solo letras y espacios", font=("Arial", 9), 
-              fg="gray", bg="#f9fafb").grid(row=0, column=5, sticky=tk.W, padx=5)
+        self._ayudas["nombres"] = Label(form, text=AYUDAS["nombres"], font=("Arial", 9), 
+                                        fg="gray", bg="#f9fafb")
+        self._ayudas["nombres"].grid(row=0, column=5, sticky=tk.W, padx=5)
 
         # Fila 2 - Apellidos y Carrera
         Label(form, text="Apellidos:*", bg="#f9fafb", fg="red", 
@@ -102,8 +116,9 @@ class GestionEstudiantes:
         self.txt_apellidos = Entry(form, width=22, font=("Arial", 10))
         self.txt_apellidos.grid(row=1, column=1, padx=12, pady=10, sticky=tk.W)
         
-        Label(form, text="Solo letras y espacios", font=("Arial", 9), 
-              fg="gray", bg="#f9fafb").grid(row=1, column=2, sticky=tk.W, padx=5)
+        self._ayudas["apellidos"] = Label(form, text=AYUDAS["apellidos"], font=("Arial", 9), 
+                                          fg="gray", bg="#f9fafb")
+        self._ayudas["apellidos"].grid(row=1, column=2, sticky=tk.W, padx=5)
         
         Label(form, text="Carrera Técnica:*", bg="#f9fafb", fg="red", 
               font=("Arial", 10, "bold")).grid(row=1, column=3, padx=12, pady=10, sticky=tk.E)
@@ -133,8 +148,9 @@ class GestionEstudiantes:
         self.txt_telefono = Entry(form, width=22, font=("Arial", 10))
         self.txt_telefono.grid(row=3, column=1, padx=12, pady=10, sticky=tk.W)
         
-        Label(form, text="Ejemplo: 8888-8888", font=("Arial", 9), 
-              fg="gray", bg="#f9fafb").grid(row=3, column=2, sticky=tk.W, padx=5)
+        self._ayudas["telefono"] = Label(form, text=AYUDAS["telefono"], font=("Arial", 9), 
+                                         fg="gray", bg="#f9fafb")
+        self._ayudas["telefono"].grid(row=3, column=2, sticky=tk.W, padx=5)
         
         Label(form, text="Dirección:", bg="#f9fafb", font=("Arial", 10, "bold")).grid(row=3, column=3, padx=12, pady=10, sticky=tk.E)
         self.txt_direccion = Entry(form, width=45, font=("Arial", 10))
@@ -143,6 +159,23 @@ class GestionEstudiantes:
         Label(form, text="Ejemplo: Managua, Barrio X", font=("Arial", 9), 
               fg="gray", bg="#f9fafb").grid(row=3, column=6, sticky=tk.W, padx=5)
 
+        # Fila 5 - Acudiente (destinatario de los avisos de inasistencia)
+        Label(form, text="Acudiente:", bg="#f9fafb", font=("Arial", 10, "bold")).grid(row=4, column=0, padx=12, pady=10, sticky=tk.E)
+        self.txt_acudiente = Entry(form, width=22, font=("Arial", 10))
+        self.txt_acudiente.grid(row=4, column=1, padx=12, pady=10, sticky=tk.W)
+        
+        Label(form, text="Tel. acudiente:", bg="#f9fafb", font=("Arial", 10, "bold")).grid(row=4, column=3, padx=12, pady=10, sticky=tk.E)
+        self.txt_acudiente_telefono = Entry(form, width=25, font=("Arial", 10))
+        self.txt_acudiente_telefono.grid(row=4, column=4, padx=12, pady=10, sticky=tk.W)
+        
+        Label(form, text="Correo acudiente:", bg="#f9fafb", font=("Arial", 10, "bold")).grid(row=5, column=0, padx=12, pady=10, sticky=tk.E)
+        self.txt_acudiente_correo = Entry(form, width=22, font=("Arial", 10))
+        self.txt_acudiente_correo.grid(row=5, column=1, padx=12, pady=10, sticky=tk.W)
+        
+        self._ayudas["acudiente_correo"] = Label(form, text=AYUDAS["acudiente_correo"], font=("Arial", 9), 
+                                                 fg="gray", bg="#f9fafb")
+        self._ayudas["acudiente_correo"].grid(row=5, column=2, columnspan=2, sticky=tk.W, padx=5)
+
         # Configurar eventos
         self._configurar_eventos()
 
@@ -155,13 +188,21 @@ class GestionEstudiantes:
         self.txt_anio.bind('<Return>', lambda event: self.txt_seccion.focus_set())
         self.txt_seccion.bind('<Return>', lambda event: self.txt_telefono.focus_set())
         self.txt_telefono.bind('<Return>', lambda event: self.txt_direccion.focus_set())
-        self.txt_direccion.bind('<Return>', lambda event: self.guardar_estudiante())
-
-        # Validaciones en tiempo real
-        self.txt_cedula.bind("<FocusOut>", self.validar_cedula_tiempo_real)
-        self.txt_nombres.bind("<FocusOut>", self.validar_nombres_tiempo_real)
-        self.txt_apellidos.bind("<FocusOut>", self.validar_apellidos_tiempo_real)
-        self.txt_telefono.bind("<FocusOut>", self.validar_telefono_tiempo_real)
+        self.txt_direccion.bind('<Return>', lambda event: self.txt_acudiente.focus_set())
+        self.txt_acudiente.bind('<Return>', lambda event: self.txt_acudiente_telefono.focus_set())
+        self.txt_acudiente_telefono.bind('<Return>', lambda event: self.txt_acudiente_correo.focus_set())
+        self.txt_acudiente_correo.bind('<Return>', lambda event: self.guardar_estudiante())
+
+        # Validaciones en tiempo real (al dejar de escribir) y cédula duplicada en segundo plano
+        self._id_editando = None
+        entradas = self._entradas()
+        self.validador = ValidadorFormulario(
+            ESQUEMA_ESTUDIANTE,
+            {campo: entradas[campo] for campo in ("cedula", "nombres", "apellidos", "anio", "telefono",
+                                                  "acudiente_correo")},
+            verificar_unico={"cedula": self._cedula_registrada},
+            al_cambiar=self._mostrar_validacion,
+        )
 
     def _crear_botones_accion(self, parent):
         """Crea los botones de acción"""
@@ -183,6 +224,9 @@ class GestionEstudiantes:
         Button(acciones, text="🧹 Limpiar", bg="#f59e0b", fg="white", 
                font=("Arial", 11), padx=20, pady=10, 
                command=self.limpiar_campos).grid(row=0, column=3, padx=12)
+        Button(acciones, text="📥 Importar CSV/Excel", bg="#7c3aed", fg="white", 
+               font=("Arial", 11), padx=20, pady=10, 
+               command=self.importar_estudiantes).grid(row=0, column=4, padx=12)
 
     def _crear_tabla_estudiantes(self, parent):
         """Crea la tabla de estudiantes"""
@@ -193,20 +237,23 @@ class GestionEstudiantes:
         scrollbar = ttk.Scrollbar(tree_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        cols = ("id", "cedula", "nombres", "apellidos", "carrera", "anio", "seccion", "telefono", "direccion")
+        cols = ("id", "cedula", "nombres", "apellidos", "carrera", "anio", "seccion", "telefono", "direccion",
+                "acudiente", "acudiente_correo", "acudiente_telefono")
         self.tree = ttk.Treeview(tree_frame, columns=cols, show="headings", height=16, yscrollcommand=scrollbar.set)
+        # Los datos de contacto del acudiente solo se usan en el formulario
+        self.tree["displaycolumns"] = cols[:10]
         
         headers = {
             "id": "ID", "cedula": "Cédula", "nombres": "Nombres", "apellidos": "Apellidos",
             "carrera": "Carrera", "anio": "Año", "seccion": "Sección", 
-            "telefono": "Teléfono", "direccion": "Dirección"
+            "telefono": "Teléfono", "direccion": "Dirección", "acudiente": "Acudiente"
         }
         
         # Configurar columnas más anchas
         column_widths = {
             "id": 60, "cedula": 140, "nombres": 150, "apellidos": 150,
             "carrera": 180, "anio": 80, "seccion": 100, 
-            "telefono": 120, "direccion": 200
+            "telefono": 120, "direccion": 200, "acudiente": 150
         }
         
         for col in cols:
@@ -226,7 +273,7 @@ class GestionEstudiantes:
 
     def cargar_carreras(self):
         """Cargar carreras disponibles desde la base de datos"""
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("SELECT nombre FROM carreras ORDER BY nombre")
@@ -251,24 +298,39 @@ class GestionEstudiantes:
 
     def llenar_tabla(self):
         """Llenar la tabla con datos de estudiantes"""
-        for i in self.tree.get_children(): 
-            self.tree.delete(i)
-        conn = sqlite3.connect(DB)
+        ejecutar_en_segundo_plano(
+            self.root, self._consultar_estudiantes,
+            al_terminar=self._mostrar_estudiantes,
+            al_error=self._error_llenar_tabla
+        )
+
+    @staticmethod
+    def _consultar_estudiantes() -> list:
+        """Consulta los estudiantes (hilo de trabajo)"""
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("""
-                SELECT id, cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion 
+                SELECT id, cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion,
+                       acudiente, acudiente_correo, acudiente_telefono
                 FROM estudiantes 
                 ORDER BY id DESC
             """)
-            for row in c.fetchall():
-                self.tree.insert("", "end", values=row)
-        except Exception as e:
-            print(f"Error llenando tabla: {e}")
-            MessageManager.show_error(self.root, "Error", f"Error al cargar estudiantes: {e}")
+            return c.fetchall()
         finally:
             conn.close()
 
+    def _mostrar_estudiantes(self, filas):
+        """Vuelca las filas consultadas en la tabla"""
+        for i in self.tree.get_children(): 
+            self.tree.delete(i)
+        for row in filas:
+            self.tree.insert("", "end", values=row)
+
+    def _error_llenar_tabla(self, e):
+        print(f"Error llenando tabla: {e}")
+        MessageManager.show_error(self.root, "Error", f"Error al cargar estudiantes: {e}")
+
     def guardar_estudiante(self):
         """Guardar nuevo estudiante"""
         # Obtener datos del formulario
@@ -280,64 +342,28 @@ class GestionEstudiantes:
         seccion = self.txt_seccion.get().strip()
         telefono = self.txt_telefono.get().strip()
         direccion = self.txt_direccion.get().strip()
-        
-        # Validaciones básicas
-        if not cedula:
-            MessageManager.show_warning(self.root, "Atención", "La cédula es obligatoria")
-            self.txt_cedula.focus_set()
-            return
-            
-        if not nombres:
-            MessageManager.show_warning(self.root, "Atención", "Los nombres son obligatorios")
-            self.txt_nombres.focus_set()
-            return
-            
-        if not apellidos:
-            MessageManager.show_warning(self.root, "Atención", "Los apellidos son obligatorios")
-            self.txt_apellidos.focus_set()
-            return
-            
-        if not carrera:
-            MessageManager.show_warning(self.root, "Atención", "La carrera es obligatoria")
-            self.cmb_carrera.focus_set()
-            return
-        
-        # Validación de cédula
-        if not validar_cedula(cedula):
-            MessageManager.show_error(self.root, "Error en formato de cédula", 
-                                    "❌ El formato de la cédula no es válido.\n\n"
-                                    "🆔 FORMATOS ACEPTADOS:\n"
-                                    "   • 0010808888888A (13 dígitos + letra)\n"
-                                    "   • 001-080888-8888A (con guiones)")
-            self.txt_cedula.focus_set()
-            return
-        
-        # Validación de nombres (solo texto)
-        if not validar_solo_texto(nombres):
-            mostrar_error_texto("nombres")
-            self.txt_nombres.focus_set()
-            return
-        
-        # Validación de apellidos (solo texto)
-        if not validar_solo_texto(apellidos):
-            mostrar_error_texto("apellidos")
-            self.txt_apellidos.focus_set()
-            return
-        
-        # Validación de teléfono
-        if telefono and not validar_telefono(telefono):
-            mostrar_error_telefono()
-            self.txt_telefono.focus_set()
+        acudiente = self.txt_acudiente.get().strip()
+        acudiente_correo = self.txt_acudiente_correo.get().strip()
+        acudiente_telefono = self.txt_acudiente_telefono.get().strip()
+        
+        if not self._validar_formulario(cedula=cedula, nombres=nombres, apellidos=apellidos, carrera=carrera,
+                                        anio=anio, seccion=seccion, telefono=telefono, direccion=direccion,
+                                        acudiente=acudiente, acudiente_correo=acudiente_correo,
+                                        acudiente_telefono=acudiente_telefono):
             return
             
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("""
-                INSERT INTO estudiantes (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion))
+                INSERT INTO estudiantes (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion,
+                                         acudiente, acudiente_correo, acudiente_telefono, cedula_normalizada)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion,
+                  acudiente, acudiente_correo, acudiente_telefono, cedula_normalizada(cedula)))
             conn.commit()
+            IndiceEstudiantes.obtener().actualizar(c.lastrowid, cedula, f"{nombres} {apellidos}")
+            eventos.publicar(eventos.ESTUDIANTES_AGREGADOS, cantidad=1)
             
             MessageManager.show_info(self.root, "Éxito", "✅ Estudiante guardado correctamente")
             
@@ -352,6 +378,32 @@ class GestionEstudiantes:
         finally:
             conn.close()
 
+    def importar_estudiantes(self):
+        """Importa estudiantes en bloque desde un archivo CSV o XLSX"""
+        ruta = filedialog.askopenfilename(
+            parent=self.root, title="Importar estudiantes",
+            filetypes=[("CSV o Excel", "*.csv *.xlsx"), ("Todos los archivos", "*.*")]
+        )
+        if not ruta:
+            return
+        
+        def al_terminar(resultado):
+            mensaje = (f"📥 Filas leídas: {resultado['total']}\n"
+                       f"✅ Importadas: {resultado['importados']}\n"
+                       f"❌ Con errores: {resultado['con_errores']}")
+            if resultado['reporte_errores']:
+                mensaje += f"\n\nDetalle de errores en:\n{resultado['reporte_errores']}"
+                MessageManager.show_warning(self.root, "Importación con errores", mensaje)
+            else:
+                MessageManager.show_info(self.root, "Importación completada", mensaje)
+            self.llenar_tabla()
+        
+        ejecutar_en_segundo_plano(
+            self.root, ImportadorEstudiantes().importar, ruta,
+            al_terminar=al_terminar,
+            al_error=lambda e: MessageManager.show_error(self.root, "Error", f"❌ Error al importar: {str(e)}")
+        )
+
     def seleccionar_estudiante(self, event):
         """Selecciona un estudiante de la tabla para editar"""
         selection = self.tree.selection()
@@ -366,6 +418,7 @@ class GestionEstudiantes:
             
         # Limpiar campos primero
         self.limpiar_campos()
+        self._id_editando = values[0]
         
         # Llenar campos con datos del estudiante seleccionado
         self.txt_cedula.insert(0, str(values[1]) if len(values) > 1 and values[1] else "")
@@ -388,6 +441,9 @@ class GestionEstudiantes:
         self.txt_seccion.insert(0, str(values[6]) if len(values) > 6 and values[6] else "")
         self.txt_telefono.insert(0, str(values[7]) if len(values) > 7 and values[7] else "")
         self.txt_direccion.insert(0, str(values[8]) if len(values) > 8 and values[8] else "")
+        self.txt_acudiente.insert(0, str(values[9]) if len(values) > 9 and values[9] else "")
+        self.txt_acudiente_correo.insert(0, str(values[10]) if len(values) > 10 and values[10] else "")
+        self.txt_acudiente_telefono.insert(0, str(values[11]) if len(values) > 11 and values[11] else "")
 
     def actualizar_estudiante(self):
         """Actualizar estudiante seleccionado"""
@@ -414,43 +470,30 @@ class GestionEstudiantes:
         seccion = self.txt_seccion.get().strip()
         telefono = self.txt_telefono.get().strip()
         direccion = self.txt_direccion.get().strip()
-        
-        # Validaciones
-        if not cedula or not nombres or not apellidos or not carrera:
-            MessageManager.show_warning(self.root, "Atención", "Complete los campos obligatorios")
-            return
-        
-        # Validación de cédula
-        if not validar_cedula(cedula):
-            mostrar_error_cedula()
-            return
-        
-        # Validación de nombres (solo texto)
-        if not validar_solo_texto(nombres):
-            mostrar_error_texto("nombres")
-            return
-        
-        # Validación de apellidos (solo texto)
-        if not validar_solo_texto(apellidos):
-            mostrar_error_texto("apellidos")
-            return
-        
-        # Validación de teléfono
-        if telefono and not validar_telefono(telefono):
-            mostrar_error_telefono()
+        acudiente = self.txt_acudiente.get().strip()
+        acudiente_correo = self.txt_acudiente_correo.get().strip()
+        acudiente_telefono = self.txt_acudiente_telefono.get().strip()
+        
+        if not self._validar_formulario(cedula=cedula, nombres=nombres, apellidos=apellidos, carrera=carrera,
+                                        anio=anio, seccion=seccion, telefono=telefono, direccion=direccion,
+                                        acudiente=acudiente, acudiente_correo=acudiente_correo,
+                                        acudiente_telefono=acudiente_telefono):
             return
             
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("""
                 UPDATE estudiantes 
-                SET cedula=?, nombres=?, apellidos=?, carrera=?, anio=?, seccion=?, telefono=?, direccion=?
+                SET cedula=?, nombres=?, apellidos=?, carrera=?, anio=?, seccion=?, telefono=?, direccion=?,
+                    acudiente=?, acudiente_correo=?, acudiente_telefono=?, cedula_normalizada=?
                 WHERE id=?
-            """, (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion, estudiante_id))
+            """, (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion,
+                  acudiente, acudiente_correo, acudiente_telefono, cedula_normalizada(cedula), estudiante_id))
             
             if c.rowcount > 0:
                 conn.commit()
+                IndiceEstudiantes.obtener().actualizar(estudiante_id, cedula, f"{nombres} {apellidos}")
                 MessageManager.show_info(self.root, "Éxito", "✅ Estudiante actualizado correctamente")
                 self.limpiar_campos()
                 self.llenar_tabla()
@@ -491,11 +534,13 @@ class GestionEstudiantes:
         if not respuesta:
             return
             
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("DELETE FROM estudiantes WHERE id=?", (estudiante_id,))
             conn.commit()
+            IndiceEstudiantes.obtener().eliminar(estudiante_id)
+            eventos.publicar(eventos.ESTUDIANTES_ELIMINADOS, ids=[estudiante_id])
             MessageManager.show_info(self.root, "Éxito", "✅ Estudiante eliminado correctamente")
             self.limpiar_campos()
             self.llenar_tabla()
@@ -514,54 +559,49 @@ class GestionEstudiantes:
         self.txt_seccion.delete(0, END)
         self.txt_telefono.delete(0, END)
         self.txt_direccion.delete(0, END)
+        self.txt_acudiente.delete(0, END)
+        self.txt_acudiente_correo.delete(0, END)
+        self.txt_acudiente_telefono.delete(0, END)
         
-        # Restablecer colores de fondo
-        self.txt_cedula.config(bg="white")
-        self.txt_nombres.config(bg="white")
-        self.txt_apellidos.config(bg="white")
-        self.txt_telefono.config(bg="white")
+        # Restablecer colores de fondo y validaciones pendientes
+        self._id_editando = None
+        self.validador.reiniciar()
         
         # Poner foco en el primer campo
         self.txt_cedula.focus_set()
 
     # Métodos de validación en tiempo real
-    def validar_cedula_tiempo_real(self, event=None):
-        cedula = self.txt_cedula.get().strip()
-        if cedula:
-            if validar_cedula(cedula):
-                self.txt_cedula.config(bg="#f0fff4")  # Verde claro
-            else:
-                self.txt_cedula.config(bg="#fff0f0")  # Rojo claro
-        else:
-            self.txt_cedula.config(bg="white")
-
-    def validar_nombres_tiempo_real(self, event=None):
-        nombres = self.txt_nombres.get().strip()
-        if nombres:
-            if validar_solo_texto(nombres):
-                self.txt_nombres.config(bg="#f0fff4")
-            else:
-                self.txt_nombres.config(bg="#fff0f0")
-        else:
-            self.txt_nombres.config(bg="white")
-
-    def validar_apellidos_tiempo_real(self, event=None):
-        apellidos = self.txt_apellidos.get().strip()
-        if apellidos:
-            if validar_solo_texto(apellidos):
-                self.txt_apellidos.config(bg="#f0fff4")
-            else:
-                self.txt_apellidos.config(bg="#fff0f0")
-        else:
-            self.txt_apellidos.config(bg="white")
+    def _entradas(self) -> dict:
+        """Widgets del formulario por nombre de campo del esquema"""
+        return {
+            "cedula": self.txt_cedula, "nombres": self.txt_nombres, "apellidos": self.txt_apellidos,
+            "carrera": self.cmb_carrera, "anio": self.txt_anio, "seccion": self.txt_seccion,
+            "telefono": self.txt_telefono, "direccion": self.txt_direccion,
+            "acudiente": self.txt_acudiente, "acudiente_correo": self.txt_acudiente_correo,
+            "acudiente_telefono": self.txt_acudiente_telefono,
+        }
 
-    def validar_telefono_tiempo_real(self, event=None):
-        telefono = self.txt_telefono.get().strip()
-        if telefono:
-            if validar_telefono(telefono):
-                self.txt_telefono.config(bg="#f0fff4")
-            else:
-                self.txt_telefono.config(bg="#fff0f0")
+    def _validar_formulario(self, **datos) -> bool:
+        """Valida con ESQUEMA_ESTUDIANTE; muestra el primer error y enfoca su campo"""
+        errores = ESQUEMA_ESTUDIANTE.validar(datos)
+        if not errores:
+            return True
+        campo, mensaje = errores[0]
+        mostrar_error_campo(ESQUEMA_ESTUDIANTE, campo, mensaje, parent=self.root)
+        self._entradas()[campo].focus_set()
+        return False
+
+    def _cedula_registrada(self, cedula: str) -> bool:
+        """Corre en un hilo de trabajo: consulta el índice de cédulas"""
+        id_estudiante = IndiceEstudiantes.obtener().resolver(cedula)
+        return id_estudiante is not None and id_estudiante != self._id_editando
+
+    def _mostrar_validacion(self, campo: str, estado: str, mensaje):
+        ayuda = self._ayudas.get(campo)
+        if ayuda is None:
+            return
+        if estado == INVALIDO:
+            ayuda.config(text=f"⚠️ {mensaje}", fg="#dc2626")
         else:
-            self.txt_telefono.config(bg="white")
+            ayuda.config(text=AYUDAS[campo], fg="gray")
   
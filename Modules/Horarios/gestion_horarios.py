@@ -0,0 +1,340 @@
+"""
+Gestión de Horarios de Clase (solo administradores)
+"""
+
+import tkinter as tk
+from tkinter import Toplevel, Frame, Label, Entry, Button, Text, ttk
+import sqlite3
+
+from core.horarios import GestorHorarios, ConflictoHorario, NOMBRES_DIA, describir_conflicto
+from core.generador_horarios import generar, guardar_solucion
+from core.tareas import ejecutar_en_segundo_plano
+from ui.message_manager import MessageManager
+
+DIAS = list(NOMBRES_DIA.values())[:6]
+SEGUNDOS_GENERACION = 20
+
+class GestionHorarios:
+    """Horario semanal por sección con validación de choques de docente y aula"""
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Horarios de Clase")
+        self.root.geometry("1150x700")
+        self.root.configure(bg="#f9fafb")
+
+        self.gestor = GestorHorarios()
+        self.materias = {}
+        self.docentes = {}
+        self.id_seleccionado = None
+
+        self._crear_interfaz()
+        self.cargar_opciones()
+
+    def _crear_interfaz(self):
+        """Crea la interfaz de horarios"""
+        header = Frame(self.root, bg="#f9fafb")
+        header.pack(fill='x', pady=8)
+        Label(header, text="🗓️ HORARIOS DE CLASE", font=("Arial", 16, "bold"),
+              bg="#f9fafb", fg="#2563eb").pack(side=tk.LEFT, padx=15)
+        Button(header, text="Cerrar", bg="#64748b", fg="white",
+               command=self.root.destroy).pack(side=tk.RIGHT, padx=15)
+
+        # Filtro por sección
+        filtro = Frame(self.root, bg="#f9fafb")
+        filtro.pack(fill='x', padx=15)
+        Label(filtro, text="Sección:", bg="#f9fafb", font=("Arial", 10, "bold")).pack(side=tk.LEFT)
+        self.cmb_filtro = ttk.Combobox(filtro, width=12)
+        self.cmb_filtro.pack(side=tk.LEFT, padx=5)
+        self.cmb_filtro.bind("<<ComboboxSelected>>", lambda e: self.cargar_horario())
+        self.cmb_filtro.bind("<Return>", lambda e: self.cargar_horario())
+        Button(filtro, text="🔄 Mostrar", bg="#2563eb", fg="white",
+               command=self.cargar_horario).pack(side=tk.LEFT, padx=5)
+
+        # Formulario
+        form = Frame(self.root, bg="#f9fafb", padx=15, pady=10)
+        form.pack(fill='x')
+
+        Label(form, text="Materia:*", bg="#f9fafb").grid(row=0, column=0, sticky=tk.E, padx=5, pady=4)
+        self.cmb_materia = ttk.Combobox(form, width=28)
+        self.cmb_materia.grid(row=0, column=1, padx=5, pady=4)
+        Label(form, text="Docente:*", bg="#f9fafb").grid(row=0, column=2, sticky=tk.E, padx=5, pady=4)
+        self.cmb_docente = ttk.Combobox(form, width=28, state="readonly")
+        self.cmb_docente.grid(row=0, column=3, padx=5, pady=4)
+        Label(form, text="Sección:*", bg="#f9fafb").grid(row=0, column=4, sticky=tk.E, padx=5, pady=4)
+        self.cmb_seccion = ttk.Combobox(form, width=10)
+        self.cmb_seccion.grid(row=0, column=5, padx=5, pady=4)
+
+        Label(form, text="Día:*", bg="#f9fafb").grid(row=1, column=0, sticky=tk.E, padx=5, pady=4)
+        self.cmb_dia = ttk.Combobox(form, values=DIAS, width=12, state="readonly")
+        self.cmb_dia.grid(row=1, column=1, sticky=tk.W, padx=5, pady=4)
+        Label(form, text="Inicio / Fin (HH:MM):*", bg="#f9fafb").grid(row=1, column=2, sticky=tk.E, padx=5, pady=4)
+        horas = Frame(form, bg="#f9fafb")
+        horas.grid(row=1, column=3, sticky=tk.W, padx=5, pady=4)
+        self.txt_inicio = Entry(horas, width=8)
+        self.txt_inicio.pack(side=tk.LEFT)
+        Label(horas, text=" - ", bg="#f9fafb").pack(side=tk.LEFT)
+        self.txt_fin = Entry(horas, width=8)
+        self.txt_fin.pack(side=tk.LEFT)
+        Label(form, text="Aula:", bg="#f9fafb").grid(row=1, column=4, sticky=tk.E, padx=5, pady=4)
+        self.txt_aula = Entry(form, width=12)
+        self.txt_aula.grid(row=1, column=5, padx=5, pady=4)
+
+        botones = Frame(self.root, bg="#f9fafb")
+        botones.pack(pady=4)
+        Button(botones, text="💾 Guardar Clase", bg="#22c55e", fg="white",
+               command=self.guardar).pack(side=tk.LEFT, padx=5)
+        Button(botones, text="🗑️ Eliminar", bg="#ef4444", fg="white",
+               command=self.eliminar).pack(side=tk.LEFT, padx=5)
+        Button(botones, text="🧹 Limpiar", bg="#64748b", fg="white",
+               command=self.limpiar).pack(side=tk.LEFT, padx=5)
+        Button(botones, text="🔍 Validar Horario Completo", bg="#8b5cf6", fg="white",
+               command=self.validar_todo).pack(side=tk.LEFT, padx=5)
+        Button(botones, text="🤖 Generar Automático", bg="#0f766e", fg="white",
+               command=self.generar_automatico).pack(side=tk.LEFT, padx=5)
+        Button(botones, text="🏫 Aulas", bg="#0ea5e9", fg="white",
+               command=self.abrir_aulas).pack(side=tk.LEFT, padx=5)
+
+        # Tabla de clases
+        cols = ("id", "dia", "inicio", "fin", "materia", "docente", "seccion", "aula")
+        self.tree = ttk.Treeview(self.root, columns=cols, show="headings", height=14)
+        headers = {"id": "ID", "dia": "Día", "inicio": "Inicio", "fin": "Fin", "materia": "Materia",
+                   "docente": "Docente", "seccion": "Sección", "aula": "Aula"}
+        widths = {"id": 50, "dia": 90, "inicio": 70, "fin": 70, "materia": 230, "docente": 230,
+                  "seccion": 80, "aula": 80}
+        for col in cols:
+            self.tree.heading(col, text=headers[col])
+            self.tree.column(col, width=widths[col])
+        self.tree.tag_configure("choque", background="#fff0f0")
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=15, pady=6)
+        self.tree.bind("<<TreeviewSelect>>", self._al_seleccionar)
+
+        # Reporte de choques
+        self.lbl_conflictos = Label(self.root, text="", bg="#f9fafb", fg="#64748b", font=("Arial", 10, "bold"))
+        self.lbl_conflictos.pack(anchor='w', padx=15)
+        self.txt_conflictos = Text(self.root, height=7, font=("Consolas", 9), wrap=tk.NONE)
+        self.txt_conflictos.pack(fill='x', padx=15, pady=(0, 10))
+
+    # ==================== CARGA ====================
+
+    def cargar_opciones(self):
+        ejecutar_en_segundo_plano(self.root, self.gestor.opciones,
+                                  al_terminar=self._mostrar_opciones, al_error=self._error_carga)
+
+    def _mostrar_opciones(self, opciones):
+        self.materias = {nombre: id_ for id_, nombre in opciones['materias']}
+        self.docentes = {f"{nombre} (#{id_})": id_ for id_, nombre in opciones['docentes']}
+        self.cmb_materia['values'] = list(self.materias)
+        self.cmb_docente['values'] = list(self.docentes)
+        self.cmb_seccion['values'] = opciones['secciones']
+        self.cmb_filtro['values'] = [""] + opciones['secciones']
+        self.cargar_horario()
+
+    def cargar_horario(self):
+        seccion = self.cmb_filtro.get().strip() or None
+        ejecutar_en_segundo_plano(self.root, self._consultar_horario, self.gestor, seccion,
+                                  al_terminar=self._mostrar_horario, al_error=self._error_carga)
+
+    @staticmethod
+    def _consultar_horario(gestor, seccion):
+        """Se ejecuta en un hilo de trabajo"""
+        clases = gestor.listar(seccion)
+        return clases, gestor.validar_todo()
+
+    def _mostrar_horario(self, resultado):
+        clases, conflictos = resultado
+        con_choque = {c[k].get('id_horario') for c in conflictos for k in ('clase_a', 'clase_b')}
+        self.tree.delete(*self.tree.get_children())
+        for clase in clases:
+            self.tree.insert("", "end", iid=str(clase['id_horario']), values=(
+                clase['id_horario'], clase['dia_semana'], clase['hora_inicio'], clase['hora_fin'],
+                clase['materia'], clase['docente'], clase['seccion'] or "", clase['aula'] or ""
+            ), tags=("choque",) if clase['id_horario'] in con_choque else ())
+        self._mostrar_conflictos(conflictos)
+
+    def _mostrar_conflictos(self, conflictos, titulo="Choques en el horario completo"):
+        self.txt_conflictos.delete("1.0", tk.END)
+        if conflictos:
+            self.lbl_conflictos.config(text=f"⚠️ {titulo}: {len(conflictos)}", fg="#dc2626")
+            self.txt_conflictos.insert(tk.END, "\n".join(describir_conflicto(c) for c in conflictos))
+        else:
+            self.lbl_conflictos.config(text="✅ Sin choques de docente, aula ni sección", fg="#16a34a")
+
+    def _error_carga(self, e):
+        MessageManager.show_error(self.root, "Error", f"Error al cargar horarios: {str(e)}")
+
+    def validar_todo(self):
+        self.cargar_horario()
+
+    # ==================== FORMULARIO ====================
+
+    def _al_seleccionar(self, event):
+        seleccion = self.tree.selection()
+        if not seleccion:
+            return
+        valores = self.tree.item(seleccion[0], "values")
+        self.id_seleccionado = int(valores[0])
+        self.cmb_dia.set(valores[1])
+        self._poner(self.txt_inicio, valores[2])
+        self._poner(self.txt_fin, valores[3])
+        self.cmb_materia.set(valores[4])
+        self.cmb_docente.set(next((k for k, v in self.docentes.items() if k.startswith(f"{valores[5]} (#")), ""))
+        self.cmb_seccion.set(valores[6])
+        self._poner(self.txt_aula, valores[7])
+
+    @staticmethod
+    def _poner(entrada, texto):
+        entrada.delete(0, tk.END)
+        entrada.insert(0, texto)
+
+    def limpiar(self):
+        self.id_seleccionado = None
+        for combo in (self.cmb_materia, self.cmb_docente, self.cmb_seccion, self.cmb_dia):
+            combo.set("")
+        for entrada in (self.txt_inicio, self.txt_fin, self.txt_aula):
+            entrada.delete(0, tk.END)
+        self.tree.selection_remove(self.tree.selection())
+
+    def _datos_formulario(self):
+        materia = self.cmb_materia.get().strip()
+        docente = self.docentes.get(self.cmb_docente.get())
+        seccion = self.cmb_seccion.get().strip()
+        if not materia or docente is None or not seccion or not self.cmb_dia.get():
+            MessageManager.show_warning(self.root, "Atención", "Complete materia, docente, sección y día.")
+            return None
+        return {
+            'id_horario': self.id_seleccionado,
+            'materia': materia,
+            'docente_id': docente,
+            'dia_semana': self.cmb_dia.get(),
+            'hora_inicio': self.txt_inicio.get().strip(),
+            'hora_fin': self.txt_fin.get().strip(),
+            'aula': self.txt_aula.get().strip(),
+            'seccion': seccion,
+        }
+
+    def guardar(self):
+        datos = self._datos_formulario()
+        if datos is None:
+            return
+        ejecutar_en_segundo_plano(self.root, self._guardar_clase, self.gestor, datos, self.materias,
+                                  al_terminar=self._clase_guardada, al_error=self._error_guardar)
+
+    @staticmethod
+    def _guardar_clase(gestor, datos, materias):
+        """Se ejecuta en un hilo de trabajo; crea la materia si es nueva"""
+        nombre = datos.pop('materia')
+        datos['materia_id'] = materias.get(nombre) or gestor.agregar_materia(nombre)
+        return gestor.guardar(datos)
+
+    def _clase_guardada(self, id_horario):
+        MessageManager.show_info(self.root, "Éxito", f"Clase #{id_horario} guardada correctamente.")
+        self.limpiar()
+        self.cargar_opciones()
+
+    def _error_guardar(self, e):
+        if isinstance(e, ConflictoHorario):
+            self._mostrar_conflictos(e.conflictos, "La clase no se guardó por choques")
+            MessageManager.show_error(self.root, "Choque de horario",
+                                      "La clase choca con otras clases:\n\n" +
+                                      "\n".join(describir_conflicto(c) for c in e.conflictos[:5]))
+        elif isinstance(e, ValueError):
+            MessageManager.show_error(self.root, "Datos inválidos", str(e))
+        else:
+            MessageManager.show_error(self.root, "Error", f"Error al guardar la clase: {str(e)}")
+
+    def eliminar(self):
+        if self.id_seleccionado is None:
+            MessageManager.show_warning(self.root, "Atención", "Seleccione una clase.")
+            return
+        if not MessageManager.ask_yesno(self.root, "Confirmar", f"¿Eliminar la clase #{self.id_seleccionado}?"):
+            return
+        try:
+            self.gestor.eliminar(self.id_seleccionado)
+        except sqlite3.Error as e:
+            MessageManager.show_error(self.root, "Error", f"Error al eliminar la clase: {str(e)}")
+            return
+        self.limpiar()
+        self.cargar_horario()
+
+    # ==================== GENERACIÓN AUTOMÁTICA ====================
+
+    def generar_automatico(self):
+        seccion = self.cmb_filtro.get().strip()
+        alcance = f"la sección {seccion}" if seccion else "todas las secciones"
+        if not MessageManager.ask_yesno(
+            self.root, "Generar horario",
+            f"Se generará un horario para {alcance} (hasta {SEGUNDOS_GENERACION} s).\n"
+            "El horario actual de esas secciones se reemplazará al guardar. ¿Continuar?"
+        ):
+            return
+        ejecutar_en_segundo_plano(self.root, generar, SEGUNDOS_GENERACION, None, [seccion] if seccion else None,
+                                  al_terminar=self._solucion_generada, al_error=self._error_generar)
+
+    def _solucion_generada(self, solucion):
+        problema = solucion['problema']
+        resumen = (f"{len(problema['sesiones'])} horas de clase en {len(problema['secciones'])} secciones\n"
+                   f"Reinicios: {solucion['reinicios']} — {solucion['segundos']:.1f} s\n"
+                   f"Violaciones duras: {solucion['duros']} — Penalización blanda: {solucion['blandos']}")
+        if problema['problemas']:
+            resumen += "\n\nAvisos:\n" + "\n".join(problema['problemas'][:8])
+        if solucion['duros']:
+            MessageManager.show_error(self.root, "Sin solución válida",
+                                      resumen + "\n\nNo se encontró un horario sin choques; no se guardó nada.")
+            return
+        if MessageManager.ask_yesno(self.root, "Horario generado", resumen + "\n\n¿Guardar este horario?"):
+            ejecutar_en_segundo_plano(self.root, guardar_solucion, solucion,
+                                      al_terminar=lambda total: self.cargar_opciones(),
+                                      al_error=self._error_generar)
+
+    def _error_generar(self, e):
+        MessageManager.show_error(self.root, "Error", f"Error al generar el horario: {str(e)}")
+
+    # ==================== AULAS ====================
+
+    def abrir_aulas(self):
+        ventana = Toplevel(self.root)
+        ventana.title("Aulas")
+        ventana.geometry("420x420")
+        ventana.configure(bg="#f9fafb")
+        ventana.transient(self.root)
+
+        form = Frame(ventana, bg="#f9fafb")
+        form.pack(pady=8)
+        Label(form, text="Aula:", bg="#f9fafb").grid(row=0, column=0, padx=4)
+        txt_nombre = Entry(form, width=12)
+        txt_nombre.grid(row=0, column=1, padx=4)
+        Label(form, text="Capacidad:", bg="#f9fafb").grid(row=0, column=2, padx=4)
+        txt_capacidad = Entry(form, width=6)
+        txt_capacidad.grid(row=0, column=3, padx=4)
+
+        tree = ttk.Treeview(ventana, columns=("id", "nombre", "capacidad"), show="headings", height=12)
+        for col, texto, ancho in (("id", "ID", 50), ("nombre", "Aula", 180), ("capacidad", "Capacidad", 100)):
+            tree.heading(col, text=texto)
+            tree.column(col, width=ancho)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=6)
+
+        def recargar():
+            tree.delete(*tree.get_children())
+            for fila in self.gestor.listar_aulas():
+                tree.insert("", "end", values=tuple("" if v is None else v for v in fila))
+
+        def guardar():
+            nombre, capacidad = txt_nombre.get().strip(), txt_capacidad.get().strip()
+            if not nombre or (capacidad and not capacidad.isdigit()):
+                MessageManager.show_warning(ventana, "Atención", "Indique el aula y una capacidad numérica.")
+                return
+            self.gestor.guardar_aula(nombre, int(capacidad) if capacidad else None)
+            txt_nombre.delete(0, tk.END)
+            txt_capacidad.delete(0, tk.END)
+            recargar()
+
+        def eliminar():
+            seleccion = tree.selection()
+            if seleccion:
+                self.gestor.eliminar_aula(int(tree.item(seleccion[0], "values")[0]))
+                recargar()
+
+        Button(form, text="💾 Guardar", bg="#22c55e", fg="white", command=guardar).grid(row=0, column=4, padx=4)
+        Button(ventana, text="🗑️ Eliminar", bg="#ef4444", fg="white", command=eliminar).pack(pady=(0, 10))
+        recargar()
@@ -3,12 +3,13 @@ Módulo de Login del Sistema
 """
 
 import tkinter as tk
-from tkinter import Tk, Frame, Label, Entry, Button, Canvas, StringVar
+from tkinter import Tk, Frame, Label, Entry, Button, Canvas, StringVar, ttk
 import sqlite3
 import random
 import sys
 from tkinter import messagebox
 
+from config import sedes
 from core.security import verificar_usuario
 from ui.theme_manager import FondoManager
 from ui.window_manager import GestorVentanas
@@ -41,7 +42,8 @@ class Login:
         
         # Panel principal
         self.panel_principal = Frame(root, bg='white', bd=0, relief='flat')
-        self.panel_principal.place(relx=0.5, rely=0.5, anchor='center', width=500, height=620)
+        self.panel_principal.place(relx=0.5, rely=0.5, anchor='center', width=500,
+                                   height=660 if len(sedes.sedes()) > 1 else 620)
 
         # ==================== ENCABEZADO INSTITUCIONAL ====================
         
@@ -57,6 +59,15 @@ class Login:
         
         Label(self.frame_logo, text="Sistema de Gestión Académica", 
               font=("Arial", 12), bg='white', fg="#64748b").pack(pady=(5, 0))
+        
+        # Selector de sede (solo si hay más de una registrada)
+        self.sedes = {sede.nombre: sede.clave for sede in sedes.sedes()}
+        self.cmb_sede = None
+        if len(self.sedes) > 1:
+            self.cmb_sede = ttk.Combobox(self.frame_logo, values=list(self.sedes),
+                                         state="readonly", width=30, font=("Arial", 11))
+            self.cmb_sede.set(sedes.sede_activa().nombre)
+            self.cmb_sede.pack(pady=(10, 0))
 
         # Separador
         separator = Frame(self.panel_principal, height=2, bg="#e2e8f0")
@@ -208,6 +219,10 @@ class Login:
             self.usuario.focus_set()
             return
         
+        # Cada sede tiene sus propios usuarios: enrutar la sesión antes de verificar
+        if self.cmb_sede is not None:
+            sedes.seleccionar_sede(self.sedes[self.cmb_sede.get()])
+        
         # Verificar credenciales
         ok = verificar_usuario(usuario, clave)
         if ok:
@@ -216,6 +231,7 @@ class Login:
             messagebox.showinfo("Bienvenido", 
                               f"✅ ¡Bienvenido {usuario}!\n\n"
                               f"Rol: {rol}\n"
+                              f"Sede: {sedes.sede_activa().nombre}\n"
                               f"Acceso concedido al Sistema de Gestión")
             
             self.root.after(1500, lambda: self._transicion_a_menu_principal(usuario, rol))
@@ -0,0 +1,170 @@
+"""
+Visor de Auditoría (solo administradores)
+"""
+
+import tkinter as tk
+from tkinter import Frame, Label, Entry, Button, StringVar, BooleanVar, Checkbutton, ttk
+from datetime import datetime
+
+from core.auditoria import Auditoria
+from core.database_manager import DatabaseManager
+from core.tareas import ejecutar_en_segundo_plano
+from ui.message_manager import MessageManager
+
+TAMANO_PAGINA = 100
+ENCABEZADOS = ("ID", "Usuario", "Acción", "Detalles", "Fecha", "IP")
+
+class VisorAuditoria:
+    """Consulta filtrada de la auditoría con paginación por cursor (fecha, id)"""
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Auditoría del Sistema")
+        self.root.geometry("1150x650")
+        self.root.configure(bg="#f9fafb")
+
+        self.auditoria = Auditoria(DatabaseManager())
+        # Cursores de inicio de cada página visitada; el último es la página actual
+        self.cursores = [None]
+        self.siguiente = None
+        self.filtros = {}
+
+        self._crear_interfaz()
+        ejecutar_en_segundo_plano(self.root, self.auditoria.acciones,
+                                  al_terminar=lambda a: self.cmb_accion.config(values=[""] + a),
+                                  al_error=self._error)
+        self.buscar()
+
+    def _crear_interfaz(self):
+        Label(self.root, text="🛡️ Auditoría del Sistema", font=("Arial", 16, "bold"),
+              bg="#f9fafb", fg="#1e3a8a").pack(pady=8)
+
+        frm = Frame(self.root, bg="#f9fafb")
+        frm.pack(pady=4)
+        self.usuario_var = StringVar()
+        self.desde_var = StringVar()
+        self.hasta_var = StringVar(value=datetime.now().strftime("%Y-%m-%d"))
+        self.archivo_var = BooleanVar(value=False)
+        Label(frm, text="Usuario:", bg="#f9fafb").grid(row=0, column=0, padx=5)
+        Entry(frm, textvariable=self.usuario_var, width=16).grid(row=0, column=1, padx=5)
+        Label(frm, text="Acción:", bg="#f9fafb").grid(row=0, column=2, padx=5)
+        self.cmb_accion = ttk.Combobox(frm, width=18)
+        self.cmb_accion.grid(row=0, column=3, padx=5)
+        Label(frm, text="Desde:", bg="#f9fafb").grid(row=0, column=4, padx=5)
+        Entry(frm, textvariable=self.desde_var, width=12).grid(row=0, column=5, padx=5)
+        Label(frm, text="Hasta:", bg="#f9fafb").grid(row=0, column=6, padx=5)
+        Entry(frm, textvariable=self.hasta_var, width=12).grid(row=0, column=7, padx=5)
+        Checkbutton(frm, text="Incluir meses archivados", variable=self.archivo_var,
+                    bg="#f9fafb").grid(row=0, column=8, padx=5)
+        Button(frm, text="🔍 Buscar", bg="#2563eb", fg="white", command=self.buscar).grid(row=0, column=9, padx=5)
+
+        cols = ("id", "usuario", "accion", "detalles", "fecha", "ip")
+        self.tree = ttk.Treeview(self.root, columns=cols, show="headings", height=20)
+        anchos = {"id": 70, "usuario": 120, "accion": 160, "detalles": 480, "fecha": 150, "ip": 100}
+        for col, titulo in zip(cols, ENCABEZADOS):
+            self.tree.heading(col, text=titulo)
+            self.tree.column(col, width=anchos[col], anchor=tk.W)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=6)
+
+        nav = Frame(self.root, bg="#f9fafb")
+        nav.pack(pady=6)
+        self.btn_anterior = Button(nav, text="◀ Anterior", command=self.anterior, state=tk.DISABLED)
+        self.btn_anterior.pack(side=tk.LEFT, padx=5)
+        self.lbl_pagina = Label(nav, text="", bg="#f9fafb", fg="#64748b")
+        self.lbl_pagina.pack(side=tk.LEFT, padx=10)
+        self.btn_siguiente = Button(nav, text="Siguiente ▶", command=self.siguiente_pagina, state=tk.DISABLED)
+        self.btn_siguiente.pack(side=tk.LEFT, padx=5)
+        Button(nav, text="📤 Exportar CSV", bg="#16a34a", fg="white",
+               command=self.exportar).pack(side=tk.LEFT, padx=20)
+        Button(nav, text="🔐 Verificar Integridad", bg="#7c3aed", fg="white",
+               command=self.verificar).pack(side=tk.LEFT, padx=5)
+
+    # ==================== CONSULTA ====================
+
+    def _leer_filtros(self):
+        filtros = {
+            'usuario': self.usuario_var.get().strip() or None,
+            'accion': self.cmb_accion.get().strip() or None,
+            'desde': self.desde_var.get().strip() or None,
+            'hasta': self.hasta_var.get().strip() or None,
+            'incluir_archivo': self.archivo_var.get(),
+        }
+        for clave in ('desde', 'hasta'):
+            if filtros[clave]:
+                datetime.strptime(filtros[clave], "%Y-%m-%d")
+        return filtros
+
+    def buscar(self):
+        try:
+            self.filtros = self._leer_filtros()
+        except ValueError:
+            MessageManager.show_error(self.root, "Error", "Las fechas deben tener formato AAAA-MM-DD.")
+            return
+        self.cursores = [None]
+        self._cargar()
+
+    def siguiente_pagina(self):
+        if self.siguiente:
+            self.cursores.append(self.siguiente)
+            self._cargar()
+
+    def anterior(self):
+        if len(self.cursores) > 1:
+            self.cursores.pop()
+            self._cargar()
+
+    def _cargar(self):
+        self.btn_siguiente.config(state=tk.DISABLED)
+        self.btn_anterior.config(state=tk.DISABLED)
+        ejecutar_en_segundo_plano(self.root, self.auditoria.pagina, cursor=self.cursores[-1],
+                                  limite=TAMANO_PAGINA, **self.filtros,
+                                  al_terminar=self._mostrar, al_error=self._error)
+
+    def _mostrar(self, resultado):
+        filas, self.siguiente = resultado
+        self.tree.delete(*self.tree.get_children())
+        for fila in filas:
+            self.tree.insert("", "end", values=fila)
+        self.lbl_pagina.config(text=f"Página {len(self.cursores)} ({len(filas)} registros)")
+        self.btn_anterior.config(state=tk.NORMAL if len(self.cursores) > 1 else tk.DISABLED)
+        self.btn_siguiente.config(state=tk.NORMAL if self.siguiente else tk.DISABLED)
+
+    def _error(self, e):
+        MessageManager.show_error(self.root, "Error", f"Error consultando la auditoría: {str(e)}")
+
+    # ==================== EXPORTACIÓN ====================
+
+    def exportar(self):
+        """Escribe todas las filas del filtro actual, página a página"""
+        nombre = f"auditoria_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        ejecutar_en_segundo_plano(self.root, self._exportar, self.auditoria, nombre, dict(self.filtros),
+                                  al_terminar=self._exportado, al_error=self._error)
+
+    @staticmethod
+    def _exportar(auditoria, nombre, filtros):
+        """Se ejecuta en un hilo de trabajo"""
+        from utils.exporters import ExportadorAvanzado
+        return ExportadorAvanzado.exportar_csv(auditoria.iterar(**filtros), nombre, ENCABEZADOS)
+
+    def _exportado(self, resultado):
+        exito, mensaje = resultado
+        if exito:
+            MessageManager.show_info(self.root, "Éxito", mensaje)
+        else:
+            MessageManager.show_error(self.root, "Error", mensaje)
+
+    # ==================== INTEGRIDAD ====================
+
+    def verificar(self):
+        ejecutar_en_segundo_plano(self.root, self.auditoria.verificar,
+                                  al_terminar=self._verificado, al_error=self._error)
+
+    def _verificado(self, resultado):
+        if resultado['valido']:
+            desde = f"checkpoint del {resultado['checkpoint']}" if resultado['checkpoint'] else "el inicio"
+            MessageManager.show_info(self.root, "Integridad",
+                                     f"✅ Cadena íntegra: {resultado['verificados']} registros verificados "
+                                     f"desde {desde}.")
+        else:
+            MessageManager.show_error(self.root, "Integridad",
+                                      f"❌ La auditoría fue alterada: {resultado['error']}")
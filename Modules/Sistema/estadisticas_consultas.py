@@ -0,0 +1,92 @@
+"""
+Estadísticas de Consultas SQL (solo administradores)
+"""
+
+import tkinter as tk
+from tkinter import Frame, Label, Button, Text, ttk
+
+from core.monitor_consultas import MonitorConsultas
+from ui.message_manager import MessageManager
+
+class EstadisticasConsultas:
+    """Vista de tiempos por sentencia y de consultas lentas"""
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Rendimiento de Consultas")
+        self.root.geometry("1150x650")
+        self.root.configure(bg="#f9fafb")
+
+        self.monitor = MonitorConsultas.instancia()
+        self._crear_interfaz()
+        self.actualizar()
+
+    def _crear_interfaz(self):
+        """Crea la interfaz de estadísticas"""
+        Label(self.root, text="⏱️ Rendimiento de Consultas SQL",
+              font=("Arial", 16, "bold"), bg="#f9fafb", fg="#2563eb").pack(pady=8)
+
+        self.lbl_resumen = Label(self.root, text="", font=("Arial", 10), bg="#f9fafb", fg="#64748b")
+        self.lbl_resumen.pack()
+
+        # Tabla de sentencias
+        cols = ("sql", "modulo", "llamadas", "filas", "p50", "p95", "p99", "max", "total")
+        self.tree = ttk.Treeview(self.root, columns=cols, show="headings", height=14)
+
+        headers = {
+            "sql": "Sentencia", "modulo": "Módulo", "llamadas": "Llamadas", "filas": "Filas",
+            "p50": "p50 (ms)", "p95": "p95 (ms)", "p99": "p99 (ms)", "max": "Máx (ms)",
+            "total": "Total (ms)"
+        }
+        for col in cols:
+            self.tree.heading(col, text=headers[col])
+            self.tree.column(col, width=80, anchor=tk.E)
+        self.tree.column("sql", width=420, anchor=tk.W)
+        self.tree.column("modulo", width=180, anchor=tk.W)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=6)
+
+        # Consultas lentas con su plan
+        Label(self.root, text=f"🐢 Consultas lentas (umbral {self.monitor.umbral_lenta_ms:.0f} ms)",
+              font=("Arial", 11, "bold"), bg="#f9fafb").pack(anchor='w', padx=10)
+        self.txt_lentas = Text(self.root, height=9, font=("Consolas", 9), wrap=tk.NONE)
+        self.txt_lentas.pack(fill=tk.X, padx=10, pady=4)
+
+        btn_frame = Frame(self.root, bg="#f9fafb")
+        btn_frame.pack(pady=6)
+        Button(btn_frame, text="🔄 Actualizar", bg="#2563eb", fg="white",
+               command=self.actualizar).pack(side=tk.LEFT, padx=5)
+        Button(btn_frame, text="🧹 Reiniciar Estadísticas", bg="#f59e0b", fg="white",
+               command=self.reiniciar).pack(side=tk.LEFT, padx=5)
+
+    def actualizar(self):
+        """Recarga las estadísticas desde el monitor"""
+        for i in self.tree.get_children():
+            self.tree.delete(i)
+
+        stats = self.monitor.estadisticas()
+        for s in stats:
+            self.tree.insert("", "end", values=(
+                s['sql'][:200], s['modulo'], s['llamadas'], s['filas'],
+                f"{s['p50_ms']:.2f}", f"{s['p95_ms']:.2f}", f"{s['p99_ms']:.2f}",
+                f"{s['max_ms']:.2f}", f"{s['total_ms']:.1f}"
+            ))
+
+        total_llamadas = sum(s['llamadas'] for s in stats)
+        total_ms = sum(s['total_ms'] for s in stats)
+        self.lbl_resumen.config(
+            text=f"{len(stats)} sentencias distintas | {total_llamadas} ejecuciones | {total_ms:.1f} ms acumulados"
+        )
+
+        self.txt_lentas.delete("1.0", tk.END)
+        for lenta in self.monitor.consultas_lentas():
+            self.txt_lentas.insert(tk.END,
+                f"[{lenta['fecha'].strftime('%H:%M:%S')}] {lenta['duracion_ms']:.1f} ms "
+                f"- {lenta['filas']} filas - {lenta['modulo']}\n"
+                f"    {lenta['sql']}\n"
+                f"    Plan: {lenta['plan'] or 'no disponible'}\n")
+
+    def reiniciar(self):
+        """Reinicia las estadísticas acumuladas"""
+        if MessageManager.ask_yesno(self.root, "Confirmar", "¿Reiniciar las estadísticas de consultas?"):
+            self.monitor.reiniciar()
+            self.actualizar()
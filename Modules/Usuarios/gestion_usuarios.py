@@ -7,6 +7,7 @@ from tkinter import Toplevel, Frame, Label, Entry, Button, ttk, END
 from core.security import create_user
 from core.database_manager import DatabaseManager
 from ui.message_manager import MessageManager
+from utils.validators import ESQUEMA_USUARIO
 
 class GestionUsuarios:
     def __init__(self, root):
@@ -81,12 +82,11 @@ class GestionUsuarios:
         password = self.txt_password.get().strip()
         rol = self.cmb_rol.get().strip()
         
-        if not usuario or not password:
-            MessageManager.show_warning(self.root, "Atención", "Complete usuario y contraseña.")
-            return
-        
-        if len(password) < 4:
-            MessageManager.show_warning(self.root, "Atención", "La contraseña debe tener al menos 4 caracteres.")
+        errores = ESQUEMA_USUARIO.validar({"usuario": usuario, "password": password, "rol": rol})
+        if errores:
+            campo, mensaje = errores[0]
+            MessageManager.show_warning(self.root, "Atención",
+                                        f"{ESQUEMA_USUARIO.campo(campo).etiqueta.capitalize()}: {mensaje}")
             return
         
         # Crear usuario
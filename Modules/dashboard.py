@@ -4,11 +4,11 @@ Dashboard - Panel de Control del Sistema
 
 import tkinter as tk
 from tkinter import Toplevel, Frame, Label, ttk
-import sqlite3
 from datetime import datetime
 
-from config.database import DB
+from config.database import conectar
 from ui.theme_manager import FondoManager
+from core.tareas import ejecutar_en_segundo_plano
 
 class Dashboard:
     def __init__(self, root):
@@ -93,7 +93,16 @@ class Dashboard:
 
     def cargar_estadisticas(self):
         """Carga y actualiza las estadísticas"""
-        conn = sqlite3.connect(DB)
+        ejecutar_en_segundo_plano(
+            self.root, self._consultar_estadisticas,
+            al_terminar=self._mostrar_estadisticas,
+            al_error=lambda e: print(f"Error cargando estadísticas: {e}")
+        )
+
+    @staticmethod
+    def _consultar_estadisticas() -> dict:
+        """Consulta los totales y las últimas asistencias (hilo de trabajo)"""
+        conn = conectar()
         c = conn.cursor()
         
         try:
@@ -106,40 +115,37 @@ class Dashboard:
             c.execute("SELECT COUNT(*) FROM asistencia WHERE fecha = ?", (fecha_hoy,))
             asistencias_hoy = c.fetchone()[0]
             
-            # Faltas hoy (estimado)
-            faltas_hoy = total_estudiantes - asistencias_hoy
-            
             # Total docentes activos
             c.execute("SELECT COUNT(*) FROM docentes WHERE estado = 'ACTIVO'")
             total_docentes = c.fetchone()[0]
             
-            # Actualizar tarjetas
-            self.tarjetas['estudiantes'].config(text=str(total_estudiantes))
-            self.tarjetas['asistencias_hoy'].config(text=str(asistencias_hoy))
-            self.tarjetas['faltas_hoy'].config(text=str(faltas_hoy))
-            self.tarjetas['docentes'].config(text=str(total_docentes))
-            
-            # Actualizar tabla de últimas asistencias
-            self._actualizar_tabla_asistencias(c)
+            # Últimas asistencias
+            c.execute("""
+                SELECT a.id_asistencia, e.nombres || ' ' || e.apellidos, a.fecha, a.hora_entrada, a.estado
+                FROM asistencia a
+                LEFT JOIN estudiantes e ON a.id_estudiante = e.id
+                ORDER BY a.id_asistencia DESC LIMIT 20
+            """)
             
-        except Exception as e:
-            print(f"Error cargando estadísticas: {e}")
+            return {
+                'estudiantes': total_estudiantes,
+                'asistencias_hoy': asistencias_hoy,
+                # Faltas hoy (estimado)
+                'faltas_hoy': total_estudiantes - asistencias_hoy,
+                'docentes': total_docentes,
+                'ultimas': c.fetchall()
+            }
         finally:
             conn.close()
 
-    def _actualizar_tabla_asistencias(self, cursor):
-        """Actualiza la tabla de últimas asistencias"""
+    def _mostrar_estadisticas(self, stats: dict):
+        """Actualiza tarjetas y tabla con las estadísticas consultadas"""
+        for clave in ('estudiantes', 'asistencias_hoy', 'faltas_hoy', 'docentes'):
+            self.tarjetas[clave].config(text=str(stats[clave]))
+        
         for i in self.tree.get_children():
             self.tree.delete(i)
-            
-        cursor.execute("""
-            SELECT a.id_asistencia, e.nombres || ' ' || e.apellidos, a.fecha, a.hora_entrada, a.estado
-            FROM asistencia a
-            LEFT JOIN estudiantes e ON a.id_estudiante = e.id
-            ORDER BY a.id_asistencia DESC LIMIT 20
-        """)
-        
-        for row in cursor.fetchall():
+        for row in stats['ultimas']:
             self.tree.insert("", "end", values=row)
 
 # Botón import (añadir al inicio del archivo)
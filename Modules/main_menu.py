@@ -3,7 +3,7 @@ Menú Principal del Sistema
 """
 
 import tkinter as tk
-from tkinter import Tk, Frame, Label, Button, LabelFrame
+from tkinter import Tk, Frame, Label, Button, LabelFrame, Entry, ttk
 import sqlite3
 import sys
 
@@ -13,6 +13,7 @@ from core.auditoria import Auditoria
 from core.notifications import SistemaNotificaciones
 from ui.theme_manager import FondoManager
 from ui.window_manager import GestorVentanas
+from core.tareas import ejecutar_en_segundo_plano
 
 class MainMenu:
     def __init__(self, root, usuario, rol):
@@ -105,6 +106,14 @@ class MainMenu:
             Button(frame, text="📋 Control de Asistencia", width=28,
                    bg="#22c55e", fg="white", command=self.abrir_asistencia).pack(padx=12, pady=6)
         
+        if PermisosManager.tiene_permiso(self.rol, 'gestion_horarios'):
+            Button(frame, text="🗓️ Horarios de Clase", width=28,
+                   bg="#0f766e", fg="white", command=self.abrir_horarios).pack(padx=12, pady=6)
+        
+        if PermisosManager.tiene_permiso(self.rol, 'control_asistencia'):
+            Button(frame, text="📝 Justificaciones", width=28,
+                   bg="#b45309", fg="white", command=self.abrir_justificaciones).pack(padx=12, pady=6)
+        
         if PermisosManager.tiene_permiso(self.rol, 'gestion_usuarios'):
             Button(frame, text="👥 Usuarios y Roles", width=28,
                    bg="#64748b", fg="white", command=self.abrir_usuarios).pack(padx=12, pady=6)
@@ -116,6 +125,14 @@ class MainMenu:
         if PermisosManager.tiene_permiso(self.rol, 'backup_restore'):
             Button(frame, text="💾 Backup del Sistema", width=28,
                    bg="#f59e0b", fg="white", command=self.abrir_backup).pack(padx=12, pady=6)
+        
+        if PermisosManager.tiene_permiso(self.rol, 'configuracion_sistema'):
+            Button(frame, text="⏱️ Rendimiento de Consultas", width=28,
+                   bg="#475569", fg="white", command=self.abrir_estadisticas_consultas).pack(padx=12, pady=6)
+        
+        if PermisosManager.tiene_permiso(self.rol, 'auditoria'):
+            Button(frame, text="🛡️ Auditoría", width=28,
+                   bg="#334155", fg="white", command=self.abrir_auditoria).pack(padx=12, pady=6)
 
     def _crear_botones_reportes(self, frame):
         """Crea los botones de reportes según los permisos"""
@@ -126,6 +143,8 @@ class MainMenu:
                    bg="#f59e0b", fg="white", command=self.reporte_por_fecha).pack(padx=12, pady=6)
             Button(frame, text="🔍 Búsqueda Avanzada", width=30,
                    bg="#8b5cf6", fg="white", command=self.busqueda_avanzada).pack(padx=12, pady=6)
+            Button(frame, text="🖨️ Hojas de Asistencia (PDF)", width=30,
+                   bg="#0f766e", fg="white", command=self.hojas_asistencia).pack(padx=12, pady=6)
 
     def abrir_docentes(self):
         from modules.docentes.gestion_docentes import GestionDocentes
@@ -139,6 +158,14 @@ class MainMenu:
         from modules.asistencia.control_asistencia import GestionAsistencia
         GestorVentanas.abrir_ventana(self.root, GestionAsistencia, "Control de Asistencia - Estudiantes")
 
+    def abrir_horarios(self):
+        from modules.horarios.gestion_horarios import GestionHorarios
+        GestorVentanas.abrir_ventana(self.root, GestionHorarios, "Horarios de Clase")
+
+    def abrir_justificaciones(self):
+        from modules.asistencia.justificaciones import GestionJustificaciones
+        GestorVentanas.abrir_ventana(self.root, GestionJustificaciones, "Justificaciones", self.usuario, self.rol)
+
     def abrir_usuarios(self):
         from modules.usuarios.gestion_usuarios import GestionUsuarios
         GestorVentanas.abrir_ventana(self.root, GestionUsuarios, "Usuarios y Roles")
@@ -151,6 +178,14 @@ class MainMenu:
         from core.backup_manager import GestionBackup
         GestorVentanas.abrir_ventana(self.root, GestionBackup, "Gestión de Backup")
 
+    def abrir_estadisticas_consultas(self):
+        from modules.sistema.estadisticas_consultas import EstadisticasConsultas
+        GestorVentanas.abrir_ventana(self.root, EstadisticasConsultas, "Rendimiento de Consultas")
+
+    def abrir_auditoria(self):
+        from modules.sistema.auditoria import VisorAuditoria
+        GestorVentanas.abrir_ventana(self.root, VisorAuditoria, "Auditoría del Sistema")
+
     def reporte_general(self):
         from modules.asistencia.reportes_asistencia import ReporteGeneral
         GestorVentanas.abrir_ventana(self.root, ReporteGeneral, "Reporte General de Asistencia")
@@ -159,6 +194,10 @@ class MainMenu:
         from modules.asistencia.reportes_asistencia import ReportePorFecha
         GestorVentanas.abrir_ventana(self.root, ReportePorFecha, "Reporte de Asistencia por Fecha")
 
+    def hojas_asistencia(self):
+        from modules.asistencia.reporte_asistencia import HojasAsistenciaPDF
+        GestorVentanas.abrir_ventana(self.root, HojasAsistenciaPDF, "Hojas de Asistencia (PDF)")
+
     def busqueda_avanzada(self):
         from utils.exporters import BuscadorAvanzado
         buscador = BuscadorAvanzado(self.db_manager)
@@ -166,12 +205,49 @@ class MainMenu:
         # Crear ventana de búsqueda
         ventana_busqueda = tk.Toplevel(self.root)
         ventana_busqueda.title("Búsqueda Avanzada - Estudiantes")
-        ventana_busqueda.geometry("500x400")
+        ventana_busqueda.geometry("760x480")
         
-        # Implementar interfaz de búsqueda...
         Label(ventana_busqueda, text="🔍 Búsqueda Avanzada", 
               font=("Arial", 14, "bold")).pack(pady=10)
         
+        frame_campos = Frame(ventana_busqueda)
+        frame_campos.pack(pady=6, padx=20, fill='x')
+        
+        campos = {}
+        for fila, (clave, texto) in enumerate([("nombre", "Nombre:"), ("cedula", "Cédula:"),
+                                              ("carrera", "Carrera:"), ("anio", "Año:")]):
+            Label(frame_campos, text=texto).grid(row=fila // 2, column=(fila % 2) * 2, sticky='e', padx=5, pady=4)
+            campos[clave] = Entry(frame_campos, width=28)
+            campos[clave].grid(row=fila // 2, column=(fila % 2) * 2 + 1, padx=5, pady=4)
+        
+        cols = ("id", "cedula", "nombres", "apellidos", "carrera", "anio", "seccion")
+        tree = ttk.Treeview(ventana_busqueda, columns=cols, show="headings", height=12)
+        for col in cols:
+            tree.heading(col, text=col.capitalize())
+            tree.column(col, width=100)
+        
+        lbl_estado = Label(ventana_busqueda, text="", fg="#64748b")
+        
+        def mostrar_resultados(resultados):
+            for i in tree.get_children():
+                tree.delete(i)
+            for est in resultados or []:
+                tree.insert("", "end", values=tuple(est[col] for col in cols))
+            lbl_estado.config(text=f"{len(resultados or [])} estudiantes encontrados")
+        
+        def realizar_busqueda(event=None):
+            criterios = {clave: entry.get().strip() for clave, entry in campos.items()}
+            lbl_estado.config(text="Buscando...")
+            ejecutar_en_segundo_plano(ventana_busqueda, buscador.buscar_estudiantes, criterios,
+                                      al_terminar=mostrar_resultados)
+        
+        Button(ventana_busqueda, text="🔍 Buscar", bg="#2563eb", fg="white",
+               command=realizar_busqueda).pack(pady=4)
+        lbl_estado.pack()
+        tree.pack(fill='both', expand=True, padx=10, pady=8)
+        for entry in campos.values():
+            entry.bind('<Return>', realizar_busqueda)
+        
         self.auditoria.registrar_evento(self.usuario, "BUSQUEDA_AVANZADA", "Acceso a búsqueda avanzada")
 
     def mostrar_notificaciones(self):
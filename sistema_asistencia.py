@@ -5,7 +5,6 @@ import os
 import hashlib
 import sys
 import secrets
-import shutil
 from datetime import datetime
 from tkinter import *
 from tkinter import ttk, messagebox, filedialog
@@ -43,7 +42,11 @@ except Exception as e:
     print(f"PIL no disponible: {e}")
     PIL_AVAILABLE = False
 
-DB = "asistencia.db"
+# Todas las conexiones pasan por el monitor de consultas (config.database) y
+# se dirigen a la base de datos de la sede activa
+from config import sedes
+from config.database import conectar, ruta_base_datos, copiar_base_datos, cedula_normalizada, crear_indices_cedula
+from core.auditoria import Auditoria as AuditoriaEncadenada, EscritorAuditoria
 
 
 # ==================== MANEJADOR DE BASE DE DATOS MEJORADO ====================
@@ -51,14 +54,14 @@ DB = "asistencia.db"
 class DatabaseManager:
     """Manejador mejorado para operaciones de base de datos"""
     
-    def __init__(self, db_path="asistencia.db"):
+    def __init__(self, db_path=None):
         self.db_path = db_path
         self.cache = {}
     
     def execute_query(self, query, params=(), fetch=False):
         """Ejecuta una consulta con manejo de errores"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = conectar(self.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(query, params)
@@ -224,124 +227,11 @@ class PermisosManager:
         return cls.PERMISOS.get(rol, {}).get(permiso, False)
 # ==================== VALIDACIONES ====================
 
-import re
-
-def validar_correo(correo):
-    """
-    Valida que el correo electrónico tenga un formato correcto
-    Ejemplo: usuario@dominio.com
-    """
-    if not correo:
-        return True  # Permitir campo vacío (opcional)
-    
-    # Patrón para validar correo electrónico
-    patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if re.match(patron, correo):
-        return True
-    else:
-        return False
-
-def validar_telefono(telefono):
-    """
-    Valida que el teléfono tenga un formato correcto
-    Ejemplo: 8888-8888 o 88888888
-    """
-    if not telefono:
-        return True  # Permitir campo vacío
-    
-    # Patrón para validar teléfono (8 dígitos, con o sin guión)
-    patron = r'^(\d{8}|\d{4}-\d{4})$'
-    
-    if re.match(patron, telefono):
-        return True
-    else:
-        return False
-
-def validar_cedula(cedula):
-    """
-    Valida que la cédula tenga un formato correcto
-    Ejemplo: 001-080888-8888A o 0010808888888A
-    """
-    if not cedula:
-        return False  # Cédula es obligatoria
-    
-    # Patrón para validar cédula nicaragüense (formato flexible)
-    patron = r'^\d{3}[-]?\d{6}[-]?\d{4}[A-Za-z]?$'
-    
-    if re.match(patron, cedula):
-        return True
-    else:
-        return False
-
-def validar_solo_texto(texto):
-    """
-    Valida que el texto contenga solo letras y espacios
-    """
-    if not texto:
-        return False
-    
-    patron = r'^[A-Za-záéíóúñÑ\s]+$'
-    return bool(re.match(patron, texto))
-
-def mostrar_error_correo():
-    """Muestra un mensaje de error con ejemplo de formato correcto"""
-    messagebox.showerror(
-        "Error en formato de correo", 
-        "❌ El formato del correo electrónico no es válido.\n\n"
-        "📧 FORMATO REQUERIDO:\n"
-        "   usuario@dominio.extensión\n\n"
-        "📋 EJEMPLOS VÁLIDOS:\n"
-        "   • juan.perez@gmail.com\n"
-        "   • maria_rodriguez@instituto.edu.ni\n"
-        "   • carlos123@hotmail.com\n\n"
-        "⚠️  DEBE CONTENER:\n"
-        "   • Un símbolo @\n"
-        "   • Dominio después del @\n"
-        "   • Extensión (.com, .edu, .org, etc.)"
-    )
-
-def mostrar_error_telefono():
-    """Muestra un mensaje de error para teléfono"""
-    messagebox.showerror(
-        "Error en formato de teléfono", 
-        "❌ El formato del teléfono no es válido.\n\n"
-        "📞 FORMATOS ACEPTADOS:\n"
-        "   • 88888888 (8 dígitos)\n"
-        "   • 8888-8888 (con guión)\n\n"
-        "📋 EJEMPLOS VÁLIDOS:\n"
-        "   • 12345678\n"
-        "   • 5555-1234\n"
-        "   • 8888-8888"
-    )
-
-def mostrar_error_cedula():
-    """Muestra un mensaje de error para cédula"""
-    messagebox.showerror(
-        "Error en formato de cédula", 
-        "❌ El formato de la cédula no es válido.\n\n"
-        "🆔 FORMATOS ACEPTADOS:\n"
-        "   • 0010808888888A (13 dígitos + letra)\n"
-        "   • 001-080888-8888A (con guiones)\n\n"
-        "📋 EJEMPLOS VÁLIDOS:\n"
-        "   • 0010808888888A\n"
-        "   • 001-080888-8888A\n"
-        "   • 123-456789-1234B"
-    )
-
-def mostrar_error_texto(campo):
-    """Muestra un mensaje de error para campos de texto"""
-    messagebox.showerror(
-        f"Error en {campo}", 
-        f"❌ El campo '{campo}' solo puede contener letras y espacios.\n\n"
-        f"📝 EJEMPLOS VÁLIDOS:\n"
-        f"   • María José\n"
-        f"   • Carlos Antonio\n"
-        f"   • Ana Lucía\n\n"
-        f"⚠️  NO SE PERMITEN:\n"
-        f"   • Números (123)\n"
-        f"   • Símbolos especiales (@, #, $, etc.)"
-    )
+# Las reglas viven en utils.validators (compartidas con los módulos y la API)
+from utils.validators import (
+    validar_correo, validar_telefono, validar_cedula, validar_solo_texto,
+    mostrar_error_correo, mostrar_error_telefono, mostrar_error_cedula, mostrar_error_texto
+)
 
 # ==================== SISTEMA DE MENSAJES MEJORADO ====================
 
@@ -446,7 +336,7 @@ def hash_password(password: str, salt: str) -> str:
 
 def crear_db_y_schema():
     """Crea las tablas si no existen y realiza migraciones"""
-    conn = sqlite3.connect(DB)
+    conn = conectar()
     c = conn.cursor()
 
     # Tabla usuarios (con salt y hash)
@@ -581,6 +471,10 @@ def crear_db_y_schema():
     except:
         pass
 
+    # Migración: columna e índices únicos de cédula normalizada
+    crear_indices_cedula(c)
+    conn.commit()
+
     # Insertar admin por defecto
     try:
         c.execute("SELECT id_usuario FROM usuarios WHERE usuario='admin'")
@@ -622,7 +516,7 @@ def crear_db_y_schema():
     print("✅ Base de datos creada/actualizada correctamente")
 
 def create_user(usuario: str, password: str, rol='Usuario'):
-    conn = sqlite3.connect(DB)
+    conn = conectar()
     c = conn.cursor()
     salt = secrets.token_hex(8)
     h = hash_password(password, salt)
@@ -637,7 +531,7 @@ def create_user(usuario: str, password: str, rol='Usuario'):
     return True, "Usuario creado"
 
 def verificar_usuario(usuario, clave):
-    conn = sqlite3.connect(DB)
+    conn = conectar()
     c = conn.cursor()
     c.execute("SELECT pass_hash, salt, rol FROM usuarios WHERE usuario=?", (usuario,))
     row = c.fetchone()
@@ -658,7 +552,9 @@ def verificar_usuario(usuario, clave):
 
 class BackupManager:
     def __init__(self):
-        self.backup_dir = "backups"
+        # Cada sede respalda su propio archivo en su propio directorio
+        self.db_path = ruta_base_datos()
+        self.backup_dir = sedes.directorio_sede("backups")
         os.makedirs(self.backup_dir, exist_ok=True)
     
     def crear_backup(self):
@@ -667,7 +563,7 @@ class BackupManager:
         backup_file = os.path.join(self.backup_dir, f"asistencia_backup_{timestamp}.db")
         
         try:
-            shutil.copy2(DB, backup_file)
+            copiar_base_datos(self.db_path, backup_file)
             return True, f"Backup creado: {backup_file}"
         except Exception as e:
             return False, f"Error creando backup: {e}"
@@ -675,7 +571,8 @@ class BackupManager:
     def restaurar_backup(self, backup_file):
         """Restaura un backup"""
         try:
-            shutil.copy2(backup_file, DB)
+            # Se escribe a través de SQLite para que el WAL de la base viva no quede desfasado
+            copiar_base_datos(backup_file, self.db_path)
             return True, "Backup restaurado exitosamente"
         except Exception as e:
             return False, f"Error restaurando backup: {e}"
@@ -697,26 +594,12 @@ class Auditoria:
         self.crear_tabla_auditoria()
     
     def crear_tabla_auditoria(self):
-        """Crea la tabla de auditoría si no existe"""
-        query = """
-            CREATE TABLE IF NOT EXISTS auditoria (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                usuario TEXT NOT NULL,
-                accion TEXT NOT NULL,
-                detalles TEXT,
-                fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                ip TEXT
-            )
-        """
-        self.db_manager.execute_query(query)
+        """Crea las tablas de auditoría, con la cadena de hashes y sus checkpoints"""
+        AuditoriaEncadenada(self.db_manager)
     
     def registrar_evento(self, usuario, accion, detalles="", ip="localhost"):
-        """Registra un evento en la auditoría"""
-        query = """
-            INSERT INTO auditoria (usuario, accion, detalles, ip)
-            VALUES (?, ?, ?, ?)
-        """
-        self.db_manager.execute_query(query, (usuario, accion, detalles, ip))
+        """Registra un evento en la auditoría (encadenado por el escritor de core.auditoria)"""
+        EscritorAuditoria.obtener(self.db_manager.db_path).encolar(usuario, accion, detalles, ip)
         logger.info(f"AUDITORIA - Usuario: {usuario}, Acción: {accion}, Detalles: {detalles}")
 
 # ==================== SISTEMA DE NOTIFICACIONES MEJORADO ====================
@@ -1063,7 +946,7 @@ class GestionEstudiantes:
 
     def cargar_carreras(self):
         """Cargar carreras disponibles desde la base de datos"""
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("SELECT nombre FROM carreras ORDER BY nombre")
@@ -1090,7 +973,7 @@ class GestionEstudiantes:
         """Llenar la tabla con datos de estudiantes"""
         for i in self.tree.get_children(): 
             self.tree.delete(i)
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("""
@@ -1167,13 +1050,15 @@ class GestionEstudiantes:
             self.txt_telefono.focus_set()
             return
             
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("""
-                INSERT INTO estudiantes (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion))
+                INSERT INTO estudiantes (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion,
+                                         cedula_normalizada)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion,
+                  cedula_normalizada(cedula)))
             conn.commit()
             
             # MENSAJE MEJORADO - Mantiene el foco
@@ -1279,14 +1164,16 @@ class GestionEstudiantes:
             mostrar_error_telefono()
             return
             
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("""
                 UPDATE estudiantes 
-                SET cedula=?, nombres=?, apellidos=?, carrera=?, anio=?, seccion=?, telefono=?, direccion=?
+                SET cedula=?, nombres=?, apellidos=?, carrera=?, anio=?, seccion=?, telefono=?, direccion=?,
+                    cedula_normalizada=?
                 WHERE id=?
-            """, (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion, estudiante_id))
+            """, (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion,
+                  cedula_normalizada(cedula), estudiante_id))
             
             if c.rowcount > 0:
                 conn.commit()
@@ -1330,7 +1217,7 @@ class GestionEstudiantes:
         if not respuesta:
             return
             
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
             c.execute("DELETE FROM estudiantes WHERE id=?", (estudiante_id,))
@@ -1641,7 +1528,7 @@ class Login:
             
             # Obtener rol real de la DB para pasar al menú
             rol_actual = "Usuario"
-            conn = sqlite3.connect(DB)
+            conn = conectar()
             c = conn.cursor()
             c.execute("SELECT rol FROM usuarios WHERE usuario=?", (usuario_actual,))
             row = c.fetchone()
@@ -1811,7 +1698,7 @@ class Dashboard:
         self.tree.pack(fill=BOTH, expand=True)
     
     def cargar_estadisticas(self):
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         
         # Total estudiantes
@@ -2425,11 +2312,12 @@ class GestionDocentes:
             self.txt_telefono.focus_set()
             return
         
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         try:
-            c.execute("INSERT INTO docentes (cedula, nombres, apellido, especialidad, email, telefono) VALUES (?, ?, ?, ?, ?, ?)",
-                      (ced, nom, ape, esp, email, tel))
+            c.execute("INSERT INTO docentes (cedula, nombres, apellido, especialidad, email, telefono, cedula_normalizada) "
+                      "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                      (ced, nom, ape, esp, email, tel, cedula_normalizada(ced)))
             conn.commit()
             messagebox.showinfo("Éxito", "Docente agregado correctamente.")
             self.llenar_docentes()
@@ -2450,7 +2338,7 @@ class GestionDocentes:
     def llenar_docentes(self):
         for i in self.tree.get_children(): 
             self.tree.delete(i)
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         c.execute("SELECT id_docente, cedula, nombres, apellido, especialidad, email, telefono, estado FROM docentes ORDER BY id_docente DESC")
         for row in c.fetchall():
@@ -2463,7 +2351,7 @@ class GestionDocentes:
             messagebox.showwarning("Atención", "Seleccione un docente.")
             return
         id_doc = self.tree.item(sel[0])["values"][0]
-        conn = sqlite3.connect(DB)
+        conn = conectar()
         c = conn.cursor()
         c.execute("UPDATE docentes SET estado='INACTIVO' WHERE id_docente=?", (id_doc,))
         conn.commit()
@@ -2520,7 +2408,7 @@ class GestionAsistencia:
         self.llenar_tabla()
 
     def crear_tabla(self):
-        conn = sqlite3.connect(DB); c = conn.cursor()
+        conn = conectar(); c = conn.cursor()
         c.execute("""
             CREATE TABLE IF NOT EXISTS asistencia (
                 id_asistencia INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -2536,7 +2424,7 @@ class GestionAsistencia:
         conn.commit(); conn.close()
 
     def cargar_estudiantes(self):
-        conn = sqlite3.connect(DB); c = conn.cursor()
+        conn = conectar(); c = conn.cursor()
         # si la tabla no existe o está vacía, la combobox quedará vacía
         try:
             c.execute("SELECT id, nombres || ' ' || apellidos FROM estudiantes ORDER BY nombres")
@@ -2559,7 +2447,7 @@ class GestionAsistencia:
         hora = datetime.now().strftime("%H:%M:%S")
         estado = self.cmb_estado.get()
         obs = self.txt_obs.get().strip()
-        conn = sqlite3.connect(DB); c = conn.cursor()
+        conn = conectar(); c = conn.cursor()
         # evitar duplicados: si ya hay entrada hoy para ese estudiante
         c.execute("SELECT id_asistencia FROM asistencia WHERE id_estudiante=? AND fecha=?", (id_est, fecha))
         if c.fetchone():
@@ -2578,7 +2466,7 @@ class GestionAsistencia:
             return
         id_asist = self.tree.item(sel[0])['values'][0]
         hora_salida = datetime.now().strftime("%H:%M:%S")
-        conn = sqlite3.connect(DB); c = conn.cursor()
+        conn = conectar(); c = conn.cursor()
         c.execute("UPDATE asistencia SET hora_salida=? WHERE id_asistencia=?", (hora_salida, id_asist))
         conn.commit(); conn.close()
         messagebox.showinfo("Éxito", "Salida registrada correctamente.")
@@ -2586,7 +2474,7 @@ class GestionAsistencia:
 
     def llenar_tabla(self):
         for i in self.tree.get_children(): self.tree.delete(i)
-        conn = sqlite3.connect(DB); c = conn.cursor()
+        conn = conectar(); c = conn.cursor()
         c.execute("""
             SELECT a.id_asistencia,
                    e.nombres || ' ' || e.apellidos as estudiante,
@@ -2649,7 +2537,7 @@ class GestionUsuarios:
 
     def llenar_tabla(self):
         for i in self.tree.get_children(): self.tree.delete(i)
-        conn = sqlite3.connect(DB); c = conn.cursor()
+        conn = conectar(); c = conn.cursor()
         c.execute("SELECT id_usuario, usuario, rol FROM usuarios ORDER BY id_usuario DESC")
         for row in c.fetchall():
             self.tree.insert("", "end", values=row)
@@ -2667,7 +2555,7 @@ class ReporteGeneral:
         for col in ("id","estudiante","fecha","hora_entrada","hora_salida","estado"):
             tree.heading(col, text=col.capitalize()); tree.column(col, width=140)
         tree.pack(fill="both", expand=True, padx=10, pady=8)
-        conn = sqlite3.connect(DB); c = conn.cursor()
+        conn = conectar(); c = conn.cursor()
         c.execute("""
             SELECT a.id_asistencia, e.nombres || ' ' || e.apellidos, a.fecha, a.hora_entrada, IFNULL(a.hora_salida, '-'), a.estado
             FROM asistencia a
@@ -2695,7 +2583,7 @@ class ReportePorFecha:
     def buscar(self):
         fecha = self.txt_fecha.get().strip()
         for i in self.tree.get_children(): self.tree.delete(i)
-        conn = sqlite3.connect(DB); c = conn.cursor()
+        conn = conectar(); c = conn.cursor()
         c.execute("""
             SELECT a.id_asistencia, e.nombres || ' ' || e.apellidos, a.fecha, a.hora_entrada, IFNULL(a.hora_salida,'-'), a.estado
             FROM asistencia a
@@ -2742,25 +2630,42 @@ def configurar_fondos_personalizados():
 # ==================== INICIALIZACIÓN MEJORADA ====================
 
 def insertar_datos_prueba():
-    conn = sqlite3.connect(DB)
+    conn = conectar()
     c = conn.cursor()
 
     nombres = ["Juan", "Carlos", "Ana", "Pedro", "Luis", "María", "Sofía", "Jorge", "Elena", "Andrés"]
     apellidos = ["Martínez", "López", "García", "Hernández", "Torres", "Gómez", "Ramírez", "Castillo", "Rivas"]
 
+    # Cédulas ya usadas (normalizadas) para no generar repetidas
+    usadas = set()
+    for tabla in ("estudiantes", "docentes"):
+        c.execute(f"SELECT cedula FROM {tabla} WHERE cedula IS NOT NULL")
+        usadas.update(fila[0].replace("-", "").replace(" ", "").upper() for fila in c.fetchall())
+
+    def cedula_nueva():
+        # Formato nicaragüense: 001-080888-8888A
+        while True:
+            cedula = (f"{random.randint(1, 999):03d}-{random.randint(10101, 311299):06d}-"
+                      f"{random.randint(0, 9999):04d}{random.choice('ABCDEFGHJKLMNPQRSTUVWXY')}")
+            clave = cedula.replace("-", "")
+            if clave not in usadas:
+                usadas.add(clave)
+                return cedula
+
     # Insertar 20 estudiantes aleatorios
     for _ in range(20):
         nombre = random.choice(nombres)
         apellido = random.choice(apellidos)
-        cedula = f"{random.randint(100_000, 900_000)}-{random.randint(1000, 9999)}"
+        cedula = cedula_nueva()
         carrera = random.choice(["Técnico en Informática", "Técnico en Electrónica", "Técnico en Administración"])
         anio = random.choice(["1", "2", "3"])
         seccion = random.choice(["A", "B", "C"])
 
         c.execute("""
-            INSERT INTO estudiantes (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (cedula, nombre, apellido, carrera, anio, seccion, "8888-0000", "Managua"))
+            INSERT INTO estudiantes (cedula, nombres, apellidos, carrera, anio, seccion, telefono, direccion,
+                                     cedula_normalizada)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (cedula, nombre, apellido, carrera, anio, seccion, "8888-0000", "Managua", cedula_normalizada(cedula)))
 
     # Insertar 10 docentes aleatorios
     especialidades = ["Informática", "Matemática", "Electrónica", "Inglés", "Física"]
@@ -2768,13 +2673,14 @@ def insertar_datos_prueba():
     for _ in range(10):
         nombre = random.choice(nombres)
         apellido = random.choice(apellidos)
-        cedula = f"{random.randint(100_000, 900_000)}-{random.randint(1000, 9999)}"
+        cedula = cedula_nueva()
         esp = random.choice(especialidades)
 
         c.execute("""
-            INSERT INTO docentes (cedula, nombres, apellido, especialidad, email, telefono, estado)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (cedula, nombre, apellido, esp, f"{nombre.lower()}@gmail.com", "8888-2222", "ACTIVO"))
+            INSERT INTO docentes (cedula, nombres, apellido, especialidad, email, telefono, estado, cedula_normalizada)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (cedula, nombre, apellido, esp, f"{nombre.lower()}@gmail.com", "8888-2222", "ACTIVO",
+              cedula_normalizada(cedula)))
 
     conn.commit()
     conn.close()
@@ -0,0 +1,41 @@
+"""
+Indicador visual de ventana ocupada mientras corren tareas en segundo plano
+"""
+
+from tkinter import ttk
+
+class IndicadorOcupado:
+    """Cursor de espera y barra de progreso indeterminada sobre una ventana"""
+
+    def __init__(self, ventana):
+        self.ventana = ventana
+        self.activas = 0
+        self._cursor_original = ""
+        self._barra = None
+
+    def ajustar(self, delta: int):
+        """Suma o resta tareas activas y muestra/oculta el indicador"""
+        anteriores = self.activas
+        self.activas = max(0, self.activas + delta)
+        try:
+            if anteriores == 0 and self.activas > 0:
+                self._mostrar()
+            elif anteriores > 0 and self.activas == 0:
+                self._ocultar()
+        except Exception:
+            # La ventana pudo cerrarse mientras la tarea corría
+            self.activas = 0
+
+    def _mostrar(self):
+        self._cursor_original = self.ventana.cget("cursor")
+        self.ventana.config(cursor="watch")
+        self._barra = ttk.Progressbar(self.ventana, mode="indeterminate", length=160)
+        self._barra.place(relx=1.0, rely=1.0, anchor="se", x=-8, y=-8)
+        self._barra.start(12)
+
+    def _ocultar(self):
+        self.ventana.config(cursor=self._cursor_original)
+        if self._barra is not None:
+            self._barra.stop()
+            self._barra.destroy()
+            self._barra = None
@@ -0,0 +1,172 @@
+"""
+Selector de estudiantes con autocompletado
+
+Filtra mientras se escribe (nombre desde cualquier palabra o cédula) usando
+el índice de prefijos de IndiceEstudiantes y muestra solo las primeras
+coincidencias. El valor seleccionado es el id del estudiante, de modo que
+dos estudiantes con el mismo nombre no se confunden.
+"""
+
+import tkinter as tk
+from tkinter import Frame, Entry, Listbox, Toplevel
+from typing import Callable, Optional
+
+from core.indice_estudiantes import IndiceEstudiantes
+from core.tareas import ejecutar_en_segundo_plano
+
+
+class SelectorEstudiante(Frame):
+    """Entrada de texto con lista desplegable de coincidencias
+
+        selector = SelectorEstudiante(frm, width=40)
+        selector.grid(row=0, column=1)
+        ...
+        id_estudiante = selector.id_estudiante
+    """
+
+    def __init__(self, master, width: int = 40, max_resultados: int = 12, retraso_ms: int = 120,
+                 db_path: str = None, al_seleccionar: Optional[Callable[[int], None]] = None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.indice = IndiceEstudiantes.obtener(db_path)
+        self.max_resultados = max_resultados
+        self.retraso_ms = retraso_ms
+        self.al_seleccionar = al_seleccionar
+        self.id_estudiante: Optional[int] = None
+        self._resultados = []
+        self._programada = None
+        self._texto_mostrado = ""
+
+        self.entrada = Entry(self, width=width)
+        self.entrada.pack(fill=tk.X)
+        self.entrada.bind("<KeyRelease>", self._al_escribir)
+        self.entrada.bind("<Down>", self._bajar)
+        self.entrada.bind("<Return>", self._elegir_primero)
+        self.entrada.bind("<Escape>", lambda event: self._ocultar())
+        self.entrada.bind("<FocusOut>", lambda event: self.after(150, self._ocultar_si_sin_foco))
+
+        self._popup = None
+        self._lista = None
+        self.preparar()
+
+    # ==================== ÍNDICE ====================
+
+    def preparar(self):
+        """Construye el índice en segundo plano si aún no existe"""
+        if not self.indice.construido:
+            ejecutar_en_segundo_plano(self, self.indice.construir)
+
+    # ==================== BÚSQUEDA ====================
+
+    def _al_escribir(self, event):
+        if event.keysym in ("Down", "Up", "Return", "Escape", "Tab"):
+            return
+        texto = self.entrada.get()
+        if texto == self._texto_mostrado:
+            return
+        # Al editar el texto se descarta la selección anterior
+        self.id_estudiante = None
+        if self._programada is not None:
+            self.after_cancel(self._programada)
+        self._programada = self.after(self.retraso_ms, self._buscar)
+
+    def _buscar(self):
+        self._programada = None
+        texto = self.entrada.get().strip()
+        if not texto:
+            self._ocultar()
+            return
+        if not self.indice.construido:
+            # Índice en construcción: reintentar en breve sin bloquear la interfaz
+            self._programada = self.after(200, self._buscar)
+            return
+        self._resultados = self.indice.buscar(texto, self.max_resultados)
+        self._mostrar_lista()
+
+    # ==================== LISTA DESPLEGABLE ====================
+
+    @staticmethod
+    def _etiqueta(nombre: str, cedula: str) -> str:
+        return f"{nombre} — {cedula}" if cedula else nombre
+
+    def _mostrar_lista(self):
+        if not self._resultados:
+            self._ocultar()
+            return
+        if self._popup is None:
+            self._popup = Toplevel(self)
+            self._popup.overrideredirect(True)
+            self._lista = Listbox(self._popup, activestyle="dotbox", exportselection=False)
+            self._lista.pack(fill=tk.BOTH, expand=True)
+            self._lista.bind("<ButtonRelease-1>", lambda event: self._elegir(self._lista.curselection()))
+            self._lista.bind("<Return>", lambda event: self._elegir(self._lista.curselection()))
+            self._lista.bind("<Escape>", lambda event: (self._ocultar(), self.entrada.focus_set()))
+            self._lista.bind("<Up>", self._subir)
+        self._lista.delete(0, tk.END)
+        for _, nombre, cedula in self._resultados:
+            self._lista.insert(tk.END, self._etiqueta(nombre, cedula))
+        self._lista.config(height=len(self._resultados))
+
+        x = self.entrada.winfo_rootx()
+        y = self.entrada.winfo_rooty() + self.entrada.winfo_height()
+        self._popup.geometry(f"{max(self.entrada.winfo_width(), 280)}x{self._lista.winfo_reqheight()}+{x}+{y}")
+        self._popup.deiconify()
+        self._popup.lift()
+
+    def _ocultar(self):
+        if self._popup is not None:
+            self._popup.withdraw()
+
+    def _ocultar_si_sin_foco(self):
+        foco = self.focus_get()
+        if foco is not self._lista:
+            self._ocultar()
+
+    def _bajar(self, event):
+        if self._popup is not None and self._resultados:
+            self._lista.focus_set()
+            self._lista.selection_clear(0, tk.END)
+            self._lista.selection_set(0)
+            self._lista.activate(0)
+        return "break"
+
+    def _subir(self, event):
+        if self._lista.curselection() == (0,):
+            self.entrada.focus_set()
+            return "break"
+        return None
+
+    def _elegir_primero(self, event):
+        if self.id_estudiante is None and self._resultados:
+            self._elegir((0,))
+        return "break"
+
+    def _elegir(self, seleccion):
+        if not seleccion:
+            return
+        id_estudiante, nombre, cedula = self._resultados[seleccion[0]]
+        self.establecer(id_estudiante, self._etiqueta(nombre, cedula))
+        self._ocultar()
+        self.entrada.focus_set()
+        if self.al_seleccionar:
+            self.al_seleccionar(id_estudiante)
+
+    # ==================== API ====================
+
+    def establecer(self, id_estudiante: Optional[int], texto: str = None):
+        """Selecciona un estudiante por id (o limpia con None)"""
+        self.id_estudiante = id_estudiante
+        if texto is None and id_estudiante is not None:
+            texto = self.indice.nombre(id_estudiante)
+        self._texto_mostrado = texto or ""
+        self.entrada.delete(0, tk.END)
+        self.entrada.insert(0, self._texto_mostrado)
+
+    def limpiar(self):
+        self.establecer(None, "")
+        self._ocultar()
+
+    def get(self) -> str:
+        return self.entrada.get()
+
+    def focus_set(self):
+        self.entrada.focus_set()
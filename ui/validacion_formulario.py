@@ -0,0 +1,132 @@
+"""
+Validación en tiempo real de formularios con retardo (debounce)
+
+Las pulsaciones se agrupan: el campo se valida cuando el usuario deja de
+escribir durante `retraso_ms`. Los widgets solo se reconfiguran cuando
+cambia el estado del campo, y las verificaciones contra la base de datos
+(por ejemplo, cédula ya registrada) corren en un hilo de trabajo.
+"""
+
+import logging
+from typing import Callable, Dict, Optional
+
+from core.tareas import EjecutorTareas
+
+logger = logging.getLogger(__name__)
+
+VACIO = "vacio"
+VALIDO = "valido"
+INVALIDO = "invalido"
+
+COLORES = {VACIO: "white", VALIDO: "#f0fff4", INVALIDO: "#fff0f0"}
+
+
+class ValidadorFormulario:
+    """Valida los campos de un formulario según un Esquema de utils.validators
+
+        validador = ValidadorFormulario(ESQUEMA_DOCENTE, {"cedula": txt_cedula, ...},
+                                        verificar_unico={"cedula": cedula_registrada})
+
+    verificar_unico asocia un campo con una función valor -> bool (True si el
+    valor ya existe) que se ejecuta en segundo plano cuando el formato es válido.
+    al_cambiar(campo, estado, mensaje) se llama solo cuando el estado cambia.
+    """
+
+    def __init__(self, esquema, entradas: Dict[str, object], retraso_ms: int = 150,
+                 verificar_unico: Optional[Dict[str, Callable[[str], bool]]] = None,
+                 al_cambiar: Optional[Callable[[str, str, Optional[str]], None]] = None):
+        self.esquema = esquema
+        self.entradas = dict(entradas)
+        self.retraso_ms = retraso_ms
+        self.verificar_unico = verificar_unico or {}
+        self.al_cambiar = al_cambiar
+        self._programadas = {}
+        self._estados = {}
+        self._consultas = {}
+        for campo, entrada in self.entradas.items():
+            entrada.bind("<KeyRelease>", lambda event, c=campo: self.programar(c), add="+")
+            entrada.bind("<FocusOut>", lambda event, c=campo: self.validar(c), add="+")
+
+    def programar(self, campo: str):
+        """Reinicia la espera del campo; valida cuando se deja de escribir"""
+        entrada = self.entradas[campo]
+        anterior = self._programadas.pop(campo, None)
+        if anterior is not None:
+            entrada.after_cancel(anterior)
+        self._programadas[campo] = entrada.after(self.retraso_ms, self.validar, campo)
+
+    def validar(self, campo: str):
+        """Valida el campo de inmediato"""
+        entrada = self.entradas[campo]
+        programada = self._programadas.pop(campo, None)
+        if programada is not None:
+            entrada.after_cancel(programada)
+        if not entrada.winfo_exists():
+            return
+
+        valor = entrada.get().strip()
+        if not valor:
+            self._cancelar_consulta(campo)
+            self._aplicar(campo, VACIO, None)
+            return
+        error = self.esquema.validar_campo(campo, valor)
+        if error:
+            self._cancelar_consulta(campo)
+            self._aplicar(campo, INVALIDO, error)
+        elif campo in self.verificar_unico:
+            # El estado se aplica al llegar la respuesta, sin parpadeo intermedio
+            self._consultar_unico(campo, valor)
+        else:
+            self._aplicar(campo, VALIDO, None)
+
+    def _consultar_unico(self, campo: str, valor: str):
+        consulta = self._consultas.get(campo)
+        if consulta is not None and consulta[0] == valor:
+            return
+        self._cancelar_consulta(campo)
+        entrada = self.entradas[campo]
+
+        def al_terminar(existe):
+            self._consultas.pop(campo, None)
+            if not entrada.winfo_exists() or entrada.get().strip() != valor:
+                return
+            if existe:
+                self._aplicar(campo, INVALIDO, f"{self.esquema.campo(campo).etiqueta.capitalize()} ya registrada")
+            else:
+                self._aplicar(campo, VALIDO, None)
+
+        def al_error(e):
+            self._consultas.pop(campo, None)
+            logger.warning(f"⚠️ No se pudo verificar {campo} '{valor}': {e}")
+
+        # Sin widget: una verificación silenciosa no muestra el indicador de ocupado
+        tarea = EjecutorTareas.obtener(entrada).enviar(self.verificar_unico[campo], valor,
+                                                        al_terminar=al_terminar, al_error=al_error)
+        self._consultas[campo] = (valor, tarea)
+
+    def _cancelar_consulta(self, campo: str):
+        consulta = self._consultas.pop(campo, None)
+        if consulta is not None:
+            consulta[1].cancelar()
+
+    def _aplicar(self, campo: str, estado: str, mensaje: Optional[str]):
+        """Reconfigura el widget solo si el estado o el mensaje cambiaron"""
+        if self._estados.get(campo) == (estado, mensaje):
+            return
+        self._estados[campo] = (estado, mensaje)
+        self.entradas[campo].config(bg=COLORES[estado])
+        if self.al_cambiar:
+            self.al_cambiar(campo, estado, mensaje)
+
+    def estado(self, campo: str) -> Optional[str]:
+        actual = self._estados.get(campo)
+        return actual[0] if actual else None
+
+    def reiniciar(self):
+        """Cancela validaciones pendientes y deja los campos en blanco"""
+        for campo, entrada in self.entradas.items():
+            programada = self._programadas.pop(campo, None)
+            if programada is not None:
+                entrada.after_cancel(programada)
+            self._cancelar_consulta(campo)
+            self._aplicar(campo, VACIO, None)
@@ -1,10 +1,33 @@
 """
-Validaciones de datos para formularios
+Validaciones de datos para formularios, importaciones y la API
+
+Las reglas de cada entidad se declaran una sola vez como un Esquema de
+Campos (ESQUEMA_ESTUDIANTE, ESQUEMA_DOCENTE, ESQUEMA_USUARIO y
+ESQUEMA_REGISTRO_API para el cuerpo de /api/checkin y /api/checkout). El mismo
+esquema valida un formulario campo por campo o miles de filas con
+validar_muchos(), que aplica cada regla a la columna completa.
 """
 
 import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from tkinter import messagebox
 
+# Patrones compilados una sola vez (se usan por pulsación y en importaciones masivas)
+PATRON_CORREO = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PATRON_TELEFONO = re.compile(r'^(\d{8}|\d{4}-\d{4})$')
+PATRON_CEDULA = re.compile(r'^\d{3}[-]?\d{6}[-]?\d{4}[A-Za-z]?$')
+PATRON_SOLO_TEXTO = re.compile(r'^[A-Za-záéíóúñÑ\s]+$')
+PATRON_NUMERO = re.compile(r'^\d+$')
+PATRON_HORA = re.compile(r'^([01]\d|2[0-3]):[0-5]\d(:[0-5]\d)?$')
+
+def es_fecha_iso(texto: str) -> bool:
+    """AAAA-MM-DD y además una fecha que existe (rechaza 2026-02-30)"""
+    try:
+        return len(texto) == 10 and datetime.strptime(texto, "%Y-%m-%d") is not None
+    except ValueError:
+        return False
+
 def validar_correo(correo: str) -> bool:
     """
     Valida que el correo electrónico tenga un formato correcto
@@ -13,10 +36,7 @@ def validar_correo(correo: str) -> bool:
     if not correo:
         return True  # Permitir campo vacío (opcional)
     
-    # Patrón para validar correo electrónico
-    patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    return bool(re.match(patron, correo))
+    return bool(PATRON_CORREO.match(correo))
 
 def validar_telefono(telefono: str) -> bool:
     """
@@ -26,10 +46,8 @@ def validar_telefono(telefono: str) -> bool:
     if not telefono:
         return True  # Permitir campo vacío
     
-    # Patrón para validar teléfono (8 dígitos, con o sin guión)
-    patron = r'^(\d{8}|\d{4}-\d{4})$'
-    
-    return bool(re.match(patron, telefono))
+    # 8 dígitos, con o sin guión
+    return bool(PATRON_TELEFONO.match(telefono))
 
 def validar_cedula(cedula: str) -> bool:
     """
@@ -39,10 +57,8 @@ def validar_cedula(cedula: str) -> bool:
     if not cedula:
         return False  # Cédula es obligatoria
     
-    # Patrón para validar cédula nicaragüense (formato flexible)
-    patron = r'^\d{3}[-]?\d{6}[-]?\d{4}[A-Za-z]?$'
-    
-    return bool(re.match(patron, cedula))
+    # Cédula nicaragüense (formato flexible)
+    return bool(PATRON_CEDULA.match(cedula))
 
 def validar_solo_texto(texto: str) -> bool:
     """
@@ -51,8 +67,7 @@ def validar_solo_texto(texto: str) -> bool:
     if not texto:
         return False
     
-    patron = r'^[A-Za-záéíóúñÑ\s]+$'
-    return bool(re.match(patron, texto))
+    return bool(PATRON_SOLO_TEXTO.match(texto))
 
 def validar_numero(texto: str) -> bool:
     """
@@ -61,7 +76,153 @@ def validar_numero(texto: str) -> bool:
     if not texto:
         return True  # Permitir vacío
     
-    return texto.isdigit()
+    return bool(PATRON_NUMERO.match(texto))
+
+# ==================== ESQUEMAS DECLARATIVOS ====================
+
+OBLIGATORIO = "Campo obligatorio"
+
+# tipo de campo -> (patrón o función de validación, mensaje de error)
+FORMATOS = {
+    'cedula': (PATRON_CEDULA, "Formato inválido (001-080888-8888A)"),
+    'texto': (PATRON_SOLO_TEXTO, "Solo letras y espacios"),
+    'telefono': (PATRON_TELEFONO, "Formato inválido (8888-8888)"),
+    'correo': (PATRON_CORREO, "Formato inválido (usuario@dominio.com)"),
+    'numero': (PATRON_NUMERO, "Solo números"),
+    'fecha': (es_fecha_iso, "Formato inválido (AAAA-MM-DD)"),
+    'hora': (PATRON_HORA, "Formato inválido (HH:MM o HH:MM:SS)"),
+}
+
+ErroresFila = List[Tuple[str, str]]
+
+class Campo:
+    """Regla de un campo: obligatoriedad, formato, largo y valores permitidos"""
+
+    __slots__ = ("nombre", "etiqueta", "tipo", "obligatorio", "min_largo", "max_largo", "opciones")
+
+    def __init__(self, nombre: str, etiqueta: str = None, tipo: str = None, obligatorio: bool = False,
+                 min_largo: int = 0, max_largo: int = None, opciones: Sequence[str] = None):
+        if tipo is not None and tipo not in FORMATOS:
+            raise ValueError(f"Tipo de campo desconocido: {tipo}")
+        self.nombre = nombre
+        self.etiqueta = etiqueta or nombre
+        self.tipo = tipo
+        self.obligatorio = obligatorio
+        self.min_largo = min_largo
+        self.max_largo = max_largo
+        self.opciones = frozenset(opciones) if opciones else None
+
+    def error(self, valor) -> Optional[str]:
+        """Mensaje de error del valor, o None si es válido"""
+        return self.errores_columna([valor])[0]
+
+    def errores_columna(self, valores: Sequence) -> List[Optional[str]]:
+        """Aplica la regla a todos los valores de una columna a la vez"""
+        textos = ["" if v is None else str(v).strip() for v in valores]
+        errores = [OBLIGATORIO if self.obligatorio and not t else None for t in textos]
+        # Los vacíos opcionales son válidos; solo se revisan los que tienen contenido
+        pendientes = [i for i, t in enumerate(textos) if t and errores[i] is None]
+        if self.tipo and pendientes:
+            patron, mensaje = FORMATOS[self.tipo]
+            coincide = getattr(patron, "match", patron)
+            for i in pendientes:
+                if not coincide(textos[i]):
+                    errores[i] = mensaje
+        if self.min_largo or self.max_largo:
+            for i in pendientes:
+                if errores[i] is None:
+                    largo = len(textos[i])
+                    if largo < self.min_largo:
+                        errores[i] = f"Mínimo {self.min_largo} caracteres"
+                    elif self.max_largo and largo > self.max_largo:
+                        errores[i] = f"Máximo {self.max_largo} caracteres"
+        if self.opciones:
+            for i in pendientes:
+                if errores[i] is None and textos[i] not in self.opciones:
+                    errores[i] = f"Valor no permitido (use: {', '.join(sorted(self.opciones))})"
+        return errores
+
+
+class Esquema:
+    """Conjunto ordenado de campos de una entidad"""
+
+    def __init__(self, nombre: str, campos: Iterable[Campo]):
+        self.nombre = nombre
+        self.campos = tuple(campos)
+        self._por_nombre = {c.nombre: c for c in self.campos}
+
+    @property
+    def nombres(self) -> Tuple[str, ...]:
+        return tuple(c.nombre for c in self.campos)
+
+    @property
+    def obligatorios(self) -> Tuple[str, ...]:
+        return tuple(c.nombre for c in self.campos if c.obligatorio)
+
+    def campo(self, nombre: str) -> Campo:
+        return self._por_nombre[nombre]
+
+    def validar_campo(self, nombre: str, valor) -> Optional[str]:
+        """Valida un solo campo (validación en tiempo real de formularios)"""
+        return self._por_nombre[nombre].error(valor)
+
+    def validar(self, fila: Dict[str, str]) -> ErroresFila:
+        """Errores (campo, mensaje) de una fila, en el orden del esquema"""
+        return self.validar_muchos([fila])[0]
+
+    def validar_muchos(self, filas: Sequence[Dict[str, str]]) -> List[ErroresFila]:
+        """Valida muchas filas; devuelve un vector de errores por fila (vacío si es válida)"""
+        errores = [[] for _ in filas]
+        for campo in self.campos:
+            columna = campo.errores_columna([fila.get(campo.nombre) for fila in filas])
+            for i, mensaje in enumerate(columna):
+                if mensaje:
+                    errores[i].append((campo.nombre, mensaje))
+        return errores
+
+    def limpiar(self, fila: Dict[str, str]) -> Dict[str, str]:
+        """Fila con solo los campos del esquema, sin espacios sobrantes"""
+        return {c.nombre: str(fila.get(c.nombre) or "").strip() for c in self.campos}
+
+
+ESQUEMA_ESTUDIANTE = Esquema("estudiante", [
+    Campo("cedula", "cédula", "cedula", obligatorio=True),
+    Campo("nombres", "nombres", "texto", obligatorio=True, max_largo=100),
+    Campo("apellidos", "apellidos", "texto", obligatorio=True, max_largo=100),
+    Campo("carrera", "carrera", obligatorio=True),
+    Campo("anio", "año", max_largo=20),
+    Campo("seccion", "sección", max_largo=20),
+    Campo("telefono", "teléfono", "telefono"),
+    Campo("direccion", "dirección", max_largo=200),
+    Campo("acudiente", "acudiente", "texto", max_largo=100),
+    Campo("acudiente_correo", "correo del acudiente", "correo"),
+    Campo("acudiente_telefono", "teléfono del acudiente", "telefono"),
+])
+
+ESQUEMA_DOCENTE = Esquema("docente", [
+    Campo("cedula", "cédula", "cedula", obligatorio=True),
+    Campo("nombres", "nombres", "texto", obligatorio=True, max_largo=100),
+    Campo("apellido", "apellidos", "texto", obligatorio=True, max_largo=100),
+    Campo("especialidad", "especialidad", obligatorio=True),
+    Campo("email", "correo", "correo"),
+    Campo("telefono", "teléfono", "telefono"),
+])
+
+ESQUEMA_USUARIO = Esquema("usuario", [
+    Campo("usuario", "usuario", obligatorio=True, max_largo=50),
+    Campo("password", "contraseña", obligatorio=True, min_largo=4),
+    Campo("rol", "rol", obligatorio=True, opciones=("Administrador", "Docente", "Estudiante")),
+])
+
+# Estados que un kiosco puede enviar; "Automático" (o ninguno) lo decide el motor de reglas
+ESTADOS_ASISTENCIA = ("Presente", "Tarde", "Ausente", "Justificado", "Automático")
+
+ESQUEMA_REGISTRO_API = Esquema("registro de asistencia", [
+    Campo("fecha", "fecha", "fecha"),
+    Campo("hora", "hora", "hora"),
+    Campo("estado", "estado", opciones=ESTADOS_ASISTENCIA),
+    Campo("observaciones", "observaciones", max_largo=500),
+])
 
 def mostrar_error_correo():
     """Muestra un mensaje de error con ejemplo de formato correcto"""
@@ -121,3 +282,22 @@ def mostrar_error_texto(campo: str):
         f"   • Números (123)\n"
         f"   • Símbolos especiales (@, #, $, etc.)"
     )
+
+def mostrar_error_campo(esquema: Esquema, nombre: str, mensaje: str, parent=None):
+    """Muestra el error de un campo con el diálogo de ejemplos de su tipo"""
+    campo = esquema.campo(nombre)
+    if mensaje == OBLIGATORIO:
+        messagebox.showwarning("Atención", f"El campo '{campo.etiqueta}' es obligatorio.", parent=parent)
+    elif mensaje == FORMATOS.get(campo.tipo, (None, None))[1]:
+        if campo.tipo == 'cedula':
+            mostrar_error_cedula()
+        elif campo.tipo == 'telefono':
+            mostrar_error_telefono()
+        elif campo.tipo == 'correo':
+            mostrar_error_correo()
+        elif campo.tipo == 'texto':
+            mostrar_error_texto(campo.etiqueta)
+        else:
+            messagebox.showerror(f"Error en {campo.etiqueta}", f"❌ {mensaje}", parent=parent)
+    else:
+        messagebox.showerror(f"Error en {campo.etiqueta}", f"❌ {mensaje}", parent=parent)
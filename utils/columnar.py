@@ -0,0 +1,221 @@
+"""
+Archivo columnar compacto para históricos de asistencia
+
+Formato (inspirado en Parquet, solo biblioteca estándar):
+
+    MAGIA
+    grupo de filas 1: un bloque comprimido por columna
+    grupo de filas 2: ...
+    pie JSON (esquema, posición y tamaño de cada bloque)
+    longitud del pie (8 bytes) + MAGIA
+
+Las columnas de texto se codifican con diccionario por grupo de filas
+(valores únicos + índices enteros), las numéricas como arreglos binarios.
+Los nulos se marcan con un mapa de bits. Se puede leer una sola columna
+sin descomprimir las demás.
+
+Sin tipos declarados, cada grupo guarda los tipos inferidos de sus propios
+valores y el pie guarda el tipo más general de cada columna
+(entero < real < texto); al leer, los valores se convierten a ese tipo.
+"""
+
+import json
+import zlib
+import struct
+from array import array
+from typing import Iterable, Iterator, List, Optional
+
+MAGIA = b"ASISCOL1"
+
+TEXTO = "texto"
+ENTERO = "entero"
+REAL = "real"
+
+_CODIGOS_ARRAY = {ENTERO: "q", REAL: "d"}
+_GENERALIDAD = {ENTERO: 0, REAL: 1, TEXTO: 2}
+
+def _inferir_tipo(valores) -> str:
+    tipo = None
+    for valor in valores:
+        if valor is None:
+            continue
+        if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+            return TEXTO
+        if isinstance(valor, float):
+            tipo = REAL
+        elif tipo is None:
+            tipo = ENTERO
+    return tipo or TEXTO
+
+def _tipo_comun(a: Optional[str], b: str) -> str:
+    """El más general de dos tipos: entero < real < texto"""
+    return b if a is None or _GENERALIDAD[b] > _GENERALIDAD[a] else a
+
+def _convertir(valores: list, origen: str, destino: str) -> list:
+    if origen == destino:
+        return valores
+    conversion = str if destino == TEXTO else float
+    return [None if v is None else conversion(v) for v in valores]
+
+def _mapa_nulos(valores) -> bytes:
+    mapa = bytearray((len(valores) + 7) // 8)
+    for i, valor in enumerate(valores):
+        if valor is None:
+            mapa[i >> 3] |= 1 << (i & 7)
+    return bytes(mapa)
+
+def _es_nulo(mapa: bytes, i: int) -> bool:
+    return bool(mapa[i >> 3] & (1 << (i & 7)))
+
+
+class EscritorColumnar:
+    """Escribe filas en grupos; cada grupo se codifica columna por columna
+
+        with EscritorColumnar("asistencia_2025.acol", ["id", "fecha", "estado"]) as arch:
+            arch.escribir_filas(cursor)
+    """
+
+    def __init__(self, ruta: str, columnas: List[str], tipos: Optional[List[str]] = None,
+                 filas_por_grupo: int = 10000, nivel_compresion: int = 6):
+        self.ruta = ruta
+        self.columnas = list(columnas)
+        self.tipos = list(tipos) if tipos else None
+        self._declarados = self.tipos is not None
+        self.filas_por_grupo = filas_por_grupo
+        self.nivel = nivel_compresion
+        self.filas_escritas = 0
+        self._pendientes = []
+        self._grupos = []
+        self._archivo = open(ruta, "wb")
+        self._archivo.write(MAGIA)
+
+    def escribir_fila(self, fila):
+        self._pendientes.append(tuple(fila))
+        if len(self._pendientes) >= self.filas_por_grupo:
+            self._escribir_grupo()
+
+    def escribir_filas(self, filas: Iterable) -> int:
+        antes = self.filas_escritas + len(self._pendientes)
+        for fila in filas:
+            self.escribir_fila(fila)
+        return self.filas_escritas + len(self._pendientes) - antes
+
+    def _codificar(self, tipo: str, valores: list) -> tuple:
+        nulos = _mapa_nulos(valores)
+        if tipo == TEXTO:
+            diccionario, indices = {}, array("I")
+            for valor in valores:
+                texto = "" if valor is None else str(valor)
+                indices.append(diccionario.setdefault(texto, len(diccionario)))
+            datos = json.dumps(list(diccionario), ensure_ascii=False).encode("utf-8")
+            cuerpo = struct.pack("<I", len(datos)) + datos + indices.tobytes()
+            extra = {'distintos': len(diccionario)}
+        else:
+            try:
+                arreglo = array(_CODIGOS_ARRAY[tipo], (0 if v is None else v for v in valores))
+            except TypeError:
+                raise ValueError(f"Columna de tipo {tipo} con valores no numéricos; indique los tipos")
+            cuerpo = arreglo.tobytes()
+            extra = {}
+        return zlib.compress(nulos + cuerpo, self.nivel), extra
+
+    def _escribir_grupo(self):
+        filas, self._pendientes = self._pendientes, []
+        if not filas:
+            return
+        columnas = list(zip(*filas))
+        if self._declarados:
+            tipos = self.tipos
+        else:
+            tipos = [_inferir_tipo(valores) for valores in columnas]
+            self.tipos = [_tipo_comun(a, b) for a, b in zip(self.tipos or [None] * len(tipos), tipos)]
+        bloques = []
+        for tipo, valores in zip(tipos, columnas):
+            datos, extra = self._codificar(tipo, valores)
+            bloques.append({'posicion': self._archivo.tell(), 'tamano': len(datos), **extra})
+            self._archivo.write(datos)
+        self._grupos.append({'filas': len(filas), 'tipos': tipos, 'bloques': bloques})
+        self.filas_escritas += len(filas)
+
+    def cerrar(self):
+        if self._archivo is None:
+            return
+        self._escribir_grupo()
+        pie = json.dumps({
+            'columnas': self.columnas,
+            'tipos': self.tipos or [TEXTO] * len(self.columnas),
+            'filas': self.filas_escritas,
+            'grupos': self._grupos,
+        }, ensure_ascii=False).encode("utf-8")
+        self._archivo.write(pie)
+        self._archivo.write(struct.pack("<Q", len(pie)) + MAGIA)
+        self._archivo.close()
+        self._archivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+
+
+class LectorColumnar:
+    """Lee archivos generados por EscritorColumnar"""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        with open(ruta, "rb") as f:
+            if f.read(len(MAGIA)) != MAGIA:
+                raise ValueError(f"{ruta} no es un archivo columnar de asistencia")
+            f.seek(-(8 + len(MAGIA)), 2)
+            longitud = struct.unpack("<Q", f.read(8))[0]
+            if f.read(len(MAGIA)) != MAGIA:
+                raise ValueError(f"{ruta} está incompleto o dañado")
+            f.seek(-(8 + len(MAGIA) + longitud), 2)
+            self.metadatos = json.loads(f.read(longitud).decode("utf-8"))
+        self.columnas = self.metadatos['columnas']
+        self.tipos = self.metadatos['tipos']
+
+    def __len__(self):
+        return self.metadatos['filas']
+
+    def _decodificar(self, f, tipo: str, bloque: dict, filas: int) -> list:
+        f.seek(bloque['posicion'])
+        datos = zlib.decompress(f.read(bloque['tamano']))
+        largo_nulos = (filas + 7) // 8
+        nulos, cuerpo = datos[:largo_nulos], datos[largo_nulos:]
+        if tipo == TEXTO:
+            largo = struct.unpack_from("<I", cuerpo)[0]
+            diccionario = json.loads(cuerpo[4:4 + largo].decode("utf-8"))
+            indices = array("I")
+            indices.frombytes(cuerpo[4 + largo:])
+            valores = [diccionario[i] for i in indices]
+        else:
+            arreglo = array(_CODIGOS_ARRAY[tipo])
+            arreglo.frombytes(cuerpo)
+            valores = arreglo.tolist()
+        if any(nulos):
+            valores = [None if _es_nulo(nulos, i) else v for i, v in enumerate(valores)]
+        return valores
+
+    def _leer_bloque(self, f, grupo: dict, indice: int) -> list:
+        """Valores de una columna en un grupo, convertidos al tipo de la columna"""
+        tipo = grupo.get('tipos', self.tipos)[indice]
+        valores = self._decodificar(f, tipo, grupo['bloques'][indice], grupo['filas'])
+        return _convertir(valores, tipo, self.tipos[indice])
+
+    def leer_columna(self, nombre: str) -> Iterator:
+        """Valores de una columna, leyendo solo sus bloques"""
+        indice = self.columnas.index(nombre)
+        with open(self.ruta, "rb") as f:
+            for grupo in self.metadatos['grupos']:
+                yield from self._leer_bloque(f, grupo, indice)
+
+    def filas(self, columnas: Optional[List[str]] = None) -> Iterator[tuple]:
+        """Filas completas (o solo de las columnas indicadas), grupo por grupo"""
+        indices = [self.columnas.index(c) for c in columnas] if columnas else range(len(self.columnas))
+        with open(self.ruta, "rb") as f:
+            for grupo in self.metadatos['grupos']:
+                datos = [self._leer_bloque(f, grupo, i) for i in indices]
+                yield from zip(*datos)
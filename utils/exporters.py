@@ -0,0 +1,139 @@
+"""
+Sistema de Exportación de Datos
+"""
+
+import csv
+import os
+
+from config.database import conectar
+from utils.xlsx import EscritorXLSX
+from utils.columnar import EscritorColumnar
+from utils.reporte_html import GeneradorReporteHTML
+
+def iterar_cursor(cursor, tamano: int = 1000):
+    """Recorre un cursor por lotes con fetchmany (memoria constante)"""
+    while True:
+        lote = cursor.fetchmany(tamano)
+        if not lote:
+            return
+        yield from lote
+
+class ExportadorAvanzado:
+    """Sistema de exportación mejorado"""
+    
+    @staticmethod
+    def exportar_csv(datos, nombre_archivo, encabezados=None):
+        """Exporta datos a CSV"""
+        try:
+            # Asegurar que el directorio de exportaciones existe
+            os.makedirs("exportaciones", exist_ok=True)
+            
+            ruta_completa = os.path.join("exportaciones", f"{nombre_archivo}.csv")
+            
+            # csv.writer escapa comillas, comas y saltos de línea dentro de los campos
+            with open(ruta_completa, 'w', encoding='utf-8', newline='') as f:
+                escritor = csv.writer(f, quoting=csv.QUOTE_ALL)
+                if encabezados:
+                    escritor.writerow(encabezados)
+                escritor.writerows(datos)
+            return True, f"Archivo exportado: {ruta_completa}"
+        except Exception as e:
+            return False, f"Error exportando CSV: {e}"
+    
+    @staticmethod
+    def exportar_html(datos, nombre_archivo, titulo="Reporte", encabezados=None,
+                      resumen=None, filas_por_pagina=5000):
+        """Exporta datos a HTML (paginado en varios archivos si es grande)"""
+        try:
+            generador = GeneradorReporteHTML("exportaciones", nombre_archivo, titulo,
+                                             encabezados, filas_por_pagina)
+            resultado = generador.generar(datos, resumen)
+            paginas = f", {len(resultado['paginas'])} páginas" if resultado['paginas'] else ""
+            return True, f"Archivo exportado: {resultado['indice']} ({resultado['filas']} registros{paginas})"
+        except Exception as e:
+            return False, f"Error exportando HTML: {e}"
+    
+    @staticmethod
+    def exportar_xlsx(datos, nombre_archivo, encabezados=None, nombre_hoja="Reporte"):
+        """Exporta datos a Excel (XLSX) escribiendo fila por fila"""
+        try:
+            os.makedirs("exportaciones", exist_ok=True)
+            ruta_completa = os.path.join("exportaciones", f"{nombre_archivo}.xlsx")
+            
+            with EscritorXLSX(ruta_completa, nombre_hoja) as xlsx:
+                if encabezados:
+                    xlsx.escribir_encabezados(encabezados)
+                total = xlsx.escribir_filas(datos)
+            return True, f"Archivo exportado: {ruta_completa} ({total} registros)"
+        except Exception as e:
+            return False, f"Error exportando XLSX: {e}"
+    
+    @staticmethod
+    def exportar_columnar(datos, nombre_archivo, columnas, tipos=None):
+        """Exporta datos al formato columnar comprimido (.acol)"""
+        try:
+            os.makedirs("exportaciones", exist_ok=True)
+            ruta_completa = os.path.join("exportaciones", f"{nombre_archivo}.acol")
+            
+            with EscritorColumnar(ruta_completa, columnas, tipos) as archivo:
+                total = archivo.escribir_filas(datos)
+            return True, f"Archivo exportado: {ruta_completa} ({total} registros)"
+        except Exception as e:
+            return False, f"Error exportando archivo columnar: {e}"
+    
+    @staticmethod
+    def archivar_asistencia(desde, hasta, formato="columnar", db_path=None):
+        """Exporta el histórico de asistencia de un rango directo desde la base de datos"""
+        columnas = ["id_asistencia", "id_estudiante", "cedula", "estudiante", "seccion",
+                    "fecha", "hora_entrada", "hora_salida", "estado", "observaciones"]
+        tipos = ["entero", "entero"] + ["texto"] * 8
+        conn = conectar(db_path)
+        try:
+            cursor = conn.execute("""
+                SELECT a.id_asistencia, a.id_estudiante, e.cedula,
+                       e.nombres || ' ' || e.apellidos, e.seccion,
+                       a.fecha, a.hora_entrada, a.hora_salida, a.estado, a.observaciones
+                FROM asistencia a
+                LEFT JOIN estudiantes e ON a.id_estudiante = e.id
+                WHERE a.fecha BETWEEN ? AND ?
+                ORDER BY a.fecha, a.id_asistencia
+            """, (desde, hasta))
+            nombre = f"asistencia_{desde}_{hasta}"
+            if formato == "xlsx":
+                return ExportadorAvanzado.exportar_xlsx(iterar_cursor(cursor), nombre, columnas, "Asistencia")
+            if formato == "csv":
+                return ExportadorAvanzado.exportar_csv(iterar_cursor(cursor), nombre, columnas)
+            return ExportadorAvanzado.exportar_columnar(iterar_cursor(cursor), nombre, columnas, tipos)
+        finally:
+            conn.close()
+
+class BuscadorAvanzado:
+    """Sistema de búsqueda avanzada"""
+    
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+    
+    def buscar_estudiantes(self, criterios):
+        """Búsqueda avanzada de estudiantes"""
+        query = "SELECT * FROM estudiantes WHERE 1=1"
+        params = []
+        
+        if criterios.get('nombre'):
+            query += " AND (nombres LIKE ? OR apellidos LIKE ?)"
+            params.extend([f"%{criterios['nombre']}%", f"%{criterios['nombre']}%"])
+        
+        if criterios.get('carrera'):
+            query += " AND carrera = ?"
+            params.append(criterios['carrera'])
+        
+        if criterios.get('cedula'):
+            query += " AND cedula LIKE ?"
+            params.append(f"%{criterios['cedula']}%")
+        
+        if criterios.get('anio'):
+            query += " AND anio = ?"
+            params.append(criterios['anio'])
+        
+        query += " ORDER BY id DESC"
+        
+        return self.db_manager.execute_query(query, params, fetch=True)
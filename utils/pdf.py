@@ -0,0 +1,155 @@
+"""
+Escritor PDF mínimo en Python puro
+
+Usa las fuentes estándar Helvetica/Helvetica-Bold (no requieren incrustarse)
+con codificación WinAnsi, suficiente para texto en español. Permite texto,
+líneas y rectángulos; las métricas de ancho se cachean por proceso.
+"""
+
+import zlib
+import unicodedata
+from functools import lru_cache
+
+A4_HORIZONTAL = (842, 595)
+A4_VERTICAL = (595, 842)
+
+FUENTES = {"normal": "Helvetica", "negrita": "Helvetica-Bold"}
+
+# Anchos AFM (1/1000 em) de los caracteres 32..126
+_ANCHOS_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_ANCHOS_HELVETICA_NEGRITA = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+
+@lru_cache(maxsize=None)
+def _tabla_anchos(estilo: str) -> dict:
+    """Anchos por carácter de una fuente (se arma una vez por proceso)"""
+    anchos = _ANCHOS_HELVETICA_NEGRITA if estilo == "negrita" else _ANCHOS_HELVETICA
+    return {chr(32 + i): ancho for i, ancho in enumerate(anchos)}
+
+@lru_cache(maxsize=4096)
+def _ancho_caracter(caracter: str, estilo: str) -> int:
+    tabla = _tabla_anchos(estilo)
+    if caracter in tabla:
+        return tabla[caracter]
+    # Letras acentuadas: mismo ancho que la letra base
+    base = unicodedata.normalize("NFKD", caracter)[:1]
+    return tabla.get(base, 556)
+
+@lru_cache(maxsize=8192)
+def ancho_texto(texto: str, tamano: float, estilo: str = "normal") -> float:
+    """Ancho en puntos de un texto"""
+    return sum(_ancho_caracter(c, estilo) for c in texto) * tamano / 1000.0
+
+def recortar(texto: str, ancho_max: float, tamano: float, estilo: str = "normal") -> str:
+    """Recorta el texto con '…' para que quepa en el ancho indicado"""
+    if ancho_texto(texto, tamano, estilo) <= ancho_max:
+        return texto
+    while texto and ancho_texto(texto + "…", tamano, estilo) > ancho_max:
+        texto = texto[:-1]
+    return texto + "…"
+
+def _cadena_pdf(texto: str) -> bytes:
+    datos = str(texto).encode("cp1252", errors="replace")
+    return b"(" + datos.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+class DocumentoPDF:
+    """Documento PDF que se arma página por página
+
+        doc = DocumentoPDF(A4_HORIZONTAL)
+        doc.nueva_pagina()
+        doc.texto(40, 550, "Hola", 12, "negrita")
+        doc.guardar("hoja.pdf")
+    """
+
+    def __init__(self, tamano_pagina=A4_VERTICAL, titulo: str = ""):
+        self.ancho, self.alto = tamano_pagina
+        self.titulo = titulo
+        self._paginas = []
+        self._actual = None
+
+    def nueva_pagina(self):
+        self._actual = []
+        self._paginas.append(self._actual)
+
+    def _op(self, operacion: bytes):
+        if self._actual is None:
+            self.nueva_pagina()
+        self._actual.append(operacion)
+
+    def texto(self, x: float, y: float, texto: str, tamano: float = 10, estilo: str = "normal",
+              alineacion: str = "izquierda"):
+        """Escribe texto con la línea base en (x, y); y se mide desde abajo"""
+        if alineacion == "centro":
+            x -= ancho_texto(texto, tamano, estilo) / 2
+        elif alineacion == "derecha":
+            x -= ancho_texto(texto, tamano, estilo)
+        fuente = b"/F2" if estilo == "negrita" else b"/F1"
+        self._op(b"BT %s %.2f Tf %.2f %.2f Td %s Tj ET" % (fuente, tamano, x, y, _cadena_pdf(texto)))
+
+    def linea(self, x1: float, y1: float, x2: float, y2: float, grosor: float = 0.5):
+        self._op(b"%.2f w %.2f %.2f m %.2f %.2f l S" % (grosor, x1, y1, x2, y2))
+
+    def rectangulo(self, x: float, y: float, ancho: float, alto: float, relleno=None, borde: bool = True):
+        """Rectángulo con esquina inferior izquierda en (x, y); relleno es (r, g, b) 0..1"""
+        if relleno is not None:
+            self._op(b"q %.3f %.3f %.3f rg %.2f %.2f %.2f %.2f re f Q" % (*relleno, x, y, ancho, alto))
+        if borde:
+            self._op(b"0.5 w %.2f %.2f %.2f %.2f re S" % (x, y, ancho, alto))
+
+    @property
+    def paginas(self) -> int:
+        return len(self._paginas)
+
+    def guardar(self, ruta: str):
+        """Serializa el documento (objetos, tabla xref y trailer)"""
+        objetos = []
+
+        def agregar(contenido: bytes) -> int:
+            objetos.append(contenido)
+            return len(objetos)
+
+        catalogo = agregar(b"")
+        raiz_paginas = agregar(b"")
+        f1 = agregar(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        f2 = agregar(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+        recursos = b"<< /Font << /F1 %d 0 R /F2 %d 0 R >> >>" % (f1, f2)
+
+        hijos = []
+        for operaciones in self._paginas or [[]]:
+            flujo = zlib.compress(b"\n".join(operaciones))
+            contenido = agregar(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(flujo), flujo))
+            hijos.append(agregar(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+                % (raiz_paginas, self.ancho, self.alto, recursos, contenido)
+            ))
+        objetos[catalogo - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % raiz_paginas
+        objetos[raiz_paginas - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % h for h in hijos), len(hijos))
+        info = agregar(b"<< /Title %s /Producer (Sistema de Asistencia) >>" % _cadena_pdf(self.titulo))
+
+        salida = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        posiciones = []
+        for numero, contenido in enumerate(objetos, start=1):
+            posiciones.append(len(salida))
+            salida += b"%d 0 obj\n%s\nendobj\n" % (numero, contenido)
+        inicio_xref = len(salida)
+        salida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+        salida += b"".join(b"%010d 00000 n \n" % p for p in posiciones)
+        salida += b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(objetos) + 1, catalogo, info, inicio_xref)
+        with open(ruta, "wb") as f:
+            f.write(salida)
@@ -0,0 +1,163 @@
+"""
+Generador de reportes HTML paginados
+
+Escribe las filas en bloques grandes (no una escritura por celda), escapa
+todo el contenido y divide los reportes grandes en páginas numeradas con
+una página índice, para que el navegador no tenga que cargar decenas de
+miles de filas en un solo documento.
+"""
+
+import os
+from html import escape
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, List, Optional
+
+ESTILOS = """
+    body { font-family: Arial, sans-serif; margin: 20px; }
+    table { border-collapse: collapse; width: 100%; margin-top: 20px; }
+    th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+    th { background-color: #2563eb; color: white; position: sticky; top: 0; }
+    tr:nth-child(even) { background-color: #f9fafb; }
+    .header { background-color: #1e3a8a; color: white; padding: 20px; text-align: center; }
+    .info { margin: 10px 0; color: #64748b; }
+    .resumen { display: flex; flex-wrap: wrap; gap: 12px; margin-top: 16px; }
+    .resumen div { background: #eff6ff; border: 1px solid #bfdbfe; padding: 10px 16px; border-radius: 6px; }
+    .resumen b { display: block; font-size: 20px; color: #1e3a8a; }
+    .nav { margin: 12px 0; }
+    .nav a { margin-right: 12px; }
+    .paginas a { display: inline-block; margin: 4px; padding: 6px 10px; border: 1px solid #ddd; }
+"""
+
+_FIN = object()
+
+def _texto(valor) -> str:
+    return "" if valor is None else escape(str(valor))
+
+
+class GeneradorReporteHTML:
+    """Genera un reporte HTML en una o varias páginas
+
+    Si todas las filas caben en una página el reporte queda en un único
+    archivo; si no, `<nombre>.html` es el índice y las filas van en
+    `<nombre>_p0001.html`, `<nombre>_p0002.html`...
+    """
+
+    def __init__(self, directorio: str, nombre: str, titulo: str = "Reporte",
+                 encabezados: Optional[List[str]] = None, filas_por_pagina: int = 5000,
+                 tamano_bloque: int = 256 * 1024):
+        self.directorio = directorio
+        self.nombre = nombre
+        self.titulo = titulo
+        self.encabezados = list(encabezados or [])
+        self.filas_por_pagina = filas_por_pagina
+        self.tamano_bloque = tamano_bloque
+        self.generado = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    @property
+    def ruta_indice(self) -> str:
+        return os.path.join(self.directorio, f"{self.nombre}.html")
+
+    def _ruta_pagina(self, numero: int) -> str:
+        return os.path.join(self.directorio, self._archivo_pagina(numero))
+
+    def _archivo_pagina(self, numero: int) -> str:
+        return f"{self.nombre}_p{numero:04d}.html"
+
+    def _cabecera(self, subtitulo: str = "", resumen: Optional[dict] = None) -> str:
+        partes = [
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n',
+            f"<title>{_texto(self.titulo)}</title>\n<style>{ESTILOS}</style>\n</head>\n<body>\n",
+            '<div class="header">',
+            f"<h1>{_texto(self.titulo)}</h1>",
+            "<p>Instituto Rubén Darío - Sistema de Gestión Académica</p>",
+            f'<p class="info">Generado: {self.generado}</p>',
+        ]
+        if subtitulo:
+            partes.append(f"<p>{_texto(subtitulo)}</p>")
+        partes.append("</div>\n")
+        if resumen:
+            partes.append('<div class="resumen">')
+            partes.extend(f"<div><b>{_texto(v)}</b>{_texto(k)}</div>" for k, v in resumen.items())
+            partes.append("</div>\n")
+        return "".join(partes)
+
+    def _inicio_tabla(self) -> str:
+        if not self.encabezados:
+            return "<table>\n"
+        return "<table>\n<thead><tr>" + "".join(f"<th>{_texto(h)}</th>" for h in self.encabezados) + "</tr></thead>\n"
+
+    def _escribir_filas(self, archivo, filas) -> int:
+        """Escribe las filas en bloques de ~tamano_bloque caracteres"""
+        bloque, largo, total = [], 0, 0
+        for fila in filas:
+            linea = "<tr>" + "".join(f"<td>{_texto(celda)}</td>" for celda in fila) + "</tr>\n"
+            bloque.append(linea)
+            largo += len(linea)
+            total += 1
+            if largo >= self.tamano_bloque:
+                archivo.write("".join(bloque))
+                bloque, largo = [], 0
+        if bloque:
+            archivo.write("".join(bloque))
+        return total
+
+    def _abrir(self, ruta: str):
+        return open(ruta, "w", encoding="utf-8", buffering=self.tamano_bloque)
+
+    def _navegacion(self, numero: int, hay_siguiente: bool) -> str:
+        enlaces = [f'<a href="{escape(os.path.basename(self.ruta_indice))}">Índice</a>']
+        if numero > 1:
+            enlaces.append(f'<a href="{escape(self._archivo_pagina(numero - 1))}">« Anterior</a>')
+        if hay_siguiente:
+            enlaces.append(f'<a href="{escape(self._archivo_pagina(numero + 1))}">Siguiente »</a>')
+        return f'<div class="nav">{"".join(enlaces)}</div>\n'
+
+    def generar(self, filas: Iterable, resumen: Optional[dict] = None) -> dict:
+        """Escribe el reporte; devuelve rutas y número de filas y páginas"""
+        os.makedirs(self.directorio, exist_ok=True)
+        iterador = iter(filas)
+        primera = list(islice(iterador, self.filas_por_pagina))
+        siguiente = next(iterador, _FIN)
+
+        if siguiente is _FIN:
+            # Reporte pequeño: un solo archivo con la tabla
+            with self._abrir(self.ruta_indice) as f:
+                f.write(self._cabecera(resumen=resumen))
+                f.write(self._inicio_tabla())
+                total = self._escribir_filas(f, primera)
+                f.write(f'</table>\n<div class="info"><p>Total de registros: {total}</p></div>\n</body>\n</html>\n')
+            return {'indice': self.ruta_indice, 'paginas': [], 'filas': total}
+
+        paginas, total, numero = [], 0, 0
+        pagina = primera
+        while pagina:
+            numero += 1
+            if len(pagina) == self.filas_por_pagina and siguiente is _FIN:
+                siguiente = next(iterador, _FIN)
+            hay_siguiente = siguiente is not _FIN
+            ruta = self._ruta_pagina(numero)
+            with self._abrir(ruta) as f:
+                desde = total + 1
+                f.write(self._cabecera(f"Página {numero} — registros desde {desde}"))
+                f.write(self._navegacion(numero, hay_siguiente))
+                f.write(self._inicio_tabla())
+                total += self._escribir_filas(f, pagina)
+                f.write("</table>\n")
+                f.write(self._navegacion(numero, hay_siguiente))
+                f.write("</body>\n</html>\n")
+            paginas.append((ruta, desde, total))
+            if not hay_siguiente:
+                break
+            pagina = [siguiente] + list(islice(iterador, self.filas_por_pagina - 1))
+            siguiente = _FIN
+
+        with self._abrir(self.ruta_indice) as f:
+            f.write(self._cabecera(f"{total} registros en {len(paginas)} páginas", resumen))
+            f.write('<div class="paginas">')
+            f.write("".join(
+                f'<a href="{escape(os.path.basename(ruta))}">Página {i} ({desde}–{hasta})</a>'
+                for i, (ruta, desde, hasta) in enumerate(paginas, start=1)
+            ))
+            f.write("</div>\n</body>\n</html>\n")
+        return {'indice': self.ruta_indice, 'paginas': [p[0] for p in paginas], 'filas': total}
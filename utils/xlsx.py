@@ -0,0 +1,224 @@
+"""
+Lectura y escritura XLSX en streaming (sin dependencias externas)
+
+Escribe el libro como un zip de partes XML. Las filas se escriben directo a
+la hoja comprimida a medida que llegan, con celdas de texto en línea
+(inlineStr), así que la memoria usada no depende del número de filas.
+La lectura recorre la hoja con iterparse, también fila por fila.
+"""
+
+import re
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+# Caracteres de control que XML 1.0 no permite
+_RE_INVALIDOS_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>
+</Types>"""
+
+_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+# Estilo 0: normal; estilo 1: encabezado en negrita
+_STYLES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/><xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>
+</styleSheet>"""
+
+def _columna(indice: int) -> str:
+    """0 -> A, 25 -> Z, 26 -> AA"""
+    letras = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+def _texto_xml(valor) -> str:
+    return escape(_RE_INVALIDOS_XML.sub("", str(valor)), {'"': "&quot;"})
+
+
+class EscritorXLSX:
+    """Escribe una hoja de cálculo fila por fila
+
+        with EscritorXLSX("reporte.xlsx", "Asistencia") as xlsx:
+            xlsx.escribir_encabezados(["ID", "Estudiante"])
+            xlsx.escribir_filas(cursor)
+    """
+
+    def __init__(self, ruta: str, nombre_hoja: str = "Hoja1"):
+        self.ruta = ruta
+        self.nombre_hoja = _texto_xml(re.sub(r"[\[\]:*?/\\]", "", str(nombre_hoja))[:31]) or "Hoja1"
+        self.filas_escritas = 0
+        self._columnas = []
+        self._buffer = []
+        self._zip = zipfile.ZipFile(ruta, "w", compression=zipfile.ZIP_DEFLATED)
+        self._hoja = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self._escribir(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetData>'
+        )
+
+    def _escribir(self, texto: str):
+        self._buffer.append(texto)
+        # Agrupar filas reduce las llamadas al compresor sin acumular la hoja entera
+        if len(self._buffer) >= 512:
+            self._vaciar()
+
+    def _vaciar(self):
+        if self._buffer:
+            self._hoja.write("".join(self._buffer).encode("utf-8"))
+            self._buffer.clear()
+
+    def _ref(self, indice: int) -> str:
+        while len(self._columnas) <= indice:
+            self._columnas.append(_columna(len(self._columnas)))
+        return self._columnas[indice]
+
+    def _celda(self, indice: int, fila: int, valor, estilo: int = 0) -> str:
+        ref = f"{self._ref(indice)}{fila}"
+        s = f' s="{estilo}"' if estilo else ""
+        if valor is None or valor == "":
+            return ""
+        if isinstance(valor, bool):
+            return f'<c r="{ref}" t="b"{s}><v>{int(valor)}</v></c>'
+        if isinstance(valor, (int, float)):
+            return f'<c r="{ref}"{s}><v>{valor}</v></c>'
+        if isinstance(valor, (datetime, date)):
+            valor = valor.isoformat(sep=" ") if isinstance(valor, datetime) else valor.isoformat()
+        return f'<c r="{ref}" t="inlineStr"{s}><is><t xml:space="preserve">{_texto_xml(valor)}</t></is></c>'
+
+    def escribir_fila(self, valores, estilo: int = 0):
+        self.filas_escritas += 1
+        n = self.filas_escritas
+        celdas = "".join(self._celda(i, n, v, estilo) for i, v in enumerate(valores))
+        self._escribir(f'<row r="{n}">{celdas}</row>')
+
+    def escribir_encabezados(self, encabezados):
+        self.escribir_fila(encabezados, estilo=1)
+
+    def escribir_filas(self, filas) -> int:
+        """Escribe todas las filas de un iterable (lista, generador o cursor)"""
+        antes = self.filas_escritas
+        for fila in filas:
+            self.escribir_fila(fila)
+        return self.filas_escritas - antes
+
+    def cerrar(self):
+        """Cierra la hoja y escribe las partes restantes del libro"""
+        if self._zip is None:
+            return
+        self._escribir("</sheetData></worksheet>")
+        self._vaciar()
+        self._hoja.close()
+        self._zip.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        self._zip.writestr("_rels/.rels", _RELS)
+        self._zip.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        self._zip.writestr("xl/styles.xml", _STYLES)
+        self._zip.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{self.nombre_hoja}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ))
+        self._zip.close()
+        self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_RE_REF = re.compile(r"([A-Z]+)")
+
+def _indice_columna(ref: str) -> int:
+    """'A1' -> 0, 'AB7' -> 27"""
+    letras = _RE_REF.match(ref).group(1)
+    indice = 0
+    for letra in letras:
+        indice = indice * 26 + (ord(letra) - 64)
+    return indice - 1
+
+
+class LectorXLSX:
+    """Lee la primera hoja de un .xlsx fila por fila sin cargarla completa"""
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+
+    def _hoja(self, libro: zipfile.ZipFile) -> str:
+        nombres = libro.namelist()
+        if "xl/worksheets/sheet1.xml" in nombres:
+            return "xl/worksheets/sheet1.xml"
+        hojas = sorted(n for n in nombres if n.startswith("xl/worksheets/") and n.endswith(".xml"))
+        if not hojas:
+            raise ValueError(f"{self.ruta} no contiene hojas de cálculo")
+        return hojas[0]
+
+    @staticmethod
+    def _textos_compartidos(libro: zipfile.ZipFile) -> list:
+        if "xl/sharedStrings.xml" not in libro.namelist():
+            return []
+        from xml.etree.ElementTree import iterparse
+        textos = []
+        with libro.open("xl/sharedStrings.xml") as f:
+            for _, elemento in iterparse(f):
+                if elemento.tag == _NS + "si":
+                    textos.append("".join(t.text or "" for t in elemento.iter(_NS + "t")))
+                    elemento.clear()
+        return textos
+
+    def filas(self):
+        """Genera cada fila como lista de textos (celdas vacías como '')"""
+        from xml.etree.ElementTree import iterparse
+        with zipfile.ZipFile(self.ruta) as libro:
+            compartidos = self._textos_compartidos(libro)
+            with libro.open(self._hoja(libro)) as f:
+                for _, elemento in iterparse(f):
+                    if elemento.tag != _NS + "row":
+                        continue
+                    fila = []
+                    for celda in elemento.iter(_NS + "c"):
+                        ref = celda.get("r")
+                        if ref:
+                            indice = _indice_columna(ref)
+                            fila.extend([""] * (indice - len(fila)))
+                        tipo = celda.get("t")
+                        if tipo == "inlineStr":
+                            valor = "".join(t.text or "" for t in celda.iter(_NS + "t"))
+                        else:
+                            v = celda.find(_NS + "v")
+                            valor = v.text if v is not None and v.text is not None else ""
+                            if tipo == "s" and valor:
+                                valor = compartidos[int(valor)]
+                            elif tipo is None and valor.endswith(".0"):
+                                # Números enteros guardados como real (cédulas, teléfonos)
+                                valor = valor[:-2]
+                        fila.append(valor)
+                    elemento.clear()
+                    yield fila